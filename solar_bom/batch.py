@@ -0,0 +1,305 @@
+"""Batch Quick Estimate refresh.
+
+Recalculates every saved quick estimate in the projects folder and writes a
+fresh Excel BOM and site PDF packet for each, fanned out over a process pool.
+Use it after a pricing or copper-tier change instead of re-exporting each
+estimate by hand.
+
+    python -m solar_bom.batch --jobs 4 --out exports
+    python batch.py --project "Sunny Acres" --calc-only --summary totals.json
+
+Calculation runs headless through EstimateEngine. Excel/PDF export reuses the
+Quick Estimate tab's own writers, so it needs Tk and a display (a hidden Tk
+root is created per estimate); without one the run stops before starting any
+worker. --calc-only skips export entirely and reports each estimate's totals
+(capacity, strings, devices, cable loss), which --summary also writes as JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Allow `python -m solar_bom.batch` from the repo root as well as
+# `python batch.py` from this folder — the app imports everything as src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.models.project import Project
+from src.utils.file_handlers import get_user_projects_dir
+
+
+def collect_jobs(projects_dir, project_names=None, estimate_names=None):
+    """List (project_filepath, estimate_id, project_name, estimate_name) tuples.
+
+    project_names / estimate_names filter by case-insensitive name match.
+    """
+    wanted_projects = {n.lower() for n in project_names} if project_names else None
+    wanted_estimates = {n.lower() for n in estimate_names} if estimate_names else None
+
+    jobs = []
+    for filename in sorted(os.listdir(projects_dir)):
+        if not filename.endswith('.json') or filename.startswith('.'):
+            continue
+        filepath = os.path.join(projects_dir, filename)
+        project = Project.load(filepath)
+        if project is None:
+            continue
+        project_name = project.metadata.name
+        if wanted_projects is not None and project_name.lower() not in wanted_projects:
+            continue
+        for est_id, est_data in project.quick_estimates.items():
+            est_name = est_data.get('name', 'Unnamed Estimate')
+            if wanted_estimates is not None and est_name.lower() not in wanted_estimates:
+                continue
+            jobs.append((filepath, est_id, project_name, est_name))
+    return jobs
+
+
+def calculate_estimate(project, estimate_id):
+    """Run one saved estimate through EstimateEngine. Returns the totals dict."""
+    from src.utils.estimate_engine import EstimateEngine, load_enabled_templates
+    from src.utils.inverter_library import load_merged_inverter_specs
+
+    estimate = project.quick_estimates[estimate_id]
+    templates = load_enabled_templates(getattr(project, 'enabled_templates', None))
+    inverters, _ = load_merged_inverter_specs()
+    inv_id = estimate.get('inverter_id') or estimate.get('inverter_name', '')
+
+    engine = EstimateEngine(
+        estimate, templates,
+        inverter=inverters.get(inv_id),
+        nec_factor=getattr(project, 'nec_safety_factor', 1.56),
+    )
+    return engine.calculate()
+
+
+def summarize_totals(totals):
+    """The headline numbers of a totals dict, as plain JSON-ready values."""
+    inv_summary = totals.get('inverter_summary') or {}
+    losses = totals.get('cable_losses') or {}
+    return {
+        'dc_kw': totals.get('total_dc_kw'),
+        'ac_kw': totals.get('total_ac_kw'),
+        'modules': totals.get('total_modules'),
+        'strings': inv_summary.get('total_strings'),
+        'devices': inv_summary.get('total_inverters'),
+        'cable_loss_kw': losses['total_loss_w'] / 1000.0 if 'total_loss_w' in losses else None,
+        'cable_loss_pct': losses.get('loss_pct'),
+    }
+
+
+def display_unavailable():
+    """Why export can't run in this environment, or None if it can.
+
+    Export drives a hidden Quick Estimate tab, so it needs Tk and, outside
+    Windows and macOS, an X or Wayland display.
+    """
+    try:
+        import tkinter  # noqa: F401
+    except ImportError:
+        return "export needs Tk, and this Python was built without tkinter"
+    if sys.platform not in ('win32', 'darwin') and not (
+            os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return "export needs a display, and $DISPLAY is not set"
+    return None
+
+
+def _route_dialogs_to_console():
+    """Replace blocking message boxes with console output.
+
+    A batch worker has no one to click OK, so the Quick Estimate tab's
+    warnings and errors are printed instead.
+    """
+    from tkinter import messagebox
+
+    def _show(kind):
+        def show(title=None, message=None, **kwargs):
+            print(f"[batch] {kind}: {title}: {message}", file=sys.stderr)
+            return 'ok'
+        return show
+
+    messagebox.showinfo = _show('info')
+    messagebox.showwarning = _show('warning')
+    messagebox.showerror = _show('error')
+    messagebox.askyesno = lambda *args, **kwargs: False
+
+
+def export_estimate(project, estimate_id, out_dir, excel=True, pdf=True):
+    """Recalculate one estimate in a hidden Quick Estimate tab and export it.
+
+    Returns {'excel': path_or_None, 'pdf': path_or_None, 'timings': {...}}.
+    Raises RuntimeError when the estimate can't be exported as-is, or when
+    there is no display to export with (see display_unavailable()).
+    """
+    reason = display_unavailable()
+    if reason:
+        raise RuntimeError(reason)
+
+    import tkinter as tk
+    from src.ui.quick_estimate import QuickEstimate
+
+    _route_dialogs_to_console()
+    timings = {}
+    result = {'excel': None, 'pdf': None, 'timings': timings}
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        qe = QuickEstimate(root, current_project=project)
+        if qe.estimate_id != estimate_id:
+            qe.estimate_id = estimate_id
+            qe.load_estimate()
+
+        start = time.perf_counter()
+        qe.calculate_estimate(silent=True)
+        timings['calc'] = time.perf_counter() - start
+        if qe._results_stale:
+            raise RuntimeError("calculation failed")
+
+        unalloc = qe._count_unallocated_strings()
+        if unalloc > 0:
+            raise RuntimeError(f"{unalloc} string(s) not assigned to a device")
+        ok, msg = qe._check_skid_pads()
+        if not ok:
+            raise RuntimeError(msg)
+
+        if excel:
+            path = os.path.join(out_dir, qe.suggested_export_filename("Ampacity Quick eBOM", ".xlsx"))
+            start = time.perf_counter()
+            if not qe.export_to_excel(target_filepath=path, silent=True):
+                raise RuntimeError("Excel export failed")
+            timings['excel'] = time.perf_counter() - start
+            result['excel'] = path
+
+        if pdf:
+            path = os.path.join(out_dir, qe.suggested_export_filename("Site PDF", ".pdf"))
+            start = time.perf_counter()
+            if not qe._generate_site_pdf(path, include_wiring=True):
+                raise RuntimeError("PDF export failed")
+            timings['pdf'] = time.perf_counter() - start
+            result['pdf'] = path
+    finally:
+        root.destroy()
+
+    return result
+
+
+def run_job(job, out_dir, calc_only=False, excel=True, pdf=True):
+    """Process-pool entry point. Never raises — errors come back in the result."""
+    filepath, estimate_id, project_name, estimate_name = job
+    result = {
+        'project': project_name,
+        'estimate': estimate_name,
+        'ok': False,
+        'error': None,
+        'timings': {},
+        'files': [],
+        'summary': None,
+    }
+    start = time.perf_counter()
+    try:
+        project = Project.load(filepath)
+        if project is None:
+            raise RuntimeError(f"could not load {filepath}")
+
+        if calc_only:
+            calc_start = time.perf_counter()
+            totals = calculate_estimate(project, estimate_id)
+            result['timings']['calc'] = time.perf_counter() - calc_start
+            result['summary'] = summarize_totals(totals)
+        else:
+            exported = export_estimate(project, estimate_id, out_dir, excel=excel, pdf=pdf)
+            result['timings'].update(exported['timings'])
+            result['files'] = [p for p in (exported['excel'], exported['pdf']) if p]
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    result['timings']['total'] = time.perf_counter() - start
+    return result
+
+
+def _format_result(result):
+    t = result['timings']
+    parts = [f"{t.get('total', 0):7.2f}s"]
+    for key in ('calc', 'excel', 'pdf'):
+        if key in t:
+            parts.append(f"{key} {t[key]:.2f}s")
+    status = "ok  " if result['ok'] else "FAIL"
+    line = f"{status} {'  '.join(parts):<48} {result['project']} / {result['estimate']}"
+    summary = result.get('summary')
+    if summary and summary['dc_kw'] is not None:
+        line += f"\n       {summary['dc_kw']:,.1f} kW DC, {summary['strings'] or 0:,} strings"
+        if summary['cable_loss_pct'] is not None:
+            line += f", cable loss {summary['cable_loss_pct']:.2f}%"
+    if result['error']:
+        line += f"\n       {result['error']}"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recalculate and export every saved Quick Estimate.")
+    parser.add_argument('--projects-dir', default=None,
+                        help="Folder of project .json files (default: the app's projects folder)")
+    parser.add_argument('--out', default='batch_exports',
+                        help="Output folder for Excel/PDF files (default: batch_exports)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument('--project', action='append', dest='projects',
+                        help="Only this project name (repeatable)")
+    parser.add_argument('--estimate', action='append', dest='estimates',
+                        help="Only this estimate name (repeatable)")
+    parser.add_argument('--calc-only', action='store_true',
+                        help="Recalculate and report totals without exporting. Export needs Tk "
+                             "and a display (e.g. run under xvfb-run on a headless server); "
+                             "this mode needs neither")
+    parser.add_argument('--summary', metavar='JSON',
+                        help="Also write every estimate's result and totals to this JSON file")
+    parser.add_argument('--no-excel', action='store_true', help="Skip the Excel BOM")
+    parser.add_argument('--no-pdf', action='store_true', help="Skip the site PDF packet")
+    args = parser.parse_args(argv)
+
+    projects_dir = args.projects_dir or get_user_projects_dir()
+    jobs = collect_jobs(projects_dir, args.projects, args.estimates)
+    if not jobs:
+        print(f"No quick estimates found in {projects_dir}")
+        return 1
+
+    if not args.calc_only:
+        reason = display_unavailable()
+        if reason:
+            print(f"Cannot export: {reason}.\n"
+                  "Rerun with --calc-only, or under a virtual display such as xvfb-run.",
+                  file=sys.stderr)
+            return 2
+        os.makedirs(args.out, exist_ok=True)
+
+    n_workers = max(1, min(args.jobs, len(jobs)))
+    print(f"Processing {len(jobs)} estimate(s) with {n_workers} worker(s)...")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [
+            pool.submit(run_job, job, args.out, args.calc_only, not args.no_excel, not args.no_pdf)
+            for job in jobs
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(_format_result(result), flush=True)
+
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if not r['ok']]
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(f"\n{len(results) - len(failed)}/{len(results)} estimate(s) succeeded in {elapsed:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
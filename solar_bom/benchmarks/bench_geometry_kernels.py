@@ -0,0 +1,166 @@
+"""Micro-benchmark: scalar SAT/AABB loops vs. geometry_kernels.
+
+Run from the project root:  python -m benchmarks.bench_geometry_kernels
+
+Builds a synthetic layout (250 groups x 20 trackers = 5,000 trackers by
+default, some rotated, packed tightly enough that neighbouring groups touch),
+then times the three operations the site preview and site PDF run on it:
+
+  bboxes   -- rotated tracker quads -> axis-aligned bounding boxes
+  pairs    -- bounding-box candidate pairs between neighbouring groups
+  sat      -- separating-axis test over those candidate pairs
+
+The "scalar" column is the per-corner Python code these replaced; both sides
+must agree on every result or the run fails.
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import geometry_kernels  # noqa: E402
+
+
+def synthetic_layout(n_trackers=5000, per_group=20, seed=1):
+    """List of groups, each an (per_group, 4, 2) list of tracker quads."""
+    rng = random.Random(seed)
+    groups = []
+    n_groups = max(1, n_trackers // per_group)
+    cols = max(1, int(math.sqrt(n_groups)))
+    for gi in range(n_groups):
+        gx = (gi % cols) * (per_group * 20.0 - rng.uniform(0, 30))
+        gy = (gi // cols) * (300.0 - rng.uniform(0, 20))
+        rd = rng.choice([0.0, 0.0, 0.0, 5.0])
+        rcx, rcy = gx + per_group * 10.0, gy + 150.0
+        quads = []
+        for t in range(per_group):
+            length = rng.choice([150.0, 200.0, 300.0])
+            tx, ty = gx + t * 20.0, gy + rng.uniform(0, 300.0 - length)
+            corners = [(tx, ty), (tx + 6.5, ty), (tx + 6.5, ty + length), (tx, ty + length)]
+            if rd:
+                rad = math.radians(rd)
+                corners = [((x - rcx) * math.cos(rad) - (y - rcy) * math.sin(rad) + rcx,
+                            (x - rcx) * math.sin(rad) + (y - rcy) * math.cos(rad) + rcy)
+                           for x, y in corners]
+            quads.append(corners)
+        groups.append(quads)
+    return groups
+
+
+# ---------------------------------------------------------------- scalar side
+
+def scalar_bboxes(groups):
+    out = []
+    for quads in groups:
+        for corners in quads:
+            xs = [c[0] for c in corners]
+            ys = [c[1] for c in corners]
+            out.append((min(xs), min(ys), max(xs), max(ys)))
+    return out
+
+
+def scalar_sat(a, b):
+    for poly in (a, b):
+        n = len(poly)
+        for k in range(n):
+            x1, y1 = poly[k]
+            x2, y2 = poly[(k + 1) % n]
+            nx, ny = -(y2 - y1), (x2 - x1)
+            pa = [nx * px + ny * py for px, py in a]
+            pb = [nx * px + ny * py for px, py in b]
+            if max(pa) < min(pb) or max(pb) < min(pa):
+                return False
+    return True
+
+
+def scalar_pairs(groups, boxes, offsets, group_pairs):
+    pairs = []
+    for gi, gj in group_pairs:
+        for i in range(offsets[gi], offsets[gi + 1]):
+            a = boxes[i]
+            for j in range(offsets[gj], offsets[gj + 1]):
+                b = boxes[j]
+                if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                    pairs.append((i, j))
+    return pairs
+
+
+# ---------------------------------------------------------------- kernel side
+
+def kernel_pairs(boxes, offsets, group_pairs):
+    ia, ib = [], []
+    for gi, gj in group_pairs:
+        sa, sb = slice(offsets[gi], offsets[gi + 1]), slice(offsets[gj], offsets[gj + 1])
+        i, j = np.nonzero(geometry_kernels.aabb_overlap_matrix(boxes[sa], boxes[sb]))
+        ia.append(i + offsets[gi])
+        ib.append(j + offsets[gj])
+    if not ia:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    return np.concatenate(ia), np.concatenate(ib)
+
+
+def _time(fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trackers', type=int, default=5000)
+    parser.add_argument('--per-group', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    groups = synthetic_layout(args.trackers, args.per_group)
+    polys = np.array([q for quads in groups for q in quads], dtype=float)
+    offsets = np.cumsum([0] + [len(q) for q in groups]).tolist()
+    n = len(polys)
+
+    # Neighbouring group pairs (what the site preview's grid broad phase hands over)
+    group_boxes = [(min(c[0] for q in quads for c in q), min(c[1] for q in quads for c in q),
+                    max(c[0] for q in quads for c in q), max(c[1] for q in quads for c in q))
+                   for quads in groups]
+    group_pairs = [(i, j) for i in range(len(groups)) for j in range(i + 1, len(groups))
+                   if group_boxes[i][0] <= group_boxes[j][2] and group_boxes[j][0] <= group_boxes[i][2]
+                   and group_boxes[i][1] <= group_boxes[j][3] and group_boxes[j][1] <= group_boxes[i][3]]
+
+    rows = []
+    t_s, s_boxes = _time(lambda: scalar_bboxes(groups), args.repeat)
+    t_k, k_boxes = _time(lambda: geometry_kernels.poly_bboxes(polys), args.repeat)
+    assert np.allclose(np.array(s_boxes), k_boxes)
+    rows.append(('bboxes', n, t_s, t_k))
+
+    t_s, s_pairs = _time(lambda: scalar_pairs(groups, s_boxes, offsets, group_pairs), args.repeat)
+    t_k, (ia, ib) = _time(lambda: kernel_pairs(k_boxes, offsets, group_pairs), args.repeat)
+    assert sorted(s_pairs) == sorted(zip(ia.tolist(), ib.tolist()))
+    rows.append(('pairs', len(s_pairs), t_s, t_k))
+
+    flat = [q for quads in groups for q in quads]
+    t_s, s_hits = _time(lambda: [scalar_sat(flat[i], flat[j]) for i, j in s_pairs], args.repeat)
+    t_k, k_hits = _time(lambda: geometry_kernels.sat_overlap(polys[ia], polys[ib]), args.repeat)
+    order = sorted(range(len(s_pairs)), key=lambda k: s_pairs[k])
+    k_order = np.lexsort((ib, ia))
+    assert [s_hits[k] for k in order] == k_hits[k_order].tolist()
+    rows.append(('sat', len(s_pairs), t_s, t_k))
+
+    print(f"{n:,} trackers in {len(groups)} groups, {len(group_pairs)} touching group pairs")
+    print(f"{'operation':<10}{'items':>10}{'scalar ms':>12}{'kernel ms':>12}{'speedup':>10}")
+    for name, items, t_s, t_k in rows:
+        print(f"{name:<10}{items:>10,}{t_s * 1e3:>12.2f}{t_k * 1e3:>12.2f}{t_s / t_k if t_k else 0:>9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""End-to-end timings on synthetic utility-scale sites.
+
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks                     # 50-group site
+    python -m benchmarks.run_benchmarks --groups 50 200 --repeat 5
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/abc1234.json
+
+Each case is timed on the same deterministic site (see benchmarks.synthetic)
+for every topology: Distributed String, Centralized String and Central
+Inverter. Cases:
+
+  allocate_spatial   -- allocate_strings_spatial, once per group
+  estimate           -- EstimateEngine.calculate() from scratch
+  whip_distances     -- calculate_whip_distances_from_positions
+  extender_lengths   -- calculate_extender_lengths_per_segment, every segment
+  feeder_distances   -- calculate_routed_feeder_distances to the pads
+  cable_quantities   -- BOMGenerator.calculate_cable_quantities (block BOM)
+  excel_export       -- BOMGenerator.export_bom_to_excel_with_preview_data
+  site_pdf           -- generate_site_pdf, site page only
+
+The block-BOM cases don't depend on topology and only run once per size.
+Results are written as JSON to benchmarks/results/<commit>.json (or --out);
+pass an earlier file to --compare to print the speedup per case.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+
+from benchmarks import synthetic  # noqa: E402
+from src.utils.bom_generator import BOMGenerator  # noqa: E402
+from src.utils.estimate_engine import EstimateEngine  # noqa: E402
+from src.utils.site_pdf_generator import generate_site_pdf  # noqa: E402
+from src.utils.string_allocation import allocate_strings_spatial  # noqa: E402
+
+ESTIMATE_CASES = ('allocate_spatial', 'estimate', 'whip_distances', 'extender_lengths',
+                  'feeder_distances', 'site_pdf')
+BLOCK_CASES = ('cable_quantities', 'excel_export')
+ALL_CASES = ESTIMATE_CASES + BLOCK_CASES
+
+PROJECT_INFO = {'project_name': 'Synthetic Benchmark Site', 'customer': 'Bench',
+                'location': 'Nowhere', 'system_size': '--'}
+
+
+def _time(fn, repeat):
+    """(best, median) wall time in seconds over `repeat` calls of fn().
+
+    The exporters report failure by returning False rather than raising; a
+    failed export would time as suspiciously fast, so it aborts the run.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+        if result is False:
+            raise RuntimeError(f"{getattr(fn, '__name__', 'case')} returned False")
+    return min(samples), statistics.median(samples)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _allocate_per_group(entries, estimate, strings_per_inv):
+    offset = 0
+    for group in estimate['groups']:
+        count = sum(seg['quantity'] for seg in group['segments'])
+        group_entries = entries[offset:offset + count]
+        offset += count
+        allocate_strings_spatial(group_entries, strings_per_inv,
+                                 group.get('row_spacing_ft', 20.0))
+
+
+def _extender_lengths(engine):
+    for group in engine.groups:
+        device_position = group.get('device_position', 'middle')
+        for seg in group['segments']:
+            engine.calculate_extender_lengths_per_segment(seg, device_position)
+
+
+def estimate_cases(n_groups, topology, cases, repeat, seed, tmpdir, inverter):
+    """Yield (case, trackers, best, median) for one synthetic estimate."""
+    templates = synthetic.synthetic_templates()
+    estimate = synthetic.synthetic_estimate(n_groups, topology, seed)
+    engine = EstimateEngine(estimate, templates, inverter=inverter)
+    totals = engine.calculate()
+    n_trackers = len(engine._tracker_to_segment)
+
+    inv_summary = totals.get('inverter_summary') or {}
+    allocation = inv_summary.get('allocation_result')
+    strings_per_inv = inv_summary.get('strings_per_inverter') or 0
+    num_devices = len(allocation['inverters']) if allocation else 0
+    min_pitch = min((g.get('row_spacing_ft', 20.0) for g in engine.groups), default=20.0)
+
+    entries = synthetic.tracker_entries(estimate, templates)
+
+    runs = {
+        'allocate_spatial': lambda: _allocate_per_group(entries, estimate, strings_per_inv),
+        'estimate': lambda: EstimateEngine(estimate, templates, inverter=inverter).calculate(),
+        'whip_distances': lambda: engine.calculate_whip_distances_from_positions(
+            allocation, topology, num_devices),
+        'extender_lengths': lambda: _extender_lengths(engine),
+        'feeder_distances': lambda: engine.calculate_routed_feeder_distances(
+            allocation, topology, min_pitch),
+    }
+    if 'site_pdf' in cases:
+        group_layout, devices, colors, label = synthetic.synthetic_site(estimate, templates, totals)
+        pdf_path = os.path.join(tmpdir, 'site.pdf')
+        runs['site_pdf'] = lambda: generate_site_pdf(
+            pdf_path, group_layout, devices, estimate['pads'], colors, topology, label,
+            PROJECT_INFO, corridors=estimate['corridors'])
+
+    for case in ESTIMATE_CASES:
+        if case in cases and case in runs:
+            best, median = _time(runs[case], repeat)
+            yield case, n_trackers, best, median
+
+
+def block_cases(n_groups, cases, repeat, seed, tmpdir, inverter):
+    """Yield (case, trackers, best, median) for a block BOM of matching size."""
+    # Blocks average 16 trackers; size the BOM like the estimate's tracker count
+    blocks = synthetic.synthetic_blocks(max(1, n_groups * 3), seed, inverter)
+    n_trackers = sum(len(b.tracker_positions) for b in blocks.values())
+    xlsx_path = os.path.join(tmpdir, 'bom.xlsx')
+
+    runs = {
+        'cable_quantities': lambda: BOMGenerator(blocks).calculate_cable_quantities(),
+        'excel_export': lambda: BOMGenerator(blocks).export_bom_to_excel_with_preview_data(
+            xlsx_path, dict(PROJECT_INFO), open_after_export=False),
+    }
+    for case in BLOCK_CASES:
+        if case in cases:
+            best, median = _time(runs[case], repeat)
+            yield case, n_trackers, best, median
+
+
+def run(sizes, topologies, cases, repeat, seed):
+    inverter = synthetic.load_inverter()
+    results = []
+
+    def record(case, topology, n_groups, trackers, best, median):
+        results.append({'case': case, 'topology': topology, 'groups': n_groups,
+                        'trackers': trackers, 'best_s': round(best, 6),
+                        'median_s': round(median, 6)})
+        print(f"{case:<18}{topology:<20}{n_groups:>7}{trackers:>9}"
+              f"{best * 1e3:>12.1f}{median * 1e3:>12.1f}", flush=True)
+
+    print(f"{'case':<18}{'topology':<20}{'groups':>7}{'trackers':>9}{'best ms':>12}{'median ms':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_groups in sizes:
+            for topology in topologies:
+                for row in estimate_cases(n_groups, topology, cases, repeat, seed, tmpdir, inverter):
+                    record(row[0], topology, n_groups, *row[1:])
+            for row in block_cases(n_groups, cases, repeat, seed, tmpdir, inverter):
+                record(row[0], '-', n_groups, *row[1:])
+    return results
+
+
+def compare(results, baseline_path):
+    """Print per-case speedup of `results` against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {(r['case'], r['topology'], r['groups']): r for r in baseline.get('results', [])}
+    print(f"\nvs {baseline.get('commit', '?')} ({baseline_path})")
+    print(f"{'case':<18}{'topology':<20}{'groups':>7}{'old ms':>12}{'new ms':>12}{'speedup':>10}")
+    for r in results:
+        prev = old.get((r['case'], r['topology'], r['groups']))
+        if not prev:
+            continue
+        ratio = prev['best_s'] / r['best_s'] if r['best_s'] else 0.0
+        print(f"{r['case']:<18}{r['topology']:<20}{r['groups']:>7}"
+              f"{prev['best_s'] * 1e3:>12.1f}{r['best_s'] * 1e3:>12.1f}{ratio:>9.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, nargs='+', default=[50],
+                        help='site sizes to run, in groups (default: 50)')
+    parser.add_argument('--topology', choices=synthetic.TOPOLOGIES, nargs='+',
+                        default=list(synthetic.TOPOLOGIES))
+    parser.add_argument('--cases', choices=ALL_CASES, nargs='+', default=list(ALL_CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='results JSON path (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', metavar='JSON', help='earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    results = run(args.groups, args.topology, args.cases, args.repeat, args.seed)
+
+    out = Path(args.out) if args.out else BENCH_DIR / 'results' / f'{commit}.json'
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nWrote {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
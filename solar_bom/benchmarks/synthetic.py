@@ -0,0 +1,318 @@
+"""Synthetic utility-scale sites for the benchmark suite.
+
+Everything here is deterministic for a given (n_groups, seed) so timings from
+different commits are measured on exactly the same input. Three shapes are
+built from one template set:
+
+  synthetic_estimate  -- a quick-estimate dict, as stored in
+                         project.quick_estimates, for EstimateEngine
+  synthetic_blocks    -- BlockConfigs with harness wiring and cable routes,
+                         for BOMGenerator
+  synthetic_site      -- group_layout / device_positions / pads for
+                         generate_site_pdf, built from a calculated estimate
+
+Nothing is read from the user's data folder except the bundled inverter
+library, so results don't depend on local template edits.
+"""
+
+import random
+
+from src.models.block import BlockConfig
+from src.models.module import ModuleOrientation, ModuleSpec, ModuleType
+from src.models.tracker import TrackerTemplate
+from src.utils import device_geometry
+from src.utils.inverter_library import load_merged_inverter_specs
+
+TOPOLOGIES = ('Distributed String', 'Centralized String', 'Central Inverter')
+
+INVERTER_NAME = 'SMA Highpower PEAK3 150kW'
+
+MODULE_SPEC = {
+    "manufacturer": "Bench", "model": "M-550", "type": "Mono PERC",
+    "length_mm": 2278, "width_mm": 1134, "depth_mm": 35, "weight_kg": 28,
+    "wattage": 550, "vmp": 41.5, "imp": 13.25, "voc": 49.6, "isc": 14.0,
+    "max_system_voltage": 1500,
+}
+
+# Harness configurations each template's segments are drawn from
+HARNESS_CONFIGS = {1: ['1'], 2: ['2', '1+1'], 3: ['3', '2+1', '1+2'], 4: ['4', '2+2']}
+
+ASSIGNMENT_COLORS = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#F44336',
+                     '#00BCD4', '#8BC34A', '#FFC107', '#3F51B5', '#E91E63']
+
+
+def _template(spt, motor_after, partial_side='north'):
+    mps = 28
+    return {
+        "module_orientation": "Portrait", "modules_per_string": mps,
+        "strings_per_tracker": spt, "module_spacing_m": 0.02,
+        "has_motor": True, "motor_gap_m": 1.0,
+        "motor_position_after_string": motor_after,
+        "motor_placement_type": "between_strings", "motor_string_index": None,
+        "motor_split_north": mps // 2, "motor_split_south": mps - mps // 2,
+        "modules_high": 1, "source_point_config": None,
+        "partial_string_side": partial_side,
+        "module_spec": dict(MODULE_SPEC),
+    }
+
+
+def synthetic_templates():
+    """{template_key: template_data} mixing 1S/2S/3S/4S trackers."""
+    return {
+        "Bench - 1S": _template(1, 0),
+        "Bench - 2S": _template(2, 1),
+        "Bench - 3S": _template(3, 1),
+        "Bench - 4S": _template(4, 2),
+    }
+
+
+def load_inverter():
+    """The bundled inverter every synthetic site is sized against."""
+    inverters, _ = load_merged_inverter_specs()
+    return inverters[INVERTER_NAME]
+
+
+def synthetic_estimate(n_groups, topology='Distributed String', seed=1):
+    """Quick-estimate dict with `n_groups` groups laid out on a grid.
+
+    Groups hold one to three segments of 6-30 trackers each, drawn from the
+    mixed templates. The first two groups of every ten are linked so the
+    pooled allocation path is exercised too. Two pads and one corridor are
+    placed around the site and every device is assigned to a pad.
+    """
+    rng = random.Random(seed)
+    templates = synthetic_templates()
+    keys = sorted(templates)
+    cols = max(1, int(round(n_groups ** 0.5)))
+
+    groups = []
+    for g in range(n_groups):
+        segments = []
+        for _ in range(rng.randint(1, 3)):
+            ref = rng.choice(keys)
+            spt = templates[ref]['strings_per_tracker']
+            segments.append({'quantity': rng.randint(6, 30), 'strings_per_tracker': spt,
+                             'harness_config': rng.choice(HARNESS_CONFIGS[spt]),
+                             'template_ref': ref})
+        link_id = f'link{g // 10}' if g % 10 in (0, 1) and g + 1 < n_groups else None
+        groups.append({
+            'id': f'g{g}', 'circuit_id': None, 'name': f'Group {g + 1}',
+            'segments': segments,
+            'row_spacing_ft': rng.choice([18.0, 20.0, 22.5]),
+            'device_position': rng.choice(['middle', 'north', 'south']),
+            'position_x': (g % cols) * 1900.0,
+            'position_y': (g // cols) * 450.0,
+            'strings_per_inv': None, 'link_id': link_id,
+            'driveline_angle': rng.choice([0.0, 0.0, 0.0, 2.0]),
+            'azimuth': 180,
+        })
+
+    rows = (n_groups + cols - 1) // cols
+    site_w, site_h = cols * 1900.0, rows * 450.0
+    # Devices are numbered after allocation; assigning a generous index range
+    # alternately to each pad covers any allocation the engine comes up with.
+    device_range = range(0, max(200, n_groups * 40))
+    pads = [
+        {'x': site_w / 2, 'y': -120.0, 'width_ft': 10.0, 'height_ft': 8.0,
+         'assigned_devices': [d for d in device_range if d % 2 == 0]},
+        {'x': site_w / 2, 'y': site_h + 60.0, 'width_ft': 10.0, 'height_ft': 8.0,
+         'assigned_devices': [d for d in device_range if d % 2 == 1]},
+    ]
+    corridors = [{'id': 'c1', 'label': 'Road',
+                  'points': [[-60.0, -60.0], [site_w + 60.0, -60.0], [site_w + 60.0, site_h + 30.0]],
+                  'assigned_devices': [d for d in device_range if d % 3 == 0]}]
+
+    wire_sizes = {'harness': '8 AWG', 'extender': '8 AWG', 'whip': '8 AWG'}
+    return {
+        'groups': groups, 'topology': topology,
+        'lv_collection_method': 'Wire Harness',
+        'polarity_convention': 'Negative Always South',
+        'modules_per_string': 28,
+        'strings_per_device': '12' if topology == 'Distributed String' else '24',
+        'central_inverter_count': '2', 'skids': '',
+        'ac_homerun_distance': 60.0,
+        'wire_sizing': {'by_string_count': {str(n): dict(wire_sizes) for n in range(1, 5)},
+                        'dc_feeder': '500 kcmil', 'ac_homerun': '4/0 AWG',
+                        'dc_feeder_parallel': 1, 'ac_homerun_parallel': 2},
+        'wire_sizing_settings': {'combine_extender_whip': False},
+        'pads': pads, 'corridors': corridors,
+        'device_names': {}, 'device_feeder_sizes': {}, 'device_ns_steps': {},
+        'device_ew_steps': {}, 'whip_point_overrides': {}, 'whip_point_ns_legs': {},
+        'allocation_locked': False, 'locked_allocation_result': None,
+        'combiner_assignments': None, 'si_assignments': None,
+    }
+
+
+def tracker_entries(estimate, templates):
+    """allocate_strings_spatial input for every tracker in the estimate."""
+    group_layout, _, _ = device_geometry.build_group_layout(estimate['groups'], templates)
+    entries = []
+    for gd in group_layout:
+        pitch = gd['row_spacing_ft']
+        for t in gd['trackers']:
+            local_x = t['local_x_idx']
+            entries.append({
+                'original_idx': len(entries),
+                'spt': t['strings_per_tracker'],
+                'x': gd['x'] + local_x * pitch,
+                'y': gd['y'] + local_x * pitch * gd['driveline_tan'],
+                'length_ft': t['length_ft'],
+                'motor_y_ft': t['motor_y_ft'],
+            })
+    return entries
+
+
+def _tracker_template(key, data):
+    module_data = data['module_spec']
+    module_spec = ModuleSpec(
+        manufacturer=module_data['manufacturer'],
+        model=module_data['model'],
+        type=ModuleType(module_data['type']),
+        length_mm=module_data['length_mm'],
+        width_mm=module_data['width_mm'],
+        depth_mm=module_data['depth_mm'],
+        weight_kg=module_data['weight_kg'],
+        wattage=module_data['wattage'],
+        vmp=module_data['vmp'],
+        imp=module_data['imp'],
+        voc=module_data['voc'],
+        isc=module_data['isc'],
+        max_system_voltage=module_data['max_system_voltage'],
+    )
+    return TrackerTemplate(
+        template_name=key,
+        module_spec=module_spec,
+        module_orientation=ModuleOrientation(data['module_orientation']),
+        modules_per_string=data['modules_per_string'],
+        strings_per_tracker=data['strings_per_tracker'],
+        module_spacing_m=data['module_spacing_m'],
+        has_motor=data['has_motor'],
+        motor_gap_m=data['motor_gap_m'],
+        motor_position_after_string=data['motor_position_after_string'],
+        motor_placement_type=data['motor_placement_type'],
+        motor_split_north=data['motor_split_north'],
+        motor_split_south=data['motor_split_south'],
+        modules_high=data['modules_high'],
+    )
+
+
+def _block_dict(block_id, template_key, spt, n_trackers, rng):
+    """BlockConfig.to_dict()-shaped data for one harness-wired block."""
+    pitch_m = 6.0
+    string_len_m = 28 * (1.134 + 0.02)
+    tracker_len_m = spt * string_len_m + 1.0
+    device_x = (n_trackers // 2) * pitch_m + 1.0
+    device_y = tracker_len_m + 3.0
+
+    # One harness of every string for all-in-one configs, else a 2+rest split
+    if spt > 2 and rng.random() < 0.5:
+        harnesses = [list(range(2)), list(range(2, spt))]
+    else:
+        harnesses = [list(range(spt))]
+
+    routes = {}
+    for t in range(n_trackers):
+        x = t * pitch_m + 1.0
+        for s in range(spt):
+            y0 = s * string_len_m
+            routes[f'pos_src_{t}_{s}'] = [(x + 0.5, y0 + string_len_m), (x + 0.5, y0 + string_len_m / 2)]
+            routes[f'neg_src_{t}_{s}'] = [(x - 0.5, y0), (x - 0.5, y0 + string_len_m / 2)]
+        for h_idx, strings in enumerate(harnesses, start=1):
+            hy = strings[-1] * string_len_m + string_len_m / 2
+            routes[f'pos_harness_{t}_h{h_idx}'] = [(x + 0.5, strings[0] * string_len_m), (x + 0.5, hy)]
+            routes[f'neg_harness_{t}_h{h_idx}'] = [(x - 0.5, strings[0] * string_len_m), (x - 0.5, hy)]
+            routes[f'pos_extender_{t}_h{h_idx}'] = [(x + 0.5, hy), (x + 0.5, device_y - 1.0)]
+            routes[f'neg_extender_{t}_h{h_idx}'] = [(x - 0.5, hy), (x - 0.5, device_y - 1.0)]
+            routes[f'pos_whip_t{t + 1}-h{h_idx}_whip'] = [(x + 0.5, device_y - 1.0), (x + 0.5, device_y),
+                                                          (device_x, device_y)]
+            routes[f'neg_whip_t{t + 1}-h{h_idx}_whip'] = [(x - 0.5, device_y - 1.0), (x - 0.5, device_y),
+                                                          (device_x, device_y)]
+
+    return {
+        'block_id': block_id,
+        'inverter_id': INVERTER_NAME,
+        'tracker_template_name': template_key,
+        'width_m': n_trackers * pitch_m + 2.0,
+        'height_m': device_y + 5.0,
+        'row_spacing_m': pitch_m,
+        'ns_spacing_m': 1.0,
+        'gcr': 0.4,
+        'device_x': device_x,
+        'device_y': device_y,
+        'dc_feeder_distance_ft': rng.choice([250.0, 600.0, 1200.0]),
+        'dc_feeder_cable_size': '500 kcmil',
+        'tracker_positions': [{'x': t * pitch_m + 1.0, 'y': 0.0, 'rotation': 0.0,
+                               'template_name': template_key} for t in range(n_trackers)],
+        'wiring_config': {
+            'wiring_type': 'Wire Harness',
+            'cable_routes': routes,
+            'string_cable_size': '10 AWG',
+            'harness_cable_size': '8 AWG',
+            'whip_cable_size': '8 AWG',
+            'extender_cable_size': '8 AWG',
+            'harness_groupings': {str(spt): [
+                {'string_indices': strings, 'cable_size': '8 AWG' if len(strings) < 3 else '6 AWG',
+                 'fuse_rating_amps': 20, 'use_fuse': len(strings) > 1}
+                for strings in harnesses]},
+        },
+    }
+
+
+def synthetic_blocks(n_blocks, seed=1, inverter=None):
+    """{block_id: BlockConfig} of harness-wired blocks with mixed templates.
+
+    Blocks are loaded through BlockConfig.from_dict, the same path a saved
+    project takes, so tracker string positions are calculated as they would
+    be on project open.
+    """
+    rng = random.Random(seed)
+    templates = synthetic_templates()
+    template_objects = {key: _tracker_template(key, data) for key, data in templates.items()}
+    inverters = {INVERTER_NAME: inverter or load_inverter()}
+    keys = sorted(key for key, data in templates.items() if data['strings_per_tracker'] >= 2)
+
+    blocks = {}
+    for b in range(n_blocks):
+        key = rng.choice(keys)
+        spt = templates[key]['strings_per_tracker']
+        block_id = f'Block_{b + 1:03d}'
+        data = _block_dict(block_id, key, spt, rng.randint(8, 24), rng)
+        blocks[block_id] = BlockConfig.from_dict(data, template_objects, inverters)
+    return blocks
+
+
+def synthetic_site(estimate, templates, totals):
+    """generate_site_pdf inputs for a calculated estimate.
+
+    Returns (group_layout, device_positions, colors, device_label). String
+    colors come from the allocation and devices are placed with
+    device_geometry, so the page is as dense as a real export.
+    """
+    groups = estimate['groups']
+    group_layout, tracker_to_group, max_width = device_geometry.build_group_layout(groups, templates)
+    for gd, group in zip(group_layout, groups):
+        gd['name'] = group['name']
+        gd['driveline_angle'] = group.get('driveline_angle', 0.0)
+        gd['width_ft'] = max(len(gd['trackers']) - 1, 0) * gd['row_spacing_ft'] + max_width
+
+    inverters = ((totals.get('inverter_summary') or {}).get('allocation_result') or {}).get('inverters', [])
+    colors = [ASSIGNMENT_COLORS[i % len(ASSIGNMENT_COLORS)] for i in range(len(inverters))]
+    device_label = 'SI' if estimate['topology'] == 'Distributed String' else 'CB'
+
+    device_positions = []
+    for inv_idx, inv in enumerate(inverters):
+        for entry in inv.get('harness_map', []):
+            gi, li = tracker_to_group[entry['tracker_idx']]
+            group_layout[gi]['trackers'][li].setdefault('assignments', []).append(
+                {'strings': entry.get('strings_taken', 0), 'color': colors[inv_idx]})
+        geom = device_geometry.device_position_for_inverter(
+            inv.get('harness_map', []), tracker_to_group, group_layout, groups,
+            4.0, 3.0, 5.0, max_width)
+        if geom is None:
+            continue
+        device_positions.append({
+            'x': geom['x'], 'y': geom['y'], 'width_ft': 4.0, 'height_ft': 3.0,
+            'label': f'{device_label}{len(device_positions) + 1}',
+            'group_idx': geom['primary_group_idx'],
+        })
+    return group_layout, device_positions, colors, device_label
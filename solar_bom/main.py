@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, messagebox, Menu, filedialog
 from src.models.module import ModuleSpec, ModuleType
@@ -1229,4 +1230,6 @@ def main():
     root.mainloop()
 
 if __name__ == '__main__':
+    # Frozen builds re-launch the exe for process-pool workers (wiring PDF pages)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
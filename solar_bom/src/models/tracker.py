@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
+import numpy as np
 from .module import ModuleSpec, ModuleOrientation
 from enum import Enum  # Add if not already imported
 
@@ -41,6 +42,73 @@ class StringPosition:
     negative_source_y: float  # Y coordinate of negative source point relative to tracker
     num_modules: int  # Number of modules in this string
 
+class _StringGeometry:
+    """String source points of one template shape, relative to the tracker origin.
+    
+    Every tracker placed from the same template gets the same relative
+    geometry; only the polarity flips of the toward-device conventions depend
+    on where the tracker sits, and those are a vectorized test on mid_y.
+    """
+    
+    def __init__(self, strings: List['StringPosition']):
+        # (index, pos_x, pos_y, neg_x, neg_y, num_modules), values as computed
+        self.rows = [(s.index, s.positive_source_x, s.positive_source_y,
+                      s.negative_source_x, s.negative_source_y, s.num_modules) for s in strings]
+        self.mid_y = np.array([(s.positive_source_y + s.negative_source_y) / 2 for s in strings],
+                              dtype=float)
+    
+    def flips(self, polarity_convention_value: Optional[str], tracker_y: float,
+              device_y: Optional[float]) -> Optional[List[bool]]:
+        """Per-string flip flags for a convention, or None when nothing flips.
+        
+        Same rules as TrackerPosition._apply_polarity_convention.
+        """
+        if polarity_convention_value == "Negative Always North":
+            return [True] * len(self.rows)
+        if device_y is None:
+            return None
+        if polarity_convention_value == "Negative Toward Device":
+            return ((tracker_y + self.mid_y) > device_y).tolist()
+        if polarity_convention_value == "Positive Toward Device":
+            return ((tracker_y + self.mid_y) <= device_y).tolist()
+        return None
+    
+    def strings(self, flips: Optional[List[bool]] = None) -> List['StringPosition']:
+        """Fresh StringPosition objects, with positive/negative Y swapped where flipped"""
+        if flips is None:
+            return [StringPosition(*row) for row in self.rows]
+        result = []
+        for (index, pos_x, pos_y, neg_x, neg_y, num_modules), flip in zip(self.rows, flips):
+            if flip:
+                pos_y, neg_y = neg_y, pos_y
+            result.append(StringPosition(index, pos_x, pos_y, neg_x, neg_y, num_modules))
+        return result
+
+
+# Template shape key -> _StringGeometry. Keys are built from the template's
+# values, not its identity, so edited templates never reuse stale geometry.
+_string_geometry_cache = {}
+_STRING_GEOMETRY_CACHE_MAX = 512
+
+
+def _string_geometry_key(template: 'TrackerTemplate', wiring_mode: str) -> tuple:
+    """Everything calculate_string_positions reads from the template and project"""
+    spec = template.module_spec
+    source_points = template.source_point_config
+    return (spec.length_mm, spec.width_mm, template.module_orientation,
+            template.modules_per_string, template.strings_per_tracker, template.module_spacing_m,
+            getattr(template, 'has_motor', True), template.motor_gap_m,
+            template.motor_position_after_string, template.motor_placement_type,
+            template.motor_string_index, template.motor_split_north, template.motor_split_south,
+            getattr(template, 'partial_string_side', 'north'), template.modules_high,
+            repr(source_points) if source_points else None, wiring_mode)
+
+
+def clear_string_geometry_cache() -> None:
+    """Drop cached template geometry (tests, or after bulk template edits)"""
+    _string_geometry_cache.clear()
+
+
 @dataclass
 class TrackerPosition:
     """Data class representing a tracker's position in a block"""
@@ -150,11 +218,39 @@ class TrackerPosition:
         return (x, y)
 
     def calculate_string_positions(self) -> None:
-        """Calculate string positions and their source points"""
+        """Calculate string positions and their source points
+        
+        The relative geometry is computed once per template shape and wiring
+        mode and shared by every tracker using it; each tracker gets its own
+        StringPosition objects with its polarity convention applied.
+        """
         if not self.template:
             print("No template - returning")
             return
 
+        wiring_mode = 'daisy_chain'  # default
+        if hasattr(self, '_project_ref') and hasattr(self._project_ref, 'wiring_mode'):
+            wiring_mode = self._project_ref.wiring_mode
+        
+        key = _string_geometry_key(self.template, wiring_mode)
+        geometry = _string_geometry_cache.get(key)
+        if geometry is None:
+            self._calculate_relative_string_positions()
+            geometry = _StringGeometry(self.strings)
+            if len(_string_geometry_cache) >= _STRING_GEOMETRY_CACHE_MAX:
+                _string_geometry_cache.clear()
+            _string_geometry_cache[key] = geometry
+        
+        flips = None
+        if hasattr(self, '_polarity_convention') and self._polarity_convention:
+            flips = geometry.flips(self._polarity_convention, self.y, getattr(self, '_device_y', None))
+        
+        # Clear existing strings
+        self.strings.clear()
+        self.strings.extend(geometry.strings(flips))
+
+    def _calculate_relative_string_positions(self) -> None:
+        """Compute self.strings from the template, before any polarity convention"""
         # Clear existing strings
         self.strings.clear()
 
@@ -183,13 +279,6 @@ class TrackerPosition:
                     num_modules=self.template.modules_per_string
                 )
                 self.strings.append(string)
-            
-            # Apply polarity convention if set
-            if hasattr(self, '_polarity_convention') and self._polarity_convention:
-                self._apply_polarity_convention(
-                    self._polarity_convention,
-                    getattr(self, '_device_y', None)
-                )
             return
 
         # Get module dimensions based on orientation
@@ -299,13 +388,6 @@ class TrackerPosition:
                     )
                 self.strings.append(string)
 
-        # Apply polarity convention if set
-        if hasattr(self, '_polarity_convention') and self._polarity_convention:
-            self._apply_polarity_convention(
-                self._polarity_convention,
-                getattr(self, '_device_y', None)
-            )
-
 @dataclass
 class TrackerTemplate:
     """Data class representing a solar tracker template configuration"""
@@ -6,6 +6,7 @@ import pandas as pd
 import os
 from ..models.block import BlockConfig
 from ..utils.bom_generator import BOMGenerator
+from ..utils.bom_tables import parquet_engine
 from .harness_catalog_dialog import HarnessCatalogDialog
 from .harness_designer import HarnessDesigner
 from .pricing_manager import PricingManager
@@ -136,33 +137,40 @@ class BOMManager(ttk.Frame):
             command=self.export_bom
         ).grid(row=1, column=0, padx=5, pady=5)
         
+        # Table export button
+        ttk.Button(
+            bom_frame, 
+            text="Export BOM Tables (CSV/Parquet)", 
+            command=self.export_bom_tables
+        ).grid(row=2, column=0, padx=5, pady=5)
+        
         # Harness designer button
         ttk.Button(
             bom_frame, 
             text="Harness Designer", 
             command=self.open_harness_designer
-        ).grid(row=2, column=0, padx=5, pady=5)
+        ).grid(row=3, column=0, padx=5, pady=5)
         
         # Harness drawings button
         ttk.Button(
             bom_frame, 
             text="Generate Harness Drawings", 
             command=self.generate_harness_drawings
-        ).grid(row=3, column=0, padx=5, pady=5)
+        ).grid(row=4, column=0, padx=5, pady=5)
 
         # SLD Generator button
         ttk.Button(
             bom_frame, 
             text="Single Line Diagram", 
             command=self.open_sld_editor
-        ).grid(row=4, column=0, padx=5, pady=5)
+        ).grid(row=5, column=0, padx=5, pady=5)
 
         # Pricing manager button
         ttk.Button(
             bom_frame, 
             text="Manage Pricing", 
             command=self.open_pricing_manager
-        ).grid(row=5, column=0, padx=5, pady=5)
+        ).grid(row=6, column=0, padx=5, pady=5)
         
         # Right side - BOM Preview
         right_column = ttk.Frame(main_container)
@@ -683,6 +691,52 @@ class BOMManager(ttk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export BOM: {str(e)}")
 
+    def export_bom_tables(self):
+        """Export the summary, detailed and block allocation tables as CSV (and Parquet)"""
+        selected_blocks = {block_id: self.blocks[block_id] for block_id in self.selected_blocks if block_id in self.blocks}
+        
+        if not selected_blocks:
+            messagebox.showwarning("Warning", "No blocks selected for BOM export")
+            return
+        
+        output_dir = filedialog.askdirectory(title="Export BOM Tables")
+        if not output_dir:
+            return
+        
+        project = self.main_app.current_project if self.main_app and hasattr(self.main_app, 'current_project') else None
+        
+        # Same naming as the Excel export, minus the extension
+        stem = "bom"
+        if project:
+            client = clean_filename(project.metadata.client or 'Unknown_Client')
+            project_name = clean_filename(project.metadata.name or 'Unknown_Project')
+            rev = self.revision_var.get() or '0'
+            date_str = datetime.now().strftime('%Y-%m-%d')
+            stem = f"{client}_{project_name}_Ampacity eBOM_v{rev}_{date_str}"
+        
+        # Parquet needs pyarrow or fastparquet; CSV always works
+        formats = ['csv', 'parquet'] if parquet_engine() else ['csv']
+        
+        try:
+            bom_generator = BOMGenerator(selected_blocks, project, segment_rounding=self.get_segment_rounding())
+            bom_generator.parent = self.main_app
+            written = bom_generator.export_bom_tables(output_dir, stem=stem, formats=formats)
+            
+            message = "BOM tables exported to " + output_dir + ":\n\n"
+            message += "\n".join(os.path.basename(path) for path in written)
+            if 'parquet' not in formats:
+                message += "\n\nParquet files were skipped: install pyarrow to export them."
+            messagebox.showinfo("Success", message)
+            
+        except PermissionError:
+            messagebox.showerror(
+                "Permission Error", 
+                f"Cannot write to {output_dir}.\n\n"
+                "Please close any programs that might be using these files, or choose a different folder."
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export BOM tables: {str(e)}")
+
     def get_checked_components(self):
         """Get list of components that are checked for export"""
         checked_components = []
@@ -926,17 +980,9 @@ class BOMManager(ttk.Frame):
     def get_fuse_part_number(self, row):
         """Get fuse part number from fuse library"""
         try:
-            # Load fuse library directly
-            import json
-            import os
-            
-            # Get fuse library path
-            current_dir = os.path.dirname(os.path.abspath(__file__))  # src/ui/
-            project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels
-            library_path = os.path.join(project_root, 'data', 'fuse_library.json')
-            
-            with open(library_path, 'r') as f:
-                fuse_library = json.load(f)
+            # Load fuse library (cached until the file changes)
+            from ..utils.data_store import load_library
+            fuse_library = load_library('fuse_library.json', {})
             
             # Extract fuse rating from description
             import re
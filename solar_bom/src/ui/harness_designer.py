@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+import os
 from pathlib import Path
 from typing import Optional, Dict, Any
 from ..utils.harness_drawing_generator import HarnessDrawingGenerator
@@ -505,7 +506,9 @@ Fuse Configuration:
         
         try:
             generator = HarnessDrawingGenerator(self.harness_library_path)
-            count = generator.generate_all_harness_drawings()
+            # Only parts whose spec changed since the last run are redrawn
+            count = generator.generate_all_harness_drawings(
+                incremental=True, workers=os.cpu_count() or 1)
             messagebox.showinfo("Success", f"Generated {count} harness drawings")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate drawings: {str(e)}")
\ No newline at end of file
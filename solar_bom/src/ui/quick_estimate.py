@@ -1,16 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from typing import Optional, Dict, List, Any
-from pathlib import Path
-import json
 import uuid
-import math
 import copy
 from datetime import datetime
 from collections import defaultdict
-from src.utils.string_allocation import allocate_strings, allocate_strings_sequential, allocate_strings_spatial
-from src.utils.file_handlers import get_user_data_path, get_bundled_data_path
-from src.utils import device_geometry
+from src.utils.data_store import load_library
+from src.utils.estimate_engine import EstimateCache, EstimateEngine, EstimateValidationError, load_enabled_templates
 from .site_preview import SitePreviewWindow, QuickEstimateDialog
 
 
@@ -61,6 +57,9 @@ class QuickEstimate(ttk.Frame):
         self._results_stale = True
         self._calc_btn = None  # Reference to calculate button
         self._autosave_after_id = None
+        # Per-group partial results reused across recalculations — an edit
+        # only recomputes the groups whose inputs actually changed.
+        self._estimate_cache = EstimateCache()
         
         # Allocation lock state
         self.allocation_locked = False
@@ -75,7 +74,7 @@ class QuickEstimate(ttk.Frame):
 
         self.wire_sizing_settings = {}   # populated in setup_ui; persisted in .ebom
         self._updating_wss = False       # guard against re-entrant WSS trace callbacks
-        self._wss_autosize_results = {}  # {(sc, cable_key) or cable_key: full result dict}
+        self._wss_autosize_results = {}  # {(sc, 'harness') or feeder cable_key: full result dict}
         self._wire_length_estimates = {}   # {cable_key: one_way_ft} — populated after calc
         self._source_voltage_by_cable = {} # {cable_key: volts} — populated after calc
         self._refreshing_ws_table = False  # guard: suppress feeder trace during table rebuild
@@ -88,14 +87,7 @@ class QuickEstimate(ttk.Frame):
 
     def load_pricing_data(self):
         """Load pricing data from JSON file"""
-        try:
-            pricing_path = Path(get_bundled_data_path('pricing_data.json'))
-            if pricing_path.exists():
-                with open(pricing_path, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading pricing data: {e}")
-        return {}
+        return load_library('pricing_data.json', {})
 
     def load_module_library(self):
         """Load modules from the merged factory and user module libraries."""
@@ -152,41 +144,10 @@ class QuickEstimate(ttk.Frame):
     def load_enabled_templates(self):
         """Load tracker templates that are enabled for the current project.
         Returns {template_key: template_data_dict} for enabled templates only."""
-        templates = {}
-        try:
-            template_path = Path(get_user_data_path('tracker_templates.json'))
-            if not template_path.exists():
-                return templates
-            
-            with open(template_path, 'r') as f:
-                data = json.load(f)
-            
-            if not data:
-                return templates
-            
-            # Parse hierarchical format
-            all_templates = {}
-            first_value = next(iter(data.values()))
-            if isinstance(first_value, dict) and not any(key in first_value for key in ['module_orientation', 'modules_per_string']):
-                for manufacturer, template_group in data.items():
-                    for template_name, template_data in template_group.items():
-                        unique_name = f"{manufacturer} - {template_name}"
-                        all_templates[unique_name] = template_data
-            else:
-                all_templates = data
-            
-            # Filter to enabled only
-            if self.current_project and hasattr(self.current_project, 'enabled_templates'):
-                for key in self.current_project.enabled_templates:
-                    if key in all_templates:
-                        templates[key] = all_templates[key]
-            else:
-                templates = all_templates
-                
-        except Exception as e:
-            print(f"Error loading enabled templates: {e}")
-        
-        return templates
+        enabled_keys = None
+        if self.current_project and hasattr(self.current_project, 'enabled_templates'):
+            enabled_keys = self.current_project.enabled_templates
+        return load_enabled_templates(enabled_keys)
 
     def get_template_display_name(self, template_key):
         """Build a short display name for a template key.
@@ -990,572 +951,23 @@ class QuickEstimate(ttk.Frame):
 
     def round_whip_length(self, raw_length_ft):
         """Apply 5% waste factor and round up to nearest 10ft increment (min 10ft)"""
-        import math
-        WASTE_FACTOR = 1.05
-        INCREMENT = 10
-        length_with_waste = raw_length_ft * WASTE_FACTOR
-        rounded = INCREMENT * math.ceil(length_with_waste / INCREMENT)
-        return max(10, int(rounded))
-
-    def _record_combined_whip(self, totals, whip_raw_ft, ext_pos_raw, ext_neg_raw,
-                              h_str_count, inv_idx):
-        """Record one harness as a combined (extender-folded) whip, per polarity.
-
-        Used only when the "combine extender + whip" setting is on. The combined
-        length is the whip E-W distance plus that polarity's extender leg, rounded
-        as a single conductor. Combined whips keep the WHIP wire gauge (no new sizing
-        rule). Populates the site-level per-polarity buckets, the per-device
-        per-polarity buckets, and total_whip_length.
-        """
-        gauge = self.get_wire_size_for('whip', h_str_count)
-        pos_len = self.round_whip_length(whip_raw_ft + ext_pos_raw)
-        neg_len = self.round_whip_length(whip_raw_ft + ext_neg_raw)
-        pos_key = (pos_len, gauge)
-        neg_key = (neg_len, gauge)
-        totals['whips_pos_by_length'][pos_key] += 1
-        totals['whips_neg_by_length'][neg_key] += 1
-        totals['total_whip_length'] += pos_len + neg_len
-        pd_pos = totals['whips_pos_by_length_per_device'].setdefault(inv_idx, {})
-        pd_neg = totals['whips_neg_by_length_per_device'].setdefault(inv_idx, {})
-        pd_pos[pos_key] = pd_pos.get(pos_key, 0) + 1
-        pd_neg[neg_key] = pd_neg.get(neg_key, 0) + 1
-
-        # Shadow running sums of the *separate* whip (E-W only) and extender (pos leg)
-        # lengths, mirroring what the symmetric extender/whip buckets would hold. These
-        # feed _compute_wire_length_estimates so the voltage-drop auto-sizing — and thus
-        # the whip gauge — is identical whether or not this setting is on.
-        whip_len = self.round_whip_length(whip_raw_ft)
-        totals['_combine_whip_len_sum'] = totals.get('_combine_whip_len_sum', 0) + whip_len * 2
-        totals['_combine_whip_qty'] = totals.get('_combine_whip_qty', 0) + 2
-        totals['_combine_ext_pos_len_sum'] = (
-            totals.get('_combine_ext_pos_len_sum', 0) + self.round_whip_length(ext_pos_raw))
-        totals['_combine_ext_pos_qty'] = totals.get('_combine_ext_pos_qty', 0) + 1
-
-    def load_combiner_library(self):
-        """Load combiner box library from JSON file"""
-        try:
-            lib_path = Path(get_bundled_data_path('combiner_box_library.json'))
-            if lib_path.exists():
-                with open(lib_path, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading combiner box library: {e}")
-        return {}
+        return EstimateEngine.round_whip_length(raw_length_ft)
 
     def get_fuse_holder_category(self, fuse_current_amps):
         """Determine fuse holder rating category from required fuse current"""
-        if fuse_current_amps <= 20:
-            return "20A and Below"
-        elif fuse_current_amps <= 32:
-            return "25-32A"
-        else:
-            return "32A and Above"
+        return EstimateEngine.get_fuse_holder_category(fuse_current_amps)
 
     def find_combiner_box(self, strings_per_cb, breaker_size, fuse_holder_rating):
-        """Find a matching combiner box from the library.
-        
-        Returns the part_number and description, or None if no match.
-        Prefers smallest max_inputs that fits, with whips (whip_length > 0).
-        """
-        combiner_library = self.load_combiner_library()
-        
-        candidates = []
-        for part_num, cb_data in combiner_library.items():
-            if (cb_data.get('max_inputs', 0) >= strings_per_cb and
-                cb_data.get('breaker_size', 0) == breaker_size and
-                cb_data.get('fuse_holder_rating', '') == fuse_holder_rating):
-                candidates.append(cb_data)
-        
-        if not candidates:
-            return None
-        
-        # Sort by max_inputs (prefer smallest that fits), then prefer with whips
-        candidates.sort(key=lambda c: (c['max_inputs'], -c.get('whip_length_ft', 0)))
-        return candidates[0]
-
-    def calculate_cb_whip_distances(self, total_rows, num_combiners, row_spacing_ft):
-        """Calculate whip distances for each row based on evenly-spaced CB placement.
-        
-        Returns a list of (distance_ft, cb_index) for each row.
-        
-        CB placement logic:
-        - Rows are divided into groups, first CB(s) get extra rows if uneven
-        - Each CB is placed at the center of its group
-        - Each row connects to its nearest CB
-        """
-        if total_rows <= 0 or num_combiners <= 0:
-            return []
-        
-        # Divide rows into groups for each CB
-        base_group_size = total_rows // num_combiners
-        extra_rows = total_rows % num_combiners
-        
-        # Build groups - first CBs get the extra rows
-        groups = []
-        row_start = 1
-        for cb_idx in range(num_combiners):
-            group_size = base_group_size + (1 if cb_idx < extra_rows else 0)
-            row_end = row_start + group_size - 1
-            # CB position is center of its group
-            cb_position = (row_start + row_end) / 2.0
-            groups.append({
-                'cb_idx': cb_idx,
-                'row_start': row_start,
-                'row_end': row_end,
-                'cb_position': cb_position
-            })
-            row_start = row_end + 1
-        
-        # Calculate distance from each row to its assigned CB
-        whip_distances = []
-        for group_num in range(1, total_rows + 1):
-            # Find which group this row belongs to
-            for group in groups:
-                if group['row_start'] <= group_num <= group['row_end']:
-                    distance_ft = abs(group_num - group['cb_position']) * row_spacing_ft
-                    whip_distances.append((distance_ft, group['cb_idx']))
-                    break
-        
-        return whip_distances
-
-    @staticmethod
-    def _compact_device_index_map(inverters):
-        """Map each inverter's raw index to its compacted device index.
-
-        Mirrors SitePreviewWindow._compute_devices_from_allocation, which allocates
-        a device slot only for inverters with a non-empty harness_map — so the Nth
-        rendered/selected device is the Nth inverter that actually has one, not the
-        Nth inverter overall. device_names, device_ns_steps, device_ew_steps,
-        device_feeder_sizes, and pad/corridor assignments are all keyed by that
-        compacted index, not by an inverter's raw position in the allocation list.
-
-        Returns a list the same length as inverters; entries are None for
-        inverters that get no device slot.
-        """
-        mapping = []
-        next_dev_idx = 0
-        for inv in inverters:
-            if not inv.get('harness_map', []):
-                mapping.append(None)
-            else:
-                mapping.append(next_dev_idx)
-                next_dev_idx += 1
-        return mapping
-
-    def calculate_whip_distances_from_positions(self, allocation_result, topology, num_devices, row_spacing_ft=None):
-        """Calculate whip distances using device positions derived from allocation.
-        
-        For Distributed String and Centralized String: uses allocation result
-        to map each inverter's trackers to a device, computing real E-W + N-S distance.
-        
-        For Central Inverter: falls back to the abstract even-spacing method.
-        
-        Returns a flat list of distance_ft values, one per tracker.
-        """
-        if not allocation_result:
-            total_trackers = sum(
-                sum(seg['quantity'] for seg in group['segments'])
-                for group in self.groups
-            )
-            fallback_spacing = self.groups[0].get('row_spacing_ft', 20.0) if self.groups else 20.0
-            old_distances = self.calculate_cb_whip_distances(
-                total_trackers, num_devices, fallback_spacing
-            )
-            # Build flat spt list matching tracker order
-            spt_list = []
-            for group in self.groups:
-                for seg in group['segments']:
-                    for _ in range(seg['quantity']):
-                        spt_list.append(seg['strings_per_tracker'])
-            return [(d[0], spt_list[i] if i < len(spt_list) else 0, i, -1) for i, d in enumerate(old_distances)]
-        
-        # Build world X for every global tracker index — quick_estimate's own
-        # tracker-centerline convention, used only for the tracker's own E-W
-        # position (the whip's "from" end). The device's own X now comes
-        # entirely from the shared geometry below (the whip's "to" end).
-        # Uses saved group positions or auto-layout, same as site preview.
-        tracker_world_x = []
-        auto_x_cursor = 0.0
-
-        for grp_idx, group in enumerate(self.groups):
-            saved_x = group.get('position_x')
-            if saved_x is not None:
-                group_x = saved_x
-            else:
-                group_x = auto_x_cursor
-
-            grp_row_spacing = group.get('row_spacing_ft', 20.0)
-            local_idx = 0
-            for seg in group['segments']:
-                dims = self._get_estimate_tracker_dims_ft(seg.get('template_ref'))
-                t_half_width = dims[0] / 2 if dims else 0.0
-                for _ in range(seg['quantity']):
-                    local_x_offset = local_idx * grp_row_spacing
-                    tracker_world_x.append(group_x + local_x_offset + t_half_width)
-                    local_idx += 1
-
-            # Advance auto cursor
-            group_tracker_count = sum(seg['quantity'] for seg in group['segments'])
-            auto_x_cursor += group_tracker_count * grp_row_spacing + grp_row_spacing * 2
-
-        # Motor-row-anchored world Y for every global tracker index — the
-        # single source of truth shared with site_preview.py, so a combiner
-        # N-S nudge and this whip length agree on where the device actually is.
-        group_layout, tracker_to_group, max_tracker_width_ft = device_geometry.build_group_layout(
-            self.groups, self.enabled_templates
-        )
-        tracker_world_y = []
-        for tidx in range(len(tracker_world_x)):
-            grp_local = tracker_to_group.get(tidx)
-            if grp_local is None:
-                tracker_world_y.append(0.0)
-                continue
-            g_idx, l_idx = grp_local
-            gd = group_layout[g_idx]
-            t = gd['trackers'][l_idx]
-            tracker_world_y.append(device_geometry.tracker_motor_row_y(gd, t, l_idx))
-
-        # device_position_for_inverter's rendered-box constants. quick_estimate
-        # has no rendered device box, but must use the SAME device_height_ft/
-        # offset_ft site_preview.py uses so a stored N-S step count resolves to
-        # the same anchor in both files — physical_anchor_y() below then
-        # converts the rendered-corner Y back into the physical connection Y.
-        _DEVICE_WIDTH_FT = 4.0
-        _DEVICE_HEIGHT_FT = 3.0
-        _OFFSET_FT = 5.0
-
-        # Compute device world X and metadata for each inverter
-        inverters = allocation_result.get('inverters', [])
-        inv_to_dev = self._compact_device_index_map(inverters)
-        device_info = []  # list of (device_x, device_y) per inverter
-
-        for inv_idx, inv in enumerate(inverters):
-            harness_map = inv.get('harness_map', [])
-            if not harness_map:
-                device_info.append(None)
-                continue
-
-            geom = device_geometry.device_position_for_inverter(
-                harness_map, tracker_to_group, group_layout, self.groups,
-                _DEVICE_WIDTH_FT, _DEVICE_HEIGHT_FT, _OFFSET_FT, max_tracker_width_ft
-            )
-            if geom is None:
-                device_info.append(None)
-                continue
-
-            primary_grp = geom['primary_group_idx']
-            group_source = self.groups[primary_grp] if primary_grp < len(self.groups) else {}
-
-            # Device X: same shared geometry as site_preview.py's rendered
-            # position, not quick_estimate's own tracker-centerline formula —
-            # so this and the CB popup agree exactly, not just on bias direction.
-            device_x = geom['x']
-
-            dev_idx = inv_to_dev[inv_idx]
-
-            # Device Y: resolve this device's own N-S nudge step (for the first
-            # time) against the shared anchor set, then convert the resolved
-            # rendered-corner Y back into the physical connection-point Y.
-            # Computed before the X bias below, which needs it for the
-            # nearest-pad tie-break.
-            if dev_idx is not None:
-                resolved_y, resolved_type = device_geometry.resolve_ns_step(
-                    self.device_ns_steps, dev_idx, geom['y'], geom['ns_anchors']
-                )
-            else:
-                resolved_y, resolved_type = geom['y'], None
-
-            effective_y = resolved_y if resolved_type is not None else geom['y']
-            effective_type = resolved_type if resolved_type is not None else geom['device_position']
-            device_y = device_geometry.physical_anchor_y(effective_y, effective_type, _DEVICE_HEIGHT_FT)
-
-            # For 'middle' placement: snap device_x into the row-spacing gap,
-            # using the shared bias direction (string-weighted, pad-tiebreak)
-            # so this agrees with site_preview.py's CB popup — quick_estimate's
-            # own "always bias east" rule could pick the opposite direction on
-            # a tie, throwing E-W off by a full row pitch for exactly the
-            # devices where the tie-break matters.
-            if geom['middle_bias_context'] is not None:
-                bc = geom['middle_bias_context']
-                device_x = device_geometry.apply_middle_x_bias(
-                    device_x, device_y, bc['center_local_x'], bc['local_x_indices'],
-                    bc['spt_map'], bc['pitch'], bc['group_x'], bc['group_num_trackers'],
-                    max_tracker_width_ft, self.pads
-                )
-
-            # Apply E-W nudge step — keyed by compacted device index (see
-            # _compact_device_index_map), not the raw inv_idx used above.
-            if dev_idx is not None:
-                ew_pitch = group_source.get('row_spacing_ft', 20.0)
-                if ew_pitch:
-                    device_x += self.device_ew_steps.get(dev_idx, 0) * (ew_pitch / 2.0)
-
-            device_info.append((device_x, device_y))
-
-        # Compute distance for each tracker to its assigned device
-        # Deduplicate: each physical tracker generates whips once, even if split across inverters
-        whip_distances = []
-        seen_trackers = set()
-
-        for inv_idx, inv in enumerate(inverters):
-            if inv_idx >= len(device_info) or device_info[inv_idx] is None:
-                continue
-
-            dev_x, dev_y = device_info[inv_idx]
-
-            for entry in inv['harness_map']:
-                tidx = entry['tracker_idx']
-                is_split = entry.get('is_split', False)
-                
-                # Allow split tracker portions through (they appear in multiple inverters)
-                if tidx in seen_trackers and not is_split:
-                    continue
-                seen_trackers.add(tidx)
-                
-                if tidx >= len(tracker_world_x):
-                    continue
-                
-                ew_distance = abs(tracker_world_x[tidx] - dev_x)
-                # N-S inter-row distance (tracker to device) — stored for extender adjustment
-                ns_inter_row = abs(tracker_world_y[tidx] - dev_y)
-                
-                # Whip = E-W plus the N-S run from the tracker's row to the device's
-                # row. That N-S term is 0 for same-group trackers (device_y is the
-                # midpoint of primary-group tracker Ys), and is the full inter-group
-                # gap when a combiner spans groups — footage that was previously
-                # dropped from the BOM entirely.
-                total_distance = ew_distance + ns_inter_row
-                
-                # Store SIGNED N-S offset: positive = CB is south of tracker
-                if not hasattr(self, '_tracker_ns_to_device'):
-                    self._tracker_ns_to_device = {}
-                signed_ns = dev_y - tracker_world_y[tidx]
-                self._tracker_ns_to_device[(tidx, inv_idx)] = signed_ns
-                
-                spt = entry.get('strings_per_tracker', 0)
+        """Find a matching combiner box from the library (see EstimateEngine.find_combiner_box)."""
+        return self._estimate_engine().find_combiner_box(strings_per_cb, breaker_size, fuse_holder_rating)
 
-                whip_distances.append((total_distance, spt, tidx, inv_idx))
-        
-        return whip_distances
-    
     def calculate_routed_feeder_distances(self, allocation_result, topology, row_spacing_ft):
-        """Calculate routed feeder distances from each device to its assigned pad.
-        
-        Returns a dict with:
-            'feeder_distances': list of (device_label, distance_ft) tuples
-            'feeder_total_ft': total feeder cable
-            'feeder_count': number of feeder runs
-            'homerun_distances': list of (pad_label, distance_ft) for AC homeruns (stub)
-        """
-        result = {
-            'feeder_distances': [],
-            'feeder_total_ft': 0,
-            'feeder_count': 0,
-            'routed_feeder_paths': {},  # {dev_idx: [(x,y),...]} three-leg or L-shape geometry
-        }
-        
-        if not self.pads or not allocation_result:
-            return result
-        
-        inverters = allocation_result.get('inverters', [])
-        if not inverters:
-            return result
-        
-        # Group left-edge X per group — still needed below for the azimuth
-        # rotation math (device X/Y itself now comes entirely from the shared
-        # geometry; see the device_position_for_inverter call below).
-        group_x_map = {}
-        auto_x_cursor = 0.0
-
-        for grp_idx, group in enumerate(self.groups):
-            saved_x = group.get('position_x')
-            group_x_map[grp_idx] = saved_x if saved_x is not None else auto_x_cursor
-
-            group_tracker_count = sum(seg['quantity'] for seg in group['segments'])
-            auto_x_cursor += group_tracker_count * row_spacing_ft + row_spacing_ft * 2
-
-        # Motor-row-anchored world Y and N-S nudge — the same shared geometry
-        # calculate_whip_distances_from_positions uses, so a combiner N-S nudge
-        # moves the feeder route too, not just the whips.
-        group_layout, tracker_to_group, max_tracker_width_ft = device_geometry.build_group_layout(
-            self.groups, self.enabled_templates, default_row_spacing_ft=row_spacing_ft
-        )
-
-        _DEVICE_WIDTH_FT = 4.0
-        _DEVICE_HEIGHT_FT = 3.0
-        _OFFSET_FT = 5.0
-
-        # Compute device positions (center X, Y based on device_position)
-        inv_to_dev = self._compact_device_index_map(inverters)
-        device_positions = []
-        for inv_idx, inv in enumerate(inverters):
-            harness_map = inv.get('harness_map', [])
-            if not harness_map:
-                device_positions.append(None)
-                continue
-
-            geom = device_geometry.device_position_for_inverter(
-                harness_map, tracker_to_group, group_layout, self.groups,
-                _DEVICE_WIDTH_FT, _DEVICE_HEIGHT_FT, _OFFSET_FT, max_tracker_width_ft
-            )
-            if geom is None:
-                device_positions.append(None)
-                continue
-
-            primary_grp = geom['primary_group_idx']
-            group_source = self.groups[primary_grp] if primary_grp < len(self.groups) else {}
-
-            # Device X: same shared geometry as site_preview.py's rendered
-            # position (see the comment on this same pattern in
-            # calculate_whip_distances_from_positions).
-            dev_x = geom['x']
-
-            dev_idx = inv_to_dev[inv_idx]
-
-            # Device Y: resolve this device's own N-S nudge step against the
-            # shared anchor set, then convert the resolved rendered-corner Y
-            # back into the physical connection-point Y (see the comment on
-            # this same pattern in calculate_whip_distances_from_positions).
-            # Computed before the X bias below, which needs it for the
-            # nearest-pad tie-break.
-            if dev_idx is not None:
-                resolved_y, resolved_type = device_geometry.resolve_ns_step(
-                    self.device_ns_steps, dev_idx, geom['y'], geom['ns_anchors']
-                )
-            else:
-                resolved_y, resolved_type = geom['y'], None
-
-            effective_y = resolved_y if resolved_type is not None else geom['y']
-            effective_type = resolved_type if resolved_type is not None else geom['device_position']
-            dev_y = device_geometry.physical_anchor_y(effective_y, effective_type, _DEVICE_HEIGHT_FT)
-
-            # For 'middle' placement: snap dev_x into the row-spacing gap,
-            # using the shared bias direction (string-weighted, pad-tiebreak)
-            # so this agrees with site_preview.py's CB popup (see the comment
-            # on this same pattern in calculate_whip_distances_from_positions).
-            if geom['middle_bias_context'] is not None:
-                bc = geom['middle_bias_context']
-                dev_x = device_geometry.apply_middle_x_bias(
-                    dev_x, dev_y, bc['center_local_x'], bc['local_x_indices'],
-                    bc['spt_map'], bc['pitch'], bc['group_x'], bc['group_num_trackers'],
-                    max_tracker_width_ft, self.pads
-                )
-
-            # Apply E-W nudge step — keyed by compacted device index (see
-            # _compact_device_index_map), not the raw inv_idx used above.
-            if dev_idx is not None:
-                ew_pitch = group_source.get('row_spacing_ft', row_spacing_ft)
-                if ew_pitch:
-                    dev_x += self.device_ew_steps.get(dev_idx, 0) * (ew_pitch / 2.0)
-
-            device_positions.append((dev_x, dev_y, primary_grp))
-        
-        # Build device -> pad lookup
-        device_to_pad = {}
-        for pad_idx, pad in enumerate(self.pads):
-            for dev_idx in pad.get('assigned_devices', []):
-                device_to_pad[dev_idx] = pad_idx
-
-        # Build device -> corridor lookup
-        device_to_corridor = {}
-        for c_idx, corridor in enumerate(self.corridors):
-            for dev_idx in corridor.get('assigned_devices', []):
-                device_to_corridor[dev_idx] = c_idx
-
-        # Compute routed feeder distance (row-direction projection) from each device to its pad
-        for dev_idx, dev_pos in enumerate(device_positions):
-            if dev_pos is None:
-                continue
-
-            pad_idx = device_to_pad.get(dev_idx)
-            if pad_idx is None or pad_idx >= len(self.pads):
-                continue
+        """Routed feeder distances from each device to its assigned pad.
 
-            pad = self.pads[pad_idx]
-            pad_cx = pad['x'] + pad.get('width_ft', 10.0) / 2
-            pad_cy = pad['y'] + pad.get('height_ft', 8.0) / 2
-
-            dev_x, dev_y, primary_grp = dev_pos
-            group_source = self.groups[primary_grp] if primary_grp < len(self.groups) else {}
-
-            azimuth = group_source.get('azimuth', 180)
-            rotation_deg = azimuth - 180
-            driveline_angle_deg = group_source.get('driveline_angle', 0.0)
-
-            # Rotation center: horizontal midpoint of group, vertical midpoint of tracker length
-            gx = group_x_map.get(primary_grp, 0)
-            gy = group_source.get('position_y', 0) or 0
-            grp_count = sum(seg['quantity'] for seg in group_source.get('segments', []))
-            first_ref_r = None
-            for seg in group_source.get('segments', []):
-                ref = seg.get('template_ref')
-                if ref and ref in self.enabled_templates:
-                    first_ref_r = ref
-                    break
-            tlen_r = 180.0
-            twid_r = 0.0
-            if first_ref_r:
-                dims_r = self._get_estimate_tracker_dims_ft(first_ref_r)
-                if dims_r:
-                    twid_r, tlen_r = dims_r[0], dims_r[1]
-            rot_cx = gx + (twid_r + max(0, grp_count - 1) * row_spacing_ft) / 2
-            rot_cy = gy + tlen_r / 2
-
-            # Rotate device center by group azimuth
-            if rotation_deg != 0:
-                rad = math.radians(rotation_deg)
-                cos_r = math.cos(rad)
-                sin_r = math.sin(rad)
-                dx = dev_x - rot_cx
-                dy = dev_y - rot_cy
-                dev_x = rot_cx + dx * cos_r - dy * sin_r
-                dev_y = rot_cy + dx * sin_r + dy * cos_r
-
-            # Corridor-aware routing (three-leg) or L-shape fallback
-            routed = 0.0
-            used_corridor = False
-            c_idx = device_to_corridor.get(dev_idx)
-            if c_idx is not None and c_idx < len(self.corridors):
-                corridor = self.corridors[c_idx]
-                pts = corridor.get('points', [])
-                if len(pts) >= 2:
-                    try:
-                        from src.utils.corridor_routing import three_leg_distance
-                        routed, path_geom = three_leg_distance(
-                            (dev_x, dev_y), (pad_cx, pad_cy), pts
-                        )
-                        result['routed_feeder_paths'][dev_idx] = path_geom
-                        used_corridor = True
-                    except Exception as e:
-                        print(f"Warning: corridor routing failed for device {dev_idx}: {e}", flush=True)
-
-            if not used_corridor:
-                # L-shape routing
-                driveline_tan = math.tan(math.radians(driveline_angle_deg)) if driveline_angle_deg != 0 else 0.0
-                mag = math.sqrt(1.0 + driveline_tan ** 2)
-                rdx_u, rdy_u = 1.0 / mag, driveline_tan / mag
-                if rotation_deg != 0:
-                    cos_r = math.cos(math.radians(rotation_deg))
-                    sin_r = math.sin(math.radians(rotation_deg))
-                    row_dx = rdx_u * cos_r - rdy_u * sin_r
-                    row_dy = rdx_u * sin_r + rdy_u * cos_r
-                else:
-                    row_dx, row_dy = rdx_u, rdy_u
-                t = (pad_cx - dev_x) * row_dx + (pad_cy - dev_y) * row_dy
-                corner_x = dev_x + t * row_dx
-                corner_y = dev_y + t * row_dy
-                leg2 = math.sqrt((pad_cx - corner_x) ** 2 + (pad_cy - corner_y) ** 2)
-                routed = abs(t) + leg2
-                result['routed_feeder_paths'][dev_idx] = [
-                    (dev_x, dev_y), (corner_x, corner_y), (pad_cx, pad_cy)
-                ]
-
-            label = f"Dev-{dev_idx+1:02d}"
-            result['feeder_distances'].append((dev_idx, label, routed))
-            result['feeder_total_ft'] += routed
-            result['feeder_count'] += 1
-
-        return result
+        See EstimateEngine.calculate_routed_feeder_distances.
+        """
+        return self._estimate_engine().calculate_routed_feeder_distances(
+            allocation_result, topology, row_spacing_ft)
     
     def _build_wire_sizing_frame(self, parent):
         """Build the Wire Sizing widget to the right of Global Settings."""
@@ -2012,16 +1424,8 @@ class QuickEstimate(ttk.Frame):
         finally:
             self._updating_wss = False
 
-    def _autosize_for_cable(self, cable_key: str, isc_total_a: float,
-                             ocpd_rating_a: float, string_count=None) -> str:
-        """Call autosize_conductor using wire_sizing_settings for the given cable type.
-
-        Returns the recommended gauge string. Caches the full result dict in
-        self._wss_autosize_results keyed by (string_count, cable_key) for LV types
-        or cable_key for feeder types, for later use in the Sizing Detail display.
-        """
-        from src.utils.cable_sizing import autosize_conductor
-
+    def _autosize_settings(self, cable_key: str) -> dict:
+        """autosize_conductor keyword arguments (all but the currents) for a cable type."""
         s = self.wire_sizing_settings.get(cable_key, {})
         install_method = s.get('install_method', 'conduit')
         circuits = max(1, s.get('circuits_sharing', 1))
@@ -2034,9 +1438,7 @@ class QuickEstimate(ttk.Frame):
         else:
             ambient = self.wire_sizing_settings.get('ambient_c', 30)
 
-        result = autosize_conductor(
-            isc_total_a=isc_total_a,
-            ocpd_rating_a=ocpd_rating_a,
+        return dict(
             material=s.get('material', 'copper'),
             insulation_type=s.get('insulation', 'PV Wire'),
             installation_method=install_method,
@@ -2048,10 +1450,49 @@ class QuickEstimate(ttk.Frame):
             vd_target_pct=s.get('vd_target_pct', 2.0),
         )
 
+    def _autosize_for_cable(self, cable_key: str, isc_total_a: float,
+                             ocpd_rating_a: float, string_count=None) -> str:
+        """Call autosize_conductor using wire_sizing_settings for the given cable type.
+
+        Returns the recommended gauge string. Caches the full result dict in
+        self._wss_autosize_results keyed by (string_count, cable_key) for LV types
+        or cable_key for feeder types, for later use in the Sizing Detail display.
+        """
+        from src.utils.cable_sizing import autosize_conductor
+
+        result = autosize_conductor(isc_total_a=isc_total_a, ocpd_rating_a=ocpd_rating_a,
+                                    **self._autosize_settings(cable_key))
+
         result_key = (string_count, cable_key) if string_count is not None else cable_key
         self._wss_autosize_results[result_key] = result
         return result['gauge']
 
+    def _autosize_lv_cables(self, string_counts, module_isc: float) -> dict:
+        """Recommended harness/extender/whip gauges for every string count.
+
+        Sizes all string counts of a cable type in one autosize_many call.
+        The Sizing Detail column shows the harness breakdown, so the harness
+        call also returns per-run details, kept in self._wss_autosize_results.
+
+        Returns {string_count: {'harness': gauge, 'extender': gauge, 'whip': gauge}}.
+        """
+        from src.utils.cable_sizing import autosize_many
+
+        string_counts = list(string_counts)
+        by_sc = {sc: {} for sc in string_counts}
+        if not string_counts:
+            return by_sc
+        isc_totals = [sc * module_isc for sc in string_counts]
+        results = {}
+        for cable_type in ('harness', 'extender', 'whip'):
+            results[cable_type] = autosize_many(isc_totals, 0, details=(cable_type == 'harness'),
+                                                **self._autosize_settings(cable_type))
+            for sc, gauge in zip(string_counts, results[cable_type]['gauge']):
+                by_sc[sc][cable_type] = str(gauge)
+        for sc, detail in zip(string_counts, results['harness']['details']):
+            self._wss_autosize_results[(sc, 'harness')] = detail
+        return by_sc
+
     def _compute_wire_length_estimates(self, totals: dict):
         """Derive average one-way cable lengths from BOM totals and cache in instance dicts.
 
@@ -2138,16 +1579,15 @@ class QuickEstimate(ttk.Frame):
         by_sc = self.wire_sizing.setdefault('by_string_count', {})
         topology = self.topology_var.get() if hasattr(self, 'topology_var') else 'Distributed String'
 
+        recommended = self._autosize_lv_cables(active_counts, module_isc)
         for sc in active_counts:
-            isc_total = sc * module_isc
             # Resolve entry using int-or-str lookup to avoid creating a duplicate
             # int-keyed entry that would shadow the string-keyed one from a JSON load.
             entry = by_sc.get(sc) or by_sc.get(str(sc))
             if entry is None:
                 entry = {}
                 by_sc[sc] = entry
-            for cable_type in ('harness', 'extender', 'whip'):
-                new_gauge = self._autosize_for_cable(cable_type, isc_total, 0, sc)
+            for cable_type, new_gauge in recommended[sc].items():
                 if not overrides.get(f"{sc}_{cable_type}"):
                     entry[cable_type] = new_gauge
 
@@ -2493,15 +1933,7 @@ class QuickEstimate(ttk.Frame):
 
         # Recommend LV sizes for each active string count
         active_counts = self._collect_active_string_counts()
-        by_sc = {}
-        for sc in active_counts:
-            isc_total = sc * module_isc
-            by_sc[sc] = {
-                'harness':  self._autosize_for_cable('harness',  isc_total, 0, sc),
-                'extender': self._autosize_for_cable('extender', isc_total, 0, sc),
-                'whip':     self._autosize_for_cable('whip',     isc_total, 0, sc),
-            }
-        self.wire_sizing['by_string_count'] = by_sc
+        self.wire_sizing['by_string_count'] = self._autosize_lv_cables(active_counts, module_isc)
 
         # Recommend DC feeder
         topology = self.topology_var.get() if hasattr(self, 'topology_var') else 'Distributed String'
@@ -2528,24 +1960,8 @@ class QuickEstimate(ttk.Frame):
         that have at least one real part for string_count, filtered to those >=
         the length-derived snap so the dropdown never offers an undersized option.
         """
-        import os as _os, json as _json
-        cur = _os.path.dirname(_os.path.abspath(__file__))
-        root = _os.path.dirname(_os.path.dirname(cur))
-        lib_path = _os.path.join(root, 'data', 'harness_library.json')
-        try:
-            with open(lib_path) as _f:
-                lib = _json.load(_f)
-        except Exception:
-            return []
-
-        spacings = set()
-        for pn, spec in lib.items():
-            if pn.startswith('_comment_'):
-                continue
-            if spec.get('num_strings') == string_count:
-                sp = spec.get('string_spacing_ft')
-                if sp is not None:
-                    spacings.add(float(sp))
+        from src.utils.part_index import get_part_index
+        spacings = get_part_index().harness_spacings(string_count)
 
         _, length_snap, _ = self._compute_harness_spacing()
         return sorted(sp for sp in spacings if sp >= length_snap)
@@ -2703,16 +2119,9 @@ class QuickEstimate(ttk.Frame):
         by_sc = self.wire_sizing.get('by_string_count', {})
 
         # Add recommendations for any new string counts
-        _table_changed = False
-        for sc in active_counts:
-            if sc not in by_sc and str(sc) not in by_sc:
-                isc_total = sc * module_isc
-                by_sc[sc] = {
-                    'harness':  self._autosize_for_cable('harness',  isc_total, 0, sc),
-                    'extender': self._autosize_for_cable('extender', isc_total, 0, sc),
-                    'whip':     self._autosize_for_cable('whip',     isc_total, 0, sc),
-                }
-                _table_changed = True
+        new_counts = [sc for sc in active_counts if sc not in by_sc and str(sc) not in by_sc]
+        by_sc.update(self._autosize_lv_cables(new_counts, module_isc))
+        _table_changed = bool(new_counts)
 
         # Remove string counts no longer in use, clearing any overrides for them
         keys_to_remove = []
@@ -2733,22 +2142,8 @@ class QuickEstimate(ttk.Frame):
             self.refresh_wire_sizing_table()
     
     def _compute_dc_breaker_size(self):
-        """Estimate the DC feeder/CB breaker rating from the selected inverter's MPPT channels.
-
-        Takes the largest per-MPPT max_input_current, scales by 1.25 (continuous load),
-        and rounds up to the next standard breaker size. Falls back to 400A when no
-        inverter is selected or the channel data is missing.
-        """
-        BREAKER_SIZES = [100, 125, 150, 175, 200, 225, 250, 300, 350, 400, 450, 500, 600, 700, 800]
-        if self.selected_inverter and hasattr(self.selected_inverter, 'mppt_channels'):
-            channels = self.selected_inverter.mppt_channels
-            if channels:
-                max_ch_current = max(ch.max_input_current for ch in channels)
-                target = max_ch_current * 1.25
-                for bs in BREAKER_SIZES:
-                    if bs >= target:
-                        return bs
-        return 400
+        """DC feeder/CB breaker rating from the selected inverter's MPPT channels."""
+        return self._estimate_engine()._compute_dc_breaker_size()
 
     def _on_topology_changed_wire_sizing(self):
         """Handle topology change — show/hide DC feeder row, recalc if needed."""
@@ -2823,37 +2218,7 @@ class QuickEstimate(ttk.Frame):
         Returns:
             str: Cable size string (e.g., '10 AWG', '500 kcmil')
         """
-        if cable_type in ('dc_feeder', 'ac_homerun'):
-            size = self.wire_sizing.get(cable_type, '')
-            return size if size else '4/0 AWG'
-        
-        if num_strings is None:
-            return '10 AWG'
-        
-        by_sc = self.wire_sizing.get('by_string_count', {})
-        # Try int key first, then string key (JSON round-trip converts int keys to strings)
-        entry = by_sc.get(num_strings) or by_sc.get(str(num_strings))
-        if entry:
-            return entry.get(cable_type, '10 AWG')
-
-        # No exact match — find the nearest configured string count.
-        # Split trackers (e.g. 1-string) inherit from the closest configured count.
-        if by_sc and num_strings is not None:
-            int_keys = []
-            for k in by_sc.keys():
-                try:
-                    int_keys.append(int(k))
-                except (ValueError, TypeError):
-                    pass
-            if int_keys:
-                # Prefer the closest count <= num_strings; otherwise use the minimum
-                floor_keys = [k for k in int_keys if k <= num_strings]
-                closest = max(floor_keys) if floor_keys else min(int_keys)
-                fallback_entry = by_sc.get(closest) or by_sc.get(str(closest))
-                if fallback_entry:
-                    return fallback_entry.get(cable_type, '10 AWG')
-
-        return '10 AWG'
+        return self._estimate_engine().get_wire_size_for(cable_type, num_strings)
     
     def _gauge_to_string_count(self, cable_type, gauge):
         """Reverse-lookup: find a string count that maps to this gauge for a given cable type.
@@ -3033,14 +2398,14 @@ class QuickEstimate(ttk.Frame):
         Returns (part_number, unit_price_str, ext_price_str)
         """
         try:
-            import os
-            import json
-            from src.utils.pricing_lookup import PricingLookup
+            from src.utils.pricing_lookup import get_pricing_lookup
+            from src.utils.part_index import get_part_index
 
             # Wire gauge is now looked up per cable type from wire_sizing dict
             wire_gauge = None  # Will be set per item_type below
 
-            pricing = PricingLookup()
+            pricing = get_pricing_lookup()
+            part_index = get_part_index()
             part_number = 'N/A'
 
             if item_type == 'harness':
@@ -3048,13 +2413,6 @@ class QuickEstimate(ttk.Frame):
                 polarity = kwargs.get('polarity', 'positive')
                 qty = kwargs.get('qty', 1)
 
-                # Load harness library
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                project_root = os.path.dirname(os.path.dirname(current_dir))
-                lib_path = os.path.join(project_root, 'data', 'harness_library.json')
-                with open(lib_path, 'r') as f:
-                    harness_library = json.load(f)
-
                 string_spacing_ft, target_spacing, _ = self._compute_harness_spacing()
 
                 # Apply per-string-count spacing override if the user has bumped this size up
@@ -3063,17 +2421,8 @@ class QuickEstimate(ttk.Frame):
                 if _sp_val is not None:
                     target_spacing = float(_sp_val)
 
-                matches = []
-                for pn, spec in harness_library.items():
-                    if pn.startswith('_comment_'):
-                        continue
-                    if (spec.get('num_strings') == num_strings and
-                            spec.get('polarity') == polarity and
-                            abs(spec.get('string_spacing_ft', 0) - target_spacing) < 0.1):
-                        spec_trunk = spec.get('trunk_cable_size', spec.get('trunk_wire_gauge', ''))
-                        harness_gauge = self.get_wire_size_for('harness', num_strings)
-                        if spec_trunk == harness_gauge:
-                            matches.append(pn)
+                harness_gauge = self.get_wire_size_for('harness', num_strings)
+                matches = part_index.find_harnesses(num_strings, polarity, target_spacing, harness_gauge) if harness_gauge else []
                 part_number = matches[0] if len(matches) == 1 else ('N/A' if not matches else ' or '.join(sorted(matches)))
 
             elif item_type in ('whip', 'extender'):
@@ -3084,13 +2433,6 @@ class QuickEstimate(ttk.Frame):
                 target_length = ((length_ft - 1) // 5 + 1) * 5
                 target_length = max(10, target_length)
 
-                lib_name = 'whip_library.json' if item_type == 'whip' else 'extender_library.json'
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                project_root = os.path.dirname(os.path.dirname(current_dir))
-                lib_path = os.path.join(project_root, 'data', lib_name)
-                with open(lib_path, 'r') as f:
-                    library = json.load(f)
-
                 # Look up wire gauge for this cable type
                 # If num_strings is provided, use per-string-count size; otherwise use effective size
                 item_num_strings = kwargs.get('num_strings', None)
@@ -3099,14 +2441,7 @@ class QuickEstimate(ttk.Frame):
                 else:
                     item_wire_gauge = self._get_effective_wire_size(item_type)
 
-                for pn, spec in library.items():
-                    if pn.startswith('_comment_'):
-                        continue
-                    if (spec.get('wire_gauge') == item_wire_gauge and
-                            spec.get('polarity') == polarity and
-                            spec.get('length_ft') == target_length):
-                        part_number = pn
-                        break
+                part_number = part_index.find_cable(item_type, item_wire_gauge, polarity, target_length) or 'N/A'
             else:
                 qty = kwargs.get('qty', 1)
 
@@ -3126,18 +2461,11 @@ class QuickEstimate(ttk.Frame):
         """Return the library description for part_number, or 'N/A' if not found."""
         if not part_number or part_number in ('N/A', ''):
             return 'N/A'
-        import os as _os, json as _json
-        cur = _os.path.dirname(_os.path.abspath(__file__))
-        root = _os.path.dirname(_os.path.dirname(cur))
         for lib in ('harness_library.json', 'whip_library.json', 'extender_library.json',
                     'fuse_library.json', 'combiner_box_library.json', 'combiner_box_fuse_library.json'):
-            try:
-                with open(_os.path.join(root, 'data', lib)) as _f:
-                    data = _json.load(_f)
-                if part_number in data:
-                    return data[part_number].get('description', 'N/A')
-            except Exception:
-                pass
+            data = load_library(lib, {})
+            if part_number in data:
+                return data[part_number].get('description', 'N/A')
         return 'N/A'
 
     def _on_results_tree_click(self, event):
@@ -3258,10 +2586,7 @@ class QuickEstimate(ttk.Frame):
 
     def parse_harness_config(self, config_str):
         """Parse harness config string like '2+1' into list of integers [2, 1]"""
-        try:
-            return [int(x) for x in config_str.split('+')]
-        except:
-            return []
+        return EstimateEngine.parse_harness_config(config_str)
         
     def _get_effective_harness_config(self, seg):
         """Get the effective harness config for a segment, considering LV Collection Method.
@@ -3269,11 +2594,7 @@ class QuickEstimate(ttk.Frame):
         When 'String HR' is selected, override to all 1-string harnesses (1+1+...+1).
         Otherwise, return the segment's stored harness_config.
         """
-        lv_method = self.lv_collection_var.get() if hasattr(self, 'lv_collection_var') else 'Wire Harness'
-        if lv_method in ('String HR', 'Trunk Bus'):
-            spt = seg.get('strings_per_tracker', 1)
-            return '+'.join(['1'] * int(spt))
-        return seg.get('harness_config', str(seg.get('strings_per_tracker', 1)))
+        return self._estimate_engine()._get_effective_harness_config(seg)
         
     def calculate_extender_lengths_per_segment(self, seg, device_position, string_offset=0, whip_point_override=None, harness_sizes_override=None, debug_label=None):
         """Calculate per-harness positive and negative extender lengths for a segment.
@@ -3281,248 +2602,11 @@ class QuickEstimate(ttk.Frame):
         Returns a list of (pos_length_ft, neg_length_ft) tuples, one per harness in the config.
         Multiply each by seg['quantity'] for total counts.
         """
-        template_ref = seg.get('template_ref')
-        if harness_sizes_override is not None:
-            harness_sizes = harness_sizes_override
-        else:
-            harness_config = self._get_effective_harness_config(seg)
-            harness_sizes = self.parse_harness_config(harness_config)
-        spt = seg['strings_per_tracker']
-        
-        if not harness_sizes:
-            return []
-        
-        m_to_ft = 3.28084
-        
-        # Get template geometry
-        tracker_length_ft = None
-        string_length_ft = None
-        motor_y_ft = None
-        motor_gap_ft = 0
-        has_motor = False
-        
-        if template_ref and template_ref in self.enabled_templates:
-            tdata = self.enabled_templates[template_ref]
-            mod_spec = tdata.get('module_spec', {})
-            orientation = tdata.get('module_orientation', 'Portrait')
-            mps = tdata.get('modules_per_string', 28)
-            spacing_m = tdata.get('module_spacing_m', 0.02)
-            has_motor = tdata.get('has_motor', True)
-            motor_gap_m = tdata.get('motor_gap_m', 1.0) if has_motor else 0
-            
-            if orientation == 'Portrait':
-                mod_along_m = mod_spec.get('width_mm', 1000) / 1000
-            else:
-                mod_along_m = mod_spec.get('length_mm', 2000) / 1000
-            
-            string_length_ft = (mps * mod_along_m + (mps - 1) * spacing_m) * m_to_ft
-            motor_gap_ft = motor_gap_m * m_to_ft
-            
-            # Total tracker length — use full strings + partial modules
-            full_spt = int(spt)
-            partial_mods = round((spt - full_spt) * mps) if spt != full_spt else 0
-            total_modules = full_spt * mps + partial_mods
-            tracker_length_m = (total_modules * mod_along_m + 
-                               (total_modules - 1) * spacing_m + 
-                               (motor_gap_m if has_motor else 0))
-            tracker_length_ft = tracker_length_m * m_to_ft
-            
-            # Motor Y position from north end
-            if has_motor:
-                motor_placement = tdata.get('motor_placement_type', 'between_strings')
-                motor_pos_after = tdata.get('motor_position_after_string', None)
-                motor_string_idx = tdata.get('motor_string_index', None)
-                motor_split_north = tdata.get('motor_split_north', mps // 2)
-                
-                # Partial string on north adds height before everything
-                partial_north_mods = 0
-                spt_val = tdata.get('strings_per_tracker', 1)
-                if spt_val != int(spt_val) and tdata.get('partial_string_side', 'north') == 'north':
-                    partial_north_mods = round((spt_val - int(spt_val)) * mps)
-                partial_north_m = partial_north_mods * (mod_along_m + spacing_m) if partial_north_mods > 0 else 0
-                
-                # Partial string on north shifts motor further south
-                partial_north_mods_ext = 0
-                if spt != int(spt):
-                    tdata_ext = self.enabled_templates.get(template_ref, {})
-                    if tdata_ext.get('partial_string_side', 'north') == 'north':
-                        partial_north_mods_ext = round((spt - int(spt)) * mps)
-                partial_north_m_ext = partial_north_mods_ext * (mod_along_m + spacing_m)
-                
-                if motor_placement == 'between_strings':
-                    if motor_pos_after is not None:
-                        strings_before = motor_pos_after
-                    else:
-                        strings_before = 1  # default: after first string
-                    modules_before = strings_before * mps
-                    motor_y_m = partial_north_m + (modules_before * mod_along_m + 
-                                (modules_before - 1) * spacing_m + spacing_m)
-                    motor_y_ft = motor_y_m * m_to_ft
-                elif motor_placement == 'middle_of_string':
-                    if motor_string_idx is not None:
-                        strings_before = motor_string_idx - 1  # 1-based
-                    else:
-                        strings_before = 0
-                    modules_before = strings_before * mps + motor_split_north
-                    motor_y_m = partial_north_m + (modules_before * mod_along_m + 
-                                max(modules_before - 1, 0) * spacing_m + spacing_m)
-                    motor_y_ft = motor_y_m * m_to_ft
-                else:
-                    motor_y_ft = tracker_length_ft / 2
-            else:
-                motor_y_ft = tracker_length_ft / 2
-        
-        # Fallback if template not found
-        if tracker_length_ft is None:
-            module_width_ft = (self.selected_module.width_mm / 304.8) if self.selected_module else 3.3
-            try:
-                mps = int(self.modules_per_string_var.get())
-            except ValueError:
-                mps = 28
-            string_length_ft = module_width_ft * mps
-            motor_gap_ft = 3.28
-            tracker_length_ft = string_length_ft * spt + motor_gap_ft
-            motor_y_ft = tracker_length_ft / 2
-            has_motor = True
-        
-        # Whip point in tracker-local Y coords — default determined by device_position
-        if device_position == 'north':
-            target_y = 0.0
-        elif device_position == 'south':
-            target_y = tracker_length_ft
-        else:  # middle
-            target_y = motor_y_ft + motor_gap_ft / 2
-
-        # Manual whip point override shifts relative to motor row, clamped to tracker bounds
-        if whip_point_override is not None:
-            target_y = max(0.0, min(tracker_length_ft,
-                                    motor_y_ft + motor_gap_ft / 2 + whip_point_override))
-        
-        # Resolve polarity convention
-        polarity = self.polarity_convention_var.get()
-        
-        # Determine which absolute string index the motor gap follows
-        motor_after_string = None  # 0-based absolute string index
-        if has_motor and template_ref and template_ref in self.enabled_templates:
-            tdata_motor = self.enabled_templates[template_ref]
-            motor_placement = tdata_motor.get('motor_placement_type', 'between_strings')
-            if motor_placement == 'between_strings':
-                pos_after = tdata_motor.get('motor_position_after_string', None)
-                if pos_after is not None:
-                    motor_after_string = pos_after - 1 if pos_after > 0 else 0
-                else:
-                    motor_after_string = 0
-            elif motor_placement == 'middle_of_string':
-                # Motor is inside a string — gap is effectively after (string_index - 1)
-                # but for extender purposes, treat it as between string boundaries
-                idx = tdata_motor.get('motor_string_index', 1)
-                motor_after_string = idx - 1 if idx > 0 else 0
-        elif has_motor:
-            motor_after_string = 0  # default fallback
-        
-        # Build ALL string boundary positions for the full tracker N→S
-        inter_string_gap = (spacing_m if (template_ref and template_ref in self.enabled_templates) else 0.02) * m_to_ft
-        full_string_count = int(spt)
-        all_string_positions = []  # (north_edge, south_edge) for every string on tracker
-        y_cursor = 0.0
-        for abs_idx in range(full_string_count):
-            north_edge = y_cursor
-            south_edge = y_cursor + string_length_ft
-            all_string_positions.append((north_edge, south_edge))
-            y_cursor = south_edge
-            if has_motor and motor_after_string is not None and abs_idx == motor_after_string:
-                y_cursor += motor_gap_ft
-            elif abs_idx < full_string_count - 1:
-                y_cursor += inter_string_gap
-
-        # Assign harness indices starting from string_offset
-        # (For non-split trackers offset=0; for split portions, offset = physical start position)
-        string_positions = []
-        str_pos = string_offset
-        for h_idx, h_size in enumerate(harness_sizes):
-            for s in range(h_size):
-                if str_pos < len(all_string_positions):
-                    n_edge, s_edge = all_string_positions[str_pos]
-                    string_positions.append((n_edge, s_edge, h_idx))
-                    str_pos += 1
-        
-        # Calculate per-harness extender lengths
-        result = []
-        for h_idx, h_size in enumerate(harness_sizes):
-            harness_strings = [(n, s) for n, s, hi in string_positions if hi == h_idx]
-            
-            if not harness_strings:
-                result.append((10.0, 10.0))
-                continue
-            
-            # Find the device-side string (the harness end closest to the whip point)
-            harness_center = (harness_strings[0][0] + harness_strings[-1][1]) / 2
-            if device_position == 'north':
-                device_side = harness_strings[0]    # northernmost string
-            elif device_position == 'south':
-                device_side = harness_strings[-1]   # southernmost string
-            else:  # middle (or override) — compare harness center to whip point
-                if harness_center <= target_y:
-                    device_side = harness_strings[-1]   # harness is north of whip point → exit south end
-                else:
-                    device_side = harness_strings[0]    # harness is south of whip point → exit north end
-            
-            ds_north = device_side[0]  # north edge of device-side string
-            ds_south = device_side[1]  # south edge of device-side string
-            
-            # Determine which edge is positive and which is negative
-            if polarity == 'Negative Always South':
-                pos_y = ds_north
-                neg_y = ds_south
-            elif polarity == 'Negative Always North':
-                pos_y = ds_south
-                neg_y = ds_north
-            elif polarity == 'Negative Toward Device':
-                if device_position == 'north':
-                    neg_y = ds_north
-                    pos_y = ds_south
-                elif device_position == 'south':
-                    neg_y = ds_south
-                    pos_y = ds_north
-                else:
-                    if ds_north < motor_y_ft:
-                        neg_y = ds_south
-                        pos_y = ds_north
-                    else:
-                        neg_y = ds_north
-                        pos_y = ds_south
-            elif polarity == 'Positive Toward Device':
-                if device_position == 'north':
-                    pos_y = ds_north
-                    neg_y = ds_south
-                elif device_position == 'south':
-                    pos_y = ds_south
-                    neg_y = ds_north
-                else:
-                    if ds_north < motor_y_ft:
-                        pos_y = ds_south
-                        neg_y = ds_north
-                    else:
-                        pos_y = ds_north
-                        neg_y = ds_south
-            else:
-                pos_y = ds_north
-                neg_y = ds_south
-            
-            pos_extender = max(abs(pos_y - target_y), 5.0)
-            neg_extender = max(abs(neg_y - target_y), 5.0)
-
-            if debug_label:
-                wp_str = f"  whip_pt_override={whip_point_override:.1f}" if whip_point_override is not None else ""
-                print(f"    H{h_idx}: tracker_len={tracker_length_ft:.1f}ft"
-                      f"  target_y={target_y:.1f}{wp_str}"
-                      f"  device_side=[{device_side[0]:.1f},{device_side[1]:.1f}]"
-                      f"  pos_y={pos_y:.1f}  neg_y={neg_y:.1f}"
-                      f"  → ext+={pos_extender:.1f}  ext-={neg_extender:.1f}")
-
-            result.append((pos_extender, neg_extender))
-
-        return result
+        return self._estimate_engine().calculate_extender_lengths_per_segment(
+            seg, device_position, string_offset,
+            whip_point_override=whip_point_override,
+            harness_sizes_override=harness_sizes_override,
+            debug_label=debug_label)
         
     def load_estimate(self):
         """Load estimate data from the project"""
@@ -4313,7 +3397,7 @@ class QuickEstimate(ttk.Frame):
 
     def _get_harness_sizes(self, seg):
         """Parse the effective harness config for a segment into a list of ints."""
-        return self.parse_harness_config(self._get_effective_harness_config(seg))
+        return self._estimate_engine()._get_harness_sizes(seg)
 
     def _rebuild_group_details(self, group_idx):
         """Destroy and rebuild the details panel for a group, then refresh dependent state."""
@@ -4614,228 +3698,36 @@ class QuickEstimate(ttk.Frame):
     def _get_estimate_tracker_dims_ft(self, template_ref):
         """Get (width_ft, length_ft) for a tracker from its template reference.
         
-        Width = E-W dimension (across tracker row).
-        Length = N-S dimension (along tracker).
-        
         Returns (width_ft, length_ft) or None if template not found.
         """
-        if not template_ref or template_ref not in self.enabled_templates:
-            return None
-        
-        tdata = self.enabled_templates[template_ref]
-        ms = tdata.get('module_spec', {})
-        mps = tdata.get('modules_per_string', 28)
-        strings_per_tracker = tdata.get('strings_per_tracker', 1)
-        orientation = tdata.get('module_orientation', 'Portrait')
-        module_spacing_m = tdata.get('module_spacing_m', 0.02)
-        
-        mod_w_m = ms.get('width_mm', 1134) / 1000.0
-        mod_l_m = ms.get('length_mm', 2278) / 1000.0
-        
-        if orientation == 'Portrait':
-            mod_across = mod_l_m   # E-W (width of tracker)
-            mod_along = mod_w_m    # N-S (length of tracker)
-        else:
-            mod_across = mod_w_m
-            mod_along = mod_l_m
-        
-        # Width (E-W): module across dimension × modules_high (stacked columns)
-        modules_high = tdata.get('modules_high', 1)
-        width_m = mod_across * modules_high
-        
-        # Length (N-S): all modules laid end-to-end (full strings + partial) plus gaps and motor
-        full_spt = int(strings_per_tracker)
-        partial_mods = round((strings_per_tracker - full_spt) * mps) if strings_per_tracker != full_spt else 0
-        modules_in_row = full_spt * mps + partial_mods
-        
-        motor_gap_m = tdata.get('motor_gap_m', 0)
-        has_motor = tdata.get('has_motor', True)
-        if not has_motor:
-            motor_gap_m = 0
-        
-        length_m = modules_in_row * mod_along + max(modules_in_row - 1, 0) * module_spacing_m + motor_gap_m
-
-        width_ft = width_m * 3.28084
-        length_ft = length_m * 3.28084
-        
-        return (width_ft, length_ft)
+        return self._estimate_engine()._get_estimate_tracker_dims_ft(template_ref)
 
     def _get_harness_config_for_tracker_type(self, strings_per_tracker):
         """Find the harness config used for trackers with the given string count."""
-        for group in self.groups:
-            for seg in group['segments']:
-                if seg['strings_per_tracker'] == strings_per_tracker and seg['quantity'] > 0:
-                    return self.parse_harness_config(self._get_effective_harness_config(seg))
-                
-        # Fallback: single harness equal to full string count
-        return [int(strings_per_tracker)]
+        return self._estimate_engine()._get_harness_config_for_tracker_type(strings_per_tracker)
 
-    def _build_combiner_assignments(self, totals, topology):
-        """Build structured combiner box assignments for Device Configurator.
-        
-        Produces self.last_combiner_assignments — a list of dicts, one per CB,
-        each containing the tracker/harness connections that feed it.
-        
-        For Centralized String: 1 CB per inverter, connections from allocation harness_map.
-        For Central Inverter: distribute trackers proportionally across N combiners.
-        For Distributed String: no CBs — returns empty list.
-        """
-        self.last_combiner_assignments = []
-        self.last_si_assignments = []
+    def _read_combiner_bom_from_device_config(self):
+        """Read combiner BOM data from Device Configurator (single source of truth).
 
-        if topology == 'Distributed String':
-            self._build_si_assignments(totals)
-            return
-        
-        inv_summary = totals.get('inverter_summary', {})
-        allocation_result = inv_summary.get('allocation_result')
-        module_isc = self.selected_module.isc if self.selected_module else 0
+        Populates self.last_totals['combiners_by_breaker'] and ['combiner_details']
+        from the Device Configurator's combiner_configs, which reflect the user's
+        NEC multiplier, breaker overrides, and fuse sizes.
 
-        # NEC factor — use project setting if available
-        nec_factor = 1.56
-        if self.current_project:
-            nec_factor = getattr(self.current_project, 'nec_safety_factor', 1.56)
+        Also syncs breaker sizes back into self.last_combiner_assignments.
         
-        # Standard breaker sizes for per-CB calculation
-        BREAKER_SIZES = [100, 125, 150, 175, 200, 225, 250, 300, 350, 400, 450, 500, 600, 700, 800]
+        Returns True if Device Configurator had data, False if fallback is needed.
+        """
+        if not hasattr(self, 'last_totals') or not self.last_totals:
+            return False
         
-        # Build flat tracker list with segment metadata for harness config lookup
-        tracker_segment_map = []  # flat list: one entry per tracker with its segment ref
-        for group in self.groups:
-            for seg in group['segments']:
-                harness_sizes = self._get_harness_sizes(seg)
-                for _ in range(seg['quantity']):
-                    tracker_segment_map.append({
-                        'spt': seg['strings_per_tracker'],
-                        'harness_sizes': list(harness_sizes),
-                        'wire_gauge': self._get_wire_gauge_for_segment(seg, 'whip'),
-                    })
+        # Get Device Configurator
+        main_app = getattr(self, 'main_app', None)
+        if not main_app or not hasattr(main_app, 'device_configurator'):
+            return False
         
-        if topology == 'Centralized String' and allocation_result:
-            # 1 CB per inverter — connections directly from allocation harness_map
-            for inv_idx, inv in enumerate(allocation_result['inverters']):
-                cb_name = self.device_names.get(inv_idx, f"CB-{inv_idx + 1:02d}")
-                connections = self._build_connections_from_harness_map(
-                    inv['harness_map'], tracker_segment_map, module_isc, nec_factor
-                )
-                # Calculate per-CB breaker from actual total current
-                total_current = sum(
-                    c['num_strings'] * c['module_isc'] * c['nec_factor']
-                    for c in connections
-                )
-                calc_breaker = 400  # fallback
-                for bs in BREAKER_SIZES:
-                    if bs >= total_current:
-                        calc_breaker = bs
-                        break
-                
-                self.last_combiner_assignments.append({
-                    'combiner_name': cb_name,
-                    'device_idx': inv_idx,
-                    'breaker_size': calc_breaker,
-                    'module_isc': module_isc,
-                    'nec_factor': nec_factor,
-                    'connections': connections,
-                })
-        
-        elif topology == 'Central Inverter' and allocation_result:
-            # Central Inverter: allocation groups = CBs (or LBDs for Trunk Bus).
-            # Use allocation harness_map (same approach as Centralized String).
-            _lv = self.lv_collection_var.get() if hasattr(self, 'lv_collection_var') else 'Wire Harness'
-            _dev_prefix = 'LBD' if _lv == 'Trunk Bus' else 'CB'
-            for inv_idx, inv in enumerate(allocation_result['inverters']):
-                cb_name = self.device_names.get(inv_idx, f"{_dev_prefix}-{inv_idx + 1:02d}")
-                connections = self._build_connections_from_harness_map(
-                    inv['harness_map'], tracker_segment_map, module_isc, nec_factor
-                )
-                # Calculate per-CB breaker from actual total current
-                total_current = sum(
-                    c['num_strings'] * c['module_isc'] * c['nec_factor']
-                    for c in connections
-                )
-                calc_breaker = 400  # fallback
-                for bs in BREAKER_SIZES:
-                    if bs >= total_current:
-                        calc_breaker = bs
-                        break
-                
-                self.last_combiner_assignments.append({
-                    'combiner_name': cb_name,
-                    'device_idx': inv_idx,
-                    'breaker_size': calc_breaker,
-                    'module_isc': module_isc,
-                    'nec_factor': nec_factor,
-                    'connections': connections,
-                })
-
-    def _build_si_assignments(self, totals):
-        """Build self.last_si_assignments for Distributed String topology.
-
-        Mirrors _build_combiner_assignments but produces one entry per string
-        inverter rather than per combiner box. Each entry carries the same
-        tracker/harness connection list format used by the Device Configurator.
-        """
-        self.last_si_assignments = []
-
-        inv_summary = totals.get('inverter_summary', {})
-        allocation_result = inv_summary.get('allocation_result')
-        if not allocation_result:
-            return
-
-        module_isc = self.selected_module.isc if self.selected_module else 0
-
-        nec_factor = 1.56
-        if self.current_project:
-            nec_factor = getattr(self.current_project, 'nec_safety_factor', 1.56)
-
-        # Build flat tracker list for harness config / wire gauge lookup
-        tracker_segment_map = []
-        for group in self.groups:
-            for seg in group['segments']:
-                harness_sizes = self._get_harness_sizes(seg)
-                for _ in range(seg['quantity']):
-                    tracker_segment_map.append({
-                        'spt': seg['strings_per_tracker'],
-                        'harness_sizes': list(harness_sizes),
-                        'wire_gauge': self._get_wire_gauge_for_segment(seg, 'whip'),
-                    })
-
-        for inv_idx, inv in enumerate(allocation_result.get('inverters', [])):
-            inv_name = self.device_names.get(inv_idx, f"SI-{inv_idx + 1:02d}")
-            connections = self._build_connections_from_harness_map(
-                inv['harness_map'], tracker_segment_map, module_isc, nec_factor
-            )
-            self.last_si_assignments.append({
-                'inverter_name': inv_name,
-                'device_idx': inv_idx,
-                'module_isc': module_isc,
-                'nec_factor': nec_factor,
-                'inverter_spec': self.selected_inverter,
-                'connections': connections,
-            })
-
-    def _read_combiner_bom_from_device_config(self):
-        """Read combiner BOM data from Device Configurator (single source of truth).
-
-        Populates self.last_totals['combiners_by_breaker'] and ['combiner_details']
-        from the Device Configurator's combiner_configs, which reflect the user's
-        NEC multiplier, breaker overrides, and fuse sizes.
-
-        Also syncs breaker sizes back into self.last_combiner_assignments.
-        
-        Returns True if Device Configurator had data, False if fallback is needed.
-        """
-        if not hasattr(self, 'last_totals') or not self.last_totals:
-            return False
-        
-        # Get Device Configurator
-        main_app = getattr(self, 'main_app', None)
-        if not main_app or not hasattr(main_app, 'device_configurator'):
-            return False
-        
-        dc = main_app.device_configurator
-        if not hasattr(dc, 'combiner_configs') or not dc.combiner_configs:
-            return False
+        dc = main_app.device_configurator
+        if not hasattr(dc, 'combiner_configs') or not dc.combiner_configs:
+            return False
         
         # Only use DC data if it's in QE mode
         if getattr(dc, 'data_source', 'blocks') != 'quick_estimate':
@@ -4918,60 +3810,7 @@ class QuickEstimate(ttk.Frame):
         """
         if not self.last_combiner_assignments or not hasattr(self, 'last_totals') or not self.last_totals:
             return
-        
-        totals = self.last_totals
-        totals['combiners_by_breaker'] = {}
-        totals['combiner_details'] = []
-        
-        module_isc = self.selected_module.isc if self.selected_module else 0
-        nec_factor = 1.56
-        if self.current_project:
-            nec_factor = getattr(self.current_project, 'nec_safety_factor', 1.56)
-        
-        for cb in self.last_combiner_assignments:
-            bs = cb['breaker_size']
-            if bs not in totals['combiners_by_breaker']:
-                totals['combiners_by_breaker'][bs] = 0
-            totals['combiners_by_breaker'][bs] += 1
-        
-        for bs, qty in totals['combiners_by_breaker'].items():
-            max_h_strings = 1
-            max_inputs = 0
-            for cb in self.last_combiner_assignments:
-                if cb['breaker_size'] == bs:
-                    num_inputs = len(cb['connections'])
-                    max_inputs = max(max_inputs, num_inputs)
-                    for conn in cb['connections']:
-                        max_h_strings = max(max_h_strings, conn['num_strings'])
-            
-            fuse_current = module_isc * nec_factor * max_h_strings
-            fuse_holder_rating = self.get_fuse_holder_category(fuse_current)
-            
-            matched_cb = self.find_combiner_box(max_inputs, bs, fuse_holder_rating)
-            if matched_cb:
-                totals['combiner_details'].append({
-                    'part_number': matched_cb.get('part_number', ''),
-                    'description': matched_cb.get('description', ''),
-                    'max_inputs': matched_cb.get('max_inputs', 0),
-                    'breaker_size': bs,
-                    'fuse_holder_rating': fuse_holder_rating,
-                    'strings_per_cb': max_inputs,
-                    'quantity': qty,
-                    'block_name': 'Site Total'
-                })
-            else:
-                totals['combiner_details'].append({
-                    'part_number': 'NO MATCH',
-                    'description': f'No CB found: {max_inputs} inputs, {bs}A, {fuse_holder_rating}',
-                    'max_inputs': max_inputs,
-                    'breaker_size': bs,
-                    'fuse_holder_rating': fuse_holder_rating,
-                    'strings_per_cb': max_inputs,
-                    'quantity': qty,
-                    'block_name': 'Site Total'
-                })
-        
-        self.last_totals = totals
+        self._estimate_engine()._rebuild_combiner_totals_from_assignments(self.last_totals)
 
     def _refresh_combiner_results_from_assignments(self):
         """Rebuild combiner BOM totals and refresh display.
@@ -5064,17 +3903,9 @@ class QuickEstimate(ttk.Frame):
         
         # Inline DC string fuses (Wire Harness only)
         if totals.get('inline_fuses_by_rating'):
-            import os as _os
             is_first_solar = totals.get('has_first_solar', False)
 
-            fuse_library = {}
-            try:
-                _cur = _os.path.dirname(_os.path.abspath(__file__))
-                _root = _os.path.dirname(_os.path.dirname(_cur))
-                with open(_os.path.join(_root, 'data', 'fuse_library.json'), 'r') as _f:
-                    fuse_library = json.load(_f)
-            except Exception:
-                pass
+            fuse_library = load_library('fuse_library.json', {})
 
             def _fuse_pn(rating):
                 for pn, spec in fuse_library.items():
@@ -5362,284 +4193,17 @@ class QuickEstimate(ttk.Frame):
 
     def _build_connections_from_harness_map(self, harness_map, tracker_segment_map, module_isc, nec_factor):
         """Convert an allocation harness_map into Device Configurator connection dicts."""
-        connections = []
-        
-        # Group harness_map entries by tracker to assign harness labels
-        tracker_harness_counter = {}  # tracker_idx -> next harness number
-        
-        for entry in harness_map:
-            tidx = entry['tracker_idx']
-            strings_taken = entry['strings_taken']
-            spt = entry['strings_per_tracker']
-            is_split = entry.get('is_split', False)
-            
-            # Get segment info for this tracker
-            t_info = tracker_segment_map[tidx] if tidx < len(tracker_segment_map) else None
-            wire_gauge = t_info['wire_gauge'] if t_info else '10 AWG'
-            original_harnesses = t_info['harness_sizes'] if t_info else [spt]
-
-            if not is_split:
-                # Full tracker — one connection per harness in the config
-                pos_cursor = 0
-                for h_idx, h_size in enumerate(original_harnesses):
-                    connections.append({
-                        'tracker_idx': tidx,
-                        'tracker_label': f"T{tidx + 1:02d}",
-                        'harness_label': f"H{h_idx + 1:02d}",
-                        'num_strings': h_size,
-                        'start_string_pos': pos_cursor,
-                        'module_isc': module_isc,
-                        'nec_factor': nec_factor,
-                        'wire_gauge': self.get_wire_size_for('whip', h_size),
-                    })
-                    pos_cursor += h_size
-            else:
-                # Split tracker — distribute strings_taken across harnesses
-                remaining = strings_taken
-                harness_cursor = tracker_harness_counter.get(tidx, 0)
-                # Compute physical start position from split_position.
-                # Head starts at 0, tail starts at (spt - strings_taken).
-                # This is correct for fresh allocations where splits are always head/tail.
-                split_pos = entry.get('split_position', 'head')
-                if split_pos == 'tail':
-                    pos_cursor = spt - strings_taken
-                else:
-                    pos_cursor = 0
-                
-                while remaining > 0 and harness_cursor < len(original_harnesses):
-                    h_size = original_harnesses[harness_cursor]
-                    take = min(remaining, h_size)
-                    connections.append({
-                        'tracker_idx': tidx,
-                        'tracker_label': f"T{tidx + 1:02d}",
-                        'harness_label': f"H{harness_cursor + 1:02d}",
-                        'num_strings': take,
-                        'start_string_pos': pos_cursor,
-                        'module_isc': module_isc,
-                        'nec_factor': nec_factor,
-                        'wire_gauge': self.get_wire_size_for('whip', take),
-                    })
-                    pos_cursor += take
-                    remaining -= take
-                    if take >= h_size:
-                        harness_cursor += 1
-                
-                tracker_harness_counter[tidx] = harness_cursor
-        
-        return connections
+        return self._estimate_engine()._build_connections_from_harness_map(
+            harness_map, tracker_segment_map, module_isc, nec_factor)
     
     def _get_wire_gauge_for_segment(self, seg, cable_type):
         """Get the wire gauge for a segment from the wire sizing table."""
-        spt = seg.get('strings_per_tracker', 1)
-        harness_sizes = self._get_harness_sizes(seg)
-        max_harness = max(harness_sizes) if harness_sizes else spt
-        
-        # Look up from self.wire_sizing
-        if hasattr(self, 'wire_sizing') and self.wire_sizing:
-            # Wire sizing is keyed by string count
-            sizing = self.wire_sizing.get(str(max_harness)) or self.wire_sizing.get(str(spt))
-            if sizing and cable_type in sizing:
-                return sizing[cable_type]
-        
-        return '10 AWG'
+        return self._estimate_engine()._get_wire_gauge_for_segment(seg, cable_type)
     
-    def _derive_harnesses_for_split(self, harness_config_sizes, spt, device_positions):
-        """Derive per-device harness configs from a segment's harness config and split boundaries.
-        
-        Walks the harness config north-to-south (physical position order) and
-        cuts any harness that straddles a device boundary.
-        
-        Args:
-            harness_config_sizes: list of ints, e.g. [6, 6] for "6+6"
-            spt: total strings per tracker
-            device_positions: list of dicts, each with:
-                - 'inv_idx': device index
-                - 'strings_taken': how many strings this device owns
-                - 'start_pos': first physical position owned (0-based, north)
-                
-        Returns:
-            list of dicts (same order as device_positions), each with:
-                - 'inv_idx': device index
-                - 'strings_taken': total strings
-                - 'harnesses': list of ints (harness sizes for this portion)
-        """
-        # Build the harness ranges: which physical positions each harness covers
-        harness_ranges = []
-        pos_cursor = 0
-        for h_size in harness_config_sizes:
-            harness_ranges.append((pos_cursor, pos_cursor + h_size - 1))  # inclusive
-            pos_cursor += h_size
-        
-        # Sort device portions by start_pos (north first)
-        sorted_portions = sorted(device_positions, key=lambda p: p['start_pos'])
-        
-        result = []
-        for portion in sorted_portions:
-            p_start = portion['start_pos']
-            p_end = p_start + portion['strings_taken'] - 1  # inclusive
-            
-            portion_harnesses = []
-            for h_start, h_end in harness_ranges:
-                # Find overlap between this harness range and this device's range
-                overlap_start = max(h_start, p_start)
-                overlap_end = min(h_end, p_end)
-                overlap = overlap_end - overlap_start + 1
-                
-                if overlap > 0:
-                    portion_harnesses.append(overlap)
-            
-            result.append({
-                'inv_idx': portion['inv_idx'],
-                'strings_taken': portion['strings_taken'],
-                'start_pos': portion['start_pos'],
-                'harnesses': portion_harnesses,
-            })
-        
-        return result
-
     def _calc_inline_fuse_rating(self, module_spec) -> int:
         """Return the inline DC string fuse rating for a single string.
         Uses fixed 1.25 NEC factor regardless of project setting."""
-        _FUSE_RATINGS = [5, 10, 15, 20, 25, 30, 35, 40, 45]
-        try:
-            if isinstance(module_spec, dict):
-                isc = float(module_spec.get('isc', 0))
-            elif module_spec is not None:
-                isc = float(module_spec.isc)
-            elif self.selected_module:
-                isc = float(self.selected_module.isc)
-            else:
-                return 15
-            nec_min = isc * 1.25
-            for rating in _FUSE_RATINGS:
-                if rating >= nec_min:
-                    return rating
-        except (ValueError, TypeError):
-            pass
-        return 15
-
-    def _adjust_harnesses_for_splits(self, totals):
-        """Derive harness configs for split trackers based on allocation boundaries.
-        
-        Walks the segment's harness config north-to-south and cuts at the split
-        boundary. Harnesses cannot span device boundaries.
-        
-        Also builds self._split_tracker_details for use by whip and extender
-        calculations — maps each split tracker to per-device harness assignments.
-        """
-        self._split_tracker_details = {}
-        
-        inv_summary = totals.get('inverter_summary', {})
-        allocation_result = inv_summary.get('allocation_result')
-        
-        if not allocation_result:
-            return
-        
-        # Collect split tracker info from harness_map
-        split_trackers = {}
-        
-        for inv_idx, inv in enumerate(allocation_result['inverters']):
-            for entry in inv['harness_map']:
-                if entry['is_split']:
-                    tidx = entry['tracker_idx']
-                    if tidx not in split_trackers:
-                        split_trackers[tidx] = []
-                    entry_with_inv = dict(entry)
-                    entry_with_inv['inv_idx'] = inv_idx
-                    split_trackers[tidx].append(entry_with_inv)
-        
-        if not split_trackers:
-            return
-        
-        # Build tracker_to_segment map for looking up harness configs
-        tracker_seg_map = getattr(self, '_tracker_to_segment', [])
-        
-        for tidx, entries in split_trackers.items():
-            spt = entries[0]['strings_per_tracker']
-            # Use per-tracker segment lookup to get correct harness config
-            # (multiple segments can share the same SPT with different configs)
-            if tidx < len(tracker_seg_map) and tracker_seg_map[tidx]:
-                seg = tracker_seg_map[tidx]['seg']
-                harness_config = self._get_effective_harness_config(seg)
-                original_harness_sizes = self.parse_harness_config(harness_config)
-            else:
-                original_harness_sizes = self._get_harness_config_for_tracker_type(spt)
-            
-            # Build device_positions with physical start positions
-            # Entries come from harness_map which is ordered by allocation sequence.
-            # For head/tail splits: head starts at 0, tail starts after head.
-            device_positions = []
-            pos_cursor = 0
-            
-            # Sort by split_position: head first, then middle, then tail
-            position_order = {'head': 0, 'middle': 1, 'tail': 2, 'full': 0}
-            sorted_entries = sorted(entries, key=lambda e: position_order.get(e.get('split_position', 'full'), 0))
-            
-            # Check if we have start_string_pos from Edit Devices (most accurate)
-            # This comes through the combiner assignments path
-            has_physical_pos = False
-            if self.last_combiner_assignments:
-                for cb in self.last_combiner_assignments:
-                    for conn in cb.get('connections', []):
-                        if conn['tracker_idx'] == tidx and 'start_string_pos' in conn:
-                            has_physical_pos = True
-                            break
-                    if has_physical_pos:
-                        break
-            
-            if has_physical_pos:
-                # Build from combiner assignments with physical positions
-                for cb_idx, cb in enumerate(self.last_combiner_assignments):
-                    for conn in cb.get('connections', []):
-                        if conn['tracker_idx'] == tidx:
-                            device_positions.append({
-                                'inv_idx': cb_idx,
-                                'strings_taken': conn['num_strings'],
-                                'start_pos': conn.get('start_string_pos', 0),
-                            })
-            elif any('start_physical_pos' in e for e in entries):
-                # Use physical positions from harness_map (from manual Edit Devices)
-                for entry in entries:
-                    device_positions.append({
-                        'inv_idx': entry['inv_idx'],
-                        'strings_taken': entry['strings_taken'],
-                        'start_pos': entry['start_physical_pos'],
-                    })
-            else:
-                # Fall back to allocation order (head=north, tail=south)
-                for entry in sorted_entries:
-                    device_positions.append({
-                        'inv_idx': entry['inv_idx'],
-                        'strings_taken': entry['strings_taken'],
-                        'start_pos': pos_cursor,
-                    })
-                    pos_cursor += entry['strings_taken']
-            # Derive harnesses for each portion
-            portion_details = self._derive_harnesses_for_split(
-                original_harness_sizes, spt, device_positions
-            )
-            
-            # Store for whip and extender calculations
-            self._split_tracker_details[tidx] = {
-                'spt': spt,
-                'original_config': original_harness_sizes,
-                'portions': portion_details,
-            }
-            
-            # Adjust harness totals: remove original, add derived
-            for size in original_harness_sizes:
-                if size in totals['harnesses_by_size']:
-                    totals['harnesses_by_size'][size] -= 1
-                    if totals['harnesses_by_size'][size] <= 0:
-                        del totals['harnesses_by_size'][size]
-            
-            all_new = []
-            for p in portion_details:
-                all_new.extend(p['harnesses'])
-            for size in all_new:
-                if size not in totals['harnesses_by_size']:
-                    totals['harnesses_by_size'][size] = 0
-                totals['harnesses_by_size'][size] += 1
+        return self._estimate_engine()._calc_inline_fuse_rating(module_spec)
 
     def _update_spi_label(self):
         """Update the Strings/Device label and show/hide central inverter count."""
@@ -6790,8 +5354,63 @@ class QuickEstimate(ttk.Frame):
                 import traceback
                 print(f"[QuickEstimate] site preview refresh error:\n{traceback.format_exc()}")
 
+    def _estimate_inputs(self):
+        """Current estimate state in the project.quick_estimates dict shape.
+
+        Unlike save_estimate() nothing is copied — groups, pads and device maps
+        are the dialog's own objects, so the engine's per-tracker state refers
+        to the same segment dicts the rest of the dialog holds.
+        """
+        def var_get(name, default=''):
+            var = getattr(self, name, None)
+            return var.get() if var is not None else default
+
+        return {
+            'groups': self.groups,
+            'topology': var_get('topology_var', 'Distributed String'),
+            'lv_collection_method': var_get('lv_collection_var', 'Wire Harness'),
+            'polarity_convention': var_get('polarity_convention_var', 'Negative Always South'),
+            'modules_per_string': var_get('modules_per_string_var', 28),
+            'strings_per_device': var_get('strings_per_inverter_var'),
+            'central_inverter_count': var_get('central_inv_count_var', '1'),
+            'skids': var_get('skids_var'),
+            'ac_homerun_distance': var_get('ac_homerun_distance_var', 50.0),
+            'wire_sizing': getattr(self, 'wire_sizing', {}),
+            'wire_sizing_settings': self.wire_sizing_settings,
+            'pads': self.pads,
+            'corridors': self.corridors,
+            'device_names': self.device_names,
+            'device_feeder_sizes': self.device_feeder_sizes,
+            'device_ns_steps': self.device_ns_steps,
+            'device_ew_steps': self.device_ew_steps,
+            'whip_point_overrides': self._whip_point_overrides,
+            'whip_point_ns_legs': self._whip_point_ns_legs,
+            'allocation_locked': self.allocation_locked,
+            'locked_allocation_result': self.locked_allocation_result,
+            'combiner_assignments': self.last_combiner_assignments,
+            'si_assignments': self.last_si_assignments,
+        }
+
+    def _estimate_engine(self, inputs=None):
+        """Build an EstimateEngine over the dialog's current state."""
+        nec_factor = 1.56
+        if self.current_project:
+            nec_factor = getattr(self.current_project, 'nec_safety_factor', 1.56)
+        return EstimateEngine(
+            inputs if inputs is not None else self._estimate_inputs(),
+            self.enabled_templates,
+            inverter=self.selected_inverter,
+            module=self.selected_module,
+            nec_factor=nec_factor,
+            cache=self._estimate_cache,
+        )
+
     def _calculate_estimate_impl(self, silent=False):
-        """Internal implementation of calculate_estimate."""
+        """Internal implementation of calculate_estimate.
+
+        The math lives in EstimateEngine; this syncs UI state into it, then
+        stores and renders the totals it returns.
+        """
         # Clear previous results
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
@@ -6811,1080 +5430,37 @@ class QuickEstimate(ttk.Frame):
 
         # Sync all group listbox text before calculating
         self._refresh_group_listbox(preserve_selection=True)
-        
-        # Aggregated totals
-        totals = {
-            'combiners_by_breaker': defaultdict(int),
-            'combiner_details': [],
-            'string_inverters': 0,
-            'trackers_by_string': defaultdict(int),
-            'harnesses_by_size': defaultdict(int),
-            'inline_fuses_by_rating': defaultdict(int),
-            'whips_by_length': defaultdict(int),
-            # Per-polarity combined-whip buckets — populated only when the
-            # "combine extender + whip" setting is on (pos ≠ neg on offset trackers,
-            # so these cannot use the symmetric whips_by_length bucket).
-            'whips_pos_by_length': defaultdict(int),
-            'whips_neg_by_length': defaultdict(int),
-            'whips_pos_by_length_per_device': {},
-            'whips_neg_by_length_per_device': {},
-            'extenders_pos_by_length': defaultdict(int),
-            'extenders_neg_by_length': defaultdict(int),
-            'extenders_pos_by_length_per_device': {},
-            'extenders_neg_by_length_per_device': {},
-            'total_whip_length': 0,
-            'dc_feeder_total_ft': 0,
-            'dc_feeder_count': 0,
-            'ac_homerun_total_ft': 0,
-            'ac_homerun_count': 0,
-            # Trunk Bus items
-            'trunk_cable_by_size': defaultdict(float),
-            'lbd_by_size': defaultdict(int),
-            'ipc_by_tap': defaultdict(int),
-        }
-        
-        # Topology and strings-per-inverter (used throughout calculation)
-        topology = self.topology_var.get()
-        
-        if topology == 'Central Inverter':
-            # For Central Inverter, allocation groups = CBs.
-            # Compute strings_per_cb from library BEFORE allocation runs.
-            _central_inv_breaker = self._compute_dc_breaker_size()
-            strings_per_inv = 0  # Will be set after we know module_isc
-        else:
-            strings_per_inv = self._get_int_var(self.strings_per_inverter_var, 0)
-        
-        # Validate — all groups must have row spacing set
-        unset_groups = [g.get('name', f'Group {i+1}') for i, g in enumerate(self.groups) if not self._group_row_spacing_set(g)]
-        if unset_groups:
-            if not silent:
-                messagebox.showwarning(
-                    "Row Spacing Required",
-                    "Row spacing is not set for the following group(s):\n\n" +
-                    "\n".join(f"  • {n}" for n in unset_groups) +
-                    "\n\nPlease enter a row spacing before calculating."
-                )
-            return
-
-        # Validate — inverter must be assigned
-        if not self.selected_inverter:
-            if not silent:
-                messagebox.showwarning(
-                    "No Inverter Selected",
-                    "No inverter is assigned to this estimate.\n\n"
-                    "Go to Equipment → Inverters, right-click an inverter, and assign it to this estimate."
-                )
-            return
 
-        # Validate — need at least one linked template or a legacy fallback module
+        # Strings/device is read before module derivation, which may rewrite it
+        inputs = self._estimate_inputs()
         self._derive_module_from_templates()
-        lv_method = self.lv_collection_var.get() if hasattr(self, 'lv_collection_var') else 'Wire Harness'
-        if not self.selected_module:
+        inputs['modules_per_string'] = self.modules_per_string_var.get()
+
+        engine = self._estimate_engine(inputs)
+        try:
+            totals = engine.calculate()
+        except EstimateValidationError as e:
             if not silent:
-                messagebox.showwarning(
-                    "No Module Available",
-                    "No tracker templates are linked and no legacy module data was found.\n\n"
-                    "Please link a tracker template to at least one segment before calculating."
-                )
+                messagebox.showwarning(e.title, str(e))
             return
-        
-        # ==================== Build tracker sequence from groups ====================
-        try:
-            modules_per_string = int(self.modules_per_string_var.get())
-        except ValueError:
-            modules_per_string = 28
-
-        tracker_sequence = []
-        total_all_trackers = 0
-        total_all_strings = 0
-        total_all_harnesses = 0
-        max_harness_strings = 0
-        self._tracker_to_segment = []
-        
-        # Track unique modules across all groups
-        unique_modules = {}  # "Manufacturer Model (WattageW)" -> module_spec_dict
-        
-        # Per-segment module data for geometry calculations
-        segment_module_data = []  # list of {module_spec_dict, modules_per_string, qty, spt}
-
-        for group in self.groups:
-            for seg in group['segments']:
-                qty = seg['quantity']
-                spt = seg['strings_per_tracker']
-                harness_config = self._get_effective_harness_config(seg)
-
-                if qty <= 0:
-                    continue
-                
-                # Resolve module from template
-                seg_module = None
-                seg_mps = modules_per_string
-                ref = seg.get('template_ref')
-                if ref and ref in self.enabled_templates:
-                    tdata = self.enabled_templates[ref]
-                    seg_module = tdata.get('module_spec', {})
-                    seg_mps = tdata.get('modules_per_string', modules_per_string)
-                    
-                    # Track unique modules
-                    mod_key = f"{seg_module.get('manufacturer', '?')} {seg_module.get('model', '?')} ({seg_module.get('wattage', '?')}W)"
-                    if mod_key not in unique_modules:
-                        unique_modules[mod_key] = seg_module
-                
-                segment_module_data.append({
-                    'module_spec': seg_module,
-                    'modules_per_string': seg_mps,
-                    'qty': qty,
-                    'spt': spt
-                })
-
-                # Determine if this segment has partial strings
-                full_spt = int(spt)
-                has_partial = (spt != full_spt)
-                
-                # Add to flat tracker sequence (one entry per physical tracker)
-                # For partial-string trackers, pair adjacent trackers:
-                #   Left of pair: full_spt + 1 (owns the shared string)
-                #   Right of pair: full_spt
-                #   Unpaired odd tracker: full_spt (half-string not counted)
-                num_pairs = qty // 2 if has_partial else 0
-                unpaired = qty % 2 if has_partial else 0
-                
-                for i in range(qty):
-                    if has_partial:
-                        if i % 2 == 0 and i + 1 < qty:
-                            effective_spt = full_spt + 1  # Left of pair — owns shared string
-                        elif i % 2 == 1:
-                            effective_spt = full_spt  # Right of pair
-                        else:
-                            effective_spt = full_spt  # Unpaired odd tracker
-                    else:
-                        effective_spt = spt
-                    
-                    tracker_sequence.append(effective_spt)
-                    self._tracker_to_segment.append({
-                        'group_idx': self.groups.index(group),
-                        'seg': seg,
-                        'device_position': group.get('device_position', 'middle'),
-                    })
-
-                total_all_trackers += qty
-                if has_partial:
-                    total_all_strings += full_spt * qty + num_pairs  # Only paired halves count
-                else:
-                    total_all_strings += qty * spt
-
-                # Count trackers by effective string count
-                if has_partial:
-                    num_pairs_count = qty // 2
-                    # Left of pair
-                    left_spt = full_spt + 1
-                    totals['trackers_by_string'][left_spt] += num_pairs_count
-                    # Right of pair + any unpaired
-                    right_count = num_pairs_count + (qty % 2)
-                    totals['trackers_by_string'][full_spt] += right_count
-                else:
-                    totals['trackers_by_string'][spt] += qty
-
-                # Count harnesses by size (skip for Trunk Bus — no harnesses)
-                if lv_method != 'Trunk Bus':
-                    harness_sizes = self.parse_harness_config(harness_config)
-                    for size in harness_sizes:
-                        if size > max_harness_strings:
-                            max_harness_strings = size
-                        totals['harnesses_by_size'][size] += qty
-                        total_all_harnesses += qty
-
-                # Count inline fuses (Wire Harness only, positive side, size >= 2)
-                if lv_method == 'Wire Harness':
-                    for size in harness_sizes:
-                        if size >= 2:
-                            fuse_rating = self._calc_inline_fuse_rating(seg_module)
-                            totals['inline_fuses_by_rating'][fuse_rating] += size * qty
-        
-        # Build harness-count-per-spt lookup for whip calculation
-        harness_count_by_spt = {}
-        harness_sizes_by_spt = {}
-        for group in self.groups:
-            for seg in group['segments']:
-                spt = seg['strings_per_tracker']
-                if spt not in harness_count_by_spt:
-                    harness_sizes = self._get_harness_sizes(seg)
-                    harness_count_by_spt[spt] = len(harness_sizes)
-                    harness_sizes_by_spt[spt] = harness_sizes
-
-        # Build per-tracker harness sizes (indexed by global tracker index)
-        # This handles segments with same SPT but different harness configs
-        tracker_harness_sizes_list = []
-        for group in self.groups:
-            for seg in group['segments']:
-                harness_sizes = self._get_harness_sizes(seg)
-                for _ in range(seg['quantity']):
-                    tracker_harness_sizes_list.append(list(harness_sizes))
 
-        # Warn about unpaired partial strings
-        unpaired_warnings = []
-        for group in self.groups:
-            for seg in group['segments']:
-                seg_spt = seg['strings_per_tracker']
-                if seg_spt != int(seg_spt) and seg['quantity'] % 2 != 0:
-                    ref = seg.get('template_ref', 'Unlinked')
-                    unpaired_warnings.append(f"{group['name']}: {seg['quantity']}x {seg_spt}S has 1 unpaired half-string")
-        
-        if unpaired_warnings:
-            messagebox.showwarning(
-                "Unpaired Partial Strings",
-                "The following segments have an odd number of partial-string trackers, "
-                "leaving half-strings unpaired:\n\n" + "\n".join(unpaired_warnings)
-            )
-
-        # ==================== Module geometry (primary module for global calcs) ====================
-        module_isc = self.selected_module.isc
-        nec_factor = 1.56
-        if self.current_project:
-            nec_factor = getattr(self.current_project, 'nec_safety_factor', 1.56)
-        module_width_mm = self.selected_module.width_mm
-        module_width_ft = module_width_mm / 304.8
-        string_length_ft = module_width_ft * modules_per_string
-
-        # ==================== Build spatial tracker entries ====================
-        fallback_width_ft = 6.0
-        fallback_length_ft = 180.0
+        # Per-tracker working state read by the site preview, exports and diagnostics
+        self._tracker_to_segment = engine._tracker_to_segment
+        self._split_tracker_details = engine._split_tracker_details
+        self._tracker_ns_to_device = engine._tracker_ns_to_device
 
-        tracker_entries = []
-        flat_idx = 0
-        auto_x_cursor = 0.0  # Running X for auto-layout
-
-        for group in self.groups:
-            saved_x = group.get('position_x')
-            saved_y = group.get('position_y')
+        for title, message in engine.warnings:
+            messagebox.showwarning(title, message)
 
-            if saved_x is not None and saved_y is not None:
-                group_x = saved_x
-                group_y = saved_y
-            else:
-                # Auto-layout: stack groups left-to-right at y=0
-                group_x = auto_x_cursor
-                group_y = 0.0
-
-            grp_row_spacing = group.get('row_spacing_ft', 20.0)
-
-            # Compute group reference motor Y (same as SitePreviewWindow uses)
-            # This is the motor_y of the FIRST segment's template in the group
-            group_ref_motor_y_ft = 0.0
-            for seg in group['segments']:
-                ref_check = seg.get('template_ref')
-                if ref_check and ref_check in self.enabled_templates:
-                    tdata_check = self.enabled_templates[ref_check]
-                    if tdata_check.get('has_motor', True):
-                        # Compute this template's motor_y using same logic
-                        ms_c = tdata_check.get('module_spec', {})
-                        orient_c = tdata_check.get('module_orientation', 'Portrait')
-                        mps_c = tdata_check.get('modules_per_string', 28)
-                        spacing_c = tdata_check.get('module_spacing_m', 0.02)
-                        placement_c = tdata_check.get('motor_placement_type', 'between_strings')
-                        pos_after_c = tdata_check.get('motor_position_after_string', None)
-                        str_idx_c = tdata_check.get('motor_string_index', None)
-                        split_n_c = tdata_check.get('motor_split_north', mps_c // 2)
-                        mod_along_c = (ms_c.get('width_mm', 1000) if orient_c == 'Portrait' else ms_c.get('length_mm', 2000)) / 1000
-                        
-                        # Partial string on north adds offset
-                        spt_c = tdata_check.get('strings_per_tracker', 1)
-                        partial_north_m_c = 0
-                        if spt_c != int(spt_c) and tdata_check.get('partial_string_side', 'north') == 'north':
-                            partial_north_mods_c = round((spt_c - int(spt_c)) * mps_c)
-                            partial_north_m_c = partial_north_mods_c * (mod_along_c + spacing_c)
-                        
-                        if placement_c == 'between_strings':
-                            p = pos_after_c if pos_after_c is not None else (str_idx_c if str_idx_c is not None else 1)
-                            mn = p * mps_c
-                            motor_y_m = partial_north_m_c + (mn * mod_along_c + (mn - 1) * spacing_c + spacing_c) if mn > 0 else 0.0
-                            group_ref_motor_y_ft = motor_y_m * 3.28084
-                        elif placement_c == 'middle_of_string':
-                            s = str_idx_c if str_idx_c is not None else 1
-                            mb = (s - 1) * mps_c + split_n_c
-                            motor_y_m = partial_north_m_c + (mb * mod_along_c + (mb - 1) * spacing_c + spacing_c)
-                            group_ref_motor_y_ft = motor_y_m * 3.28084
-                        break  # Use first template's motor as reference
-
-            # Driveline angle for this group
-            driveline_angle_deg = group.get('driveline_angle', 0.0)
-            driveline_tan = math.tan(math.radians(driveline_angle_deg)) if driveline_angle_deg != 0 else 0.0
-
-            # Build tracker entries left-to-right across all segments
-            tracker_within_group = 0
-            for seg in group['segments']:
-                qty = seg['quantity']
-                spt = seg['strings_per_tracker']
-                if qty <= 0:
-                    continue
-
-                ref = seg.get('template_ref')
-                dims = self._get_estimate_tracker_dims_ft(ref)
-                t_length = dims[1] if dims else fallback_length_ft
-
-                full_spt = int(spt)
-                has_partial = (spt != full_spt)
-
-                for i in range(qty):
-                    if has_partial:
-                        if i % 2 == 0 and i + 1 < qty:
-                            effective_spt = full_spt + 1
-                        else:
-                            effective_spt = full_spt
-                    else:
-                        effective_spt = int(spt)
-
-                    local_x_offset = tracker_within_group * grp_row_spacing
-                    tracker_entries.append({
-                        'original_idx': flat_idx,
-                        'spt': effective_spt,
-                        'x': group_x + local_x_offset,
-                        'y': group_y + local_x_offset * driveline_tan,
-                        'length_ft': t_length,
-                        'motor_y_ft': group_ref_motor_y_ft,
-                        'row_spacing_ft': grp_row_spacing,
-                    })
-                    flat_idx += 1
-                    tracker_within_group += 1
-
-            group_width = tracker_within_group * grp_row_spacing
-            auto_x_cursor += group_width + grp_row_spacing * 2  # Extra gap between groups
-
-        # For Central Inverter, compute strings_per_cb from library now that we have module_isc
-        if topology == 'Central Inverter':
-            _ci_fuse_current = module_isc * nec_factor * max(max_harness_strings, 1)
-            _ci_fuse_rating = self.get_fuse_holder_category(_ci_fuse_current)
-            _ci_library = self.load_combiner_library()
-            _ci_matching = [
-                cb for cb in _ci_library.values()
-                if (cb.get('breaker_size', 0) == _central_inv_breaker and
-                    cb.get('fuse_holder_rating', '') == _ci_fuse_rating)
-            ]
-            if _ci_matching:
-                _ci_matching.sort(key=lambda c: c.get('max_inputs', 0), reverse=True)
-                _ci_max_inputs = _ci_matching[0].get('max_inputs', 24)
-            else:
-                _ci_max_inputs = 24
-            
-            # User's Strings/CB input is authoritative. The library max-inputs
-            # value is only used as a default when the field is empty — never
-            # as a cap on user input. If the user picks a number that no real
-            # CB part supports, the BOM will surface that as a "NO MATCH" row.
-            user_strings_per_cb = self._get_int_var(self.strings_per_inverter_var, 0)
-            if user_strings_per_cb > 0:
-                strings_per_inv = user_strings_per_cb
-            else:
-                # No user input — default to library max
-                strings_per_inv = _ci_max_inputs
-                self._updating_spi = True
-                self.strings_per_inverter_var.set(str(strings_per_inv))
-                self._updating_spi = False
-
-        # ==================== Allocation ====================
-        allocation_result = None
-
-        if self.selected_inverter and strings_per_inv > 0 and total_all_strings > 0:
-            if self.allocation_locked and self.locked_allocation_result is not None:
-                # Use the locked (frozen) allocation — skip spatial recalculation
-                allocation_result = self.locked_allocation_result
-                spatial_runs = allocation_result.get('spatial_runs', 1)
-            elif tracker_entries:
-                # Build per-group entry slices first so we can combine linked groups.
-                per_group_entries = []
-                flat_offset = 0
-                for group in self.groups:
-                    grp_count = sum(seg['quantity'] for seg in group['segments'])
-                    per_group_entries.append(tracker_entries[flat_offset:flat_offset + grp_count])
-                    flat_offset += grp_count
-
-                # Group indices by link_id; standalone groups each get their own bucket.
-                link_buckets = {}   # link_id -> [grp_idx, ...]
-                standalone = []     # [grp_idx, ...]
-                for gi, g in enumerate(self.groups):
-                    lid = g.get('link_id')
-                    if lid:
-                        link_buckets.setdefault(lid, []).append(gi)
-                    else:
-                        standalone.append(gi)
-
-                merged_inverters = []
-                num_spatial_runs = 0
-
-                # Allocate standalone groups individually.
-                for gi in standalone:
-                    g = self.groups[gi]
-                    grp_entries = per_group_entries[gi]
-                    grp_spi = g.get('strings_per_inv') or strings_per_inv
-                    grp_pitch = g.get('row_spacing_ft', 20.0) or 20.0
-                    if grp_entries and grp_spi > 0:
-                        grp_result = allocate_strings_spatial(
-                            grp_entries, grp_spi, grp_pitch,
-                            force_single_row=False)
-                        merged_inverters.extend(grp_result.get('inverters', []))
-                        num_spatial_runs += grp_result.get('spatial_runs', 1)
-
-                # Allocate linked groups together — one allocation per pool.
-                for lid, grp_indices in link_buckets.items():
-                    combined_entries = []
-                    for gi in grp_indices:
-                        combined_entries.extend(per_group_entries[gi])
-                    if not combined_entries:
-                        continue
-                    # Use the first linked group's strings_per_inv override, fall back to global.
-                    primary_g = self.groups[grp_indices[0]]
-                    pool_spi = primary_g.get('strings_per_inv') or strings_per_inv
-                    pool_pitch = primary_g.get('row_spacing_ft', 20.0) or 20.0
-                    pool_result = allocate_strings_spatial(
-                        combined_entries, pool_spi, pool_pitch,
-                        force_single_row=True)
-                    merged_inverters.extend(pool_result.get('inverters', []))
-                    num_spatial_runs += pool_result.get('spatial_runs', 1)
-
-                if merged_inverters:
-                    # Build merged summary
-                    total_inv_strings = sum(inv['total_strings'] for inv in merged_inverters)
-                    split_tidxs = set()
-                    for inv in merged_inverters:
-                        for entry in inv.get('harness_map', []):
-                            if entry.get('is_split'):
-                                split_tidxs.add(entry['tracker_idx'])
-                    total_split = len(split_tidxs)
-                    inv_sizes = [inv['total_strings'] for inv in merged_inverters]
-                    allocation_result = {
-                        'inverters': merged_inverters,
-                        'spatial_runs': num_spatial_runs,
-                        'summary': {
-                            'total_inverters': len(merged_inverters),
-                            'total_strings': total_inv_strings,
-                            'total_trackers': len(tracker_entries),
-                            'total_split_trackers': total_split,
-                            'max_strings_per_inverter': max(inv_sizes) if inv_sizes else 0,
-                            'min_strings_per_inverter': min(inv_sizes) if inv_sizes else 0,
-                            'num_larger_inverters': 0,
-                            'num_smaller_inverters': 0,
-                            'tracker_type_counts': {},
-                        }
-                    }
-                    spatial_runs = num_spatial_runs
-                else:
-                    allocation_result = allocate_strings_sequential(tracker_sequence, strings_per_inv)
-                    spatial_runs = 1
-
-            module_wattage = self.selected_module.wattage
-            # Use site-level DC:AC (total DC power / total AC capacity)
-            total_alloc_strings = allocation_result['summary']['total_strings']
-            total_alloc_invs = allocation_result['summary']['total_inverters']
-
-            # Sum modules and DC capacity per-module-type so multi-module projects
-            # don't apply a single mps/wattage across strings of different module types.
-            _total_modules_sum = 0
-            _total_dc_w = 0.0
-            for _grp in self.groups:
-                for _seg in _grp.get('segments', []):
-                    _ref = _seg.get('template_ref')
-                    _qty = _seg.get('quantity', 0)
-                    _spt = _seg.get('strings_per_tracker', 1)
-                    if not (_ref and _ref in self.enabled_templates and _qty > 0):
-                        continue
-                    _td = self.enabled_templates[_ref]
-                    _mps = _td.get('modules_per_string', 28)
-                    _w = _td.get('module_spec', {}).get('wattage', module_wattage)
-                    _full_spt = int(_spt)
-                    if _spt != _full_spt:
-                        _ss = _full_spt * _qty + (_qty // 2)
-                    else:
-                        _ss = _qty * _full_spt
-                    _seg_modules = _ss * _mps
-                    _total_modules_sum += _seg_modules
-                    _total_dc_w += _seg_modules * _w
-            total_dc_kw = _total_dc_w / 1000
-            total_ac_kw = 0.0
-
-            if topology == 'Central Inverter':
-                # For Central Inverter, allocation groups are CBs, not inverters.
-                # DC:AC uses the user-specified central inverter count.
-                central_inv_count = self._get_int_var(self.central_inv_count_var, 1)
-                total_ac_kw = central_inv_count * self.selected_inverter.rated_power_kw
-                actual_dc_ac = round(total_dc_kw / total_ac_kw, 3) if total_ac_kw > 0 else 0.0
-            else:
-                if total_alloc_invs > 0:
-                    total_ac_kw = total_alloc_invs * self.selected_inverter.rated_power_kw
-                    actual_dc_ac = round(total_dc_kw / total_ac_kw, 3)
-                else:
-                    actual_dc_ac = 0.0         
-
-            if topology == 'Central Inverter':
-                totals['string_inverters'] = self._get_int_var(self.central_inv_count_var, 1)
-            else:
-                totals['string_inverters'] = allocation_result['summary']['total_inverters']
-            # Recount split trackers by unique tracker_idx (avoids double-counting)
-            _split_tidxs = set()
-            for _inv in allocation_result.get('inverters', []):
-                for _entry in _inv.get('harness_map', []):
-                    if _entry.get('is_split'):
-                        _split_tidxs.add(_entry['tracker_idx'])
-            _true_split_count = len(_split_tidxs)
-            
-            totals['inverter_summary'] = {
-                'strings_per_inverter': strings_per_inv,
-                'total_inverters': allocation_result['summary']['total_inverters'],
-                'total_split_trackers': _true_split_count,
-                'total_strings': allocation_result['summary']['total_strings'],
-                'actual_dc_ac': actual_dc_ac,
-                'allocation_result': allocation_result,
-                'allocations': [],  # Backward compat
-                'central_inverter_count': self._get_int_var(self.central_inv_count_var, 1) if topology == 'Central Inverter' else 0,
-            }
-            totals['total_dc_kw'] = round(total_dc_kw, 2)
-            totals['total_ac_kw'] = round(total_ac_kw, 2)
-            totals['total_modules'] = _total_modules_sum
-
-            # For Central Inverter, update device/combiner count from allocation
-            # (allocation respects group boundaries, may differ from library estimate)
-            if topology == 'Central Inverter':
-                num_combiners = allocation_result['summary']['total_inverters']
-                num_devices = num_combiners
-
-        # ==================== Topology-driven device & combiner counting ===================
-
-        total_inverters_count = totals.get('inverter_summary', {}).get('total_inverters', 0)
-        num_devices = 0
-        num_combiners = 0
-        strings_per_cb = 0
-
-        # Breaker size derived from inverter MPPT
-        breaker_size = self._compute_dc_breaker_size()
-
-        if topology == 'Distributed String':
-            num_devices = total_inverters_count
-
-        elif topology == 'Centralized String':
-            num_devices = total_inverters_count
-            num_combiners = total_inverters_count
-            strings_per_cb = strings_per_inv
-
-        elif topology == 'Central Inverter':
-            if lv_method == 'Trunk Bus':
-                # Trunk Bus: allocation groups = LBDs, not combiner boxes.
-                # num_devices is still needed for DC feeder distance calc.
-                if totals.get('inverter_summary', {}).get('allocation_result'):
-                    num_devices = totals['inverter_summary']['allocation_result']['summary']['total_inverters']
-                # Do NOT populate combiners_by_breaker — no combiner boxes for Trunk Bus.
-            else:
-                # CB count from library: target breaker + fuse holder rating → max inputs
-                fuse_current = module_isc * nec_factor * max(max_harness_strings, 1)
-                fuse_holder_rating = self.get_fuse_holder_category(fuse_current)
-                combiner_library = self.load_combiner_library()
-
-                matching_cbs = [
-                    cb_data for cb_data in combiner_library.values()
-                    if (cb_data.get('breaker_size', 0) == breaker_size and
-                        cb_data.get('fuse_holder_rating', '') == fuse_holder_rating)
-                ]
-
-                if matching_cbs:
-                    matching_cbs.sort(key=lambda c: c.get('max_inputs', 0), reverse=True)
-                    max_inputs_per_cb = matching_cbs[0].get('max_inputs', 24)
-                else:
-                    max_inputs_per_cb = 24  # fallback
-
-                if total_all_strings > 0:
-                    num_combiners = math.ceil(total_all_strings / max_inputs_per_cb)
-                    strings_per_cb = math.ceil(total_all_strings / num_combiners)
-                # Allocation may produce more CBs due to group boundaries.
-                # Update num_combiners from allocation if available.
-                if totals.get('inverter_summary', {}).get('allocation_result'):
-                    num_combiners = totals['inverter_summary']['allocation_result']['summary']['total_inverters']
-                num_devices = num_combiners
-
-        # Preliminary combiner count (used for DC feeder/AC homerun distance calc)
-        # Actual CB part matching is done later via Device Configurator or fallback
-        # For Central Inverter, post-allocation block sets the authoritative count.
-        if num_combiners > 0 and topology != 'Central Inverter':
-            if breaker_size not in totals['combiners_by_breaker']:
-                totals['combiners_by_breaker'][breaker_size] = 0
-            totals['combiners_by_breaker'][breaker_size] += num_combiners
-
-        # ==================== Harness split adjustment ====================
-        # For now it's a no-op since allocations=[] above.
-        self._adjust_harnesses_for_splits(totals)
-
-        # Adjust inline fuse counts for split trackers to match harness adjustments
-        if lv_method == 'Wire Harness' and self._split_tracker_details:
-            _tsm = getattr(self, '_tracker_to_segment', [])
-            for tidx, split_info in self._split_tracker_details.items():
-                _seg_module = None
-                if tidx < len(_tsm):
-                    _seg = _tsm[tidx].get('seg')
-                    if _seg:
-                        _ref = _seg.get('template_ref')
-                        if _ref and _ref in self.enabled_templates:
-                            _seg_module = self.enabled_templates[_ref].get('module_spec')
-                _fuse_rating = self._calc_inline_fuse_rating(_seg_module)
-                for size in split_info['original_config']:
-                    if size >= 2:
-                        totals['inline_fuses_by_rating'][_fuse_rating] -= size
-                for portion in split_info['portions']:
-                    for size in portion['harnesses']:
-                        if size >= 2:
-                            totals['inline_fuses_by_rating'][_fuse_rating] += size
-            # Clean up zero/negative entries
-            zero_keys = [r for r, v in totals['inline_fuses_by_rating'].items() if v <= 0]
-            for r in zero_keys:
-                del totals['inline_fuses_by_rating'][r]
-
-        # ==================== Trunk Bus calculation ====================
-        if lv_method == 'Trunk Bus' and allocation_result:
-            from src.utils.cable_sizing import recommend_trunk_cable_size, select_lbd_size
-            
-            for inv_data in allocation_result.get('inverters', []):
-                block_strings = inv_data['total_strings']
-                if block_strings <= 0:
-                    continue
-                
-                # Count trackers in this LBD block
-                block_tracker_indices = [ti for ti, _ in inv_data['tracker_indices']]
-                num_trackers_in_block = len(block_tracker_indices)
-                
-                # Trunk cable length = (trackers - 1) × row_spacing
-                if num_trackers_in_block > 1:
-                    # Get row_spacing from tracker_entries for this block's trackers
-                    block_row_spacings = []
-                    for tidx in block_tracker_indices:
-                        if tidx < len(tracker_entries):
-                            block_row_spacings.append(tracker_entries[tidx].get('row_spacing_ft', 20.0))
-                    avg_row_spacing = sum(block_row_spacings) / len(block_row_spacings) if block_row_spacings else 20.0
-                    trunk_length_ft = (num_trackers_in_block - 1) * avg_row_spacing
-                else:
-                    trunk_length_ft = 0.0
-                
-                # Auto-size trunk cable
-                trunk_cable_size = recommend_trunk_cable_size(
-                    block_strings, module_isc, nec_factor
-                )
-                totals['trunk_cable_by_size'][trunk_cable_size] += trunk_length_ft
-                
-                # Auto-size LBD
-                lbd_size = select_lbd_size(block_strings, module_isc, nec_factor)
-                totals['lbd_by_size'][lbd_size] += 1
-                
-                # Count IPCs: 1 per tracker per polarity (×2), grouped by tap count
-                for tidx, strings_taken in inv_data['tracker_indices']:
-                    # Determine tap count: use strings_taken from this tracker
-                    # Auto-select: ≤2 strings → 2-tap, ≤4 strings → 4-tap
-                    if strings_taken <= 2:
-                        tap_count = 2
-                    else:
-                        tap_count = 4
-                    totals['ipc_by_tap'][tap_count] += 2  # pos + neg
-
-        # "Combine extender + whip into single whip" — fold each harness's extender
-        # leg into its whip so the takeoff has no extender line items and longer whips.
-        # Only active where whips actually run (not Trunk Bus, has trackers + devices);
-        # otherwise extenders are left untouched so no footage is silently dropped.
-        combine = self.wire_sizing_settings.get('combine_extender_whip', False)
-        combine_active = (combine and lv_method != 'Trunk Bus'
-                          and total_all_trackers > 0 and num_devices > 0)
-        # Recorded so diagnostics can relax the whip/extender invariants this
-        # feature intentionally breaks (no extenders, whips longer than E-W span).
-        totals['_combine_extender_whip'] = combine_active
-
-        # ==================== Whip calculation (skipped for Trunk Bus) ====================
-        if lv_method != 'Trunk Bus' and total_all_trackers > 0 and num_devices > 0:
-            whip_distances = self.calculate_whip_distances_from_positions(
-                allocation_result, topology, num_devices
-            )
-
-            split_details = getattr(self, '_split_tracker_details', {})
-            tracker_seg_map_whip = getattr(self, '_tracker_to_segment', [])
-            seen_whip_trackers = set()
-            
-            for entry in whip_distances:
-                if len(entry) == 4:
-                    distance_ft, spt, tidx, inv_idx = entry
-                else:
-                    distance_ft, spt = entry[0], entry[1]
-                    tidx, inv_idx = -1, -1
-                # Add NS leg of Manhattan whip when whip point has been manually positioned
-                if tidx >= 0 and inv_idx >= 0:
-                    ns_leg = self._whip_point_ns_legs.get(f"{tidx}:{inv_idx}", 0.0)
-                    distance_ft += ns_leg
-                whip_length = self.round_whip_length(distance_ft)
-                
-                if tidx in split_details:
-                    # Split tracker — collect ALL portions for this inv_idx
-                    # (a single inverter can own multiple portions when a harness
-                    #  straddles the split boundary)
-                    portion_harnesses = 0
-                    for portion in split_details[tidx]['portions']:
-                        if portion['inv_idx'] == inv_idx:
-                            portion_harnesses += len(portion['harnesses'])
-                    
-                    if portion_harnesses == 0:
-                        continue
-                    
-                    num_harnesses = portion_harnesses
-                else:
-                    # Non-split tracker — skip duplicates, use original harness count
-                    if tidx in seen_whip_trackers:
-                        debug_whip_skipped.append(f"T{tidx+1:02d} inv={inv_idx} DUPLICATE skipped")
-                        continue
-                    seen_whip_trackers.add(tidx)
-                    num_harnesses = harness_count_by_spt.get(spt, 1)
-                
-                # Determine individual harness sizes for wire gauge lookup
-                if tidx in split_details:
-                    # Collect harness sizes from ALL portions for this inv_idx
-                    ind_harness_sizes = []
-                    for portion in split_details[tidx]['portions']:
-                        if portion['inv_idx'] == inv_idx:
-                            ind_harness_sizes.extend(portion['harnesses'])
-                    if not ind_harness_sizes:
-                        ind_harness_sizes = split_details[tidx]['portions'][0]['harnesses']
-                else:
-                    if tidx < len(tracker_harness_sizes_list):
-                        ind_harness_sizes = tracker_harness_sizes_list[tidx]
-                    else:
-                        ind_harness_sizes = harness_sizes_by_spt.get(spt, [spt])
-                
-                if not combine_active:
-                    for h_str_count in ind_harness_sizes:
-                        gauge = self.get_wire_size_for('whip', h_str_count)
-                        key = (whip_length, gauge)
-                        totals['whips_by_length'][key] += 2  # pos + neg
-                        totals['total_whip_length'] += whip_length * 2
-                        totals.setdefault('whips_by_length_per_device', {})
-                        per_dev = totals['whips_by_length_per_device'].setdefault(inv_idx, {})
-                        per_dev[key] = per_dev.get(key, 0) + 2
-                elif tidx < 0 or tidx >= len(tracker_seg_map_whip):
-                    # No tracker→segment mapping (e.g. no-allocation fallback): can't
-                    # pair with an extender, so keep the plain symmetric whip rather
-                    # than dropping the footage entirely.
-                    for h_str_count in ind_harness_sizes:
-                        gauge = self.get_wire_size_for('whip', h_str_count)
-                        key = (whip_length, gauge)
-                        totals['whips_by_length'][key] += 2  # pos + neg
-                        totals['total_whip_length'] += whip_length * 2
-                        totals.setdefault('whips_by_length_per_device', {})
-                        per_dev = totals['whips_by_length_per_device'].setdefault(inv_idx, {})
-                        per_dev[key] = per_dev.get(key, 0) + 2
-                else:
-                    # Combine mode: fold each harness's extender leg into its whip,
-                    # per polarity. Uses the FINAL whip distance (distance_ft, which
-                    # already includes any manual N-S leg) plus the FINAL extender pairs
-                    # (with any whip-point override applied), so a moved whip junction
-                    # nets out correctly. Combined whips carry the whip wire gauge.
-                    seg_info_c = tracker_seg_map_whip[tidx]
-                    seg_c = seg_info_c['seg']
-                    device_position_c = seg_info_c['device_position']
-                    wp_override_c = self._whip_point_overrides.get(f"{tidx}:{inv_idx}")
-                    if tidx in split_details:
-                        for portion in split_details[tidx]['portions']:
-                            if portion['inv_idx'] != inv_idx:
-                                continue
-                            ext_pairs_c = self.calculate_extender_lengths_per_segment(
-                                seg_c, device_position_c, portion.get('start_pos', 0),
-                                whip_point_override=wp_override_c,
-                                harness_sizes_override=portion['harnesses'])
-                            ph_c = portion['harnesses']
-                            for pair_idx, (pos_raw, neg_raw) in enumerate(ext_pairs_c):
-                                h_c = ph_c[pair_idx] if pair_idx < len(ph_c) else 1
-                                self._record_combined_whip(
-                                    totals, distance_ft, pos_raw, neg_raw, h_c, inv_idx)
-                    else:
-                        ext_pairs_c = self.calculate_extender_lengths_per_segment(
-                            seg_c, device_position_c, whip_point_override=wp_override_c)
-                        for pair_idx, (pos_raw, neg_raw) in enumerate(ext_pairs_c):
-                            h_c = ind_harness_sizes[pair_idx] if pair_idx < len(ind_harness_sizes) else 1
-                            self._record_combined_whip(
-                                totals, distance_ft, pos_raw, neg_raw, h_c, inv_idx)
-
-        split_details = getattr(self, '_split_tracker_details', {})
-        tracker_seg_map = getattr(self, '_tracker_to_segment', [])
-        
-        # Count how many split trackers exist per (group_idx, seg identity) so we can reduce bulk qty
-        split_tracker_seg_counts = {}  # (group_idx, id(seg)) -> count of split trackers
-        for tidx in split_details:
-            if tidx < len(tracker_seg_map):
-                info = tracker_seg_map[tidx]
-                key = (info['group_idx'], id(info['seg']))
-                split_tracker_seg_counts[key] = split_tracker_seg_counts.get(key, 0) + 1
-
-        # Build tracker-to-device and seg-to-trackers maps for per-device extender tagging
-        tracker_to_device_ext = {}
-        if allocation_result:
-            for _inv_idx_ext, _inv_ext in enumerate(allocation_result.get('inverters', [])):
-                for _tidx_ext, _ in _inv_ext.get('tracker_indices', []):
-                    tracker_to_device_ext[_tidx_ext] = _inv_idx_ext
-        trackers_by_seg_id = {}
-        for _tidx_ext, _info_ext in enumerate(tracker_seg_map):
-            trackers_by_seg_id.setdefault(id(_info_ext['seg']), []).append(_tidx_ext)
-
-        # Process non-split trackers in bulk (original logic minus split count).
-        # In combine mode these extenders are folded into whips above, so skip.
-        for group_idx, group in ([] if combine_active else enumerate(self.groups)):
-            device_position = group.get('device_position', 'middle')
-            for seg in group['segments']:
-                if seg['quantity'] <= 0:
-                    continue
-                
-                key = (group_idx, id(seg))
-                num_splits_in_seg = split_tracker_seg_counts.get(key, 0)
-                non_split_qty = seg['quantity'] - num_splits_in_seg
-                
-                if non_split_qty > 0:
-                    extender_pairs = self.calculate_extender_lengths_per_segment(seg, device_position)
-                    harness_sizes = self._get_harness_sizes(seg)
-                    for pair_idx, (pos_len, neg_len) in enumerate(extender_pairs):
-                        h_str_count = harness_sizes[pair_idx] if pair_idx < len(harness_sizes) else 1
-                        gauge = self.get_wire_size_for('extender', h_str_count)
-                        pos_rounded = self.round_whip_length(pos_len)
-                        neg_rounded = self.round_whip_length(neg_len)
-                        pos_key = (pos_rounded, gauge)
-                        neg_key = (neg_rounded, gauge)
-                        totals['extenders_pos_by_length'][pos_key] += non_split_qty
-                        totals['extenders_neg_by_length'][neg_key] += non_split_qty
-                    for _tidx_ns in [t for t in trackers_by_seg_id.get(id(seg), []) if t not in split_details]:
-                        _dev_ns = tracker_to_device_ext.get(_tidx_ns, -1)
-                        for pair_idx, (pos_len, neg_len) in enumerate(extender_pairs):
-                            h_str_count = harness_sizes[pair_idx] if pair_idx < len(harness_sizes) else 1
-                            gauge = self.get_wire_size_for('extender', h_str_count)
-                            pos_key = (self.round_whip_length(pos_len), gauge)
-                            neg_key = (self.round_whip_length(neg_len), gauge)
-                            _pd_pos = totals['extenders_pos_by_length_per_device'].setdefault(_dev_ns, {})
-                            _pd_neg = totals['extenders_neg_by_length_per_device'].setdefault(_dev_ns, {})
-                            _pd_pos[pos_key] = _pd_pos.get(pos_key, 0) + 1
-                            _pd_neg[neg_key] = _pd_neg.get(neg_key, 0) + 1
-
-        # Process split trackers individually — each portion gets its own extenders.
-        # In combine mode these are folded into whips above, so skip.
-        for tidx, details in ([] if combine_active else split_details.items()):
-            if tidx >= len(tracker_seg_map):
-                continue
-            
-            seg_info = tracker_seg_map[tidx]
-            seg = seg_info['seg']
-            device_position = seg_info['device_position']
-            
-            for portion in details['portions']:
-                string_offset = portion.get('start_pos', 0)
-                extender_pairs = self.calculate_extender_lengths_per_segment(
-                    seg, device_position, string_offset,
-                    harness_sizes_override=portion['harnesses'])
-                portion_harness_sizes = portion['harnesses']
-                
-                for pair_idx, (pos_len, neg_len) in enumerate(extender_pairs):
-                    h_str_count = portion_harness_sizes[pair_idx] if pair_idx < len(portion_harness_sizes) else 1
-                    gauge = self.get_wire_size_for('extender', h_str_count)
-                    pos_rounded = self.round_whip_length(pos_len)
-                    neg_rounded = self.round_whip_length(neg_len)
-                    pos_key = (pos_rounded, gauge)
-                    neg_key = (neg_rounded, gauge)
-                    totals['extenders_pos_by_length'][pos_key] += 1
-                    totals['extenders_neg_by_length'][neg_key] += 1
-                    per_dev_pos = totals['extenders_pos_by_length_per_device'].setdefault(portion['inv_idx'], {})
-                    per_dev_neg = totals['extenders_neg_by_length_per_device'].setdefault(portion['inv_idx'], {})
-                    per_dev_pos[pos_key] = per_dev_pos.get(pos_key, 0) + 1
-                    per_dev_neg[neg_key] = per_dev_neg.get(neg_key, 0) + 1
-
-        # Adjust extenders for trackers that have a user-set whip point override.
-        # Extenders are not affected by CB N-S position or device_position_overrides —
-        # only explicit _whip_point_overrides change extender lengths.
-        # In combine mode, whip-point overrides are already applied inside the
-        # combined-whip fold above, so this extender adjustment pass is skipped.
-        ns_offsets = getattr(self, '_tracker_ns_to_device', {})
-        if ns_offsets and not combine_active:
-            for (tidx, inv_idx), _signed_ns in ns_offsets.items():
-                wp_override = self._whip_point_overrides.get(f"{tidx}:{inv_idx}")
-
-                # Skip if no whip point override — base extenders are already correct
-                if wp_override is None:
-                    continue
-
-                if tidx >= len(tracker_seg_map):
-                    continue
-
-                seg_info = tracker_seg_map[tidx]
-                seg = seg_info['seg']
-                device_position = seg_info['device_position']  # layout-assigned, not CB-position-derived
-
-                if tidx in split_details:
-                    for portion in split_details[tidx]['portions']:
-                        if portion['inv_idx'] != inv_idx:
-                            continue
-                        string_offset = portion.get('start_pos', 0)
-                        h_override = portion['harnesses']
-
-                        # Base extenders — original device_position, no whip point override
-                        base_pairs = self.calculate_extender_lengths_per_segment(
-                            seg, device_position, string_offset,
-                            harness_sizes_override=h_override)
-                        # Adjusted extenders — same device_position, with whip point override applied
-                        adjusted_pairs = self.calculate_extender_lengths_per_segment(
-                            seg, device_position, string_offset,
-                            whip_point_override=wp_override,
-                            harness_sizes_override=h_override)
-                        portion_harness_sizes = portion['harnesses']
-
-                        for pair_idx in range(len(base_pairs)):
-                            h_str_count = portion_harness_sizes[pair_idx] if pair_idx < len(portion_harness_sizes) else 1
-                            gauge = self.get_wire_size_for('extender', h_str_count)
-                            # Remove base
-                            base_pos, base_neg = base_pairs[pair_idx]
-                            old_pos_key = (self.round_whip_length(base_pos), gauge)
-                            old_neg_key = (self.round_whip_length(base_neg), gauge)
-                            totals['extenders_pos_by_length'][old_pos_key] -= 1
-                            totals['extenders_neg_by_length'][old_neg_key] -= 1
-                            # Add adjusted
-                            adj_pos, adj_neg = adjusted_pairs[pair_idx]
-                            new_pos_key = (self.round_whip_length(adj_pos), gauge)
-                            new_neg_key = (self.round_whip_length(adj_neg), gauge)
-                            totals['extenders_pos_by_length'][new_pos_key] += 1
-                            totals['extenders_neg_by_length'][new_neg_key] += 1
-                            per_dev_pos = totals['extenders_pos_by_length_per_device'].setdefault(inv_idx, {})
-                            per_dev_neg = totals['extenders_neg_by_length_per_device'].setdefault(inv_idx, {})
-                            per_dev_pos[old_pos_key] = per_dev_pos.get(old_pos_key, 0) - 1
-                            per_dev_neg[old_neg_key] = per_dev_neg.get(old_neg_key, 0) - 1
-                            per_dev_pos[new_pos_key] = per_dev_pos.get(new_pos_key, 0) + 1
-                            per_dev_neg[new_neg_key] = per_dev_neg.get(new_neg_key, 0) + 1
-                else:
-                    # Non-split tracker
-                    base_pairs = self.calculate_extender_lengths_per_segment(
-                        seg, device_position)
-                    adjusted_pairs = self.calculate_extender_lengths_per_segment(
-                        seg, device_position, whip_point_override=wp_override)
-                    harness_sizes = self._get_harness_sizes(seg)
-
-                    for pair_idx in range(len(base_pairs)):
-                        h_str_count = harness_sizes[pair_idx] if pair_idx < len(harness_sizes) else 1
-                        gauge = self.get_wire_size_for('extender', h_str_count)
-                        # Remove base
-                        base_pos, base_neg = base_pairs[pair_idx]
-                        old_pos_key = (self.round_whip_length(base_pos), gauge)
-                        old_neg_key = (self.round_whip_length(base_neg), gauge)
-                        totals['extenders_pos_by_length'][old_pos_key] -= 1
-                        totals['extenders_neg_by_length'][old_neg_key] -= 1
-                        # Add adjusted
-                        adj_pos, adj_neg = adjusted_pairs[pair_idx]
-                        new_pos_key = (self.round_whip_length(adj_pos), gauge)
-                        new_neg_key = (self.round_whip_length(adj_neg), gauge)
-                        totals['extenders_pos_by_length'][new_pos_key] += 1
-                        totals['extenders_neg_by_length'][new_neg_key] += 1
-                        per_dev_pos = totals['extenders_pos_by_length_per_device'].setdefault(inv_idx, {})
-                        per_dev_neg = totals['extenders_neg_by_length_per_device'].setdefault(inv_idx, {})
-                        per_dev_pos[old_pos_key] = per_dev_pos.get(old_pos_key, 0) - 1
-                        per_dev_neg[old_neg_key] = per_dev_neg.get(old_neg_key, 0) - 1
-                        per_dev_pos[new_pos_key] = per_dev_pos.get(new_pos_key, 0) + 1
-                        per_dev_neg[new_neg_key] = per_dev_neg.get(new_neg_key, 0) + 1
-
-            # Clean up any zero-count entries
-            for key_dict in [totals['extenders_pos_by_length'], totals['extenders_neg_by_length']]:
-                zero_keys = [k for k, v in key_dict.items() if v <= 0]
-                for k in zero_keys:
-                    del key_dict[k]
-
-        # ==================== DC Feeder and AC Homerun ====================
-        # DC feeder avg is 0 when no pads exist (routed distances will be used when pads present)
-        dc_feeder_avg_ft = 0.0
-        ac_homerun_avg_ft = self._get_float_var(self.ac_homerun_distance_var, 50.0)
-
-        total_inverters = totals.get('inverter_summary', {}).get('total_inverters', 0)
-        total_combiners = sum(totals['combiners_by_breaker'].values())
-
-        # Default feeder size for devices without a per-device override
-        if topology == 'Distributed String':
-            default_feeder_size = self.wire_sizing.get('ac_homerun', '') or '4/0 AWG'
-        else:
-            default_feeder_size = self.wire_sizing.get('dc_feeder', '') or '4/0 AWG'
-
-        use_routed = bool(self.pads)
+        if engine.strings_per_device_defaulted is not None:
+            self._updating_spi = True
+            self.strings_per_inverter_var.set(str(engine.strings_per_device_defaulted))
+            self._updating_spi = False
 
-        # Build per-device distance list: [(dev_idx, label, distance_ft), ...]
-        per_device_distances = []
-        
-        if use_routed and self.pads and allocation_result:
-            try:
-                routed = self.calculate_routed_feeder_distances(
-                    allocation_result, topology, min((g.get('row_spacing_ft', 20.0) for g in self.groups), default=20.0)
-                )
-            except Exception as e:
-                print(f"[Routed distance error] {e}")
-                import traceback
-                traceback.print_exc()
-                routed = {'feeder_distances': [], 'feeder_total_ft': 0, 'feeder_count': 0}
-            
-            per_device_distances = routed['feeder_distances']  # already (dev_idx, label, ft)
-            totals['routed_feeder_details'] = routed['feeder_distances']
-        else:
-            # Build per-device using average distance
-            if topology == 'Distributed String':
-                num_feeders = total_inverters
-                avg_ft = ac_homerun_avg_ft
-            else:
-                num_feeders = total_combiners
-                avg_ft = dc_feeder_avg_ft
-            per_device_distances = [(i, f"Dev-{i+1:02d}", avg_ft) for i in range(num_feeders)]
-        
-        # Group primary device-to-pad cable by (per-device feeder size, parallel count)
-        # - 'count'       = number of physical runs (devices)
-        # - 'distance_ft' = sum of raw run distances (not multiplied) — used for avg display
-        # - 'total_ft'    = distance_ft × parallel_count (actual cable footage needed)
-        if topology == 'Distributed String':
-            parallel_count = max(1, self.wire_sizing.get('ac_homerun_parallel', 1))
-        else:
-            parallel_count = max(1, self.wire_sizing.get('dc_feeder_parallel', 1))
-
-        feeders_by_size = defaultdict(lambda: {'count': 0, 'distance_ft': 0.0, 'total_ft': 0.0})
-        for dev_idx, label, dist_ft in per_device_distances:
-            size = self.device_feeder_sizes.get(dev_idx, default_feeder_size)
-            key = (size, parallel_count)
-            feeders_by_size[key]['count'] += 1
-            feeders_by_size[key]['distance_ft'] += dist_ft
-            feeders_by_size[key]['total_ft'] += dist_ft * parallel_count
-        
-        totals['feeders_by_size'] = dict(feeders_by_size)
-        
-        # Aggregate totals (backward compat) — total_feeder_ft reflects parallel-multiplied cable
-        total_feeder_ft = sum(v['total_ft'] for v in feeders_by_size.values())
-        total_feeder_count = sum(v['count'] for v in feeders_by_size.values())
-        
-        if topology == 'Distributed String':
-            totals['dc_feeder_count'] = 0
-            totals['dc_feeder_total_ft'] = 0
-            totals['ac_homerun_count'] = total_feeder_count
-            totals['ac_homerun_total_ft'] = total_feeder_ft
-        elif topology == 'Centralized String':
-            totals['dc_feeder_count'] = total_feeder_count
-            totals['dc_feeder_total_ft'] = total_feeder_ft
-            totals['ac_homerun_count'] = total_inverters
-            totals['ac_homerun_total_ft'] = total_inverters * ac_homerun_avg_ft
-        elif topology == 'Central Inverter':
-            totals['dc_feeder_count'] = total_feeder_count
-            totals['dc_feeder_total_ft'] = total_feeder_ft
-            central_inv_count = self._get_int_var(self.central_inv_count_var, 1)
-            totals['central_inverter_count'] = central_inv_count
-            skids = self._get_int_var(self.skids_var, central_inv_count)
-            totals['ac_homerun_count'] = skids
-            totals['ac_homerun_total_ft'] = skids * ac_homerun_avg_ft
-
-        # ==================== Display Results ====================
-        
-        total_inverters = totals.get('inverter_summary', {}).get('total_inverters', 0)
-        total_combiners = sum(totals['combiners_by_breaker'].values())
-
-        # Stash display context into totals so _redraw_results_tree has everything
-        totals['_display'] = {
-            'topology': topology,
-            'use_routed': use_routed if 'use_routed' in dir() else False,
-            'dc_feeder_avg_ft': dc_feeder_avg_ft if 'dc_feeder_avg_ft' in dir() else 0,
-            'ac_homerun_avg_ft': ac_homerun_avg_ft if 'ac_homerun_avg_ft' in dir() else 0,
-        }
-        totals['unique_modules'] = unique_modules
-        totals['segment_module_data'] = segment_module_data
-        totals['has_first_solar'] = any(
-            'first solar' in (m.get('manufacturer', '') or '').lower()
-            for m in unique_modules.values()
-        )
+        topology = engine.topology
+        lv_method = engine.lv_method
+        self.last_combiner_assignments = engine.last_combiner_assignments
+        self.last_si_assignments = engine.last_si_assignments
 
         # Store totals for Excel export
         self.last_totals = totals
@@ -7892,17 +5468,6 @@ class QuickEstimate(ttk.Frame):
         if self._calc_btn:
             self._calc_btn.config(style='TButton')
         self._update_export_button_state()
-        
-        # Combiner assignments: preserve if allocation is locked (user edited devices),
-        # otherwise rebuild from scratch with correct positions.
-        # For Trunk Bus, still build assignments (used for device positions/labels) but
-        # they represent LBDs, not combiner boxes.
-        if self.allocation_locked and self.last_combiner_assignments:
-            # Edit Devices locked the allocation — its assignments are the source of truth
-            pass
-        else:
-            # Fresh or unlocked — rebuild from allocation + harness configs
-            self._build_combiner_assignments(totals, topology)
 
         # Keep DC in sync with the fresh allocation so the BOM read below sees current
         # data on the first calc after a structural change. Skip Trunk Bus — its devices
@@ -7914,72 +5479,11 @@ class QuickEstimate(ttk.Frame):
                 if getattr(dc, 'data_source', 'blocks') == 'quick_estimate':
                     dc.sync_from_qe_assignments(self.last_combiner_assignments)
 
-        # Read combiner BOM from Device Configurator (single source of truth)
-        # Falls back to simple assignment-based totals if DC isn't available
-        # For Trunk Bus, skip combiner BOM entirely — LBDs are handled separately.
-        if lv_method == 'Trunk Bus':
-            dc_had_data = True  # Skip combiner BOM rebuild
-        elif topology == 'Central Inverter' and not self.allocation_locked:
-            dc_had_data = False
-        else:
-            dc_had_data = self._read_combiner_bom_from_device_config()
-        if not dc_had_data:
-            self._rebuild_combiner_totals_from_assignments()
-            
-            self.last_totals = totals
-            totals['combiners_by_breaker'] = {}
-            totals['combiner_details'] = []
-            
-            # Group by breaker size
-            for cb in self.last_combiner_assignments:
-                bs = cb['breaker_size']
-                if bs not in totals['combiners_by_breaker']:
-                    totals['combiners_by_breaker'][bs] = 0
-                totals['combiners_by_breaker'][bs] += 1
-            
-            # Rebuild combiner details with per-breaker matching
-            module_isc = self.selected_module.isc if self.selected_module else 0
-            for bs, qty in totals['combiners_by_breaker'].items():
-                # Find max harness strings for fuse holder rating
-                max_h_strings = 1
-                max_inputs = 0
-                for cb in self.last_combiner_assignments:
-                    if cb['breaker_size'] == bs:
-                        num_inputs = len(cb['connections'])
-                        max_inputs = max(max_inputs, num_inputs)
-                        for conn in cb['connections']:
-                            max_h_strings = max(max_h_strings, conn['num_strings'])
-                
-                fuse_current = module_isc * 1.56 * max_h_strings
-                fuse_holder_rating = self.get_fuse_holder_category(fuse_current)
-                strings_per_cb = max_inputs
-                
-                matched_cb = self.find_combiner_box(strings_per_cb, bs, fuse_holder_rating)
-                if matched_cb:
-                    totals['combiner_details'].append({
-                        'part_number': matched_cb.get('part_number', ''),
-                        'description': matched_cb.get('description', ''),
-                        'max_inputs': matched_cb.get('max_inputs', 0),
-                        'breaker_size': bs,
-                        'fuse_holder_rating': fuse_holder_rating,
-                        'strings_per_cb': strings_per_cb,
-                        'quantity': qty,
-                        'block_name': 'Site Total'
-                    })
-                else:
-                    totals['combiner_details'].append({
-                        'part_number': 'NO MATCH',
-                        'description': f'No CB found: {strings_per_cb} inputs, {bs}A, {fuse_holder_rating}',
-                        'max_inputs': strings_per_cb,
-                        'breaker_size': bs,
-                        'fuse_holder_rating': fuse_holder_rating,
-                        'strings_per_cb': strings_per_cb,
-                        'quantity': qty,
-                        'block_name': 'Site Total'
-                    })
-
-            # Update last_totals since we modified totals
-            self.last_totals = totals
+        # Combiner BOM: the engine already built it from the assignments; prefer the
+        # Device Configurator's view (user NEC multiplier, breaker and fuse overrides)
+        # when it has data. Central Inverter keeps the engine's until devices are edited.
+        if lv_method != 'Trunk Bus' and not (topology == 'Central Inverter' and not self.allocation_locked):
+            self._read_combiner_bom_from_device_config()
 
         # Push fresh combiner/SI assignments to Device Configurator if in QE mode
         _has_assignments = self.last_combiner_assignments or self.last_si_assignments
@@ -7999,29 +5503,35 @@ class QuickEstimate(ttk.Frame):
         self._compute_wire_length_estimates(totals)
         self._update_wire_sizing_with_lengths()
 
-    def _write_block_details_sheet(self, wb):
-        """Write a Block Details sheet with per-device part breakdowns."""
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    def _write_block_details_sheet(self, ws):
+        """Write the Block Details sheet with per-device part breakdowns.
+
+        ws is a write-only worksheet (see save_with_streamed_sheets). Rows are
+        laid out as plain value tuples first because write-only sheets need
+        their column widths before the first row; cells are only created as
+        each row is streamed out.
+        """
         from openpyxl.utils import get_column_letter
-        import os as _os
+        from src.utils.excel_stream import styled_row
 
-        title_font = Font(bold=True, size=14)
-        header_font = Font(bold=True, size=11, color="FFFFFF")
-        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        section_font = Font(bold=True, size=11)
-        section_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        center_align = Alignment(horizontal='center', vertical='center')
-        left_align = Alignment(horizontal='left', vertical='center')
+        rows = []    # (values, style name or one per column), in sheet order
+        merged = []  # sheet rows merged across A:E
 
-        ws = wb.create_sheet("Block Details")
-        row = 1
-        ws.merge_cells(f'A{row}:E{row}')
-        ws.cell(row=row, column=1, value="Block Details — Per-Device Part Breakdown").font = title_font
-        row += 2
+        def _row(values=(), styles=None, merge=False):
+            rows.append((list(values), styles))
+            if merge:
+                merged.append(len(rows))
+
+        def _flush(widths=None):
+            for col_letter, width in (widths or {}).items():
+                ws.column_dimensions[col_letter].width = width
+            for r in merged:
+                ws.merged_cells.add(f'A{r}:E{r}')
+            for values, styles in rows:
+                ws.append(styled_row(ws, values, styles))
+
+        _row(["Block Details — Per-Device Part Breakdown"], 'BOM Title', merge=True)
+        _row()
 
         topology = self.topology_var.get() if hasattr(self, 'topology_var') else ''
         totals = getattr(self, 'last_totals', {}) or {}
@@ -8060,7 +5570,8 @@ class QuickEstimate(ttk.Frame):
                     })
 
         if not devices:
-            ws.cell(row=row, column=1, value="No device data available.").font = section_font
+            _row(["No device data available."], 'BOM Bold')
+            _flush()
             return
 
         default_feeder_size = (
@@ -8093,20 +5604,10 @@ class QuickEstimate(ttk.Frame):
             whip_avg_by_gauge[gauge] = d['total_ft'] / d['count'] if d['count'] > 0 else 10.0
 
         # Load part libraries for description and PN lookups
-        _cur = _os.path.dirname(_os.path.abspath(__file__))
-        _root = _os.path.dirname(_os.path.dirname(_cur))
-
-        def _load_lib(filename):
-            try:
-                with open(_os.path.join(_root, 'data', filename), 'r') as _f:
-                    return json.load(_f)
-            except Exception:
-                return {}
-
-        harness_library = _load_lib('harness_library.json')
-        extender_library = _load_lib('extender_library.json')
-        whip_library = _load_lib('whip_library.json')
-        fuse_library = _load_lib('fuse_library.json')
+        harness_library = load_library('harness_library.json', {})
+        extender_library = load_library('extender_library.json', {})
+        whip_library = load_library('whip_library.json', {})
+        fuse_library = load_library('fuse_library.json', {})
 
         def _lib_desc(lib, pn):
             return lib.get(pn, {}).get('description', '')
@@ -8123,6 +5624,7 @@ class QuickEstimate(ttk.Frame):
             return min(candidates)[1] if candidates else 'N/A'
 
         col_headers = ['Component Type', 'Part Number', 'Description', 'Quantity', 'Unit']
+        data_styles = ['BOM Cell Left', 'BOM Cell', 'BOM Cell', 'BOM Cell', 'BOM Cell']
 
         _split_details_bds = getattr(self, '_split_tracker_details', {})
         _tracker_seg_map_bds = getattr(self, '_tracker_to_segment', [])
@@ -8155,28 +5657,11 @@ class QuickEstimate(ttk.Frame):
             parallel_txt = f", {parallel}× parallel" if parallel > 1 else ""
             summary = f"{total_strings} strings allocated, {feeder_size} feeder{parallel_txt}"
 
-            ws.merge_cells(f'A{row}:E{row}')
-            hdr = ws.cell(row=row, column=1, value=f"{dev_name}  —  {summary}")
-            hdr.font = section_font
-            for c in range(1, 6):
-                ws.cell(row=row, column=c).fill = section_fill
-            row += 1
-
-            for col, h in enumerate(col_headers, 1):
-                cell = ws.cell(row=row, column=col, value=h)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_align
-                cell.border = thin_border
-            row += 1
+            _row([f"{dev_name}  —  {summary}", None, None, None, None], 'BOM Group', merge=True)
+            _row(col_headers, 'BOM Header')
 
             def _wr(comp_type, part_num, desc, qty, unit, skip_summary=False):
-                nonlocal row
-                for c, v in enumerate([comp_type, part_num, desc, qty, unit], 1):
-                    cell = ws.cell(row=row, column=c, value=v)
-                    cell.border = thin_border
-                    cell.alignment = left_align if c == 1 else center_align
-                row += 1
+                _row([comp_type, part_num, desc, qty, unit], data_styles)
                 if not skip_summary:
                     key = (comp_type, part_num or '', desc or '', unit or '')
                     _summary[key] = _summary.get(key, 0) + (qty or 0)
@@ -8375,33 +5860,18 @@ class QuickEstimate(ttk.Frame):
                     _fd['total_cable_ft'] += ac_ft
                     _fd['count'] += 1
 
-            row += 1  # blank row between devices
+            _row()  # blank row between devices
 
         # Summary table — all devices combined
         if _summary or _feeder_summary:
-            row += 1
-            ws.merge_cells(f'A{row}:E{row}')
-            summary_title = ws.cell(row=row, column=1, value="Summary — All Devices Combined")
-            summary_title.font = title_font
-            for c in range(1, 6):
-                ws.cell(row=row, column=c).fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
-            row += 1
+            _row()
+            _row(["Summary — All Devices Combined", None, None, None, None], 'BOM Summary Title', merge=True)
 
             summary_headers = ['Component Type', 'Part Number', 'Description', 'Total Qty', 'Unit']
-            for col, h in enumerate(summary_headers, 1):
-                cell = ws.cell(row=row, column=col, value=h)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = center_align
-                cell.border = thin_border
-            row += 1
+            _row(summary_headers, 'BOM Header')
 
             for (comp_type, part_num, desc, unit), total_qty in sorted(_summary.items()):
-                for c, v in enumerate([comp_type, part_num, desc, total_qty, unit], 1):
-                    cell = ws.cell(row=row, column=c, value=v)
-                    cell.border = thin_border
-                    cell.alignment = left_align if c == 1 else center_align
-                row += 1
+                _row([comp_type, part_num, desc, total_qty, unit], data_styles)
 
             # Consolidated feeder rows — one line per (type, size, parallel) with avg run length
             _feeder_mat = 'AL' if self.wire_sizing.get('feeder_material', 'aluminum') == 'aluminum' else 'CU'
@@ -8420,20 +5890,17 @@ class QuickEstimate(ttk.Frame):
                     new_label = f"DC Feeder {feeder_size}, {_feeder_mat} — avg {avg_ft:.0f}ft{_feeder_routed}{runs_lbl}{parallel_suffix} (neg)"
                 else:
                     new_label = comp_type
-                for c, v in enumerate([new_label, '', '', total_cable_ft, 'ft'], 1):
-                    cell = ws.cell(row=row, column=c, value=v)
-                    cell.border = thin_border
-                    cell.alignment = left_align if c == 1 else center_align
-                row += 1
+                _row([new_label, '', '', total_cable_ft, 'ft'], data_styles)
 
         # Auto-fit columns
+        widths = {}
         for col_idx in range(1, 6):
             max_len = max(len(col_headers[col_idx - 1]), 10)
-            col_letter = get_column_letter(col_idx)
-            for cell in ws[col_letter]:
-                if cell.value:
-                    max_len = max(max_len, len(str(cell.value)))
-            ws.column_dimensions[col_letter].width = min(max_len + 3, 55)
+            for values, _ in rows:
+                if len(values) >= col_idx and values[col_idx - 1]:
+                    max_len = max(max_len, len(str(values[col_idx - 1])))
+            widths[get_column_letter(col_idx)] = min(max_len + 3, 55)
+        _flush(widths)
 
     def _write_combiner_sheet(self, wb):
         """Write a Combiner Boxes sheet to the workbook from Device Configurator data."""
@@ -8669,6 +6136,30 @@ class QuickEstimate(ttk.Frame):
             )
         return True, ""
 
+    def suggested_export_filename(self, label, ext):
+        """Build the default export filename for this estimate.
+
+        e.g. 'Client_Project_Site PDF_Estimate 1_Wire Harness_rev0_2026-01-31.pdf'
+        """
+        def clean_fn(s):
+            return "".join(c for c in s if c.isalnum() or c in (' ', '-', '_')).strip()
+
+        client = "Unknown_Client"
+        project_name = "Unknown_Project"
+        estimate_name = "Estimate"
+
+        if self.current_project and self.current_project.metadata:
+            client = clean_fn(self.current_project.metadata.client or "Unknown_Client")
+            project_name = clean_fn(self.current_project.metadata.name or "Unknown_Project")
+        if self.estimate_id and self.current_project:
+            est_data = self.current_project.quick_estimates.get(self.estimate_id, {})
+            estimate_name = clean_fn(est_data.get('name', 'Estimate'))
+
+        lv_token = clean_fn(self.lv_collection_var.get() if hasattr(self, 'lv_collection_var') else 'Wire Harness')
+        revision = self.est_revision_var.get() if hasattr(self, 'est_revision_var') else '0'
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        return f"{client}_{project_name}_{label}_{estimate_name}_{lv_token}_rev{revision}_{date_str}{ext}"
+
     def export_to_excel(self, target_filepath=None, silent=False):
         """Export the quick estimate BOM to Excel
 
@@ -8714,25 +6205,7 @@ class QuickEstimate(ttk.Frame):
         module_width_ft = module_width_mm / 304.8
         string_length_ft = module_width_ft * modules_per_string
         
-        # Build suggested filename (matching BOM Generator convention)
-        def clean_filename(s):
-            return "".join(c for c in s if c.isalnum() or c in (' ', '-', '_')).strip()
-        
-        client = "Unknown_Client"
-        project_name = "Unknown_Project"
-        estimate_name = "Estimate"
-        
-        if self.current_project and self.current_project.metadata:
-            client = clean_filename(self.current_project.metadata.client or "Unknown_Client")
-            project_name = clean_filename(self.current_project.metadata.name or "Unknown_Project")
-        if self.estimate_id and self.current_project:
-            est_data = self.current_project.quick_estimates.get(self.estimate_id, {})
-            estimate_name = clean_filename(est_data.get('name', 'Estimate'))
-        
-        lv_method_tag = clean_filename(self.lv_collection_var.get() if hasattr(self, 'lv_collection_var') else 'Wire Harness')
-        revision = self.est_revision_var.get() if hasattr(self, 'est_revision_var') else '0'
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        suggested_filename = f"{client}_{project_name}_Ampacity Quick eBOM_{estimate_name}_{lv_method_tag}_rev{revision}_{date_str}.xlsx"
+        suggested_filename = self.suggested_export_filename("Ampacity Quick eBOM", ".xlsx")
         
         if target_filepath:
             filepath = target_filepath
@@ -9115,6 +6588,7 @@ class QuickEstimate(ttk.Frame):
             
             # Pull results from the results treeview - only checked items
             bom_first_data_row = None
+            sensitivity_lines = []  # (part_number, qty, description) for the copper sweep
             for item_id in self.results_tree.get_children():
                 values = self.results_tree.item(item_id, 'values')
                 if len(values) < 8:
@@ -9159,6 +6633,9 @@ class QuickEstimate(ttk.Frame):
                 if isinstance(unit_cost_val, float):
                     cell_unit_cost.number_format = '"$"#,##0.00'
 
+                if not is_section and part_number and isinstance(qty_val, (int, float)):
+                    sensitivity_lines.append((part_number, qty_val, description or ''))
+
                 # Ext. Cost: formula for all non-section rows
                 if not is_section:
                     cell_ext_cost = ws.cell(row=row, column=7, value=f'=IF(F{row}="","",D{row}*F{row})')
@@ -9199,7 +6676,8 @@ class QuickEstimate(ttk.Frame):
                 row += 1
 
             # ========== BLOCK DETAILS SHEET ==========
-            self._write_block_details_sheet(wb)
+            # Placeholder; the rows are streamed into this position on save
+            wb.create_sheet("Block Details")
 
             # ========== COMBINER BOXES / STRING INVERTERS SHEET ==========
             topology = self.topology_var.get() if hasattr(self, 'topology_var') else ''
@@ -9207,6 +6685,25 @@ class QuickEstimate(ttk.Frame):
                 self._write_string_inverter_sheet(wb)
             else:
                 self._write_combiner_sheet(wb)
+
+            # ========== COPPER SENSITIVITY SHEET ==========
+            if sensitivity_lines:
+                from src.utils.pricing_lookup import get_pricing_lookup, write_copper_sensitivity_sheet
+                sweep = get_pricing_lookup().copper_sensitivity(
+                    [pn for pn, _, _ in sensitivity_lines],
+                    [q for _, q, _ in sensitivity_lines],
+                )
+                write_copper_sensitivity_sheet(wb, sweep, descriptions={pn: d for pn, _, d in sensitivity_lines})
+
+            # ========== CABLE LOSSES SHEET ==========
+            # Placeholder; one row per run, streamed at save like Block Details
+            streamed_sheets = {"Block Details": self._write_block_details_sheet}
+            if getattr(self, 'last_totals', None):
+                from src.utils.cable_losses import cable_losses, estimate_cable_runs, write_cable_loss_sheet
+                losses = cable_losses(estimate_cable_runs(self._estimate_engine(), self.last_totals))
+                dc_power_w = self.last_totals.get('total_dc_kw', 0) * 1000.0
+                wb.create_sheet("Cable Losses")
+                streamed_sheets["Cable Losses"] = lambda ws: write_cable_loss_sheet(ws, losses, dc_power_w=dc_power_w)
             
             # ========== AUTO-FIT COLUMNS (BOM sheet) ==========
             for col_idx in range(1, 9):
@@ -9219,7 +6716,8 @@ class QuickEstimate(ttk.Frame):
                 ws.column_dimensions[col_letter].width = min(max_length + 4, cap)
             
             # Save
-            wb.save(filepath)
+            from src.utils.excel_stream import save_with_streamed_sheets
+            save_with_streamed_sheets(wb, filepath, streamed_sheets)
             
             if not silent:
                 # Try to open the file
@@ -9270,24 +6768,7 @@ class QuickEstimate(ttk.Frame):
             messagebox.showerror("Skid/Pad Mismatch", msg, parent=self)
             return
 
-        def clean_fn(s):
-            return "".join(c for c in s if c.isalnum() or c in (' ', '-', '_')).strip()
-
-        client = "Unknown_Client"
-        project_name = "Unknown_Project"
-        estimate_name = "Estimate"
-
-        if self.current_project and self.current_project.metadata:
-            client = clean_fn(self.current_project.metadata.client or "Unknown_Client")
-            project_name = clean_fn(self.current_project.metadata.name or "Unknown_Project")
-        if self.estimate_id and self.current_project:
-            est_data = self.current_project.quick_estimates.get(self.estimate_id, {})
-            estimate_name = clean_fn(est_data.get('name', 'Estimate'))
-
-        lv_token = clean_fn(self.lv_collection_var.get()) if hasattr(self, 'lv_collection_var') else ''
-        revision = self.est_revision_var.get() if hasattr(self, 'est_revision_var') else '0'
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        suggested_name = f"{client}_{project_name}_Site PDF_{estimate_name}_{lv_token}_rev{revision}_{date_str}.pdf"
+        suggested_name = self.suggested_export_filename("Site PDF", ".pdf")
 
         filepath = filedialog.asksaveasfilename(
             defaultextension=".pdf",
@@ -9491,14 +6972,7 @@ class QuickEstimate(ttk.Frame):
         if hasattr(self, 'topology_var'):
             topology = self.topology_var.get()
 
-        import os as _os
-        _cur_dir = _os.path.dirname(_os.path.abspath(__file__))
-        _proj_root = _os.path.dirname(_os.path.dirname(_cur_dir))
-        try:
-            with open(_os.path.join(_proj_root, 'data', 'harness_library.json')) as _hf:
-                _harness_lib = json.load(_hf)
-        except Exception:
-            _harness_lib = {}
+        _harness_lib = load_library('harness_library.json', {})
 
         for group in self.groups:
             for seg in group.get('segments', []):
@@ -9661,24 +7135,7 @@ class QuickEstimate(ttk.Frame):
             messagebox.showinfo("No Data", "Run Calculate Estimate first to generate preview data.")
             return
 
-        def clean_fn(s):
-            return "".join(c for c in s if c.isalnum() or c in (' ', '-', '_')).strip()
-
-        client = "Unknown_Client"
-        project_name = "Unknown_Project"
-        estimate_name = "Estimate"
-
-        if self.current_project and self.current_project.metadata:
-            client = clean_fn(self.current_project.metadata.client or "Unknown_Client")
-            project_name = clean_fn(self.current_project.metadata.name or "Unknown_Project")
-        if self.estimate_id and self.current_project:
-            est_data = self.current_project.quick_estimates.get(self.estimate_id, {})
-            estimate_name = clean_fn(est_data.get('name', 'Estimate'))
-
-        lv_token = clean_fn(self.lv_collection_var.get()) if hasattr(self, 'lv_collection_var') else ''
-        revision = self.est_revision_var.get() if hasattr(self, 'est_revision_var') else '0'
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        suggested_name = f"{client}_{project_name}_String Allocation_{estimate_name}_{lv_token}_rev{revision}_{date_str}.pdf"
+        suggested_name = self.suggested_export_filename("String Allocation", ".pdf")
 
         filepath = filedialog.asksaveasfilename(
             defaultextension=".pdf",
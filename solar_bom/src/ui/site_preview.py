@@ -4,7 +4,11 @@ import math
 import copy
 import re
 
-from ..utils import device_geometry
+import numpy as np
+
+from ..utils import device_geometry, geometry_kernels
+from ..utils.render_lod import LOD_STRING_PX_PER_FT, dominant_color, group_footprints, lod_tier
+from ..utils.spatial_grid import UniformGrid, bbox_of
 
 # Set True to print per-tracker extender debug info to stdout whenever
 # the info panel is refreshed (e.g. after nudging a combiner box).
@@ -81,6 +85,7 @@ class SitePreviewWindow(tk.Toplevel):
         # Canvas string selection state (inspect mode only)
         self._last_clicked_string = None   # (tracker_idx, s_idx) of last plain/shift click
         self._string_rects = []            # cache populated by draw(); used by hit_test_string
+        self._string_grid = None           # UniformGrid over _string_rects; see _string_index
         self._box_selecting = False        # True during Shift+drag rubber-band box select
         self._box_select_start = (0, 0)   # canvas coords where Shift+drag began
 
@@ -129,6 +134,15 @@ class SitePreviewWindow(tk.Toplevel):
         self._wiring_layer_vars = {}
 
         self._world_dirty = True  # True → rebuild world layer on next draw()
+        # Retained group items: group_idx -> scene entry (see _draw_group).
+        # Between full rebuilds only dirty groups are redrawn, and pan/zoom
+        # move the rest with canvas.move/scale.
+        self._group_scene = {}
+        self._dirty_groups = set()
+        self._view_dirty = False
+        self._scene_view = None  # (scale, pan_x, pan_y) the group items are drawn at
+        # id(group layout dict) -> (layout, signature, geometry); see _group_overlap_geometry
+        self._overlap_geometry_cache = {}
 
         self.setup_ui()
         self.build_layout_data()
@@ -694,6 +708,7 @@ class SitePreviewWindow(tk.Toplevel):
         """
         self.group_layout = []
         self.selected_group_indices = set()
+        self._invalidate_world_layer()
 
         allocation_result = self.inv_summary.get('allocation_result')
         if not allocation_result:
@@ -1490,6 +1505,7 @@ class SitePreviewWindow(tk.Toplevel):
         
         center_x = cw / 2
         center_y = ch / 2
+        old_view = (self.scale, self.pan_x, self.pan_y)
         
         self.pan_x = center_x - (center_x - self.pan_x) * factor
         self.pan_y = center_y - (center_y - self.pan_y) * factor
@@ -1497,7 +1513,9 @@ class SitePreviewWindow(tk.Toplevel):
         
         self.zoom_label.config(text=f"{self.scale * 100:.0f}%")
         self.canvas.scale('world', center_x, center_y, factor, factor)
-        self._invalidate_world_layer()
+        if self._scene_view == old_view:
+            self._scene_view = (self.scale, self.pan_x, self.pan_y)
+        self._invalidate_view()
         self._schedule_redraw()
     
     def on_mousewheel(self, event):
@@ -1887,7 +1905,8 @@ class SitePreviewWindow(tk.Toplevel):
                 self.group_layout[idx]['x'] = sx + snapped_dx
                 self.group_layout[idx]['y'] = sy + snapped_dy
 
-            self._invalidate_world_layer()
+            # Only the dragged groups (and overlays) are redrawn
+            self._invalidate_groups(self.selected_group_indices)
             self.draw()
     
     def on_release(self, event):
@@ -1996,16 +2015,19 @@ class SitePreviewWindow(tk.Toplevel):
         if self.dragging_canvas:
             dx_px = event.x - self.drag_start_x
             dy_px = event.y - self.drag_start_y
+            old_view = (self.scale, self.pan_x, self.pan_y)
             self.pan_x += dx_px
             self.pan_y += dy_px
             self.drag_start_x = event.x
             self.drag_start_y = event.y
             self.canvas.move('world', dx_px, dy_px)
+            if self._scene_view == old_view:
+                self._scene_view = (self.scale, self.pan_x, self.pan_y)
 
     def on_pan_release(self, event):
-        """Handle middle mouse release — stop panning, rebuild world at new position."""
+        """Handle middle mouse release — stop panning, draw groups that came into view."""
         self.dragging_canvas = False
-        self._invalidate_world_layer()
+        self._invalidate_view()
         self.draw()
     
     def _snap_group_position(self, group_idx, raw_x, raw_y):
@@ -2198,7 +2220,7 @@ class SitePreviewWindow(tk.Toplevel):
 
         self._sync_wiring_panel_visibility()
 
-        if not self._world_dirty:
+        if not (self._world_dirty or self._dirty_groups or self._view_dirty):
             self.canvas.delete('screen_fixed')
             self._draw_scale_bar()
             self.canvas.update_idletasks()
@@ -2217,8 +2239,14 @@ class SitePreviewWindow(tk.Toplevel):
             )
             return
 
-        self.canvas.delete('world')
-        self._string_rects = []
+        if self._world_dirty or self._scene_view != (self.scale, self.pan_x, self.pan_y):
+            self.canvas.delete('world')
+            self._group_scene = {}
+        else:
+            # Retained scene: group items are already where pan/zoom moved
+            # them; only devices, routes, pads and other overlays are rebuilt.
+            self.canvas.delete('world&&!group')
+        self._string_grid = None
 
         # Viewport bounds in world space for per-group culling
         canvas_w = self.canvas.winfo_width()
@@ -2229,331 +2257,23 @@ class SitePreviewWindow(tk.Toplevel):
             view_x_min, view_x_max = view_x_max, view_x_min
         if view_y_min > view_y_max:
             view_y_min, view_y_max = view_y_max, view_y_min
+        view = (view_x_min, view_y_min, view_x_max, view_y_max)
 
-        max_width = getattr(self, 'max_tracker_width_ft', 6)
-
-        for group_idx, group_data in enumerate(self.group_layout):
-            pitch = group_data.get('row_spacing_ft', getattr(self, 'tracker_pitch_ft', 20))
-            gx = group_data['x']
-            gy = group_data['y']
-            is_selected = (group_idx in self.selected_group_indices)
-            rotation_deg = group_data.get('rotation_deg', 0.0)
-            vis_min = group_data.get('visual_min_y', 0)
-            vis_max = group_data.get('visual_max_y', group_data['length_ft'])
-            rot_cx = gx + group_data['width_ft'] / 2
-            rot_cy = gy + (vis_min + vis_max) / 2
-
-            def _wc(wx, wy, _rcx=rot_cx, _rcy=rot_cy, _rd=rotation_deg):
-                """World-to-canvas with optional group rotation applied."""
-                if _rd != 0:
-                    wx, wy = self._rotate_point(_rcx, _rcy, wx, wy, _rd)
-                return self.world_to_canvas(wx, wy)
-
-            def _rect_as_poly(x1, y1, x2, y2, _rcx=rot_cx, _rcy=rot_cy, _rd=rotation_deg):
-                """Return flat canvas coord list for a rotated rectangle polygon."""
-                corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
-                pts = []
-                for wx, wy in corners:
-                    if _rd != 0:
-                        wx, wy = self._rotate_point(_rcx, _rcy, wx, wy, _rd)
-                    cx2, cy2 = self.world_to_canvas(wx, wy)
-                    pts.extend([cx2, cy2])
-                return pts
-
-            def _rect_as_poly_world(x1, y1, x2, y2, _rcx=rot_cx, _rcy=rot_cy, _rd=rotation_deg):
-                """Return flat world-coord list for a rotated rectangle (rotation baked in)."""
-                corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
-                pts = []
-                for wx, wy in corners:
-                    if _rd != 0:
-                        wx, wy = self._rotate_point(_rcx, _rcy, wx, wy, _rd)
-                    pts.extend([wx, wy])
-                return pts
-
-            # Viewport culling — skip groups entirely outside the visible canvas
-            margin = max(self.max_tracker_width_ft, 10.0) * 2.0
-            g_x_min = gx
-            g_x_max = gx + group_data['width_ft']
-            g_y_min = gy + vis_min
-            g_y_max = gy + vis_max
-            if rotation_deg != 0:
-                half_w = (g_x_max - g_x_min) / 2
-                half_h = (g_y_max - g_y_min) / 2
-                diag = (half_w ** 2 + half_h ** 2) ** 0.5
-                cx_g = (g_x_min + g_x_max) / 2
-                cy_g = (g_y_min + g_y_max) / 2
-                g_x_min, g_x_max = cx_g - diag, cx_g + diag
-                g_y_min, g_y_max = cy_g - diag, cy_g + diag
-            if (g_x_max + margin < view_x_min or
-                    g_x_min - margin > view_x_max or
-                    g_y_max + margin < view_y_min or
-                    g_y_min - margin > view_y_max):
-                continue
-
-            # Draw selection highlight behind group (using visual bounds)
-            if is_selected:
-                pad = max_width * 0.3
-                h_poly = _rect_as_poly(
-                    gx - pad, gy + vis_min - pad,
-                    gx + group_data['width_ft'] + pad, gy + vis_max + pad
-                )
-                self.canvas.create_polygon(
-                    *h_poly, fill='', outline='#4A90D9', width=2, tags='world'
-                )
-            
-            # Draw group label
-            label_x, label_y = _wc(
-                gx - max_width * 0.5,
-                gy + group_data['length_ft'] / 2
-            )
-            font_size = max(6, min(11, int(9 * self.scale)))
-            self._draw_text_with_bg(
-                label_x, label_y,
-                text=group_data['name'], font=('Helvetica', font_size),
-                fill='#4A90D9' if is_selected else '#333333', anchor='e',
-                bg_required=False
-            )
-            
-            for t_idx, tracker in enumerate(group_data['trackers']):
-                spt = tracker['strings_per_tracker']
-                assignments = tracker['assignments']
-                t_width = tracker.get('width_ft', max_width)
-                t_length = tracker.get('length_ft', 100)
-                
-                # X position within group
-                _t_local_x = tracker.get('local_x_idx', t_idx)
-                tx = gx + _t_local_x * pitch
-                # Center tracker within pitch slot
-                tx_offset = (max_width - t_width) / 2 if max_width > t_width else 0
-
-                # Driveline angle: offset each tracker in Y
-                angle_y_offset = _t_local_x * pitch * group_data.get('driveline_tan', 0.0)
-
-                # Align tracker vertically within the group
-                _talign = group_data.get('tracker_alignment', 'motor')
-                group_length = group_data.get('length_ft', t_length)
-                if _talign == 'top':
-                    ty = gy + angle_y_offset
-                elif _talign == 'bottom':
-                    ty = gy + (group_length - t_length) + angle_y_offset
-                elif tracker.get('has_motor', False) and group_data.get('motor_y_ft', None) is not None:
-                    ty = gy + (group_data['motor_y_ft'] - tracker['motor_y_ft']) + angle_y_offset
-                else:
-                    # Center alignment fallback
-                    ty = gy + (group_length - t_length) / 2 + angle_y_offset
-                # Per-string height — adjust for partial strings
-                partial_mods = tracker.get('partial_module_count', 0)
-                partial_side = tracker.get('partial_string_side', 'north')
-                full_str_count = tracker.get('full_string_count', spt)
-                mps_for_height = 26  # fallback
-                
-                ref = tracker.get('template_ref')
-                if partial_mods > 0 and ref and ref in self.enabled_templates:
-                    mps_for_height = self.enabled_templates[ref].get('modules_per_string', 26)
-                
-                if partial_mods > 0 and full_str_count > 0:
-                    total_mods = full_str_count * mps_for_height + partial_mods
-                    module_extent = t_length
-                    full_height = (module_extent * mps_for_height / total_mods) if total_mods > 0 else module_extent
-                    partial_height = (module_extent * partial_mods / total_mods) if total_mods > 0 else 0
-                    
-                    # Build height list per effective string slot
-                    # Always include the partial band (even for right-of-pair trackers)
-                    string_heights = []
-                    has_owned_partial = (spt > full_str_count)
-                    draw_spt = spt + (1 if not has_owned_partial else 0)  # Add unowned partial band
-                    
-                    if partial_side == 'north':
-                        string_heights.append(partial_height)  # Always draw partial band
-                        for _ in range(full_str_count):
-                            string_heights.append(full_height)
-                    else:  # south
-                        for _ in range(full_str_count):
-                            string_heights.append(full_height)
-                        string_heights.append(partial_height)  # Always draw partial band
-                else:
-                    string_height = t_length / spt if spt > 0 else t_length
-                    string_heights = [string_height] * int(spt)
-                
-                # Build string colors
-                string_colors = []
-                for assignment in assignments:
-                    for _ in range(assignment['strings']):
-                        string_colors.append(assignment['color'])
-                
-                # Determine global tracker index for device highlighting
-                global_tracker_idx = sum(
-                    len(self.group_layout[g]['trackers']) for g in range(group_idx)
-                ) + t_idx
-                
-                # Check if we're highlighting a selected device or pad
-                highlighting = False
-                selected_strings = set()
-                
-                if self.inspect_mode and hasattr(self, 'device_positions') and self.device_positions:
-                    if self.selected_device_idx is not None:
-                        highlighting = True
-                        dev = self.device_positions[self.selected_device_idx]
-                        assigned = dev.get('assigned_strings', {})
-                        selected_strings = assigned.get(global_tracker_idx, set())
-                    elif self.selected_pad_inspect_idx is not None:
-                        highlighting = True
-                        # Collect strings from ALL devices assigned to this pad
-                        pad = self.pads[self.selected_pad_inspect_idx] if self.selected_pad_inspect_idx < len(self.pads) else None
-                        if pad:
-                            for dev_idx in pad.get('assigned_devices', []):
-                                if dev_idx < len(self.device_positions):
-                                    dev = self.device_positions[dev_idx]
-                                    assigned = dev.get('assigned_strings', {})
-                                    selected_strings.update(assigned.get(global_tracker_idx, set()))
-                
-                # Draw each string (including unowned partial bands)
-                draw_count = len(string_heights)
-                _hl = getattr(self, '_highlighted_strings', set())
-
-                # First pass: compute render attributes per string slot
-                _str_attrs = []  # (color, outline_color, outline_width, is_unowned_partial)
-                for s_idx in range(draw_count):
-                    is_unowned_partial = (partial_mods > 0 and spt <= full_str_count and
-                                         ((partial_side == 'north' and s_idx == 0) or
-                                          (partial_side == 'south' and s_idx == draw_count - 1)))
-                    if is_unowned_partial:
-                        color = '#D4C878'
-                    else:
-                        if partial_mods > 0 and partial_side == 'north':
-                            color_idx = s_idx - 1
-                            if spt > full_str_count and s_idx == 0:
-                                color_idx = 0
-                        elif partial_mods > 0 and partial_side == 'south':
-                            if spt > full_str_count and s_idx == draw_count - 1:
-                                color_idx = spt - 1
-                            else:
-                                color_idx = s_idx
-                        else:
-                            color_idx = s_idx
-                        color = string_colors[color_idx] if 0 <= color_idx < len(string_colors) else '#D0D0D0'
-
-                    if highlighting:
-                        if s_idx not in selected_strings:
-                            color = '#E0E0E0'
-                            outline_color = '#CCCCCC'
-                            outline_width = 1
-                        else:
-                            outline_color = '#555555'
-                            outline_width = 1
-                    elif self.assigning_devices:
-                        color = '#E0E0E0'
-                        outline_color = '#CCCCCC'
-                        outline_width = 1
-                    else:
-                        outline_color = '#555555'
-                        outline_width = 1
-
-                    if (not is_unowned_partial and _hl and
-                            (global_tracker_idx, s_idx) in _hl):
-                        color = '#FFFF00'
-                        outline_color = '#DAA520'
-                        outline_width = 2
-
-                    _str_attrs.append((color, outline_color, outline_width, is_unowned_partial))
-
-                # Second pass: emit polygons.
-                # When individual strings are tall enough on screen to interact with,
-                # draw one polygon per string so the borders are visible. Below that
-                # threshold, coalesce consecutive same-key strings to reduce item count.
-                min_str_h_px = min(string_heights) * self.scale if string_heights else 0
-                if min_str_h_px >= 8:
-                    # Detail mode — individual string polygons
-                    sy = ty
-                    for s_idx in range(draw_count):
-                        color, outline_color, outline_width, _ = _str_attrs[s_idx]
-                        sh = string_heights[s_idx]
-                        poly = _rect_as_poly(tx + tx_offset, sy, tx + tx_offset + t_width, sy + sh)
-                        self.canvas.create_polygon(*poly, fill=color, outline=outline_color, width=outline_width, tags='world')
-                        sy += sh
-                else:
-                    # Performance mode — one polygon per run of consecutive same-key strings
-                    sy_cursor = ty
-                    run_start = 0
-                    while run_start < draw_count:
-                        run_color, run_outline, run_width, _ = _str_attrs[run_start]
-                        run_key = (run_color, run_outline, run_width)
-                        run_end = run_start
-                        while (run_end + 1 < draw_count and
-                               _str_attrs[run_end + 1][:3] == run_key):
-                            run_end += 1
-                        run_sy = sy_cursor
-                        for i in range(run_start, run_end + 1):
-                            sy_cursor += string_heights[i]
-                        poly = _rect_as_poly(
-                            tx + tx_offset, run_sy,
-                            tx + tx_offset + t_width, sy_cursor
-                        )
-                        self.canvas.create_polygon(*poly, fill=run_color, outline=run_outline, width=run_width, tags='world')
-                        run_start = run_end + 1
-
-                # Third pass: populate _string_rects per individual string (no polygon emission)
-                sy = ty
-                for s_idx in range(draw_count):
-                    sh = string_heights[s_idx] if s_idx < len(string_heights) else string_heights[-1]
-                    poly = _rect_as_poly(tx + tx_offset, sy, tx + tx_offset + t_width, sy + sh)
-                    poly_w = _rect_as_poly_world(tx + tx_offset, sy, tx + tx_offset + t_width, sy + sh)
-                    _, _, _, is_unowned_partial = _str_attrs[s_idx]
-                    self._string_rects.append({
-                        'tracker_idx': global_tracker_idx,
-                        's_idx': s_idx,
-                        'poly_canvas': poly,
-                        'poly_world': poly_w,
-                        'is_unowned_partial': is_unowned_partial,
-                    })
-                    sy += sh
+        tracker_offsets = [0]
+        for group_data in self.group_layout:
+            tracker_offsets.append(tracker_offsets[-1] + len(group_data['trackers']))
 
-                # Tracker outline
-                out_poly = _rect_as_poly(
-                    tx + tx_offset - 0.5, ty - 0.5,
-                    tx + tx_offset + t_width + 0.5, ty + t_length + 0.5
-                )
-                self.canvas.create_polygon(
-                    *out_poly, fill='', outline='#222222', width=1, tags='world'
-                )
-                # Keep ox1/oy1 for pixel_width calculation (use first two corners)
-                ox1, oy1 = out_poly[0], out_poly[1]
-                ox2, oy2 = out_poly[2], out_poly[3]
-
-                # Motor indicator
-                if tracker.get('has_motor', False):
-                    motor_y = tracker['motor_y_ft']
-                    motor_gap = tracker['motor_gap_ft']
-
-                    motor_world_y = ty + motor_y
-                    motor_x1 = tx + tx_offset - 0.3
-                    motor_x2 = tx + tx_offset + t_width + 0.3
-
-                    m_poly = _rect_as_poly(motor_x1, motor_world_y, motor_x2, motor_world_y + motor_gap)
-                    self.canvas.create_polygon(
-                        *m_poly, fill='#666666', outline='#444444', width=1, tags='world'
-                    )
+        # Redrawn groups land on top of the retained ones; the overlays below
+        # are recreated afterwards, so they still end up above every group.
+        for group_idx in sorted(self._stale_groups(view)):
+            self.canvas.delete(f'group_{group_idx}')
+            self._group_scene.pop(group_idx, None)
+            if group_idx < len(self.group_layout) and self._group_in_view(self.group_layout[group_idx], view):
+                self._group_scene[group_idx] = self._draw_group(group_idx, tracker_offsets[group_idx])
 
-                    motor_cx = sum(m_poly[0::2]) / 4
-                    motor_cy = sum(m_poly[1::2]) / 4
-                    dot_r = max(2, min(4, 3 * self.scale))
-                    self.canvas.create_oval(
-                        motor_cx - dot_r, motor_cy - dot_r,
-                        motor_cx + dot_r, motor_cy + dot_r,
-                        fill='#FF8800', outline='#CC6600', width=1, tags='world'
-                    )
+        self._string_rects = [rect for group_idx in sorted(self._group_scene)
+                              for rect in self._group_scene[group_idx]['string_rects']]
 
-                # Tracker label — use global tracker index to match info panel / assignments
-                label_cx, label_cy = _wc(tx + tx_offset + t_width / 2, ty + t_length + 2)
-                pixel_width = abs(ox2 - ox1)
-                if pixel_width > 14:
-                    lbl_size = max(6, min(9, int(8 * self.scale)))
-                    self._draw_text_with_bg(
-                        label_cx, label_cy,
-                        text=f"T{global_tracker_idx+1}", font=('Helvetica', lbl_size), fill='#555555',
-                        bg_required=False
-                    )
-        
         # Draw devices (CB/SI)
         self._draw_devices()
         self._draw_device_wiring_layers()
@@ -2580,6 +2300,9 @@ class SitePreviewWindow(tk.Toplevel):
         self._draw_measurements()
 
         self._world_dirty = False
+        self._dirty_groups = set()
+        self._view_dirty = False
+        self._scene_view = (self.scale, self.pan_x, self.pan_y)
 
         # screen_fixed items always re-emitted at current canvas dimensions
         self.canvas.delete('screen_fixed')
@@ -2602,6 +2325,426 @@ class SitePreviewWindow(tk.Toplevel):
             text='N', font=('Helvetica', 9, 'bold'), fill='#333333', tags='screen_fixed'
         )
 
+    def _invalidate_groups(self, group_indices):
+        """Rebuild only these groups' canvas items (plus overlays) on the next draw()."""
+        self._dirty_groups.update(group_indices)
+
+    def _invalidate_view(self):
+        """Pan/zoom changed: re-cull and re-LOD retained groups on the next draw()."""
+        self._view_dirty = True
+
+    def _group_in_view(self, group_data, view):
+        """True if the group's (rotated) visual bounds reach the world-space view box."""
+        view_x_min, view_y_min, view_x_max, view_y_max = view
+        gx = group_data['x']
+        gy = group_data['y']
+        rotation_deg = group_data.get('rotation_deg', 0.0)
+        vis_min = group_data.get('visual_min_y', 0)
+        vis_max = group_data.get('visual_max_y', group_data['length_ft'])
+        margin = max(self.max_tracker_width_ft, 10.0) * 2.0
+        g_x_min = gx
+        g_x_max = gx + group_data['width_ft']
+        g_y_min = gy + vis_min
+        g_y_max = gy + vis_max
+        if rotation_deg != 0:
+            half_w = (g_x_max - g_x_min) / 2
+            half_h = (g_y_max - g_y_min) / 2
+            diag = (half_w ** 2 + half_h ** 2) ** 0.5
+            cx_g = (g_x_min + g_x_max) / 2
+            cy_g = (g_y_min + g_y_max) / 2
+            g_x_min, g_x_max = cx_g - diag, cx_g + diag
+            g_y_min, g_y_max = cy_g - diag, cy_g + diag
+        return not (g_x_max + margin < view_x_min or
+                    g_x_min - margin > view_x_max or
+                    g_y_max + margin < view_y_min or
+                    g_y_min - margin > view_y_max)
+
+    def _group_lod(self, min_string_h, label_w):
+        """Scale-dependent drawing choices for a group, from its world-space sizes.
+
+        A retained group is redrawn when this changes: the LOD tier, label font
+        sizes, which trackers draw per-string polygons (vs coalesced runs), and
+        which get a tracker label.
+        """
+        scale = self.scale
+        detail = scale >= LOD_STRING_PX_PER_FT
+        return (lod_tier(scale),
+                max(6, min(11, int(9 * scale))),
+                max(6, min(9, int(8 * scale))),
+                tuple(detail and h * scale >= 8 for h in min_string_h),
+                tuple(detail and w * scale > 14 for w in label_w))
+
+    def _stale_groups(self, view):
+        """Group indices whose canvas items must be deleted and, if visible, redrawn.
+
+        That is groups marked by _invalidate_groups, groups entering or leaving
+        the view, groups whose layout dict was replaced, and groups whose LOD
+        changed with the zoom. Retained groups that were only scaled get their
+        motor dots re-sized instead, since canvas.scale stretches the ovals.
+        """
+        stale = set(self._dirty_groups)
+        for group_idx, group_data in enumerate(self.group_layout):
+            entry = self._group_scene.get(group_idx)
+            if entry is None:
+                if self._group_in_view(group_data, view):
+                    stale.add(group_idx)
+            elif (entry['layout'] is not group_data
+                    or not self._group_in_view(group_data, view)
+                    or entry['lod'] != self._group_lod(entry['min_string_h'], entry['label_w'])):
+                stale.add(group_idx)
+            elif entry['scale'] != self.scale:
+                dot_r = max(2, min(4, 3 * self.scale))
+                for item in self.canvas.find_withtag(f'group_{group_idx}&&motor_dot'):
+                    x1, y1, x2, y2 = self.canvas.coords(item)
+                    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+                    self.canvas.coords(item, cx - dot_r, cy - dot_r, cx + dot_r, cy + dot_r)
+                entry['scale'] = self.scale
+        stale.update(i for i in self._group_scene if i >= len(self.group_layout))
+        return stale
+
+    def _draw_group(self, group_idx, tracker_offset):
+        """Create one group's canvas items and return its retained-scene entry.
+
+        Items are tagged 'world', 'group' and 'group_<idx>' so the group can be
+        dropped on its own. The entry holds the group's string hit-test
+        polygons and what _group_lod needs to tell when a zoom invalidates it.
+
+        In the 'group' LOD tier the trackers collapse into one footprint per
+        run of same-colored trackers; motors and tracker labels are only drawn
+        in the 'string' tier.
+        """
+        group_data = self.group_layout[group_idx]
+        pitch = group_data.get('row_spacing_ft', getattr(self, 'tracker_pitch_ft', 20))
+        gx = group_data['x']
+        gy = group_data['y']
+        is_selected = (group_idx in self.selected_group_indices)
+        rotation_deg = group_data.get('rotation_deg', 0.0)
+        vis_min = group_data.get('visual_min_y', 0)
+        vis_max = group_data.get('visual_max_y', group_data['length_ft'])
+        max_width = getattr(self, 'max_tracker_width_ft', 6)
+        gtags = ('world', 'group', f'group_{group_idx}')
+        tier = lod_tier(self.scale)
+        string_rects = []
+        min_string_h = []   # per tracker, world ft — see _group_lod
+        label_w = []        # per tracker outline width at scale 1
+        footprint_spans = []
+        footprint_colors = []
+        rot_cx = gx + group_data['width_ft'] / 2
+        rot_cy = gy + (vis_min + vis_max) / 2
+
+        def _wc(wx, wy, _rcx=rot_cx, _rcy=rot_cy, _rd=rotation_deg):
+            """World-to-canvas with optional group rotation applied."""
+            if _rd != 0:
+                wx, wy = self._rotate_point(_rcx, _rcy, wx, wy, _rd)
+            return self.world_to_canvas(wx, wy)
+
+        def _rect_as_poly(x1, y1, x2, y2, _rcx=rot_cx, _rcy=rot_cy, _rd=rotation_deg):
+            """Return flat canvas coord list for a rotated rectangle polygon."""
+            corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+            pts = []
+            for wx, wy in corners:
+                if _rd != 0:
+                    wx, wy = self._rotate_point(_rcx, _rcy, wx, wy, _rd)
+                cx2, cy2 = self.world_to_canvas(wx, wy)
+                pts.extend([cx2, cy2])
+            return pts
+
+        def _rect_as_poly_world(x1, y1, x2, y2, _rcx=rot_cx, _rcy=rot_cy, _rd=rotation_deg):
+            """Return flat world-coord list for a rotated rectangle (rotation baked in)."""
+            corners = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+            pts = []
+            for wx, wy in corners:
+                if _rd != 0:
+                    wx, wy = self._rotate_point(_rcx, _rcy, wx, wy, _rd)
+                pts.extend([wx, wy])
+            return pts
+
+        # Draw selection highlight behind group (using visual bounds)
+        if is_selected:
+            pad = max_width * 0.3
+            h_poly = _rect_as_poly(
+                gx - pad, gy + vis_min - pad,
+                gx + group_data['width_ft'] + pad, gy + vis_max + pad
+            )
+            self.canvas.create_polygon(
+                *h_poly, fill='', outline='#4A90D9', width=2, tags=gtags
+            )
+        
+        # Draw group label
+        label_x, label_y = _wc(
+            gx - max_width * 0.5,
+            gy + group_data['length_ft'] / 2
+        )
+        font_size = max(6, min(11, int(9 * self.scale)))
+        self._draw_text_with_bg(
+            label_x, label_y,
+            text=group_data['name'], font=('Helvetica', font_size),
+            fill='#4A90D9' if is_selected else '#333333', anchor='e',
+            bg_required=False, tags=gtags
+        )
+        
+        for t_idx, tracker in enumerate(group_data['trackers']):
+            spt = tracker['strings_per_tracker']
+            assignments = tracker['assignments']
+            t_width = tracker.get('width_ft', max_width)
+            t_length = tracker.get('length_ft', 100)
+            
+            # X position within group
+            _t_local_x = tracker.get('local_x_idx', t_idx)
+            tx = gx + _t_local_x * pitch
+            # Center tracker within pitch slot
+            tx_offset = (max_width - t_width) / 2 if max_width > t_width else 0
+
+            # Driveline angle: offset each tracker in Y
+            angle_y_offset = _t_local_x * pitch * group_data.get('driveline_tan', 0.0)
+
+            # Align tracker vertically within the group
+            _talign = group_data.get('tracker_alignment', 'motor')
+            group_length = group_data.get('length_ft', t_length)
+            if _talign == 'top':
+                ty = gy + angle_y_offset
+            elif _talign == 'bottom':
+                ty = gy + (group_length - t_length) + angle_y_offset
+            elif tracker.get('has_motor', False) and group_data.get('motor_y_ft', None) is not None:
+                ty = gy + (group_data['motor_y_ft'] - tracker['motor_y_ft']) + angle_y_offset
+            else:
+                # Center alignment fallback
+                ty = gy + (group_length - t_length) / 2 + angle_y_offset
+            # Per-string height — adjust for partial strings
+            partial_mods = tracker.get('partial_module_count', 0)
+            partial_side = tracker.get('partial_string_side', 'north')
+            full_str_count = tracker.get('full_string_count', spt)
+            mps_for_height = 26  # fallback
+            
+            ref = tracker.get('template_ref')
+            if partial_mods > 0 and ref and ref in self.enabled_templates:
+                mps_for_height = self.enabled_templates[ref].get('modules_per_string', 26)
+            
+            if partial_mods > 0 and full_str_count > 0:
+                total_mods = full_str_count * mps_for_height + partial_mods
+                module_extent = t_length
+                full_height = (module_extent * mps_for_height / total_mods) if total_mods > 0 else module_extent
+                partial_height = (module_extent * partial_mods / total_mods) if total_mods > 0 else 0
+                
+                # Build height list per effective string slot
+                # Always include the partial band (even for right-of-pair trackers)
+                string_heights = []
+                has_owned_partial = (spt > full_str_count)
+                draw_spt = spt + (1 if not has_owned_partial else 0)  # Add unowned partial band
+                
+                if partial_side == 'north':
+                    string_heights.append(partial_height)  # Always draw partial band
+                    for _ in range(full_str_count):
+                        string_heights.append(full_height)
+                else:  # south
+                    for _ in range(full_str_count):
+                        string_heights.append(full_height)
+                    string_heights.append(partial_height)  # Always draw partial band
+            else:
+                string_height = t_length / spt if spt > 0 else t_length
+                string_heights = [string_height] * int(spt)
+            
+            # Build string colors
+            string_colors = []
+            for assignment in assignments:
+                for _ in range(assignment['strings']):
+                    string_colors.append(assignment['color'])
+            
+            # Determine global tracker index for device highlighting
+            global_tracker_idx = tracker_offset + t_idx
+            
+            # Check if we're highlighting a selected device or pad
+            highlighting = False
+            selected_strings = set()
+            
+            if self.inspect_mode and hasattr(self, 'device_positions') and self.device_positions:
+                if self.selected_device_idx is not None:
+                    highlighting = True
+                    dev = self.device_positions[self.selected_device_idx]
+                    assigned = dev.get('assigned_strings', {})
+                    selected_strings = assigned.get(global_tracker_idx, set())
+                elif self.selected_pad_inspect_idx is not None:
+                    highlighting = True
+                    # Collect strings from ALL devices assigned to this pad
+                    pad = self.pads[self.selected_pad_inspect_idx] if self.selected_pad_inspect_idx < len(self.pads) else None
+                    if pad:
+                        for dev_idx in pad.get('assigned_devices', []):
+                            if dev_idx < len(self.device_positions):
+                                dev = self.device_positions[dev_idx]
+                                assigned = dev.get('assigned_strings', {})
+                                selected_strings.update(assigned.get(global_tracker_idx, set()))
+            
+            # Draw each string (including unowned partial bands)
+            draw_count = len(string_heights)
+            _hl = getattr(self, '_highlighted_strings', set())
+
+            # First pass: compute render attributes per string slot
+            _str_attrs = []  # (color, outline_color, outline_width, is_unowned_partial)
+            for s_idx in range(draw_count):
+                is_unowned_partial = (partial_mods > 0 and spt <= full_str_count and
+                                     ((partial_side == 'north' and s_idx == 0) or
+                                      (partial_side == 'south' and s_idx == draw_count - 1)))
+                if is_unowned_partial:
+                    color = '#D4C878'
+                else:
+                    if partial_mods > 0 and partial_side == 'north':
+                        color_idx = s_idx - 1
+                        if spt > full_str_count and s_idx == 0:
+                            color_idx = 0
+                    elif partial_mods > 0 and partial_side == 'south':
+                        if spt > full_str_count and s_idx == draw_count - 1:
+                            color_idx = spt - 1
+                        else:
+                            color_idx = s_idx
+                    else:
+                        color_idx = s_idx
+                    color = string_colors[color_idx] if 0 <= color_idx < len(string_colors) else '#D0D0D0'
+
+                if highlighting:
+                    if s_idx not in selected_strings:
+                        color = '#E0E0E0'
+                        outline_color = '#CCCCCC'
+                        outline_width = 1
+                    else:
+                        outline_color = '#555555'
+                        outline_width = 1
+                elif self.assigning_devices:
+                    color = '#E0E0E0'
+                    outline_color = '#CCCCCC'
+                    outline_width = 1
+                else:
+                    outline_color = '#555555'
+                    outline_width = 1
+
+                if (not is_unowned_partial and _hl and
+                        (global_tracker_idx, s_idx) in _hl):
+                    color = '#FFFF00'
+                    outline_color = '#DAA520'
+                    outline_width = 2
+
+                _str_attrs.append((color, outline_color, outline_width, is_unowned_partial))
+
+            # Second pass: emit polygons.
+            # When individual strings are tall enough on screen to interact with,
+            # draw one polygon per string so the borders are visible. Below that
+            # threshold, coalesce consecutive same-key strings to reduce item count.
+            # Zoomed out to the 'group' tier, only the tracker's color is kept.
+            min_string_h.append(min(string_heights) if string_heights else 0)
+            min_str_h_px = min_string_h[-1] * self.scale
+            if tier == 'group':
+                footprint_spans.append((tx + tx_offset, tx + tx_offset + t_width, ty, ty + t_length))
+                footprint_colors.append(dominant_color(
+                    [a[0] for a in _str_attrs if not a[3]] or [a[0] for a in _str_attrs]))
+            elif tier == 'string' and min_str_h_px >= 8:
+                # Detail mode — individual string polygons
+                sy = ty
+                for s_idx in range(draw_count):
+                    color, outline_color, outline_width, _ = _str_attrs[s_idx]
+                    sh = string_heights[s_idx]
+                    poly = _rect_as_poly(tx + tx_offset, sy, tx + tx_offset + t_width, sy + sh)
+                    self.canvas.create_polygon(*poly, fill=color, outline=outline_color, width=outline_width, tags=gtags)
+                    sy += sh
+            else:
+                # Performance mode — one polygon per run of consecutive same-key strings
+                sy_cursor = ty
+                run_start = 0
+                while run_start < draw_count:
+                    run_color, run_outline, run_width, _ = _str_attrs[run_start]
+                    run_key = (run_color, run_outline, run_width)
+                    run_end = run_start
+                    while (run_end + 1 < draw_count and
+                           _str_attrs[run_end + 1][:3] == run_key):
+                        run_end += 1
+                    run_sy = sy_cursor
+                    for i in range(run_start, run_end + 1):
+                        sy_cursor += string_heights[i]
+                    poly = _rect_as_poly(
+                        tx + tx_offset, run_sy,
+                        tx + tx_offset + t_width, sy_cursor
+                    )
+                    self.canvas.create_polygon(*poly, fill=run_color, outline=run_outline, width=run_width, tags=gtags)
+                    run_start = run_end + 1
+
+            # Third pass: record per-string hit-test polygons (no polygon emission)
+            sy = ty
+            for s_idx in range(draw_count):
+                sh = string_heights[s_idx] if s_idx < len(string_heights) else string_heights[-1]
+                poly_w = _rect_as_poly_world(tx + tx_offset, sy, tx + tx_offset + t_width, sy + sh)
+                _, _, _, is_unowned_partial = _str_attrs[s_idx]
+                string_rects.append({
+                    'tracker_idx': global_tracker_idx,
+                    's_idx': s_idx,
+                    'poly_world': poly_w,
+                    'is_unowned_partial': is_unowned_partial,
+                })
+                sy += sh
+
+            if tier == 'group':
+                label_w.append(0)
+                continue
+
+            # Tracker outline
+            out_poly = _rect_as_poly(
+                tx + tx_offset - 0.5, ty - 0.5,
+                tx + tx_offset + t_width + 0.5, ty + t_length + 0.5
+            )
+            self.canvas.create_polygon(
+                *out_poly, fill='', outline='#222222', width=1, tags=gtags
+            )
+            # Keep ox1/oy1 for pixel_width calculation (use first two corners)
+            ox1, oy1 = out_poly[0], out_poly[1]
+            ox2, oy2 = out_poly[2], out_poly[3]
+
+            # Motor indicator
+            if tier == 'string' and tracker.get('has_motor', False):
+                motor_y = tracker['motor_y_ft']
+                motor_gap = tracker['motor_gap_ft']
+
+                motor_world_y = ty + motor_y
+                motor_x1 = tx + tx_offset - 0.3
+                motor_x2 = tx + tx_offset + t_width + 0.3
+
+                m_poly = _rect_as_poly(motor_x1, motor_world_y, motor_x2, motor_world_y + motor_gap)
+                self.canvas.create_polygon(
+                    *m_poly, fill='#666666', outline='#444444', width=1, tags=gtags
+                )
+
+                motor_cx = sum(m_poly[0::2]) / 4
+                motor_cy = sum(m_poly[1::2]) / 4
+                dot_r = max(2, min(4, 3 * self.scale))
+                self.canvas.create_oval(
+                    motor_cx - dot_r, motor_cy - dot_r,
+                    motor_cx + dot_r, motor_cy + dot_r,
+                    fill='#FF8800', outline='#CC6600', width=1, tags=gtags + ('motor_dot',)
+                )
+
+            # Tracker label — use global tracker index to match info panel / assignments
+            label_cx, label_cy = _wc(tx + tx_offset + t_width / 2, ty + t_length + 2)
+            pixel_width = abs(ox2 - ox1)
+            label_w.append(pixel_width / self.scale if self.scale else 0)
+            if tier == 'string' and pixel_width > 14:
+                lbl_size = max(6, min(9, int(8 * self.scale)))
+                self._draw_text_with_bg(
+                    label_cx, label_cy,
+                    text=f"T{global_tracker_idx+1}", font=('Helvetica', lbl_size), fill='#555555',
+                    bg_required=False, tags=gtags
+                )
+
+        for color, footprint in group_footprints(footprint_spans, footprint_colors):
+            self.canvas.create_polygon(
+                *[c for wx, wy in footprint for c in _wc(wx, wy)],
+                fill=color, outline='#222222', width=1, tags=gtags
+            )
+
+        return {
+            'layout': group_data,
+            'scale': self.scale,
+            'min_string_h': min_string_h,
+            'label_w': label_w,
+            'lod': self._group_lod(min_string_h, label_w),
+            'string_rects': string_rects,
+        }
+
     def _draw_text_with_bg(self, x, y, text, font, fill='#333333', anchor='center', bg='white', pad=2, bg_required=True, tags='world'):
         """Draw canvas text, optionally with a white background rectangle for readability."""
         tid = self.canvas.create_text(x, y, text=text, font=font, fill=fill, anchor=anchor, tags=tags)
@@ -2894,15 +3037,32 @@ class SitePreviewWindow(tk.Toplevel):
             j = i
         return inside
 
+    def _string_index(self):
+        """Uniform grid over the world-space bounding boxes of _string_rects.
+
+        Keys are positions in _string_rects. Built lazily on the first hit test
+        after draw() rebuilds the world layer, which also discards the old grid,
+        so pan/zoom redraws that keep the world layer reuse it.
+        """
+        if self._string_grid is None:
+            boxes = {}
+            for i, rect in enumerate(self._string_rects):
+                poly = rect['poly_world']
+                boxes[i] = bbox_of(list(zip(poly[0::2], poly[1::2])))
+            self._string_grid = UniformGrid.from_boxes(boxes)
+        return self._string_grid
+
     def hit_test_string(self, cx, cy):
         """Return (tracker_idx, s_idx) for the string under canvas coords, or None.
 
-        Iterates _string_rects in reverse (topmost drawn wins). Unowned partial
-        bands are excluded — they have no device owner to move.
+        Candidates come from the string grid; among those, the last drawn
+        (topmost) polygon containing the point wins. Unowned partial bands are
+        excluded — they have no device owner to move.
         Tests against poly_world so results stay correct after pan/zoom.
         """
         wx, wy = self.canvas_to_world(cx, cy)
-        for rect in reversed(self._string_rects):
+        for i in sorted(self._string_index().query_point(wx, wy), reverse=True):
+            rect = self._string_rects[i]
             if rect['is_unowned_partial']:
                 continue
             if self._point_in_polygon(wx, wy, rect['poly_world']):
@@ -2913,23 +3073,16 @@ class SitePreviewWindow(tk.Toplevel):
         """Return list of (tracker_idx, s_idx) whose polygon overlaps the canvas box.
 
         Uses the polygon's axis-aligned bounding box in world space, so results
-        stay correct after pan/zoom without rebuilding _string_rects.
+        stay correct after pan/zoom without rebuilding _string_rects. Results
+        are in draw order.
         """
         wx1, wy1 = self.canvas_to_world(cx1, cy1)
         wx2, wy2 = self.canvas_to_world(cx2, cy2)
-        x_lo, x_hi = min(wx1, wx2), max(wx1, wx2)
-        y_lo, y_hi = min(wy1, wy2), max(wy1, wy2)
+        box = (min(wx1, wx2), min(wy1, wy2), max(wx1, wx2), max(wy1, wy2))
         results = []
-        for rect in self._string_rects:
-            if rect['is_unowned_partial']:
-                continue
-            poly = rect['poly_world']
-            n = len(poly) // 2
-            px_vals = [poly[i * 2] for i in range(n)]
-            py_vals = [poly[i * 2 + 1] for i in range(n)]
-            # Overlap: neither box is fully outside the other on either axis
-            if (max(px_vals) >= x_lo and min(px_vals) <= x_hi and
-                    max(py_vals) >= y_lo and min(py_vals) <= y_hi):
+        for i in sorted(self._string_index().query(box)):
+            rect = self._string_rects[i]
+            if not rect['is_unowned_partial']:
                 results.append((rect['tracker_idx'], rect['s_idx']))
         return results
 
@@ -3170,97 +3323,112 @@ class SitePreviewWindow(tk.Toplevel):
         self._device_data = None
         self._device_metadata = None
 
+    def _group_overlap_geometry(self, g):
+        """World-space collision geometry for one group, cached until it changes.
+
+        Returns a dict with 'group_poly' (the group's parallelogram, (4, 2)),
+        'group_bbox', 'tracker_polys' ((N, 4, 2) array, one quad per tracker)
+        and 'tracker_bboxes' ((N, 4) array). The cache is keyed on the layout dict and a
+        signature of everything the polygons depend on, so dragging one
+        group only rebuilds that group's polygons.
+        """
+        trackers = g['trackers']
+        signature = (
+            g['x'], g['y'], g['width_ft'], g['length_ft'],
+            g.get('driveline_tan', 0.0), g.get('rotation_deg', 0.0),
+            g.get('visual_min_y'), g.get('visual_max_y'),
+            g.get('visual_min_y_base'), g.get('visual_max_y_base'),
+            g.get('motor_y_ft', 0), g.get('tracker_alignment', 'motor'),
+            g.get('row_spacing_ft', self.tracker_pitch_ft),
+            self.max_tracker_width_ft, id(trackers), len(trackers),
+        )
+        cache = self._overlap_geometry_cache
+        cached = cache.get(id(g))
+        if cached is not None and cached[0] is g and cached[1] == signature:
+            return cached[2]
+
+        gx = g['x']
+        gy = g['y']
+        w = g['width_ft']
+        g_len = g['length_ft']
+        dt = g.get('driveline_tan', 0.0)
+        rd = g.get('rotation_deg', 0.0)
+        vis_min_base = g.get('visual_min_y_base', g.get('visual_min_y', 0))
+        vis_max_base = g.get('visual_max_y_base', g.get('visual_max_y', g_len))
+        vis_min = g.get('visual_min_y', vis_min_base)
+        vis_max = g.get('visual_max_y', vis_max_base)
+        rcx = gx + w / 2
+        rcy = gy + (vis_min + vis_max) / 2
+
+        group_poly = [
+            (gx,     gy + vis_min_base),
+            (gx,     gy + vis_max_base),
+            (gx + w, gy + vis_max_base + w * dt),
+            (gx + w, gy + vis_min_base + w * dt),
+        ]
+        if rd:
+            group_poly = [self._rotate_point(rcx, rcy, px, py, rd) for px, py in group_poly]
+
+        # One 4-corner polygon per tracker, as an (N, 4, 2) array
+        ref_motor = g.get('motor_y_ft', 0)
+        alignment = g.get('tracker_alignment', 'motor')
+        pitch = g.get('row_spacing_ft', self.tracker_pitch_ft)
+        t_len = np.array([t.get('length_ft', g_len) for t in trackers], dtype=float)
+        t_w = np.array([t.get('width_ft', self.max_tracker_width_ft) for t in trackers], dtype=float)
+        local_x = np.array([t.get('local_x_idx', t_i) for t_i, t in enumerate(trackers)], dtype=float)
+        if alignment == 'top':
+            yo = np.zeros(len(trackers))
+        elif alignment == 'bottom':
+            yo = g_len - t_len
+        else:
+            yo = ref_motor - np.array([t.get('motor_y_ft', 0) for t in trackers], dtype=float)
+        tracker_polys = geometry_kernels.rect_polys(
+            gx + local_x * pitch, gy + yo + local_x * pitch * dt, t_w, t_len)
+        if rd:
+            tracker_polys = geometry_kernels.rotate_polys(tracker_polys, rcx, rcy, rd)
+
+        geometry = {
+            'group_poly': np.array(group_poly, dtype=float),
+            'group_bbox': bbox_of(group_poly),
+            'tracker_polys': tracker_polys,
+            'tracker_bboxes': geometry_kernels.poly_bboxes(tracker_polys),
+        }
+        cache[id(g)] = (g, signature, geometry)
+        return geometry
+
     def _check_overlaps(self):
         """Check for overlapping groups and return list of overlapping pair indices.
 
-        Two-pass: group-level parallelogram SAT as a fast pre-filter, then
-        per-tracker rectangle SAT for the pairs that survive the pre-filter.
-        Only reports a collision when actual tracker rectangles intersect.
+        Broad phase: a uniform grid over group bounding boxes yields candidate
+        pairs, which are then filtered by group-level parallelogram SAT (one
+        batched geometry_kernels call). Narrow phase: per-tracker rectangle
+        SAT, pruned to tracker pairs whose bounding boxes touch. Only reports
+        a collision when actual tracker rectangles intersect.
         """
+        geometries = [self._group_overlap_geometry(g) for g in self.group_layout]
+        # Drop cache entries for groups no longer in the layout
+        live = {id(g) for g in self.group_layout}
+        cache = self._overlap_geometry_cache
+        for key in [k for k in cache if k not in live]:
+            del cache[key]
+
+        group_grid = UniformGrid.from_boxes({i: geo['group_bbox'] for i, geo in enumerate(geometries)})
+        candidates = group_grid.candidate_pairs()
+        if not candidates:
+            return []
+        group_hits = geometry_kernels.sat_overlap(
+            np.array([geometries[i]['group_poly'] for i, _ in candidates]),
+            np.array([geometries[j]['group_poly'] for _, j in candidates]))
 
-        def _group_poly(g):
-            gx = g['x']
-            gy = g['y']
-            w = g['width_ft']
-            dt = g.get('driveline_tan', 0.0)
-            vis_min_base = g.get('visual_min_y_base', g.get('visual_min_y', 0))
-            vis_max_base = g.get('visual_max_y_base', g.get('visual_max_y', g['length_ft']))
-            vis_min = g.get('visual_min_y', vis_min_base)
-            vis_max = g.get('visual_max_y', vis_max_base)
-            rd = g.get('rotation_deg', 0.0)
-            rcx = gx + w / 2
-            rcy = gy + (vis_min + vis_max) / 2
-            corners = [
-                (gx,     gy + vis_min_base),
-                (gx,     gy + vis_max_base),
-                (gx + w, gy + vis_max_base + w * dt),
-                (gx + w, gy + vis_min_base + w * dt),
-            ]
-            if rd:
-                corners = [self._rotate_point(rcx, rcy, px, py, rd) for px, py in corners]
-            return corners
-
-        def _tracker_polys(g):
-            """Return a list of 4-corner polygons, one per tracker in g."""
-            polys = []
-            ref_motor = g.get('motor_y_ft', 0)
-            alignment = g.get('tracker_alignment', 'motor')
-            dt = g.get('driveline_tan', 0.0)
-            pitch = g.get('row_spacing_ft', self.tracker_pitch_ft)
-            rd = g.get('rotation_deg', 0.0)
-            gx, gy = g['x'], g['y']
-            g_len = g['length_ft']
-            vis_min = g.get('visual_min_y', 0)
-            vis_max = g.get('visual_max_y', g_len)
-            rcx = gx + g['width_ft'] / 2
-            rcy = gy + (vis_min + vis_max) / 2
-            for t_i, t in enumerate(g['trackers']):
-                t_len = t.get('length_ft', g_len)
-                t_w = t.get('width_ft', self.max_tracker_width_ft)
-                _ov_local_x = t.get('local_x_idx', t_i)
-                if alignment == 'top':
-                    yo = 0.0
-                elif alignment == 'bottom':
-                    yo = g_len - t_len
-                else:
-                    yo = ref_motor - t.get('motor_y_ft', 0)
-                tx = gx + _ov_local_x * pitch
-                ty = gy + yo + _ov_local_x * pitch * dt
-                corners = [
-                    (tx,       ty),
-                    (tx + t_w, ty),
-                    (tx + t_w, ty + t_len),
-                    (tx,       ty + t_len),
-                ]
-                if rd:
-                    corners = [self._rotate_point(rcx, rcy, px, py, rd) for px, py in corners]
-                polys.append(corners)
-            return polys
-
-        def _sat(a, b):
-            for poly in (a, b):
-                n = len(poly)
-                for k in range(n):
-                    x1, y1 = poly[k]
-                    x2, y2 = poly[(k + 1) % n]
-                    nx, ny = -(y2 - y1), (x2 - x1)
-                    pa = [nx * px + ny * py for px, py in a]
-                    pb = [nx * px + ny * py for px, py in b]
-                    if max(pa) < min(pb) or max(pb) < min(pa):
-                        return False
-            return True
-
-        group_polys = [_group_poly(g) for g in self.group_layout]
         overlaps = []
-        for i in range(len(self.group_layout)):
-            for j in range(i + 1, len(self.group_layout)):
-                if not _sat(group_polys[i], group_polys[j]):
-                    continue
-                # Groups' bounding shapes overlap — check individual trackers.
-                tp_i = _tracker_polys(self.group_layout[i])
-                tp_j = _tracker_polys(self.group_layout[j])
-                if any(_sat(pi, pj) for pi in tp_i for pj in tp_j):
-                    overlaps.append((i, j))
+        for (i, j), hit in zip(candidates, group_hits):
+            if not hit:
+                continue
+            # Groups' bounding shapes overlap — check individual trackers.
+            geo_i, geo_j = geometries[i], geometries[j]
+            if geometry_kernels.any_overlap(geo_i['tracker_polys'], geo_i['tracker_bboxes'],
+                                            geo_j['tracker_polys'], geo_j['tracker_bboxes']):
+                overlaps.append((i, j))
         return overlaps
 
     def _draw_overlap_warnings(self):
@@ -6734,7 +6902,8 @@ class SitePreviewWindow(tk.Toplevel):
     def _draw_routes(self):
         """Draw routes from each device to its assigned pad.
 
-        Devices assigned to a corridor draw three-leg paths (row→corridor→pad).
+        Devices assigned to a corridor draw three-leg paths (row→corridor→pad),
+        changing roads where corridors meet if that is shorter.
         Unassigned devices draw the original L-shaped Manhattan path.
         """
         if not self.show_routes_var.get():
@@ -6756,6 +6925,7 @@ class SitePreviewWindow(tk.Toplevel):
         for c_idx, corridor in enumerate(self.corridors):
             for dev_idx in corridor.get('assigned_devices', []):
                 device_to_corridor[dev_idx] = c_idx
+        corridor_network = None  # CorridorNetwork over all corridors, built on first use
 
         for dev_idx, dev in enumerate(self.device_positions):
             pad_idx = device_to_pad.get(dev_idx)
@@ -6786,9 +6956,11 @@ class SitePreviewWindow(tk.Toplevel):
                 pts = corridor.get('points', [])
                 if len(pts) >= 2:
                     try:
-                        from src.utils.corridor_routing import three_leg_distance
-                        total_dist, path_geom = three_leg_distance(
-                            (dev_cx, dev_cy), (pad_cx, pad_cy), pts
+                        if corridor_network is None:
+                            from src.utils.corridor_routing import CorridorNetwork
+                            corridor_network = CorridorNetwork([c.get('points', []) for c in self.corridors])
+                        total_dist, path_geom = corridor_network.route(
+                            c_idx, (dev_cx, dev_cy), (pad_cx, pad_cy)
                         )
                         # Draw the full three-leg path
                         canvas_pts = [self.world_to_canvas(wx, wy) for wx, wy in path_geom]
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
-import json
+import io
 import os
+from itertools import chain
 from typing import Dict, List, Any, Optional
 from ..models.block import BlockConfig, WiringType, WiringConfig, HarnessGroup
 from openpyxl import Workbook
@@ -8,7 +10,47 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from ..models.device import HarnessConnection, CombinerBoxConfig
 import re
-from .pricing_lookup import get_pricing_lookup
+from .pricing_lookup import get_pricing_lookup, write_copper_sensitivity_sheet
+from .part_index import get_part_index
+from .data_store import load_library
+from .excel_stream import add_named_styles, save_with_streamed_sheets, styled_row
+from .bom_tables import TABLE_FORMATS, write_bom_tables
+
+
+# (cable type, polarity, route id substrings) in matching order; extender
+# routes are matched separately, so one route can count toward both lists
+_ROUTE_PATTERNS = (
+    ('string', 'Positive', ("pos_src", "pos_node", "pos_string")),
+    ('string', 'Negative', ("neg_src", "neg_node", "neg_string")),
+    ('whip', 'Positive', ("pos_dev", "pos_main", "whip_pos", "pos_whip")),
+    ('whip', 'Negative', ("neg_dev", "neg_main", "whip_neg", "neg_whip")),
+)
+_EXTENDER_PATTERNS = (
+    ('extender', 'Positive', ("pos_extender",)),
+    ('extender', 'Negative', ("neg_extender",)),
+)
+_CABLE_TYPE_NAMES = {'string': 'String Cable', 'whip': 'Whip Cable', 'extender': 'Extender Cable'}
+_CABLE_TYPE_ORDER = {'string': 0, 'whip': 1, 'extender': 2}
+
+
+def _route_cable_types(route_id):
+    """[(cable type, polarity)] a cable route counts toward, from its id"""
+    matches = []
+    for patterns in (_ROUTE_PATTERNS, _EXTENDER_PATTERNS):
+        for cable_type, polarity, substrings in patterns:
+            if any(sub in route_id for sub in substrings):
+                matches.append((cable_type, polarity))
+                break
+    return matches
+
+
+def _excel_value(value):
+    """Cell value as DataFrame.to_excel would write it (NaN/None -> None, NumPy -> Python)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
 
 
 class BOMGenerator:
@@ -36,6 +78,7 @@ class BOMGenerator:
         self.combiner_box_library = self.load_combiner_box_library()
         self.extender_library = self.load_extender_library()
         self.whip_library = self.load_whip_library()
+        self.part_index = get_part_index()
 
     def _get_cable_size(self, harness_group: Optional[HarnessGroup], cable_type: str, block: BlockConfig) -> str:
         """
@@ -124,36 +167,45 @@ class BOMGenerator:
         """
         Get cable size for a specific segment, determining which harness it belongs to
         """
-        block_name = getattr(block, 'block_id', 'Unknown Block')
+        tracker_idx = harness_idx = None
         
         # Handle new dict format with route information
         if isinstance(segment, dict) and 'route_id' in segment:
-            route_id = segment['route_id']
-            tracker_idx, harness_idx = self._parse_route_harness_info(route_id)
-            
-            # If we found harness info, try to get harness-specific size
-            if tracker_idx is not None and harness_idx is not None:
-                # Get the tracker to find string count
-                if tracker_idx < len(block.tracker_positions):
-                    pos = block.tracker_positions[tracker_idx]
-                    string_count = len(pos.strings)
-                    
-                    # Look up the harness group
-                    if (hasattr(block.wiring_config, 'harness_groupings') and
-                        string_count in block.wiring_config.harness_groupings):
-                        harness_groups = block.wiring_config.harness_groupings[string_count]
-                        if harness_idx < len(harness_groups):
-                            harness_group = harness_groups[harness_idx]                            
-                            # Get cable size from harness group
-                            if cable_type == 'string' and harness_group.string_cable_size:
-                                return harness_group.string_cable_size
-                            elif cable_type == 'extender' and harness_group.extender_cable_size:
-                                return harness_group.extender_cable_size
-                            elif cable_type == 'whip' and harness_group.whip_cable_size:
-                                return harness_group.whip_cable_size
-                            elif cable_type == 'harness':
-                                return harness_group.cable_size
+            tracker_idx, harness_idx = self._parse_route_harness_info(segment['route_id'])
+        
+        return self._harness_cable_size(block, tracker_idx, harness_idx, cable_type)
+    
+    def _harness_cable_size(self, block: BlockConfig, tracker_idx, harness_idx, cable_type: str) -> str:
+        """
+        Cable size of a tracker's harness, falling back to the block defaults
         
+        Args:
+            tracker_idx, harness_idx: 0-based indices from _parse_route_harness_info (may be None)
+            cable_type: 'string', 'extender', 'whip' or 'harness'
+        """
+        # If we found harness info, try to get harness-specific size
+        if tracker_idx is not None and harness_idx is not None:
+            # Get the tracker to find string count
+            if tracker_idx < len(block.tracker_positions):
+                pos = block.tracker_positions[tracker_idx]
+                string_count = len(pos.strings)
+                
+                # Look up the harness group
+                if (hasattr(block.wiring_config, 'harness_groupings') and
+                    string_count in block.wiring_config.harness_groupings):
+                    harness_groups = block.wiring_config.harness_groupings[string_count]
+                    if harness_idx < len(harness_groups):
+                        harness_group = harness_groups[harness_idx]
+                        # Get cable size from harness group
+                        if cable_type == 'string' and harness_group.string_cable_size:
+                            return harness_group.string_cable_size
+                        elif cable_type == 'extender' and harness_group.extender_cable_size:
+                            return harness_group.extender_cable_size
+                        elif cable_type == 'whip' and harness_group.whip_cable_size:
+                            return harness_group.whip_cable_size
+                        elif cable_type == 'harness':
+                            return harness_group.cable_size
+    
         # Fall back to block-level defaults
         if cable_type == 'string':
             size = block.wiring_config.string_cable_size
@@ -200,9 +252,6 @@ class BOMGenerator:
                     'category': 'Structural'
                 }
             
-            # Calculate cable lengths
-            cable_lengths = block.calculate_cable_lengths()
-            
             if not block.wiring_config:
                 # Add DC Feeder cable even if no wiring config
                 dc_feeder_distance = getattr(block, 'dc_feeder_distance_ft', 0.0)
@@ -233,6 +282,7 @@ class BOMGenerator:
             
             if block.wiring_config.wiring_type == WiringType.HOMERUN:
                 # Split string cable by polarity
+                cable_lengths = block.calculate_cable_lengths()
                 string_cable_size = getattr(block.wiring_config, 'string_cable_size', '10 AWG')
                 
                 if 'string_cable_positive' in cable_lengths:
@@ -254,25 +304,6 @@ class BOMGenerator:
                         'unit': 'feet',
                         'category': 'eBOS'
                     }
-                    
-                # Get whip cable size - check if we have harness-specific sizes
-                whip_cable_sizes = {}  # Change to dict to track which harnesses use which size
-                if hasattr(block.wiring_config, 'harness_groupings'):
-                    for string_count, harness_groups in block.wiring_config.harness_groupings.items():
-                        for hg_idx, hg in enumerate(harness_groups):
-                            whip_size = self._get_cable_size(hg, 'whip', block)
-                            key = f"{string_count}_{hg_idx}"
-                            whip_cable_sizes[key] = whip_size
-
-                # Check if all harnesses use the same whip size
-                unique_whip_sizes = set(whip_cable_sizes.values())
-                if len(unique_whip_sizes) == 1:
-                    whip_cable_size = unique_whip_sizes.pop()
-                elif len(unique_whip_sizes) == 0:
-                    whip_cable_size = getattr(block.wiring_config, 'whip_cable_size', '8 AWG')
-                else:
-                    # Multiple sizes - this will be handled in segment analysis
-                    whip_cable_size = None
                         
             else:  # HARNESS configuration
                 # Add harnesses by number of strings they connect - split by polarity
@@ -333,52 +364,11 @@ class BOMGenerator:
                         'unit': 'units',
                         'category': 'eBOS'
                     }
-                
-                # Get whip cable size - check if we have harness-specific sizes
-                whip_cable_sizes = {}  # Change to dict to track which harnesses use which size
-                if hasattr(block.wiring_config, 'harness_groupings'):
-                    for string_count, harness_groups in block.wiring_config.harness_groupings.items():
-                        for hg_idx, hg in enumerate(harness_groups):
-                            whip_size = self._get_cable_size(hg, 'whip', block)
-                            key = f"{string_count}_{hg_idx}"
-                            whip_cable_sizes[key] = whip_size
-
-                # Check if all harnesses use the same whip size
-                unique_whip_sizes = set(whip_cable_sizes.values())
-                if len(unique_whip_sizes) == 1:
-                    whip_cable_size = unique_whip_sizes.pop()
-                elif len(unique_whip_sizes) == 0:
-                    whip_cable_size = getattr(block.wiring_config, 'whip_cable_size', '8 AWG')
-                else:
-                    # Multiple sizes - this will be handled in segment analysis
-                    whip_cable_size = None
-
-                # Get extender cable size - check if we have harness-specific sizes
-                extender_cable_sizes = {}  # Change to dict to track which harnesses use which size
-                if hasattr(block.wiring_config, 'harness_groupings'):
-                    for string_count, harness_groups in block.wiring_config.harness_groupings.items():
-                        for hg_idx, hg in enumerate(harness_groups):
-                            extender_size = self._get_cable_size(hg, 'extender', block)
-                            key = f"{string_count}_{hg_idx}"
-                            extender_cable_sizes[key] = extender_size
-
-                # Check if all harnesses use the same extender size
-                unique_extender_sizes = set(extender_cable_sizes.values())
-                if len(unique_extender_sizes) == 1:
-                    extender_cable_size = unique_extender_sizes.pop()
-                elif len(unique_extender_sizes) == 0:
-                    extender_cable_size = getattr(block.wiring_config, 'extender_cable_size', '8 AWG')
-                else:
-                    # Multiple sizes - this will be handled in segment analysis
-                    extender_cable_size = None
             
             quantities[block_id] = block_quantities
         
-        # Store the original quantities before segment analysis
-        original_quantities = {}
-        for block_id, block_quantities in quantities.items():
-            original_quantities[block_id] = {k: v.copy() for k, v in block_quantities.items() if 'Whip Cable' in k and v['unit'] == 'feet'}
-        
+        # Whip, extender and string cable segments (with per-harness cable
+        # sizes) and the DC feeders come from the segment table
         quantities = self.analyze_wire_segments(quantities)
 
         return quantities
@@ -617,12 +607,13 @@ class BOMGenerator:
         summary_data = sorted(summary_data, key=sort_key)
 
         # Add part numbers and prices to summary data
-        pricing = get_pricing_lookup()
         for item in summary_data:
             item['Part Number'] = self.get_component_part_number(item)
-            
-            # Look up price - Extended Price will be a formula in Excel
-            unit_price = pricing.get_price(item['Part Number'])
+        
+        # Look up prices in one pass - Extended Price will be a formula in Excel
+        prices = get_pricing_lookup().get_prices(item['Part Number'] for item in summary_data)
+        for item in summary_data:
+            unit_price = prices[item['Part Number']]
             if unit_price is not None:
                 item['Unit Price'] = unit_price
 
@@ -888,8 +879,37 @@ class BOMGenerator:
         
         return pd.DataFrame(allocation_data)
 
+    def bom_tables(self) -> Dict[str, pd.DataFrame]:
+        """
+        Summary, detailed and block allocation DataFrames for the columnar export
+        
+        Returns:
+            {'summary': ..., 'detailed': ..., 'block_allocation': ...}
+        """
+        quantities = self.calculate_cable_quantities()
+        return {
+            'summary': self.generate_summary_data(quantities),
+            'detailed': self.generate_detailed_data(quantities),
+            'block_allocation': self.generate_block_allocation_data(),
+        }
+
+    def export_bom_tables(self, output_dir: str, stem: str = 'bom', formats=TABLE_FORMATS) -> List[str]:
+        """
+        Export the BOM tables as CSV and/or Parquet, one file per table
+        
+        Args:
+            output_dir: Folder to write into
+            stem: File name prefix
+            formats: Any of 'csv', 'parquet'
+            
+        Returns:
+            Paths of the files written
+        """
+        return write_bom_tables(self.bom_tables(), output_dir, stem=stem, formats=formats)
+
     def export_bom_to_excel_with_preview_data(self, filepath: str, project_info: Optional[Dict[str, Any]] = None, 
-                                          preview_data: List[Dict] = None) -> bool:
+                                          preview_data: List[Dict] = None,
+                                          open_after_export: bool = True) -> bool:
         """
         Export BOM to Excel using preview data from UI
         
@@ -897,6 +917,7 @@ class BOMGenerator:
             filepath: Path to save the Excel file
             project_info: Optional dictionary with project information
             preview_data: Data from the UI preview with correct part numbers
+            open_after_export: Open the saved workbook in Excel (os.startfile)
             
         Returns:
             True if export successful, False otherwise
@@ -973,8 +994,9 @@ class BOMGenerator:
             if project_info is None:
                 project_info = self.generate_project_info()
             
-            # Create Excel writer
-            writer = pd.ExcelWriter(filepath, engine='openpyxl')
+            # Sheets are assembled in memory and written out by
+            # save_with_streamed_sheets(); the writer's own buffer is never saved
+            writer = pd.ExcelWriter(io.BytesIO(), engine='openpyxl')
             
             # Transfer section header text to Part Number column before dropping Component Type
             excel_summary = summary_data.copy()
@@ -1033,11 +1055,9 @@ class BOMGenerator:
             # Drop Component Type column from detailed data before writing
             excel_detailed = detailed_data.drop(columns=['Component Type'], errors='ignore')
             
-            # Write detailed data  
-            excel_detailed.to_excel(writer, sheet_name='Block Details', index=False)
-            
-            # Add harness cable size information to Block Details sheet
-            self._add_harness_cable_info_to_block_details(writer, detailed_data)
+            # Block Details runs to tens of thousands of rows on big sites; it is
+            # streamed into this placeholder's position when the workbook is saved
+            writer.book.create_sheet('Block Details')
 
             # Add combiner box sheet if there are any combiner boxes
             # (combiner_box_count and device_configs already defined above)
@@ -1272,7 +1292,6 @@ class BOMGenerator:
 
             # Format sheets
             self._format_excel_sheet(workbook['BOM Summary'], excel_summary, start_row=16 + n_extra)
-            self._format_excel_sheet(workbook['Block Details'], excel_detailed)
 
             # Format block allocation sheet
             if 'Block Allocation' in workbook.sheetnames:
@@ -1283,14 +1302,20 @@ class BOMGenerator:
             last_col_letter = get_column_letter(num_cols)
             summary_sheet.auto_filter.ref = f"A15:{last_col_letter}{15 + len(excel_summary)}"
             
+            # Copper sensitivity: BOM cost at every copper tier
+            self._add_copper_sensitivity_sheet(workbook, summary_data)
+            
             # Save and open
-            writer.close()
+            save_with_streamed_sheets(workbook, filepath, {
+                'Block Details': lambda ws: self._write_block_details_sheet(ws, excel_detailed),
+            })
             writer = None
             
-            try:
-                os.startfile(filepath)
-            except Exception as e:
-                print(f"File was saved but could not be opened automatically: {str(e)}")
+            if open_after_export:
+                try:
+                    os.startfile(filepath)
+                except Exception as e:
+                    print(f"File was saved but could not be opened automatically: {str(e)}")
 
             return True
             
@@ -1306,21 +1331,27 @@ class BOMGenerator:
                 except:
                     pass
 
-    def _add_harness_cable_info_to_block_details(self, writer, detailed_data):
-        """Add harness-specific cable size information to Block Details sheet"""
+    def _add_copper_sensitivity_sheet(self, workbook, summary_data: pd.DataFrame):
+        """Add the Copper Sensitivity sheet from the BOM summary lines"""
+        if summary_data is None or summary_data.empty or 'Part Number' not in summary_data.columns:
+            return
+        lines = summary_data
+        if 'Component Type' in lines.columns:
+            lines = lines[~lines['Component Type'].astype(str).str.startswith('---')]
+        lines = lines[lines['Part Number'].notna() & pd.to_numeric(lines['Quantity'], errors='coerce').notna()]
+        if lines.empty:
+            return
+        
+        sweep = get_pricing_lookup().copper_sensitivity(lines['Part Number'], pd.to_numeric(lines['Quantity']))
+        descriptions = {}
+        if 'Description' in lines.columns:
+            descriptions = dict(zip(lines['Part Number'].astype(str).str.strip(), lines['Description'].fillna('')))
+        write_copper_sensitivity_sheet(workbook, sweep, descriptions=descriptions)
+
+    def _harness_cable_info(self) -> List[Dict[str, str]]:
+        """Rows for the harness-specific cable size table under Block Details"""
+        harness_info = []
         try:
-            worksheet = writer.sheets['Block Details']
-            
-            # Find the last row with data
-            last_data_row = len(detailed_data) + 1  # +1 for header
-            
-            # Add some spacing
-            info_start_row = last_data_row + 3
-            
-            # Check if any blocks have custom harness cable sizes
-            has_custom_sizes = False
-            harness_info = []
-            
             for block_id, block in self.blocks.items():
                 if (hasattr(block, 'wiring_config') and 
                     block.wiring_config and 
@@ -1333,7 +1364,6 @@ class BOMGenerator:
                             if (hasattr(harness, 'string_cable_size') and harness.string_cable_size) or \
                                (hasattr(harness, 'extender_cable_size') and harness.extender_cable_size) or \
                                (hasattr(harness, 'whip_cable_size') and harness.whip_cable_size):
-                                has_custom_sizes = True
                                 
                                 # Build info string
                                 actual_string_count = len(harness.string_indices)
@@ -1346,46 +1376,77 @@ class BOMGenerator:
                                     'Whip Cable': harness.whip_cable_size if hasattr(harness, 'whip_cable_size') and harness.whip_cable_size else f"Default ({block.wiring_config.whip_cable_size})"
                                 }
                                 harness_info.append(info)
-            
-            if has_custom_sizes and harness_info:
-                # Add header
-                worksheet.cell(row=info_start_row, column=1, value="Harness-Specific Cable Sizes:").font = Font(bold=True, size=12)
-                
-                # Add column headers
-                headers = ['Block', 'Harness Type', 'String Cable', 'Harness Cable', 'Extender Cable', 'Whip Cable']
-                for col_idx, header in enumerate(headers, 1):
-                    cell = worksheet.cell(row=info_start_row + 1, column=col_idx, value=header)
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
-                    cell.border = Border(
-                        left=Side(style='thin'),
-                        right=Side(style='thin'),
-                        top=Side(style='thin'),
-                        bottom=Side(style='thin')
-                    )
-                
-                # Add data rows
-                for row_idx, info in enumerate(harness_info, info_start_row + 2):
-                    for col_idx, (key, value) in enumerate(info.items(), 1):
-                        cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-                        cell.border = Border(
-                            left=Side(style='thin'),
-                            right=Side(style='thin'),
-                            top=Side(style='thin'),
-                            bottom=Side(style='thin')
-                        )
-                        
-                        # Highlight custom sizes
-                        if key in ['String Cable', 'Extender Cable', 'Whip Cable'] and not value.startswith('Default'):
-                            cell.fill = PatternFill(start_color="FFFFCC", end_color="FFFFCC", fill_type="solid")
-                
-                # Auto-fit columns
-                for col_idx in range(1, 7):
-                    column_letter = get_column_letter(col_idx)
-                    worksheet.column_dimensions[column_letter].auto_size = True
-                    
         except Exception as e:
             print(f"Error adding harness cable info to Excel: {e}")
+            return []
+        return harness_info
+
+    def _write_block_details_sheet(self, worksheet, data: pd.DataFrame):
+        """
+        Stream the Block Details sheet into a write-only worksheet
+        
+        Same layout _format_excel_sheet gives an in-memory sheet, followed by
+        the harness-specific cable size table when any harness overrides its
+        block's cable sizes. Column widths have to be set before the first row
+        is written, so the rows are laid out twice: once to measure, once to write.
+        
+        Args:
+            worksheet: write-only worksheet from save_with_streamed_sheets
+            data: detailed BOM DataFrame, Component Type already dropped
+        """
+        columns = list(data.columns)
+        num_cols = len(columns)
+        harness_info = self._harness_cable_info()
+        harness_headers = ['Block', 'Harness Type', 'String Cable', 'Harness Cable', 'Extender Cable', 'Whip Cable']
+        
+        # Measure: longest value per column, as the in-memory auto-fit sees it
+        max_lengths = {}
+        
+        def measure(values):
+            for col_num, value in enumerate(values, 1):
+                text = str(value) if value is not None else ""
+                if not text.startswith('---') and len(text) > max_lengths.get(col_num, 0):
+                    max_lengths[col_num] = len(text)
+        
+        measure(columns)
+        for values, _, _ in self._excel_row_layout(data):
+            measure(values)
+        if harness_info:
+            measure(["Harness-Specific Cable Sizes:"])
+            measure(harness_headers)
+            for info in harness_info:
+                measure(list(info.values()))
+        
+        last_col = max(num_cols, len(harness_headers) if harness_info else 0)
+        for col_num in range(1, last_col + 1):
+            column_letter = get_column_letter(col_num)
+            header = columns[col_num - 1] if col_num <= num_cols else None
+            dimension = worksheet.column_dimensions[column_letter]
+            dimension.width = self._bom_column_width(column_letter, header, max_lengths.get(col_num, 0))
+            if harness_info and col_num <= len(harness_headers):
+                dimension.auto_size = True
+        
+        # Write
+        worksheet.append(styled_row(worksheet, columns, 'BOM Header'))
+        last_col_letter = get_column_letter(max(num_cols, 1))
+        for row_index, (values, styles, is_section) in enumerate(self._excel_row_layout(data), 2):
+            worksheet.append(styled_row(worksheet, values, styles))
+            if is_section and num_cols > 1:
+                worksheet.merged_cells.add(f"A{row_index}:{last_col_letter}{row_index}")
+        
+        if harness_info:
+            worksheet.append([])
+            worksheet.append([])
+            worksheet.append(styled_row(worksheet, ["Harness-Specific Cable Sizes:"], 'BOM Note Title'))
+            worksheet.append(styled_row(worksheet, harness_headers, 'BOM Subheader'))
+            for info in harness_info:
+                styles = [
+                    # Highlight custom sizes
+                    'BOM Custom' if key in ('String Cable', 'Extender Cable', 'Whip Cable')
+                    and not value.startswith('Default') else 'BOM Bordered'
+                    for key, value in info.items()
+                ]
+                worksheet.append(styled_row(worksheet, list(info.values()), styles))
 
     def filter_data_by_checked_components(self, data_df, checked_components, is_detailed=False):
         """Filter DataFrame based on checked components"""
@@ -1414,109 +1475,30 @@ class BOMGenerator:
             data: DataFrame with data
             start_row: Row to start formatting from (default=1)
         """
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        section_font = Font(bold=True, size=11)
-        section_fill = PatternFill(start_color="D9E2F3", end_color="D9E2F3", fill_type="solid")
-        centered_alignment = Alignment(horizontal='center', vertical='center')
-        wrap_align = Alignment(horizontal='left', vertical='center', wrap_text=True)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        warning_fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-        
+        add_named_styles(worksheet.parent)
         num_cols = len(data.columns)
         
         # Format headers
         for col_num, column_title in enumerate(data.columns, 1):
             cell = worksheet.cell(row=start_row, column=col_num)
             cell.value = column_title
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = centered_alignment
-            cell.border = border
+            cell.style = 'BOM Header'
 
         # Format data rows
-        for i in range(len(data)):
-            row_index = start_row + 1 + i
-            row_data = data.iloc[i]
-            
-            # Check if this is a section header row (section markers may be in any first column)
-            first_col_value = str(row_data.iloc[0]) if len(row_data) > 0 else ''
-            is_section = first_col_value.startswith('---')
-            
-            if is_section:
-                # Section header: merge across all columns, apply section style
-                section_name = first_col_value.replace('---', '').strip()
-                
-                # Clear all cells in the row first
-                for col_num in range(1, num_cols + 1):
-                    cell = worksheet.cell(row=row_index, column=col_num)
-                    cell.value = None
-                    cell.font = section_font
-                    cell.fill = section_fill
-                    cell.border = border
-                    cell.alignment = centered_alignment
-                
-                # Merge and write section name
-                if num_cols > 1:
-                    worksheet.merge_cells(
-                        start_row=row_index, start_column=1,
-                        end_row=row_index, end_column=num_cols
-                    )
-                cell = worksheet.cell(row=row_index, column=1)
-                cell.value = section_name
-                cell.font = section_font
-                cell.fill = section_fill
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-                cell.border = border
-            else:
-                # Regular data row
-                is_warning = False
-                if 'Unit' in data.columns:
-                    unit_value = row_data.get('Unit', '')
-                    if unit_value and 'warning' in str(unit_value).lower():
-                        is_warning = True
-                
-                # Check if Part Number is N/A
-                is_na_part = False
-                if 'Part Number' in data.columns:
-                    pn_value = str(row_data.get('Part Number', ''))
-                    if pn_value == 'N/A':
-                        is_na_part = True
-                
-                black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-                
-                for col_num in range(1, num_cols + 1):
-                    cell = worksheet.cell(row=row_index, column=col_num)
-                    cell.border = border
-                    cell.alignment = centered_alignment
-                    
-                    if is_warning:
-                        cell.fill = warning_fill
-                    
-                    # Black out price cells for N/A part numbers
-                    if is_na_part:
-                        col_name = data.columns[col_num - 1]
-                        if col_name in ('Unit Price', 'Extended Price'):
-                            cell.fill = black_fill
-                            cell.value = None
-                
-                # Left-align Description column
-                if 'Description' in data.columns:
-                    desc_col = list(data.columns).index('Description') + 1
-                    cell = worksheet.cell(row=row_index, column=desc_col)
-                    cell.alignment = wrap_align
-                
-                # Left-align Component Type column
-                if 'Component Type' in data.columns:
-                    ct_col = list(data.columns).index('Component Type') + 1
-                    cell = worksheet.cell(row=row_index, column=ct_col)
-                    cell.alignment = wrap_align
+        for row_index, (values, styles, is_section) in enumerate(self._excel_row_layout(data), start_row + 1):
+            for col_num, style in enumerate(styles, 1):
+                cell = worksheet.cell(row=row_index, column=col_num)
+                cell.style = style
+                # Section labels and blacked-out prices replace what pandas wrote
+                if is_section or style == 'BOM Price Blackout':
+                    cell.value = values[col_num - 1]
+            
+            # Section header: merge across all columns
+            if is_section and num_cols > 1:
+                worksheet.merge_cells(
+                    start_row=row_index, start_column=1,
+                    end_row=row_index, end_column=num_cols
+                )
         
         # Auto-adjust column widths
         for column in worksheet.columns:
@@ -1533,36 +1515,66 @@ class BOMGenerator:
                 except:
                     pass
             
-            adjusted_width = max_length + 2
-            
-            if column_name == 'A':
-                adjusted_width = min(adjusted_width, 35)
-            elif column_name == 'B':
-                adjusted_width = min(adjusted_width, 35)
-            elif 'Description' in str(worksheet.cell(row=start_row, column=column[0].column).value or ''):
-                adjusted_width = min(adjusted_width, 50)
-            else:
-                adjusted_width = min(adjusted_width, 30)
-            
-            adjusted_width = max(adjusted_width, 10)
-            worksheet.column_dimensions[column_name].width = adjusted_width
+            header = worksheet.cell(row=start_row, column=column[0].column).value
+            worksheet.column_dimensions[column_name].width = self._bom_column_width(column_name, header, max_length)
+
+    def _excel_row_layout(self, data: pd.DataFrame):
+        """
+        Yield (values, styles, is_section) for each data row of a BOM table
         
-        # Format price columns as currency
-        if 'Unit Price' in data.columns:
-            unit_price_col = list(data.columns).index('Unit Price') + 1
-            for row_num in range(start_row + 1, start_row + len(data) + 1):
-                cell = worksheet.cell(row=row_num, column=unit_price_col)
-                if cell.value is not None and cell.value != '':
-                    cell.number_format = '"$"#,##0.00'
-                cell.alignment = Alignment(horizontal='right')
+        Section marker rows ('--- Name ---' in the first column) become a label
+        in column A with the rest blank, warning units turn the row red, and
+        price cells of N/A part numbers are blacked out and emptied. Values are
+        converted the way DataFrame.to_excel writes them, NaN as None.
+        """
+        columns = list(data.columns)
+        num_cols = len(columns)
+        price_cols = {i for i, col in enumerate(columns) if col in ('Unit Price', 'Extended Price')}
+        wrap_cols = {i for i, col in enumerate(columns) if col in ('Description', 'Component Type')}
+        unit_idx = columns.index('Unit') if 'Unit' in columns else None
+        pn_idx = columns.index('Part Number') if 'Part Number' in columns else None
+        
+        section_styles = ['BOM Section Price' if i in price_cols else 'BOM Section' for i in range(num_cols)]
+        if num_cols:
+            section_styles[0] = 'BOM Section Label'
+        plain_styles = ['BOM Price' if i in price_cols else 'BOM Cell Wrap' if i in wrap_cols else 'BOM Cell'
+                        for i in range(num_cols)]
+        warning_styles = [f'{style} Warning' for style in plain_styles]
+        
+        for row in data.itertuples(index=False, name=None):
+            first_col_value = str(row[0]) if num_cols > 0 else ''
+            if first_col_value.startswith('---'):
+                yield [first_col_value.replace('---', '').strip()] + [None] * (num_cols - 1), section_styles, True
+                continue
+            
+            values = [_excel_value(value) for value in row]
+            unit_value = row[unit_idx] if unit_idx is not None else ''
+            is_warning = bool(unit_value) and 'warning' in str(unit_value).lower()
+            styles = warning_styles if is_warning else plain_styles
+            
+            # Black out price cells for N/A part numbers
+            if pn_idx is not None and price_cols and str(row[pn_idx]) == 'N/A':
+                styles = list(styles)
+                for i in price_cols:
+                    styles[i] = 'BOM Price Blackout'
+                    values[i] = None
+            yield values, styles, False
+
+    @staticmethod
+    def _bom_column_width(column_letter: str, header, max_length: int) -> float:
+        """Auto-fit width for a BOM table column, capped by what the column holds"""
+        adjusted_width = max_length + 2
+        
+        if column_letter == 'A':
+            adjusted_width = min(adjusted_width, 35)
+        elif column_letter == 'B':
+            adjusted_width = min(adjusted_width, 35)
+        elif 'Description' in str(header or ''):
+            adjusted_width = min(adjusted_width, 50)
+        else:
+            adjusted_width = min(adjusted_width, 30)
         
-        if 'Extended Price' in data.columns:
-            ext_price_col = list(data.columns).index('Extended Price') + 1
-            for row_num in range(start_row + 1, start_row + len(data) + 1):
-                cell = worksheet.cell(row=row_num, column=ext_price_col)
-                if cell.value is not None and cell.value != '':
-                    cell.number_format = '"$"#,##0.00'
-                cell.alignment = Alignment(horizontal='right')
+        return max(adjusted_width, 10)
 
     def generate_project_info(self) -> Dict[str, Any]:
         """
@@ -1667,205 +1679,185 @@ class BOMGenerator:
         
         return info
 
-    def analyze_wire_segments(self, quantities: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-        """Analyze wire segments and add segment counts to quantities"""
+    def segment_table(self) -> pd.DataFrame:
+        """
+        One row per cable route of every wired block, for segment counting
+        
+        Returns:
+            DataFrame with columns block_id, route_id, cable_type ('string', 'whip'
+            or 'extender'), polarity ('Positive'/'Negative'), cable_size and
+            length_ft. Whip lengths include the underground run when enabled.
+            Routes with fewer than two points are left out.
+        """
+        columns = ['block_id', 'route_id', 'cable_type', 'polarity', 'cable_size', 'length_ft']
+        route_types = {}
+        route_info = {}
+        rows = []
+        routes = []
+        extra_ft = []
+        
         for block_id, block in self.blocks.items():
-            block_quantities = quantities.get(block_id, {})
-            
-            # Skip blocks without wiring config
             if not block.wiring_config:
                 continue
             
-            # Get realistic cable routes if available, otherwise use regular routes
+            # Realistic routes are what gets built; fall back to the conceptual ones
             cable_routes = getattr(block.wiring_config, 'realistic_cable_routes', {})
             if not cable_routes:
                 cable_routes = block.wiring_config.cable_routes
             
-            # Group routes by type and analyze segments
-            string_segments_pos = []
-            string_segments_neg = []
-            whip_segments_pos = []
-            whip_segments_neg = []
-            extender_segments_pos = []
-            extender_segments_neg = []
+            underground_ft = 0.0
+            if hasattr(block, 'underground_routing') and block.underground_routing:
+                underground_addition_m = 2 * (block.pile_reveal_m + block.trench_depth_m)
+                underground_ft = underground_addition_m * 3.28084
+            
+            default_sizes = {
+                'string': block.wiring_config.string_cable_size,
+                'whip': getattr(block.wiring_config, 'whip_cable_size', "8 AWG"),
+                'extender': getattr(block.wiring_config, 'extender_cable_size', "8 AWG"),
+            }
+            harness_sizes = (block.wiring_config.wiring_type == WiringType.HARNESS and
+                             hasattr(block.wiring_config, 'harness_groupings'))
+            string_counts = [len(pos.strings) for pos in block.tracker_positions]
+            size_cache = {}
+            
+            def harness_size(route_id, cable_type):
+                # Whips and extenders take their harness's cable size, which
+                # depends on the tracker's string count rather than the tracker
+                if route_id not in route_info:
+                    route_info[route_id] = self._parse_route_harness_info(route_id)
+                tracker_idx, harness_idx = route_info[route_id]
+                string_count = None
+                if tracker_idx is not None and tracker_idx < len(string_counts):
+                    string_count = string_counts[tracker_idx]
+                key = (string_count, harness_idx, cable_type)
+                if key not in size_cache:
+                    size_cache[key] = self._harness_cable_size(block, tracker_idx, harness_idx, cable_type)
+                return size_cache[key]
             
             for route_id, route in cable_routes.items():
-                # Skip routes with less than 2 points
                 if len(route) < 2:
                     continue
-                    
-                # Calculate segment length
-                segment_length = 0
-                for i in range(len(route) - 1):
-                    dx = route[i+1][0] - route[i][0]
-                    dy = route[i+1][1] - route[i][1]
-                    segment_length += (dx**2 + dy**2)**0.5
-                
-                # Convert to feet
-                segment_length_feet = segment_length * 3.28084
-                
-                # Categorize by route type and polarity
-                if "pos_src" in route_id or "pos_node" in route_id or "pos_string" in route_id:
-                    string_segments_pos.append({
-                        'length': segment_length_feet,
-                        'route_id': route_id
-                    })
-                elif "neg_src" in route_id or "neg_node" in route_id or "neg_string" in route_id:
-                    string_segments_neg.append({
-                        'length': segment_length_feet,
-                        'route_id': route_id
-                    })
-                elif "pos_dev" in route_id or "pos_main" in route_id or "whip_pos" in route_id or "pos_whip" in route_id:
-                    # Add underground routing component if enabled
-                    if hasattr(block, 'underground_routing') and block.underground_routing:
-                        underground_addition_m = 2 * (block.pile_reveal_m + block.trench_depth_m)
-                        underground_addition_ft = underground_addition_m * 3.28084
-                        segment_length_feet += underground_addition_ft
-                    whip_segments_pos.append({
-                        'length': segment_length_feet,
-                        'route_id': route_id
-                    })
-                elif "neg_dev" in route_id or "neg_main" in route_id or "whip_neg" in route_id or "neg_whip" in route_id:
-                    # Add underground routing component if enabled
-                    if hasattr(block, 'underground_routing') and block.underground_routing:
-                        underground_addition_m = 2 * (block.pile_reveal_m + block.trench_depth_m)
-                        underground_addition_ft = underground_addition_m * 3.28084
-                        segment_length_feet += underground_addition_ft
-                    whip_segments_neg.append({
-                        'length': segment_length_feet,
-                        'route_id': route_id
-                    })
-            
-            # Process string segments only for HOMERUN wiring
-            if block.wiring_config.wiring_type == WiringType.HOMERUN:
-                string_size = block.wiring_config.string_cable_size
-                self._add_segment_analysis(block_quantities, string_segments_pos, 
-                                        string_size, "Positive String Cable", 5)
-                self._add_segment_analysis(block_quantities, string_segments_neg, 
-                                        string_size, "Negative String Cable", 5)
-                
-                # Calculate and add total string entries from segments
-                self.calculate_totals_from_segments(block_quantities, string_size, "Positive String Cable")
-                self.calculate_totals_from_segments(block_quantities, string_size, "Negative String Cable")
-            
-            # Process whip segments for all wiring types
-            # For harness configurations, we need to group segments by cable size
-            if block.wiring_config.wiring_type == WiringType.HARNESS and hasattr(block.wiring_config, 'harness_groupings'):
-                # Group whip segments by cable size
-                whip_segments_by_size_pos = {}
-                whip_segments_by_size_neg = {}
-                
-                # Analyze each segment to determine its cable size
-                for segment in whip_segments_pos:
-                    # Determine which harness this segment belongs to based on its route
-                    cable_size = self._get_cable_size_for_segment(block, segment, 'whip')
-                    
-                    if cable_size not in whip_segments_by_size_pos:
-                        whip_segments_by_size_pos[cable_size] = []
-                    whip_segments_by_size_pos[cable_size].append(segment)
-                
-                for segment in whip_segments_neg:
-                    cable_size = self._get_cable_size_for_segment(block, segment, 'whip')
-                    
-                    if cable_size not in whip_segments_by_size_neg:
-                        whip_segments_by_size_neg[cable_size] = []
-                    whip_segments_by_size_neg[cable_size].append(segment)
-                
-                # Process each cable size group separately
-                for cable_size, segments in whip_segments_by_size_pos.items():
-                    self._add_segment_analysis(block_quantities, segments, 
-                                            cable_size, f"Positive Whip Cable ({cable_size})", 1)
-                    self.calculate_totals_from_segments(block_quantities, cable_size, f"Positive Whip Cable ({cable_size})")
-
-                for cable_size, segments in whip_segments_by_size_neg.items():
-                    self._add_segment_analysis(block_quantities, segments, 
-                                            cable_size, f"Negative Whip Cable ({cable_size})", 1)
-                    self.calculate_totals_from_segments(block_quantities, cable_size, f"Negative Whip Cable ({cable_size})")
-            else:
-                # Non-harness or single cable size - process normally
-                whip_size = getattr(block.wiring_config, 'whip_cable_size', "8 AWG")
-                self._add_segment_analysis(block_quantities, whip_segments_pos, 
-                                        whip_size, "Positive Whip Cable", 1)
-                self._add_segment_analysis(block_quantities, whip_segments_neg, 
-                                        whip_size, "Negative Whip Cable", 1)
-                
-                self.calculate_totals_from_segments(block_quantities, whip_size, "Positive Whip Cable")
-                self.calculate_totals_from_segments(block_quantities, whip_size, "Negative Whip Cable")
-
-            # Process extender segments
-            extender_segments_pos = []
-            extender_segments_neg = []
+                if route_id not in route_types:
+                    route_types[route_id] = _route_cable_types(route_id)
+                for cable_type, polarity in route_types[route_id]:
+                    if harness_sizes and cable_type != 'string':
+                        cable_size = harness_size(route_id, cable_type)
+                    else:
+                        cable_size = default_sizes[cable_type]
+                    rows.append((block_id, route_id, cable_type, polarity, cable_size))
+                    routes.append(route)
+                    extra_ft.append(underground_ft if cable_type == 'whip' else 0.0)
+        
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        table = pd.DataFrame(rows, columns=columns[:-1])
+        
+        # Route lengths over all routes at once: flatten the points, then add
+        # each route's steps in order so lengths match a point-by-point sum
+        point_counts = np.fromiter(map(len, routes), dtype=np.intp, count=len(routes))
+        starts = np.concatenate(([0], np.cumsum(point_counts)[:-1]))
+        xy = np.fromiter(chain.from_iterable(chain.from_iterable(routes)), dtype=float,
+                         count=2 * int(point_counts.sum())).reshape(-1, 2)
+        steps = np.diff(xy, axis=0)
+        step_lengths = np.sqrt(steps[:, 0] ** 2 + steps[:, 1] ** 2)
+        lengths = np.zeros(len(routes))
+        for i in range(int(point_counts.max()) - 1):
+            active = point_counts - 1 > i
+            lengths[active] += step_lengths[starts[active] + i]
+        
+        table['length_ft'] = lengths * 3.28084 + np.array(extra_ft)
+        return table
+    
+    def segment_counts(self, table: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Count cut segments per block, cable, size and rounded length
+        
+        Args:
+            table: Segment table (defaults to segment_table())
+            
+        Returns:
+            DataFrame with columns block_id, cable_type_name (e.g. "Positive Whip
+            Cable (6 AWG)"), cable_size, length_ft (rounded) and count, in the
+            order the BOM lists them
+        """
+        if table is None:
+            table = self.segment_table()
+        columns = ['block_id', 'cable_type_name', 'cable_size', 'length_ft', 'count']
+        
+        # String cable segments only go in the BOM for homerun blocks
+        homerun = {block_id for block_id, block in self.blocks.items()
+                   if block.wiring_config and block.wiring_config.wiring_type == WiringType.HOMERUN}
+        harness_sizes = {block_id for block_id, block in self.blocks.items()
+                         if block.wiring_config and block.wiring_config.wiring_type == WiringType.HARNESS
+                         and hasattr(block.wiring_config, 'harness_groupings')}
+        table = table[(table['cable_type'] != 'string') | table['block_id'].isin(homerun)]
+        if table.empty:
+            return pd.DataFrame(columns=columns)
+        
+        # Name each cable; harness blocks carry the size in the name since one
+        # block can mix whip/extender sizes across harnesses
+        names = table['polarity'] + ' ' + table['cable_type'].map(_CABLE_TYPE_NAMES)
+        sized = table['block_id'].isin(harness_sizes) & (table['cable_type'] != 'string')
+        names = names.where(~sized, names + ' (' + table['cable_size'] + ')')
+        
+        # Add waste, then round up to the next increment with a 10ft minimum.
+        # Whips always use 5ft increments, everything else the configured rounding.
+        increment = np.where(table['cable_type'] == 'whip', 5, self.segment_rounding)
+        with_waste = table['length_ft'].to_numpy() * self.CABLE_WASTE_FACTOR
+        rounded = increment * ((with_waste + increment - 0.1) // increment + 1)
+        
+        block_order = {block_id: i for i, block_id in enumerate(self.blocks)}
+        frame = pd.DataFrame({
+            'block_id': table['block_id'].to_numpy(),
+            'cable_type_name': names.to_numpy(),
+            'cable_size': table['cable_size'].to_numpy(),
+            'length_ft': np.maximum(10, rounded),
+            'block_rank': table['block_id'].map(block_order).to_numpy(),
+            'type_rank': table['cable_type'].map(_CABLE_TYPE_ORDER).to_numpy(),
+            'polarity_rank': (table['polarity'] != 'Positive').to_numpy(),
+        })
+        # Within a cable type and polarity, sizes are listed in the order first seen
+        frame['size_rank'] = frame.groupby(['block_rank', 'type_rank', 'polarity_rank', 'cable_size'],
+                                           sort=False).ngroup()
+        frame = frame.sort_values(['block_rank', 'type_rank', 'polarity_rank', 'size_rank'], kind='stable')
+        
+        counts = frame.groupby(['block_id', 'cable_type_name', 'cable_size', 'length_ft'], sort=False).size()
+        return counts.reset_index(name='count')[columns]
 
-            for route_id, route in cable_routes.items():
-                # Skip routes with less than 2 points
-                if len(route) < 2:
-                    continue
-                    
-                # Calculate segment length
-                segment_length = 0
-                for i in range(len(route) - 1):
-                    dx = route[i+1][0] - route[i][0]
-                    dy = route[i+1][1] - route[i][1]
-                    segment_length += (dx**2 + dy**2)**0.5
-                
-                # Convert to feet
-                segment_length_feet = segment_length * 3.28084
-                
-                # Categorize extender routes
-                if "pos_extender" in route_id:
-                    extender_segments_pos.append({
-                        'length': segment_length_feet,
-                        'route_id': route_id
-                    })
-                elif "neg_extender" in route_id:
-                    extender_segments_neg.append({
-                        'length': segment_length_feet,
-                        'route_id': route_id
-                    })
-
-            # Process extender segments - handle harness-specific cable sizes
-            if block.wiring_config.wiring_type == WiringType.HARNESS and hasattr(block.wiring_config, 'harness_groupings'):
-                # Group extender segments by cable size
-                extender_segments_by_size_pos = {}
-                extender_segments_by_size_neg = {}
-                
-                # Analyze each segment to determine its cable size
-                for segment in extender_segments_pos:
-                    # Determine which harness this segment belongs to based on its route
-                    cable_size = self._get_cable_size_for_segment(block, segment, 'extender')
-                    
-                    if cable_size not in extender_segments_by_size_pos:
-                        extender_segments_by_size_pos[cable_size] = []
-                    extender_segments_by_size_pos[cable_size].append(segment)
-                
-                for segment in extender_segments_neg:
-                    cable_size = self._get_cable_size_for_segment(block, segment, 'extender')
+    def analyze_wire_segments(self, quantities: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Analyze wire segments and add segment counts to quantities"""
+        counts = self.segment_counts()
+        counts_by_block = {}
+        for row in zip(*(counts[column].tolist() for column in counts.columns)):
+            counts_by_block.setdefault(row[0], []).append(row[1:])
+        descriptions = {}
+        
+        for block_id, block in self.blocks.items():
+            block_quantities = quantities.get(block_id, {})
+            
+            # Skip blocks without wiring config
+            if not block.wiring_config:
+                continue
+            
+            block_counts = counts_by_block.get(block_id)
+            if block_counts:
+                previous = None
+                for cable_type_name, cable_size, length, count in block_counts:
+                    if previous and previous != (cable_type_name, cable_size):
+                        self.calculate_totals_from_segments(block_quantities, previous[1], previous[0])
+                    previous = (cable_type_name, cable_size)
                     
-                    if cable_size not in extender_segments_by_size_neg:
-                        extender_segments_by_size_neg[cable_size] = []
-                    extender_segments_by_size_neg[cable_size].append(segment)
-                
-                # Process each cable size group separately
-                for cable_size, segments in extender_segments_by_size_pos.items():
-                    self._add_segment_analysis(block_quantities, segments, 
-                                            cable_size, f"Positive Extender Cable ({cable_size})", 5)
-                    self.calculate_totals_from_segments(block_quantities, cable_size, f"Positive Extender Cable ({cable_size})")
-
-                for cable_size, segments in extender_segments_by_size_neg.items():
-                    self._add_segment_analysis(block_quantities, segments, 
-                                            cable_size, f"Negative Extender Cable ({cable_size})", 5)
-                    self.calculate_totals_from_segments(block_quantities, cable_size, f"Negative Extender Cable ({cable_size})")
-            else:
-                # Non-harness or single cable size - process normally
-                extender_size = getattr(block.wiring_config, 'extender_cable_size', "8 AWG")
-                self._add_segment_analysis(block_quantities, extender_segments_pos, 
-                                        extender_size, "Positive Extender Cable", 5)
-                self._add_segment_analysis(block_quantities, extender_segments_neg, 
-                                        extender_size, "Negative Extender Cable", 5)
-
-                # Calculate and add total extender entries from segments
-                self.calculate_totals_from_segments(block_quantities, extender_size, "Positive Extender Cable")
-                self.calculate_totals_from_segments(block_quantities, extender_size, "Negative Extender Cable")
+                    key = (cable_type_name, cable_size)
+                    if key not in descriptions:
+                        descriptions[key] = self._segment_description_format(cable_type_name, cable_size)
+                    description, category = descriptions[key]
+                    block_quantities[f"{cable_type_name} Segment {int(length)}ft ({cable_size})"] = {
+                        'description': description.format(length=int(length)),
+                        'quantity': int(count),
+                        'unit': 'ea',
+                        'category': category
+                    }
+                self.calculate_totals_from_segments(block_quantities, previous[1], previous[0])
        
             # Add DC Feeder cable if distance is specified
             dc_feeder_distance = getattr(block, 'dc_feeder_distance_ft', 0.0)
@@ -1898,43 +1890,15 @@ class BOMGenerator:
     
     def load_harness_library(self):
         """Load harness library from JSON file"""
-        try:
-            # Get the path relative to this file (src/utils/bom_generator.py)
-            current_dir = os.path.dirname(os.path.abspath(__file__))  # src/utils/
-            project_root = os.path.dirname(os.path.dirname(current_dir))  # Go up two levels to get to project root
-            library_path = os.path.join(project_root, 'data', 'harness_library.json')
-            
-            with open(library_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading harness library: {e}")
-            return {}
+        return load_library('harness_library.json', {})
         
     def load_extender_library(self):
         """Load the extender library from JSON file"""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            library_path = os.path.join(project_root, 'data', 'extender_library.json')
-            
-            with open(library_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading extender library: {e}")
-            return {}
+        return load_library('extender_library.json', {})
 
     def load_whip_library(self):
         """Load the whip library from JSON file"""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            library_path = os.path.join(project_root, 'data', 'whip_library.json')
-            
-            with open(library_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading whip library: {e}")
-            return {}
+        return load_library('whip_library.json', {})
         
     def get_whip_description_format(self, wire_gauge):
         """Get whip description format from library"""
@@ -1974,15 +1938,10 @@ class BOMGenerator:
                     fuse_text = "Fused, "
             
             # Use target spacing (next largest available) instead of raw calculated value
-            # First Solar uses 26'/32', Standard uses 102/113/122/133
-            available_spacings = [26.0, 32.0, 102.0, 113.0, 122.0, 133.0]
-            target_spacing = string_spacing_ft  # fallback to raw
-            for spacing in sorted(available_spacings):
-                if spacing >= string_spacing_ft:
-                    target_spacing = spacing
-                    break
-            else:
-                target_spacing = max(available_spacings)
+            target_spacing = self._snap_harness_spacing(num_strings, polarity, string_spacing_ft,
+                                                        trunk_cable_size)
+            if target_spacing is None:
+                target_spacing = string_spacing_ft  # fallback to raw
             
             return f"{num_strings} String, {pol_text}, {fuse_text}{string_cable_size} Drops w/{trunk_cable_size} Trunk, {int(target_spacing)}' string spacing, MC4 connectors"
         
@@ -2026,53 +1985,40 @@ class BOMGenerator:
             print(f"Error calculating string spacing: {e}")
             return 0
 
+    def _snap_harness_spacing(self, num_strings, polarity, spacing_ft, trunk_cable_size=None):
+        """Shortest stocked spacing >= spacing_ft for this harness size, polarity and trunk.
+
+        When this harness has none long enough, snap against every spacing in the
+        library instead (the largest if spacing_ft is beyond them all), so the
+        lookup misses rather than picking a harness that is too short.
+        """
+        target = self.part_index.nearest_harness_spacing(num_strings, polarity, spacing_ft, trunk_cable_size)
+        if target is None or target < spacing_ft:
+            target = self.part_index.nearest_harness_spacing(None, None, spacing_ft)
+        return target
+
     def find_matching_harness_part_number(self, num_strings, polarity, calculated_spacing_ft,
                                            trunk_cable_size=None, spacing_override_by_string_count=None):
         """Find matching harness part number from library.
 
         spacing_override_by_string_count: optional {str_count: spacing_ft} map; when an entry
         exists for num_strings the override value is used directly instead of the length snap.
+        Otherwise the spacing snaps up as in _snap_harness_spacing.
         """
         try:
-            matches = []
-
-            # Available harness spacing options based on your library
-            # First Solar uses 26'/32', Standard uses 102/113/122/133
-            available_spacings = [26.0, 32.0, 102.0, 113.0, 122.0, 133.0]
-
             # Resolve target spacing: override wins over length snap
             ov_map = spacing_override_by_string_count or {}
             ov_val = ov_map.get(num_strings) or ov_map.get(str(num_strings))
             if ov_val is not None:
                 target_spacing = float(ov_val)
             else:
-                # Length-only snap (original behavior)
-                target_spacing = None
-                for spacing in sorted(available_spacings):
-                    if spacing >= calculated_spacing_ft:
-                        target_spacing = spacing
-                        break
+                target_spacing = self._snap_harness_spacing(num_strings, polarity, calculated_spacing_ft,
+                                                            trunk_cable_size)
                 if target_spacing is None:
-                    target_spacing = max(available_spacings)  # Use largest if calculated is bigger than all
-            
+                    return "N/A"
+
             # Search for matching harnesses
-            for part_number, spec in self.harness_library.items():
-                # Skip comment entries
-                if part_number.startswith('_comment_'):
-                    continue
-                    
-                # Check basic criteria
-                if (spec.get('num_strings') == num_strings and 
-                    spec.get('polarity') == polarity and
-                    abs(spec.get('string_spacing_ft', 0) - target_spacing) < 0.1):
-                                        
-                    # If trunk cable size is specified, filter by it
-                    if trunk_cable_size:
-                        spec_trunk_size = spec.get('trunk_cable_size', spec.get('trunk_wire_gauge'))
-                        if spec_trunk_size != trunk_cable_size:
-                            continue
-                            
-                    matches.append(part_number)
+            matches = self.part_index.find_harnesses(num_strings, polarity, target_spacing, trunk_cable_size)
             
             if matches:
                 if len(matches) == 1:
@@ -2101,15 +2047,10 @@ class BOMGenerator:
                 return f"EXT-{awg_size}-{polarity_code}-{target_length}-CUSTOM"
             
             # Search for matching extender
-            for part_number, spec in self.extender_library.items():
-                # Skip comment entries
-                if part_number.startswith('_comment_'):
-                    continue
-                if (spec.get('wire_gauge') == wire_gauge and 
-                    spec.get('polarity') == polarity and
-                    spec.get('length_ft') == target_length):
-                    return part_number
-            
+            part_number = self.part_index.find_cable('extender', wire_gauge, polarity, target_length)
+            if part_number:
+                return part_number
+
             return "N/A"
             
         except Exception as e:
@@ -2130,14 +2071,9 @@ class BOMGenerator:
                 return f"WHI-{awg_size}-{polarity_code}-{target_length}-CUSTOM"
             
             # Search for matching whip
-            for part_number, spec in self.whip_library.items():
-                # Skip comment entries
-                if part_number.startswith('_comment_'):
-                    continue
-                if (spec.get('wire_gauge') == wire_gauge and 
-                    spec.get('polarity') == polarity and
-                    spec.get('length_ft') == target_length):
-                    return part_number
+            part_number = self.part_index.find_cable('whip', wire_gauge, polarity, target_length)
+            if part_number:
+                return part_number
 
             return "N/A"
             
@@ -2172,71 +2108,22 @@ class BOMGenerator:
             print(f"Error getting fuse part number: {e}")
             return f"FUSE-{fuse_rating_amps}A-ERROR"
 
-    def _add_segment_analysis(self, block_quantities, segments, cable_size, cable_type_name, round_to=5):
-        """Add individual cable segments to BOM"""
-        
-        if not segments:
-            return
-        
-        # Convert segments to lengths only for processing
-        segment_lengths = []
-        for segment in segments:
-            if isinstance(segment, dict) and 'length' in segment:
-                segment_lengths.append(segment['length'])
-            else:
-                # Backward compatibility - segment is already a float
-                segment_lengths.append(segment)
-            
-        # Add waste factor
-        segment_lengths = [s * self.CABLE_WASTE_FACTOR for s in segment_lengths]
+    def _segment_description_format(self, cable_type_name, cable_size):
+        """(description format with a {length} field, category) for a cable's segments"""
+        # Determine category based on cable type
+        if "Extender Cable" in cable_type_name:
+            category = 'Extender Cable Segments'
+        else:
+            category = 'eBOS Segments'
         
-        # Always use 5ft increment for whip cables, use configurable rounding for extenders/others
+        # Generate proper description based on cable type
         if "Whip Cable" in cable_type_name:
-            actual_increment = 5
+            description = self.get_whip_description_format(cable_size) + ", CU"
+        elif "Extender Cable" in cable_type_name:
+            description = self.get_extender_description_format(cable_size) + ", CU"
         else:
-            actual_increment = self.segment_rounding
-        
-        # Round up to nearest increment, with minimum of 10ft
-        rounded_segments = []
-        for s in segment_lengths:
-            rounded_length = actual_increment * ((s + actual_increment - 0.1) // actual_increment + 1)
-            # Ensure minimum length of 10ft
-            rounded_length = max(10, rounded_length)
-            rounded_segments.append(rounded_length)
-        
-        # Count segments by length
-        segment_counts = {}
-        for length in rounded_segments:
-            if length not in segment_counts:
-                segment_counts[length] = 0
-            segment_counts[length] += 1
-            
-        # Add segment counts to quantities
-        for length, count in segment_counts.items():
-            segment_key = f"{cable_type_name} Segment {int(length)}ft ({cable_size})"
-            
-            # Determine category based on cable type
-            if "Extender Cable" in cable_type_name:
-                category = 'Extender Cable Segments'
-            else:
-                category = 'eBOS Segments'
-            
-            # Generate proper description based on cable type
-            if "Whip Cable" in cable_type_name:
-                base_desc = self.get_whip_description_format(cable_size)
-                description = base_desc.format(length=int(length)) + ", CU"
-            elif "Extender Cable" in cable_type_name:
-                base_desc = self.get_extender_description_format(cable_size)
-                description = base_desc.format(length=int(length)) + ", CU"
-            else:
-                description = f"{int(length)}ft {cable_type_name} Segment ({cable_size}, CU)"
-
-            block_quantities[segment_key] = {
-                'description': description,
-                'quantity': count,
-                'unit': 'ea',
-                'category': category
-            }
+            description = f"{{length}}ft {cable_type_name} Segment ({cable_size}, CU)"
+        return description, category
 
     def calculate_totals_from_segments(self, block_quantities, cable_size, prefix):
         """Calculate and add total cable entry from segment entries"""
@@ -2341,43 +2228,15 @@ class BOMGenerator:
     
     def load_fuse_library(self):
         """Load fuse library from JSON file"""
-        try:
-            # Get the path relative to this file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            library_path = os.path.join(project_root, 'data', 'fuse_library.json')
-            
-            with open(library_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading fuse library: {e}")
-            return {}
+        return load_library('fuse_library.json', {})
         
     def load_combiner_box_fuse_library(self):
         """Load combiner box fuse library from JSON file"""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            library_path = os.path.join(project_root, 'data', 'combiner_box_fuse_library.json')
-            
-            with open(library_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading combiner box fuse library: {e}")
-            return {}
+        return load_library('combiner_box_fuse_library.json', {})
     
     def load_combiner_box_library(self):
         """Load combiner box library from JSON file"""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            library_path = os.path.join(project_root, 'data', 'combiner_box_library.json')
-            
-            with open(library_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading combiner box library: {e}")
-            return {}
+        return load_library('combiner_box_library.json', {})
         
     def get_combiner_box_part_number(self, num_inputs: int, max_fuse_size: int, breaker_size: int, use_whips: bool) -> str:
         """
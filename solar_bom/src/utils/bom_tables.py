@@ -0,0 +1,135 @@
+"""CSV/Parquet export of the BOM tables for procurement systems.
+
+The Excel BOM is laid out for people: project info above the table, section
+header rows, formulas, merged cells. Downstream systems want the bare tables,
+so this writes the summary, detailed and block-allocation DataFrames from
+BOMGenerator as one file per table and format:
+
+    <stem>_summary.csv / .parquet
+    <stem>_detailed.csv / .parquet
+    <stem>_block_allocation.csv / .parquet
+
+Every table always has the columns and dtypes listed in BOM_TABLE_SCHEMAS, in
+that order, even when it is empty, so an importer can rely on them. Column
+names are snake_case; new columns are only ever appended at the end.
+
+Parquet needs pyarrow or fastparquet; CSV has no extra dependency.
+"""
+
+import importlib.util
+import os
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# table -> [(column, BOMGenerator DataFrame column, dtype)]
+BOM_TABLE_SCHEMAS = {
+    'summary': [
+        ('component_type', 'Component Type', 'string'),
+        ('description', 'Description', 'string'),
+        ('part_number', 'Part Number', 'string'),
+        ('quantity', 'Quantity', 'float64'),
+        ('unit', 'Unit', 'string'),
+        ('unit_price', 'Unit Price', 'float64'),
+        ('extended_price', 'Extended Price', 'float64'),
+    ],
+    'detailed': [
+        ('block', 'Block', 'string'),
+        ('strings', 'Strings', 'int64'),
+        ('description', 'Description', 'string'),
+        ('part_number', 'Part Number', 'string'),
+        ('quantity', 'Quantity', 'float64'),
+        ('unit', 'Unit', 'string'),
+    ],
+    'block_allocation': [
+        ('block_id', 'Block ID', 'string'),
+        ('total_strings', 'Total Strings', 'int64'),
+        ('module_wattage', 'Module Wattage', 'string'),
+        ('number_of_trackers', 'Number of Trackers', 'int64'),
+        ('tracker_configuration', 'Tracker Configuration', 'string'),
+        ('wiring_type', 'Wiring Type', 'string'),
+    ],
+}
+
+TABLE_FORMATS = ('csv', 'parquet')
+
+
+def parquet_engine() -> Optional[str]:
+    """'pyarrow' or 'fastparquet', whichever is installed, else None."""
+    for engine in ('pyarrow', 'fastparquet'):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def conform_table(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """Rename, reorder and cast a BOMGenerator DataFrame to its table schema.
+
+    Section header rows ('--- Name ---' component types) are dropped, missing
+    columns come out empty, and blank strings become nulls. A summary with no
+    Extended Price is filled in as quantity x unit price, which the Excel
+    export leaves to a formula.
+    """
+    df = df if df is not None else pd.DataFrame()
+    if 'Component Type' in df.columns:
+        df = df[~df['Component Type'].astype(str).str.startswith('---')]
+
+    out = {}
+    for column, source, dtype in BOM_TABLE_SCHEMAS[table]:
+        values = df[source] if source in df.columns else pd.Series([None] * len(df), index=df.index)
+        if dtype == 'string':
+            values = values.astype('string').replace('', pd.NA)
+        elif dtype == 'int64':
+            values = pd.to_numeric(values, errors='coerce').fillna(0).astype('int64')
+        else:
+            values = pd.to_numeric(values, errors='coerce').astype(dtype)
+        out[column] = values.reset_index(drop=True)
+    result = pd.DataFrame(out)
+
+    if table == 'summary':
+        missing = result['extended_price'].isna()
+        result.loc[missing, 'extended_price'] = (result['quantity'] * result['unit_price'])[missing]
+    return result
+
+
+def write_bom_tables(tables: Dict[str, pd.DataFrame], output_dir: str, stem: str = 'bom',
+                     formats: Iterable[str] = TABLE_FORMATS) -> List[str]:
+    """Write each table in every format; returns the paths written.
+
+    Args:
+        tables: {table name: DataFrame}, names from BOM_TABLE_SCHEMAS
+        output_dir: folder for the files, created if needed
+        stem: file name prefix, e.g. the project name
+        formats: any of 'csv', 'parquet'
+
+    Files are written under a temporary name and renamed into place, so a
+    nightly import never picks up a half-written table.
+
+    Raises:
+        ValueError: unknown table or format
+        ImportError: 'parquet' requested without pyarrow or fastparquet
+    """
+    formats = list(formats)
+    unknown = [f for f in formats if f not in TABLE_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown table format(s): {', '.join(unknown)}")
+    engine = parquet_engine() if 'parquet' in formats else None
+    if 'parquet' in formats and engine is None:
+        raise ImportError("Parquet export needs pyarrow or fastparquet installed")
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for table, df in tables.items():
+        if table not in BOM_TABLE_SCHEMAS:
+            raise ValueError(f"Unknown BOM table: {table}")
+        data = conform_table(df, table)
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{stem}_{table}.{fmt}")
+            tmp_path = f"{path}.tmp"
+            if fmt == 'csv':
+                data.to_csv(tmp_path, index=False, encoding='utf-8', lineterminator='\n')
+            else:
+                data.to_parquet(tmp_path, index=False, engine=engine)
+            os.replace(tmp_path, path)
+            written.append(path)
+    return written
@@ -0,0 +1,368 @@
+"""Voltage drop and I²R loss of every cable run in a quick estimate.
+
+The wire sizing panel checks one representative run per cable type. This
+module looks at all of them: estimate_cable_runs() turns a calculated
+estimate (EstimateEngine plus its totals) into a table of runs, one row per
+device, cable type, gauge, length and harness size, and cable_losses()
+prices the whole table in one cable_sizing.voltage_drop_many() call.
+EstimateEngine.calculate() reports the result as totals['cable_losses']
+(see loss_totals()).
+
+Runs are counted in circuits, a positive and a negative conductor of the
+row's one-way length. The engine tallies whips and extenders one conductor
+at a time (pos and neg legs differ on offset trackers), so a single leg
+counts as half a circuit; its VD % is that of a circuit with both legs at
+that length.
+
+String circuits are each string's module leads and end jumper: one circuit
+per string at one module's Imp, as long as the string's footprint (module
+width × modules per string), in the string cable size. The quick estimate
+doesn't size string wire, so that is the BOM default (10 AWG copper) unless
+the wire sizing names a 'string' size.
+
+Currents are operating currents: strings × module Imp on the DC side and the
+inverter's max AC current on the AC side, against the string Vmp and the
+inverter's nominal AC voltage. Every run uses the same two-conductor drop
+formula as autosize_conductor.
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.cable_sizing import get_ampacity_table, voltage_drop_many
+
+LOSS_CABLE_TYPES = ('string', 'harness', 'extender', 'whip', 'dc_feeder', 'ac_homerun')
+
+LOSS_CABLE_TYPE_NAMES = {
+    'string': 'String',
+    'harness': 'Harness',
+    'extender': 'Extender',
+    'whip': 'Whip',
+    'dc_feeder': 'DC Feeder',
+    'ac_homerun': 'AC Homerun',
+}
+
+# Quick Estimate wire sizing defaults (QuickEstimateDialog._WSS_CABLE_TYPES)
+_DEFAULT_MATERIAL = {
+    'string': 'copper', 'harness': 'copper', 'extender': 'copper', 'whip': 'copper',
+    'dc_feeder': 'aluminum', 'ac_homerun': 'aluminum',
+}
+
+RUN_COLUMNS = ['device_idx', 'device_name', 'cable_type', 'gauge', 'material', 'one_way_length_ft',
+               'circuits', 'strings', 'current_a', 'source_voltage', 'vd_target_pct']
+
+# device_idx of runs not tied to one device (averaged feeders, AC homeruns
+# from central skids) and of extenders on trackers with no device
+SITE_DEVICE = -2
+UNASSIGNED_DEVICE = -1
+
+
+def _device_names(engine) -> Dict[int, str]:
+    names = {}
+    for cb in engine.last_combiner_assignments or []:
+        names[cb['device_idx']] = cb.get('combiner_name')
+    for si in engine.last_si_assignments or []:
+        names[si['device_idx']] = si.get('inverter_name')
+    return names
+
+
+def _harnesses_by_device(engine) -> Dict[int, list]:
+    """{device_idx: [strings per harness]} from the engine's device assignments."""
+    harnesses = defaultdict(list)
+    for assignment in (engine.last_combiner_assignments or []) + (engine.last_si_assignments or []):
+        for conn in assignment.get('connections', []):
+            harnesses[assignment['device_idx']].append(conn['num_strings'])
+    return harnesses
+
+
+def estimate_cable_runs(engine, totals: dict) -> pd.DataFrame:
+    """
+    Every string, harness, extender, whip, DC feeder and AC homerun of a calculated estimate.
+
+    Args:
+        engine: the EstimateEngine (or one built from the same inputs) whose
+            assignments, wire sizing and settings produced totals
+        totals: EstimateEngine.calculate() result
+
+    Returns a DataFrame with RUN_COLUMNS. Whip and extender buckets don't
+    record harness sizes, so their current is that of the largest harness on
+    the device that uses the same gauge.
+    """
+    module = engine.selected_module
+    imp = module.imp if module else 0.0
+    vmp = module.vmp if module else 40.0
+    module_width_ft = (module.width_mm / 304.8) if module else 3.72
+    mps = engine.modules_per_string
+    string_voltage = vmp * mps
+    # Harness one-way length, as the wire sizing panel estimates it
+    string_footprint_ft = module_width_ft * mps
+    harness_one_way_ft = string_footprint_ft / 2.0
+
+    inverter = engine.selected_inverter
+    ac_voltage = 480.0
+    ac_current = 0.0
+    if inverter is not None:
+        if getattr(inverter, 'nominal_ac_voltage', 0) and inverter.nominal_ac_voltage > 0:
+            ac_voltage = float(inverter.nominal_ac_voltage)
+        ac_current = float(getattr(inverter, 'max_ac_current', 0) or 0)
+
+    settings = engine.wire_sizing_settings
+    topology = engine.topology
+    names = _device_names(engine)
+    harnesses = _harnesses_by_device(engine)
+
+    sizes_cache = {}
+
+    def wire_size(cable_type, num_strings):
+        key = (cable_type, num_strings)
+        if key not in sizes_cache:
+            sizes_cache[key] = engine.get_wire_size_for(cable_type, num_strings)
+        return sizes_cache[key]
+
+    # (device, cable type, gauge, one-way ft, strings) -> circuits
+    circuits = defaultdict(float)
+
+    def add(device, cable_type, gauge, length_ft, strings, count):
+        if count:
+            circuits[(device, cable_type, gauge, float(length_ft), strings)] += count
+
+    # {device: {strings per harness: harnesses}}
+    harness_counts = {device: Counter(sizes) for device, sizes in harnesses.items()}
+
+    # Largest harness per (device, cable type, gauge), site-wide as a fallback
+    strings_for_gauge = {}
+    site_strings_for_gauge = {}
+    for device, counts in harness_counts.items():
+        for h in counts:
+            for cable_type in ('extender', 'whip'):
+                gauge = wire_size(cable_type, h)
+                key = (device, cable_type, gauge)
+                strings_for_gauge[key] = max(strings_for_gauge.get(key, 0), h)
+                site_key = (cable_type, gauge)
+                site_strings_for_gauge[site_key] = max(site_strings_for_gauge.get(site_key, 0), h)
+
+    def bucket_strings(device, cable_type, gauge):
+        return (strings_for_gauge.get((device, cable_type, gauge))
+                or site_strings_for_gauge.get((cable_type, gauge)) or 1)
+
+    for device, sizes in harnesses.items():
+        add(device, 'string', wire_size('string', 1), string_footprint_ft, 1, sum(sizes))
+
+    if engine.lv_method != 'Trunk Bus':
+        for device, counts in harness_counts.items():
+            for h, count in counts.items():
+                add(device, 'harness', wire_size('harness', h), harness_one_way_ft, h, count)
+
+    # Symmetric whips count both legs; the per-polarity buckets count one
+    for bucket, cable_type, per_leg in (
+            ('whips_by_length_per_device', 'whip', 0.5),
+            ('whips_pos_by_length_per_device', 'whip', 0.5),
+            ('whips_neg_by_length_per_device', 'whip', 0.5),
+            ('extenders_pos_by_length_per_device', 'extender', 0.5),
+            ('extenders_neg_by_length_per_device', 'extender', 0.5)):
+        for device, by_length in (totals.get(bucket) or {}).items():
+            for (length_ft, gauge), count in by_length.items():
+                if count > 0:
+                    add(device, cable_type, gauge, length_ft,
+                        bucket_strings(device, cable_type, gauge), count * per_leg)
+
+    # Device-to-pad feeders: AC homeruns for string inverters, DC feeders otherwise
+    feeder_type = 'ac_homerun' if topology == 'Distributed String' else 'dc_feeder'
+    default_feeder = engine.wire_sizing.get(feeder_type, '') or '4/0 AWG'
+    parallel = max(1, engine.wire_sizing.get(f'{feeder_type}_parallel', 1))
+    site_strings = sum(sum(sizes) for sizes in harnesses.values())
+    feeder_runs = {}  # (device, gauge, one-way ft) -> (device strings, runs)
+    if totals.get('routed_feeder_details'):
+        for dev_idx, label, dist_ft in totals['routed_feeder_details']:
+            names.setdefault(dev_idx, label)
+            gauge = engine.device_feeder_sizes.get(dev_idx, default_feeder)
+            feeder_runs[(dev_idx, gauge, float(dist_ft))] = (sum(harnesses.get(dev_idx, [])), 1)
+    else:
+        feeder_count = sum(v['count'] for v in (totals.get('feeders_by_size') or {}).values())
+        for (gauge, _parallel), v in (totals.get('feeders_by_size') or {}).items():
+            if v['count'] > 0:
+                avg_strings = site_strings / feeder_count if feeder_count else 0
+                feeder_runs[(SITE_DEVICE, gauge, v['distance_ft'] / v['count'])] = (avg_strings, v['count'])
+
+    # Central skids / centralized inverters homerun from the site, not a device
+    ac_parallel = max(1, engine.wire_sizing.get('ac_homerun_parallel', 1))
+    if topology != 'Distributed String' and totals.get('ac_homerun_count'):
+        ac_length = (totals.get('_display') or {}).get('ac_homerun_avg_ft', engine.ac_homerun_distance)
+        add(SITE_DEVICE, 'ac_homerun', engine.wire_sizing.get('ac_homerun', '') or '4/0 AWG',
+            ac_length, 0, totals['ac_homerun_count'] * ac_parallel)
+
+    rows = []
+    for (device, cable_type, gauge, length_ft, strings), count in circuits.items():
+        current = ac_current / ac_parallel if cable_type == 'ac_homerun' else strings * imp
+        rows.append((device, cable_type, gauge, length_ft, count, strings, current))
+    for (device, gauge, length_ft), (strings, runs) in feeder_runs.items():
+        current = (ac_current if feeder_type == 'ac_homerun' else strings * imp) / parallel
+        rows.append((device, feeder_type, gauge, length_ft, runs * parallel, strings, current))
+
+    names[SITE_DEVICE] = 'Site'
+    names[UNASSIGNED_DEVICE] = 'Unassigned'
+    runs = pd.DataFrame(rows, columns=['device_idx', 'cable_type', 'gauge', 'one_way_length_ft',
+                                       'circuits', 'strings', 'current_a'])
+    runs['device_name'] = runs['device_idx'].map(
+        {d: names.get(d) or engine.device_names.get(d) or f"Dev-{d + 1:02d}" for d in runs['device_idx'].unique()})
+    runs['material'] = runs['cable_type'].map(
+        {t: settings.get(t, {}).get('material', _DEFAULT_MATERIAL[t]) for t in LOSS_CABLE_TYPES})
+    runs['vd_target_pct'] = runs['cable_type'].map(
+        {t: float(settings.get(t, {}).get('vd_target_pct', 2.0)) for t in LOSS_CABLE_TYPES})
+    runs['source_voltage'] = np.where(runs['cable_type'] == 'ac_homerun', ac_voltage, string_voltage)
+    order = {t: i for i, t in enumerate(LOSS_CABLE_TYPES)}
+    runs['_order'] = runs['cable_type'].map(order)
+    runs = runs.sort_values(['device_idx', '_order', 'one_way_length_ft'], kind='stable')
+    return runs[RUN_COLUMNS].reset_index(drop=True)
+
+
+def cable_losses(runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    runs (RUN_COLUMNS) with voltage drop and loss for every row, in one pass.
+
+    Adds vd_pct, loss_w (per circuit), total_loss_w (loss_w × circuits) and
+    vd_passes (vd_pct within the cable type's VD target).
+    """
+    table = get_ampacity_table()
+    # A site has a handful of distinct gauges; look each up once
+    gauge_codes, gauges = pd.factorize(runs['gauge'])
+    result = voltage_drop_many(
+        runs['current_a'].to_numpy(dtype=float),
+        runs['one_way_length_ft'].to_numpy(dtype=float),
+        table.gauge_index(gauges)[gauge_codes],
+        runs['material'].to_numpy(dtype=object),
+        runs['source_voltage'].to_numpy(dtype=float),
+    )
+    losses = runs.copy()
+    losses['vd_pct'] = result['vd_pct']
+    losses['loss_w'] = result['loss_w']
+    losses['total_loss_w'] = result['loss_w'] * losses['circuits'].to_numpy(dtype=float)
+    losses['vd_passes'] = losses['vd_pct'] <= losses['vd_target_pct']
+    return losses
+
+
+def device_loss_summary(losses: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per device: loss per cable type (W), total loss, worst VD % and
+    the number of runs over their VD target. Devices are in index order with
+    unassigned and site-level runs last.
+    """
+    if losses.empty:
+        return pd.DataFrame(columns=['device_idx', 'device_name', *LOSS_CABLE_TYPES,
+                                     'total_loss_w', 'max_vd_pct', 'runs_over_target'])
+    by_type = losses.pivot_table(index='device_idx', columns='cable_type', values='total_loss_w',
+                                 aggfunc='sum', fill_value=0.0)
+    by_type = by_type.reindex(columns=list(LOSS_CABLE_TYPES), fill_value=0.0)
+    by_type.columns.name = None
+    grouped = losses.groupby('device_idx')
+    over = losses[~losses['vd_passes']].groupby('device_idx')['circuits'].sum()
+    summary = by_type.assign(
+        device_name=grouped['device_name'].first(),
+        total_loss_w=by_type.sum(axis=1),
+        max_vd_pct=grouped['vd_pct'].max(),
+        runs_over_target=over.reindex(by_type.index, fill_value=0.0),
+    ).reset_index()
+    summary['_last'] = summary['device_idx'] < 0
+    summary = summary.sort_values(['_last', 'device_idx'], kind='stable').drop(columns='_last')
+    return summary[['device_idx', 'device_name', *LOSS_CABLE_TYPES,
+                    'total_loss_w', 'max_vd_pct', 'runs_over_target']].reset_index(drop=True)
+
+
+def loss_totals(losses: pd.DataFrame, dc_power_w: Optional[float] = None) -> dict:
+    """
+    Site and per-device totals of cable_losses(), as plain dicts.
+
+    Returns {'total_loss_w', 'loss_pct' (of dc_power_w, None without it),
+    'by_cable_type': {cable type: W}, 'circuits_over_target',
+    'by_device': {device_idx: {'device_name', 'total_loss_w', 'max_vd_pct',
+    'circuits_over_target', cable type: W, ...}}}.
+    """
+    summary = device_loss_summary(losses)
+    total_loss = float(losses['total_loss_w'].sum()) if not losses.empty else 0.0
+    by_device = (summary.rename(columns={'runs_over_target': 'circuits_over_target'})
+                 .astype({'device_idx': int}).set_index('device_idx').to_dict('index'))
+    return {
+        'total_loss_w': total_loss,
+        'loss_pct': total_loss / dc_power_w * 100.0 if dc_power_w else None,
+        'by_cable_type': {t: float(summary[t].sum()) for t in LOSS_CABLE_TYPES},
+        'circuits_over_target': float(summary['runs_over_target'].sum()),
+        'by_device': by_device,
+    }
+
+
+def write_cable_loss_sheet(ws, losses: pd.DataFrame, dc_power_w: Optional[float] = None):
+    """
+    Write the per-device loss summary followed by every run.
+
+    ws is a write-only worksheet (see excel_stream.save_with_streamed_sheets)
+    or an empty in-memory one; rows are appended from the top and styled with
+    the shared BOM named styles.
+
+    Args:
+        ws: Worksheet to write
+        losses: Result of cable_losses()
+        dc_power_w: Array STC power, to show the total loss as a percentage
+    """
+    from openpyxl.utils import get_column_letter
+
+    from src.utils.excel_stream import add_named_styles, styled_row
+
+    add_named_styles(ws.parent)
+
+    def append(values, styles, formats=None):
+        row = styled_row(ws, values, styles)
+        for cell, fmt in zip(row, formats or ()):
+            if fmt:
+                cell.number_format = fmt
+        ws.append(row)
+
+    def data_styles(n, warning):
+        # Device name left-aligned; rows over their VD target turn light red
+        if warning:
+            return ['BOM Cell Warning'] * n
+        return ['BOM Cell Left'] + ['BOM Cell'] * (n - 1)
+
+    summary = device_loss_summary(losses)
+    total_loss = float(losses['total_loss_w'].sum()) if not losses.empty else 0.0
+
+    for col in range(1, 13):
+        ws.column_dimensions[get_column_letter(col)].width = 24 if col == 1 else 16
+
+    total_text = f"{total_loss / 1000.0:,.2f} kW"
+    if dc_power_w:
+        total_text += f" ({total_loss / dc_power_w * 100.0:.2f}% of STC power)"
+    append(["Cable Losses"], 'BOM Title')
+    append(["Total Loss:", total_text], ['BOM Bold', None])
+    append(["I²R loss at module Imp (DC) and inverter max AC current (AC). "
+            "Runs over their voltage drop target are highlighted."], None)
+    ws.append([])
+
+    # Per-device summary (header on row 5)
+    append(['Device'] + [f"{LOSS_CABLE_TYPE_NAMES[t]} (W)" for t in LOSS_CABLE_TYPES]
+           + ['Total (W)', 'Max VD %', 'Circuits Over VD Target'], 'BOM Header')
+    watt_formats = ['#,##0.0'] * (len(LOSS_CABLE_TYPES) + 1)
+    for line in summary.itertuples(index=False):
+        values = [line.device_name] + [round(float(getattr(line, t)), 1) for t in LOSS_CABLE_TYPES]
+        values += [round(float(line.total_loss_w), 1), round(float(line.max_vd_pct), 3),
+                   float(line.runs_over_target)]
+        append(values, data_styles(len(values), line.runs_over_target > 0),
+               [None] + watt_formats + ['0.000', '0.#'])
+    totals = [round(float(summary[t].sum()), 1) for t in list(LOSS_CABLE_TYPES) + ['total_loss_w']]
+    append(["Total:"] + totals, ['BOM Section Label'] + ['BOM Section'] * len(totals),
+           [None] + watt_formats)
+
+    # Every run
+    ws.append([])
+    ws.append([])
+    append(['Device', 'Cable', 'Gauge', 'Material', 'One-Way Length (ft)', 'Circuits',
+            'Strings', 'Current (A)', 'Voltage (V)', 'VD %', 'VD Target %', 'Loss (W)'], 'BOM Header')
+    run_formats = [None, None, None, None, '#,##0.0', '0.#', '0.##', '0.00', '#,##0.0', '0.000', '0.0', '#,##0.0']
+    for line in losses.itertuples(index=False):
+        values = [line.device_name, LOSS_CABLE_TYPE_NAMES[line.cable_type], line.gauge,
+                  line.material.title(), round(float(line.one_way_length_ft), 1), float(line.circuits),
+                  float(line.strings), round(float(line.current_a), 2), round(float(line.source_voltage), 1),
+                  round(float(line.vd_pct), 3), float(line.vd_target_pct), round(float(line.total_loss_w), 1)]
+        append(values, data_styles(len(values), not line.vd_passes), run_formats)
@@ -6,9 +6,12 @@ for all four cable types in a harness assembly based on electrical load.
 """
 
 from typing import Dict, Optional, List, Tuple
+import functools
 import json
 import os
 
+import numpy as np
+
 # NEC Table 310.15(B)(16) - Ampacity for 90°C rated cables (THWN-2, XHHW-2)
 # Standard sizes used in solar installations
 CABLE_AMPACITY_90C = {
@@ -553,6 +556,22 @@ def _load_chapter9_table8() -> dict:
     return _chapter9_table8_cache
 
 
+def reload_nec_tables() -> None:
+    """Re-read the NEC JSON tables on next use and drop everything derived from them."""
+    global _nec_table_cache, _nec_table_310_17_cache, _ambient_correction_cache
+    global _ccc_adjustment_cache, _insulation_types_cache, _chapter9_table8_cache
+    global _ampacity_table_cache
+    _nec_table_cache = None
+    _nec_table_310_17_cache = None
+    _ambient_correction_cache = None
+    _ccc_adjustment_cache = None
+    _insulation_types_cache = None
+    _chapter9_table8_cache = None
+    _ampacity_table_cache = None
+    _sizing_curve_cache.clear()
+    clear_autosize_cache()
+
+
 # ---------------------------------------------------------------------------
 # Public lookup functions
 # ---------------------------------------------------------------------------
@@ -615,6 +634,300 @@ def get_voltage_drop_pct(current_a: float, one_way_length_ft: float, gauge: str,
     return (2.0 * current_a * one_way_length_ft * r_per_kft) / 1000.0 / source_voltage * 100.0
 
 
+# ---------------------------------------------------------------------------
+# Dense lookup table — vectorized sizing over every gauge at once
+# ---------------------------------------------------------------------------
+
+_ampacity_table_cache = None
+_sizing_curve_cache = {}
+_SIZING_CURVE_CACHE_MAX = 256
+
+
+class AmpacityTable:
+    """
+    NEC ampacity and resistance data as dense NumPy arrays.
+
+    ampacity[material, temp, table, gauge] is the base ampacity from Table
+    310.16 (table 0: conduit/buried, and the 110.14(C) termination column) or
+    Table 310.17 (table 1: free air). resistance[material, gauge] is the
+    Chapter 9 Table 8 DC resistance in ohms per 1000 ft. Gauges run in
+    CABLE_SIZE_ORDER_EXTENDED order, followed by any other sizes the data
+    files list (e.g. 12 AWG), which autosizing never selects. Missing entries
+    are 0, which is what the dict lookups return for them.
+    """
+
+    def __init__(self, table_310_16: dict, table_310_17: dict, chapter9_table8: dict):
+        tables = (table_310_16, table_310_17)
+        self.gauges = list(CABLE_SIZE_ORDER_EXTENDED)
+        for t in tables + (chapter9_table8,):
+            for data in t.values():
+                if isinstance(data, dict):
+                    self.gauges.extend(g for g in data if g not in self.gauges)
+        gauge_idx = {g: i for i, g in enumerate(self.gauges)}
+        n_sizing = len(CABLE_SIZE_ORDER_EXTENDED)
+
+        self.materials = sorted({m for t in tables + (chapter9_table8,)
+                                 for m, data in t.items() if isinstance(data, dict)})
+        temp_keys = {k for t in tables for m in self.materials
+                     for row in t.get(m, {}).values() for k in row}
+        self.temps = sorted(int(k[:-1]) for k in temp_keys if k.endswith('C') and k[:-1].isdigit())
+        self._material_idx = {m: i for i, m in enumerate(self.materials)}
+        self._temp_idx = {t: i for i, t in enumerate(self.temps)}
+
+        self.ampacity = np.zeros((len(self.materials), len(self.temps), 2, len(self.gauges)))
+        self.resistance = np.zeros((len(self.materials), len(self.gauges)))
+        self.available = np.zeros((len(self.materials), len(self.gauges)), dtype=bool)
+        for mi, material in enumerate(self.materials):
+            for ti, table in enumerate(tables):
+                for gauge, row in table.get(material, {}).items():
+                    if gauge not in gauge_idx:
+                        continue
+                    if ti == 0 and gauge_idx[gauge] < n_sizing:
+                        self.available[mi, gauge_idx[gauge]] = True
+                    for temp, t_idx in self._temp_idx.items():
+                        self.ampacity[mi, t_idx, ti, gauge_idx[gauge]] = float(row.get(f"{temp}C", 0))
+            for gauge, r_per_kft in chapter9_table8.get(material, {}).items():
+                if gauge in gauge_idx:
+                    self.resistance[mi, gauge_idx[gauge]] = r_per_kft
+
+    def size_columns(self, material: str) -> np.ndarray:
+        """Gauge columns autosizing steps through: get_available_sizes(), or all of them."""
+        mi = self._material_idx.get(material)
+        if mi is None or not self.available[mi].any():
+            return np.arange(len(CABLE_SIZE_ORDER_EXTENDED))
+        return np.flatnonzero(self.available[mi])
+
+    def ampacity_row(self, material: str, temp_rating_c: int, free_air: bool) -> np.ndarray:
+        """Base ampacity of every gauge (zeros for an unknown material or temperature)."""
+        mi = self._material_idx.get(material)
+        ti = self._temp_idx.get(temp_rating_c)
+        if mi is None or ti is None:
+            return np.zeros(len(self.gauges))
+        return self.ampacity[mi, ti, 1 if free_air else 0]
+
+    def resistance_row(self, material: str) -> np.ndarray:
+        mi = self._material_idx.get(material)
+        if mi is None:
+            return np.zeros(len(self.gauges))
+        return self.resistance[mi]
+
+    def gauge_index(self, gauges) -> np.ndarray:
+        """Column of each gauge name, -1 for a size the table doesn't cover."""
+        idx = {g: i for i, g in enumerate(self.gauges)}
+        return np.array([idx.get(g, -1) for g in gauges], dtype=np.intp)
+
+    def material_index(self, materials) -> np.ndarray:
+        """Row of each material name, -1 for an unknown material."""
+        return np.array([self._material_idx.get(m, -1) for m in materials], dtype=np.intp)
+
+
+def get_ampacity_table() -> AmpacityTable:
+    """The AmpacityTable for the loaded NEC data, built on first use."""
+    global _ampacity_table_cache
+    if _ampacity_table_cache is None:
+        _sizing_curve_cache.clear()
+        _ampacity_table_cache = AmpacityTable(_load_nec_table(), _load_table_310_17(),
+                                              _load_chapter9_table8())
+    return _ampacity_table_cache
+
+
+def voltage_drop_many(current_a, one_way_length_ft, gauge_index, material, source_voltage) -> dict:
+    """
+    Voltage drop and conductor loss of many runs at once.
+
+    The array form of get_voltage_drop_pct(): current_a, one_way_length_ft,
+    gauge_index and source_voltage broadcast together; material is one name
+    for every run or one per run. gauge_index holds positions in
+    AmpacityTable.gauges (CABLE_SIZE_ORDER_EXTENDED, then the table's extra
+    sizes) as returned by get_ampacity_table().gauge_index(), with -1 for a
+    size the table doesn't cover. Sizes or materials without Chapter 9
+    resistance data drop nothing, as in the scalar lookup.
+
+    Returns a dict of arrays:
+        vd_v    -- drop over both conductors: 2 × I × L × R_per_kft / 1000
+        vd_pct  -- vd_v as a percentage of source_voltage (0 when it is 0)
+        loss_w  -- I × vd_v, the I²R loss of the run
+    """
+    table = get_ampacity_table()
+    current, length, gauge_idx, voltage = np.broadcast_arrays(
+        np.asarray(current_a, dtype=float), np.asarray(one_way_length_ft, dtype=float),
+        np.asarray(gauge_index, dtype=np.intp), np.asarray(source_voltage, dtype=float))
+    if isinstance(material, str):
+        r = table.resistance_row(material)[gauge_idx]
+    else:
+        mat_idx = np.broadcast_to(table.material_index(np.ravel(material)).reshape(np.shape(material)),
+                                  gauge_idx.shape)
+        r = table.resistance[mat_idx, gauge_idx]
+        r = np.where(mat_idx < 0, 0.0, r)
+    r = np.where(gauge_idx < 0, 0.0, r)
+
+    vd_v = (2.0 * current * length * r) / 1000.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vd_pct = np.where((r == 0) | (voltage == 0), 0.0,
+                          (2.0 * current * length * r) / 1000.0 / voltage * 100.0)
+    return {
+        'vd_v': vd_v,
+        'vd_pct': vd_pct,
+        'loss_w': current * vd_v,
+    }
+
+
+def _sizing_curve(material: str, insulation_type: str, installation_method: str,
+                  ambient_c: float, ccc_count: int, termination_temp_c: int) -> dict:
+    """Derated ampacity of each candidate gauge for one set of cable settings."""
+    table = get_ampacity_table()
+    key = (material, insulation_type, installation_method, ambient_c, ccc_count, termination_temp_c)
+    curve = _sizing_curve_cache.get(key)
+    if curve is not None:
+        return curve
+    conductor_temp_c = _load_insulation_types().get(insulation_type, {}).get('temp_rating_c', 90)
+    free_air = installation_method == 'free_air'
+    pv_wire_free_air = (insulation_type == 'PV Wire' and free_air)
+
+    columns = table.size_columns(material)
+    base = table.ampacity_row(material, conductor_temp_c, free_air)[columns]
+    af = get_ambient_correction(ambient_c, conductor_temp_c)
+    cf = 1.0 if free_air else get_ccc_adjustment(ccc_count)
+    adj = base * af * cf
+    if pv_wire_free_air:
+        tc = adj  # no termination cap: MC4 connectors are 90C-rated
+    else:
+        tc = table.ampacity_row(material, termination_temp_c, False)[columns]
+    final = np.minimum(adj, tc)
+    curve = {
+        'gauges': [table.gauges[c] for c in columns],
+        'conductor_temp_c': conductor_temp_c,
+        'ambient_correction': af,
+        'ccc_adjustment': cf,
+        'base': base,
+        'adjusted': adj,
+        'term_cap': tc,
+        'final': final,
+        # First gauge meeting a requirement == searchsorted on the running max
+        'final_cummax': np.maximum.accumulate(final),
+        'resistance': table.resistance_row(material)[columns],
+    }
+    if len(_sizing_curve_cache) >= _SIZING_CURVE_CACHE_MAX:
+        _sizing_curve_cache.clear()
+    _sizing_curve_cache[key] = curve
+    return curve
+
+
+def _select_gauges(curve: dict, required_a, one_way_length_ft, source_voltage, vd_target_pct):
+    """
+    Gauge column, ampacity/VD pass flags and binding constraint per run, by
+    the same two passes as autosize_conductor: smallest gauge meeting the
+    required ampacity, then the first from there that also meets voltage drop.
+    """
+    required_a, length, voltage = np.broadcast_arrays(
+        np.asarray(required_a, dtype=float), np.asarray(one_way_length_ft, dtype=float),
+        np.asarray(source_voltage, dtype=float))
+    n_gauges = len(curve['gauges'])
+    last = n_gauges - 1
+
+    amp_idx = np.searchsorted(curve['final_cummax'], required_a, side='left')
+    amp_passes = amp_idx < n_gauges
+
+    # Voltage drop of every run on every gauge
+    skip_vd = (length <= 0) | (voltage <= 0)
+    r = curve['resistance']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vd = (2.0 * required_a[:, None] * length[:, None] * r[None, :]) / 1000.0 / voltage[:, None] * 100.0
+    vd = np.where(skip_vd[:, None] | (r[None, :] == 0), 0.0, vd)
+    vd_ok = (length[:, None] <= 0) | (vd <= vd_target_pct)
+
+    candidates = vd_ok & (np.arange(n_gauges)[None, :] >= amp_idx[:, None])
+    found = candidates.any(axis=1)
+    first_ok = np.argmax(candidates, axis=1)
+
+    index = np.where(amp_passes & found, first_ok, last)
+    vd_at = vd[np.arange(len(index)), index]
+    vd_passes = np.where(amp_passes, found, (vd_at <= vd_target_pct) | (length <= 0))
+    binding = np.where(amp_passes & found & (first_ok == amp_idx), 'ampacity',
+                       np.where(amp_passes, 'voltage_drop', 'ampacity'))
+    return index, amp_passes, vd_at, vd_passes, binding
+
+
+def autosize_many(
+    isc_total_a,
+    ocpd_rating_a,
+    one_way_length_ft,
+    material: str,
+    insulation_type: str,
+    installation_method: str,
+    ambient_c: float,
+    ccc_count: int,
+    termination_temp_c: int,
+    source_voltage,
+    vd_target_pct: float,
+    details: bool = False,
+) -> dict:
+    """
+    Autosize many runs that share one set of cable settings.
+
+    isc_total_a, ocpd_rating_a, one_way_length_ft and source_voltage are
+    scalars or equal-length arrays, one entry per run; the remaining settings
+    are as for autosize_conductor. Each run gets the gauge autosize_conductor
+    would return for it.
+
+    Returns a dict of NumPy arrays, one entry per run: gauge, required_ampacity,
+    final_ampacity, ampacity_passes, vd_pct, vd_passes, binding_constraint.
+    With details=True it also holds 'details', a list with the breakdown dict
+    autosize_conductor returns for each run.
+    """
+    isc, ocpd, length, voltage = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(isc_total_a, dtype=float)),
+        np.atleast_1d(np.asarray(ocpd_rating_a, dtype=float)),
+        np.atleast_1d(np.asarray(one_way_length_ft, dtype=float)),
+        np.atleast_1d(np.asarray(source_voltage, dtype=float)))
+    nec_690_8 = isc * 1.5625
+    required_a = np.where(ocpd >= nec_690_8, ocpd, nec_690_8)
+
+    curve = _sizing_curve(material, insulation_type, installation_method,
+                          ambient_c, ccc_count, termination_temp_c)
+    index, amp_passes, vd_pct, vd_passes, binding = _select_gauges(
+        curve, required_a, length, voltage, vd_target_pct)
+    result = {
+        'gauge': np.array(curve['gauges'], dtype=object)[index],
+        'required_ampacity': required_a,
+        'final_ampacity': curve['final'][index],
+        'ampacity_passes': amp_passes,
+        'vd_pct': vd_pct,
+        'vd_passes': vd_passes,
+        'binding_constraint': binding,
+    }
+    if details:
+        table_label, term_source = _autosize_labels(curve['conductor_temp_c'], insulation_type,
+                                                    installation_method, termination_temp_c)
+        result['details'] = [{
+            "gauge": curve['gauges'][g],
+            "material": material,
+            "installation_method": installation_method,
+            "insulation_type": insulation_type,
+            "conductor_temp_rating_c": curve['conductor_temp_c'],
+            "termination_temp_rating_c": termination_temp_c,
+            "base_ampacity": float(curve['base'][g]),
+            "base_ampacity_source": table_label,
+            "ambient_temp_c": ambient_c,
+            "ambient_correction": round(curve['ambient_correction'], 4),
+            "ccc_count": ccc_count,
+            "ccc_adjustment": round(curve['ccc_adjustment'], 4),
+            "adjusted_ampacity": round(float(curve['adjusted'][g]), 2),
+            "termination_capped_ampacity": round(float(curve['term_cap'][g]), 2),
+            "termination_cap_source": term_source,
+            "final_ampacity": round(float(curve['final'][g]), 2),
+            "required_ampacity": round(float(required_a[i]), 2),
+            "required_ampacity_source": ("OCPD rating (NEC 240.4)" if ocpd[i] >= nec_690_8[i]
+                                         else "NEC 690.8 (Isc × 1.5625)"),
+            "ampacity_passes": bool(amp_passes[i]),
+            "vd_pct": round(float(vd_pct[i]), 3),
+            "vd_target_pct": vd_target_pct,
+            "vd_passes": bool(vd_passes[i]),
+            "binding_constraint": str(binding[i]),
+        } for i, g in enumerate(index.tolist())]
+    return result
+
+
 def autosize_conductor(
     isc_total_a: float,
     ocpd_rating_a: float,
@@ -635,10 +948,37 @@ def autosize_conductor(
     Returns a structured breakdown dict suitable for display and audit.
     If one_way_length_ft <= 0, the VD check is skipped (vd_passes=True).
     """
-    insulation_data = _load_insulation_types().get(insulation_type, {})
-    conductor_temp_c = insulation_data.get('temp_rating_c', 90)
-    temp_key = f"{conductor_temp_c}C"
+    result = _autosize_conductor_memo(
+        isc_total_a, ocpd_rating_a, material, insulation_type, installation_method,
+        ambient_c, ccc_count, termination_temp_c, one_way_length_ft, source_voltage,
+        vd_target_pct)
+    # Memoized results are shared; hand each caller its own dict
+    return dict(result)
+
 
+# Autosizing is re-run with the same inputs every time the wire sizing panel
+# refreshes, so results are memoized on the full argument tuple. typed=True
+# keeps 40 and 40.0 apart since the inputs are echoed back in the result.
+AUTOSIZE_MEMO_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=AUTOSIZE_MEMO_SIZE, typed=True)
+def _autosize_conductor_memo(*args) -> dict:
+    return _autosize_conductor(*args)
+
+
+def autosize_cache_info():
+    """Hits, misses, maxsize and current size of the autosize memo."""
+    return _autosize_conductor_memo.cache_info()
+
+
+def clear_autosize_cache() -> None:
+    _autosize_conductor_memo.cache_clear()
+
+
+def _autosize_labels(conductor_temp_c: int, insulation_type: str, installation_method: str,
+                     termination_temp_c: int):
+    """(base ampacity table, termination cap) source labels of an autosize breakdown."""
     if installation_method == 'free_air':
         table_label = f"NEC 2023 Table 310.17, {conductor_temp_c}°C"
     else:
@@ -646,16 +986,34 @@ def autosize_conductor(
 
     # NEC 110.14(C) termination cap: PV Wire in free air uses 90C-rated MC4 connectors,
     # so the cap does not apply — termination and conductor are both rated 90C.
-    pv_wire_free_air = (insulation_type == 'PV Wire' and installation_method == 'free_air')
-    if pv_wire_free_air:
+    if insulation_type == 'PV Wire' and installation_method == 'free_air':
         term_source = "N/A - PV Wire free air (MC4 connectors rated 90C, NEC 110.14(C) cap not applied)"
     else:
         term_source = f"NEC 110.14(C), {termination_temp_c}°C terminals"
-    required_a, req_source = get_required_ampacity(isc_total_a, ocpd_rating_a)
+    return table_label, term_source
 
-    available = get_available_sizes(material)
-    if not available:
-        available = CABLE_SIZE_ORDER_EXTENDED
+
+def _autosize_conductor(
+    isc_total_a: float,
+    ocpd_rating_a: float,
+    material: str,
+    insulation_type: str,
+    installation_method: str,
+    ambient_c: float,
+    ccc_count: int,
+    termination_temp_c: int,
+    one_way_length_ft: float,
+    source_voltage: float,
+    vd_target_pct: float,
+) -> dict:
+    insulation_data = _load_insulation_types().get(insulation_type, {})
+    conductor_temp_c = insulation_data.get('temp_rating_c', 90)
+    temp_key = f"{conductor_temp_c}C"
+
+    table_label, term_source = _autosize_labels(conductor_temp_c, insulation_type,
+                                                installation_method, termination_temp_c)
+    pv_wire_free_air = (insulation_type == 'PV Wire' and installation_method == 'free_air')
+    required_a, req_source = get_required_ampacity(isc_total_a, ocpd_rating_a)
 
     def _calc_for(gauge):
         base = get_base_ampacity(gauge, material, conductor_temp_c, installation_method)
@@ -674,13 +1032,13 @@ def autosize_conductor(
             return 0.0
         return get_voltage_drop_pct(required_a, one_way_length_ft, gauge, material, source_voltage)
 
-    # Pass 1: find minimum gauge that satisfies ampacity
-    amp_idx = None
-    for i, gauge in enumerate(available):
-        _, _, _, _, _, final = _calc_for(gauge)
-        if final >= required_a:
-            amp_idx = i
-            break
+    # Pass 1: find minimum gauge that satisfies ampacity, from the lookup table
+    curve = _sizing_curve(material, insulation_type, installation_method,
+                          ambient_c, ccc_count, termination_temp_c)
+    available = curve['gauges']
+    amp_idx = int(np.searchsorted(curve['final_cummax'], required_a, side='left'))
+    if amp_idx == len(available):
+        amp_idx = None
 
     def _build_result(gauge, amp_passes, vd_pct, vd_passes, binding):
         base, af, cf, adj, tc, final = _calc_for(gauge)
@@ -7,9 +7,28 @@ The three-leg path is:
     Leg 1 — row-direction from device to corridor entry point
     Leg 2 — along the corridor from entry to exit
     Leg 3 — row-direction from corridor exit point to pad
+
+The module functions work on a bare polyline and rescan it on every call.
+CorridorIndex precomputes one corridor (cumulative arc lengths, a y-sorted
+segment index) so routing many devices along it costs O(log n) per device.
+
+Where corridors cross, CorridorNetwork joins them into one routing graph so a
+feeder can enter on its assigned corridor and leave on whichever road gets it
+to the pad shortest.
 """
 
+import bisect
+import heapq
 import math
+from itertools import accumulate
+
+import numpy as np
+
+# A corridor end this close to another corridor joins it (hand-drawn T junctions)
+JUNCTION_SNAP_FT = 2.0
+
+# Network routes must beat the single-corridor route by more than this
+ROUTE_IMPROVEMENT_FT = 1e-6
 
 
 def intersect_horizontal(y, polyline):
@@ -102,6 +121,149 @@ def pick_entry(device_xy, polyline):
     return entry_x, (seg_idx, t)
 
 
+class CorridorIndex:
+    """
+    Precomputed lookups for routing many devices along one corridor polyline.
+
+    Gives the same results as the module functions, including which crossing
+    wins a tie, but answers each query in O(log n) (plus the crossings found)
+    instead of rescanning every segment:
+        cum_lengths — prefix sums of segment lengths, so arc length is one
+                      lookup instead of a re-sum from the polyline start
+        y slabs     — non-horizontal segments bucketed by the y-interval
+                      between consecutive vertex ys, so a horizontal line only
+                      tests the segments that can cross it
+    Entry/exit picks are memoized per point, so devices sharing a pad reuse
+    the pad's exit point.
+    """
+
+    def __init__(self, polyline):
+        self.polyline = [tuple(p) for p in polyline]
+        n_seg = len(self.polyline) - 1
+        seg_lengths = [math.hypot(self.polyline[i + 1][0] - self.polyline[i][0],
+                                  self.polyline[i + 1][1] - self.polyline[i][1])
+                       for i in range(n_seg)]
+        self.seg_lengths = seg_lengths
+        self.cum_lengths = [0.0] + list(accumulate(seg_lengths))
+
+        # Vertex ys for intersect_horizontal: segments touching each exact key
+        # (_on_key) and segments spanning each open slab (keys[k], keys[k+1])
+        slanted = [i for i in range(n_seg) if self.polyline[i + 1][1] != self.polyline[i][1]]
+        self._keys = sorted({self.polyline[j][1] for i in slanted for j in (i, i + 1)})
+        key_pos = {y: k for k, y in enumerate(self._keys)}
+        self._on_key = [[] for _ in self._keys]
+        self._in_slab = [[] for _ in self._keys]
+        for i in slanted:
+            a, b = sorted((key_pos[self.polyline[i][1]], key_pos[self.polyline[i + 1][1]]))
+            for k in range(a, b + 1):
+                self._on_key[k].append(i)
+            for k in range(a, b):
+                self._in_slab[k].append(i)
+
+        # Vertex ys for nearest_endpoint, each with its first vertex index
+        first_vertex = {}
+        for i, (_vx, vy) in enumerate(self.polyline):
+            first_vertex.setdefault(vy, i)
+        self._vertex_ys = sorted(first_vertex)
+        self._first_vertex = first_vertex
+        self._entries = {}
+
+    def intersect_horizontal(self, y):
+        """Same as intersect_horizontal(y, polyline)."""
+        k = bisect.bisect_left(self._keys, y)
+        if k < len(self._keys) and self._keys[k] == y:
+            candidates = self._on_key[k]
+        elif 0 < k < len(self._keys):
+            candidates = self._in_slab[k - 1]
+        else:
+            return []
+        results = []
+        for i in candidates:
+            x1, y1 = self.polyline[i]
+            x2, y2 = self.polyline[i + 1]
+            t = (y - y1) / (y2 - y1)
+            if 0.0 <= t <= 1.0:
+                results.append((x1 + t * (x2 - x1), i, t))
+        return results
+
+    def nearest_endpoint(self, point):
+        """Same as nearest_endpoint(point, polyline)."""
+        py = point[1]
+        k = bisect.bisect_left(self._vertex_ys, py)
+        best_dist = float('inf')
+        best_i = 0
+        for vy in self._vertex_ys[max(0, k - 1):k + 1]:
+            dist = abs(vy - py)
+            i = self._first_vertex[vy]
+            if dist < best_dist or (dist == best_dist and i < best_i):
+                best_dist = dist
+                best_i = i
+        last = len(self.polyline) - 1
+        seg_idx = max(0, best_i - 1) if best_i == last else best_i
+        t = 1.0 if best_i == last and best_i > 0 else 0.0
+        return seg_idx, t
+
+    def arc_length_at(self, pos):
+        """Arc length from the polyline start to (segment_idx, t)."""
+        seg_idx, t = pos
+        return self.cum_lengths[seg_idx] + t * self.seg_lengths[seg_idx]
+
+    def pick_entry(self, xy):
+        """Same as pick_entry(xy, polyline), memoized per point."""
+        entry = self._entries.get(xy)
+        if entry is None:
+            entry = self._pick_entry(xy)
+            self._entries[xy] = entry
+        return entry
+
+    def _pick_entry(self, xy):
+        x = xy[0]
+        hits = self.intersect_horizontal(xy[1])
+        if hits:
+            best_x, best_seg, best_t = min(hits, key=lambda h: abs(h[0] - x))
+            return best_x, (best_seg, best_t)
+        seg_idx, t = self.nearest_endpoint(xy)
+        seg_x1 = self.polyline[seg_idx][0]
+        seg_x2 = self.polyline[seg_idx + 1][0] if seg_idx + 1 < len(self.polyline) else seg_x1
+        return seg_x1 + t * (seg_x2 - seg_x1), (seg_idx, t)
+
+    def three_leg_distance(self, device_xy, pad_xy):
+        """Same as three_leg_distance(device_xy, pad_xy, polyline)."""
+        device_xy = tuple(device_xy)
+        pad_xy = tuple(pad_xy)
+        entry_x, entry_pos = self.pick_entry(device_xy)
+        exit_x, exit_pos = self.pick_entry(pad_xy)
+
+        entry_len = self.arc_length_at(entry_pos)
+        exit_len = self.arc_length_at(exit_pos)
+        total = abs(device_xy[0] - entry_x) + abs(exit_len - entry_len) + abs(pad_xy[0] - exit_x)
+
+        forward = entry_len <= exit_len
+        from_len, to_len = (entry_len, exit_len) if forward else (exit_len, entry_len)
+
+        # Vertices starting a segment that reaches past from_len, from from_len up to to_len
+        cum = self.cum_lengths
+        stop = min(bisect.bisect_left(cum, to_len), len(self.polyline) - 1)
+        middle_pts = [self.polyline[i] for i in range(bisect.bisect_left(cum, from_len), stop)
+                      if cum[i] + self.seg_lengths[i] > from_len]
+        if not forward:
+            middle_pts.reverse()
+
+        # middle_pts now run entry -> exit whichever way along the polyline that is
+        entry_pt = (entry_x, device_xy[1])
+        exit_pt = (exit_x, pad_xy[1])
+        return total, [device_xy, entry_pt] + middle_pts + [exit_pt, pad_xy]
+
+    def three_leg_distances(self, device_xys, pad_xys):
+        """
+        Route every device along this corridor to its pad.
+
+        device_xys and pad_xys are parallel sequences of (x, y); returns a list
+        of (total_ft, path_geom), one per device, as three_leg_distance would.
+        """
+        return [self.three_leg_distance(d, p) for d, p in zip(device_xys, pad_xys)]
+
+
 def three_leg_distance(device_xy, pad_xy, polyline):
     """
     Compute the total routed distance for a device assigned to a corridor.
@@ -109,53 +271,226 @@ def three_leg_distance(device_xy, pad_xy, polyline):
     Returns (total_ft, path_geom) where path_geom is a list of (x, y) world
     coords representing the three-leg polyline:
         [device_xy, corridor_entry, ... corridor segments ..., corridor_exit, pad_xy]
+
+    Builds a throwaway CorridorIndex; callers routing several devices along
+    the same corridor should keep one CorridorIndex and call its methods.
     """
-    device_x, device_y = device_xy
-    pad_x, pad_y = pad_xy
-
-    entry_x, entry_pos = pick_entry(device_xy, polyline)
-    exit_x, exit_pos = pick_entry(pad_xy, polyline)
-
-    leg1 = abs(device_x - entry_x)
-    leg2 = polyline_arc_length(polyline, entry_pos, exit_pos)
-    leg3 = abs(pad_x - exit_x)
-    total = leg1 + leg2 + leg3
-
-    # Build path geometry
-    entry_y = device_y  # entry is at the device's y (horizontal intersection)
-    exit_y = pad_y      # exit is at the pad's y (horizontal intersection)
-
-    # Collect corridor vertices between entry and exit
-    entry_len = _arc_param_to_length(polyline, entry_pos[0], entry_pos[1])
-    exit_len = _arc_param_to_length(polyline, exit_pos[0], exit_pos[1])
-    if entry_len <= exit_len:
-        from_len, to_len = entry_len, exit_len
-        forward = True
-    else:
-        from_len, to_len = exit_len, entry_len
-        forward = False
-
-    # Vertex indices between from_len and to_len (exclusive of end-segment fractional pts)
-    middle_pts = []
-    acc = 0.0
-    for i in range(len(polyline) - 1):
-        x1, y1 = polyline[i]
-        x2, y2 = polyline[i + 1]
-        seg_len = math.hypot(x2 - x1, y2 - y1)
-        if acc + seg_len > from_len and acc < to_len:
-            if acc >= from_len:
-                middle_pts.append((x1, y1))
-        acc += seg_len
-    if not forward:
-        middle_pts.reverse()
-
-    entry_pt = (entry_x, entry_y)
-    exit_pt = (exit_x, exit_y)
-
-    if forward:
-        corridor_pts = [entry_pt] + middle_pts + [exit_pt]
-    else:
-        corridor_pts = [exit_pt] + middle_pts + [entry_pt]
-
-    path_geom = [device_xy] + corridor_pts + [pad_xy]
-    return total, path_geom
+    return CorridorIndex(polyline).three_leg_distance(device_xy, pad_xy)
+
+
+def _segment_arrays(index):
+    """(p1, p2, seg_lengths, cum_starts) arrays for a CorridorIndex's segments."""
+    pts = np.asarray(index.polyline, dtype=float)
+    return pts[:-1], pts[1:], np.asarray(index.seg_lengths), np.asarray(index.cum_lengths[:-1])
+
+
+class CorridorNetwork:
+    """
+    Routing graph over all corridors of a site.
+
+    Nodes are corridor vertices, crossings between two corridors and the ends
+    of corridors that stop within JUNCTION_SNAP_FT of another one; edges run
+    along each corridor between consecutive nodes, weighted by arc length (a
+    snapped end adds a short edge across its gap).
+
+    A device still enters on its assigned corridor with the row-direction
+    leg 1, and the pad is still reached with a row-direction leg 3, but the
+    pad may be reached from any corridor that crosses its row and the path
+    in between may change roads at junctions. Each pad gets one Dijkstra tree (memoized), so
+    routing every device to it is a lookup plus an O(log n) entry pick.
+    A device keeps its single-corridor three-leg route unless the network
+    route is shorter, so sites with one corridor, or no junctions, route
+    exactly as before.
+    """
+
+    def __init__(self, polylines):
+        self.indexes = [CorridorIndex(pts) if len(pts) >= 2 else None for pts in polylines]
+        self.node_xy = []
+        self.adjacency = []
+        stops = [[] for _ in self.indexes]  # per corridor: [(arc length, node)]
+
+        for c, index in enumerate(self.indexes):
+            if index is not None:
+                for i, xy in enumerate(index.polyline):
+                    stops[c].append((index.cum_lengths[i], self._add_node(xy)))
+
+        arrays = {c: _segment_arrays(index) for c, index in enumerate(self.indexes) if index is not None}
+        corridors = sorted(arrays)
+        for n, c in enumerate(corridors):
+            for d in corridors[n + 1:]:
+                for xy, arc_c, arc_d in self._crossings(arrays[c], arrays[d]):
+                    node = self._add_node(xy)
+                    stops[c].append((arc_c, node))
+                    stops[d].append((arc_d, node))
+            for d in corridors:
+                if d == c:
+                    continue
+                for end in (0, len(self.indexes[c].polyline) - 1):
+                    snap = self._snap(self.indexes[c].polyline[end], arrays[d])
+                    if snap is not None:
+                        xy, arc_d, gap = snap
+                        node = self._add_node(xy)
+                        stops[d].append((arc_d, node))
+                        self._add_edge(stops[c][end][1], node, gap)
+
+        self._stop_arcs = []
+        self._stop_nodes = []
+        for corridor_stops in stops:
+            corridor_stops.sort()
+            for (arc1, n1), (arc2, n2) in zip(corridor_stops, corridor_stops[1:]):
+                self._add_edge(n1, n2, arc2 - arc1)
+            self._stop_arcs.append([arc for arc, _ in corridor_stops])
+            self._stop_nodes.append([node for _, node in corridor_stops])
+        self._trees = {}
+
+    def _add_node(self, xy):
+        self.node_xy.append((float(xy[0]), float(xy[1])))
+        self.adjacency.append([])
+        return len(self.node_xy) - 1
+
+    def _add_edge(self, a, b, weight):
+        self.adjacency[a].append((b, weight))
+        self.adjacency[b].append((a, weight))
+
+    @staticmethod
+    def _crossings(seg_c, seg_d):
+        """(xy, arc on c, arc on d) for every segment crossing, touching ends included."""
+        p1, p2, len_c, cum_c = seg_c
+        q1, q2, len_d, cum_d = seg_d
+        r = (p2 - p1)[:, None, :]
+        s = (q2 - q1)[None, :, :]
+        qp = q1[None, :, :] - p1[:, None, :]
+        denom = r[..., 0] * s[..., 1] - r[..., 1] * s[..., 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (qp[..., 0] * s[..., 1] - qp[..., 1] * s[..., 0]) / denom
+            u = (qp[..., 0] * r[..., 1] - qp[..., 1] * r[..., 0]) / denom
+        hit = (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+        seen = set()
+        out = []
+        for i, j in zip(*np.nonzero(hit)):
+            arc_c = float(cum_c[i] + t[i, j] * len_c[i])
+            arc_d = float(cum_d[j] + u[i, j] * len_d[j])
+            key = (round(arc_c, 6), round(arc_d, 6))  # a crossing at a vertex shows up per segment
+            if key not in seen:
+                seen.add(key)
+                out.append((tuple(p1[i] + t[i, j] * (p2[i] - p1[i])), arc_c, arc_d))
+        return out
+
+    @staticmethod
+    def _snap(xy, seg_d):
+        """(xy on d, arc on d, gap) for the closest point of d within JUNCTION_SNAP_FT, else None."""
+        q1, q2, len_d, cum_d = seg_d
+        v = q2 - q1
+        sq = (v * v).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = np.where(sq > 0, ((np.asarray(xy, dtype=float) - q1) * v).sum(axis=1) / sq, 0.0)
+        u = np.clip(u, 0.0, 1.0)
+        near = q1 + u[:, None] * v
+        gaps = np.hypot(near[:, 0] - xy[0], near[:, 1] - xy[1])
+        j = int(np.argmin(gaps))
+        if gaps[j] > JUNCTION_SNAP_FT:
+            return None
+        return tuple(near[j]), float(cum_d[j] + u[j] * len_d[j]), float(gaps[j])
+
+    def _bounding_stops(self, c, arc):
+        """Positions of the stops on corridor c either side of arc length arc."""
+        arcs = self._stop_arcs[c]
+        k = min(max(bisect.bisect_right(arcs, arc) - 1, 0), len(arcs) - 2)
+        return k, k + 1
+
+    def pad_tree(self, pad_xy):
+        """
+        Shortest distance from pad_xy to every node, memoized per pad.
+
+        Returns (dist, pred): dist[node] in feet including leg 3, and
+        pred[node] the next node toward the pad, or ('exit', exit_xy) for the
+        node where the path leaves its corridor for the pad.
+
+        Only corridors crossing the pad's row are exits. pick_entry's
+        nearest-vertex fallback ignores the y gap to the pad, which the
+        single-corridor route tolerates but a network route must not take.
+        """
+        pad_xy = tuple(pad_xy)
+        tree = self._trees.get(pad_xy)
+        if tree is not None:
+            return tree
+        dist = {}
+        pred = {}
+        heap = []
+        for c, index in enumerate(self.indexes):
+            if index is None or not index.intersect_horizontal(pad_xy[1]):
+                continue
+            exit_x, exit_pos = index.pick_entry(pad_xy)
+            arc = index.arc_length_at(exit_pos)
+            leg3 = abs(pad_xy[0] - exit_x)
+            for k in self._bounding_stops(c, arc):
+                node = self._stop_nodes[c][k]
+                d = leg3 + abs(self._stop_arcs[c][k] - arc)
+                if d < dist.get(node, float('inf')):
+                    dist[node] = d
+                    pred[node] = ('exit', (exit_x, pad_xy[1]))
+                    heapq.heappush(heap, (d, node))
+        done = set()
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            for nbr, weight in self.adjacency[node]:
+                nd = d + weight
+                if nd < dist.get(nbr, float('inf')):
+                    dist[nbr] = nd
+                    pred[nbr] = node
+                    heapq.heappush(heap, (nd, nbr))
+        tree = (dist, pred)
+        self._trees[pad_xy] = tree
+        return tree
+
+    def route(self, c_idx, device_xy, pad_xy):
+        """
+        Route a device assigned to corridor c_idx to its pad.
+
+        Returns (total_ft, path_geom) like three_leg_distance: the
+        single-corridor route, or the network route when that is shorter.
+        """
+        device_xy = tuple(device_xy)
+        pad_xy = tuple(pad_xy)
+        index = self.indexes[c_idx]
+        best = index.three_leg_distance(device_xy, pad_xy)
+
+        dist, pred = self.pad_tree(pad_xy)
+        entry_x, entry_pos = index.pick_entry(device_xy)
+        arc = index.arc_length_at(entry_pos)
+        leg1 = abs(device_xy[0] - entry_x)
+        start = None
+        total = best[0] - ROUTE_IMPROVEMENT_FT
+        for k in self._bounding_stops(c_idx, arc):
+            node = self._stop_nodes[c_idx][k]
+            if node in dist:
+                d = leg1 + abs(self._stop_arcs[c_idx][k] - arc) + dist[node]
+                if d < total:
+                    total, start = d, node
+        if start is None:
+            return best
+
+        path = [device_xy, (entry_x, device_xy[1])]
+        chain = []
+        node = start
+        while True:
+            if not chain or self.node_xy[node] != chain[-1]:  # junctions on a vertex repeat it
+                chain.append(self.node_xy[node])
+            nxt = pred[node]
+            if isinstance(nxt, tuple):
+                break
+            node = nxt
+        path += chain + [nxt[1], pad_xy]
+        return total, path
+
+    def route_many(self, requests):
+        """
+        Route a batch of (c_idx, device_xy, pad_xy) requests.
+
+        Devices sharing a pad share its tree; returns a list of
+        (total_ft, path_geom) in request order.
+        """
+        return [self.route(c_idx, device_xy, pad_xy) for c_idx, device_xy, pad_xy in requests]
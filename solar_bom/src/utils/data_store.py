@@ -0,0 +1,70 @@
+"""Process-wide cache for the JSON data libraries.
+
+Pricing, part catalogs and the other data/*.json libraries are read by the
+Quick Estimate, the BOM Generator and the BOM Manager, often several times
+per calculation. load_json() parses each file once and hands back the same
+object until the file's mtime (or size) changes on disk, so edits made in the
+Pricing Manager or by hand are still picked up on the next call.
+
+Returned objects are shared — treat them as read-only. Copy before mutating.
+"""
+
+import json
+import os
+import threading
+
+from src.utils.file_handlers import get_bundled_data_path
+
+
+_cache = {}  # abs path -> (stamp, data)
+_lock = threading.Lock()
+
+
+def _stamp(path):
+    """(mtime_ns, size) for path, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_json(path, default=None):
+    """Parsed contents of a JSON file, cached until the file changes.
+
+    Returns default when the file is missing or can't be parsed; errors are
+    printed once per file version rather than on every call.
+    """
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            data = cached[1]
+            return default if data is None else data
+
+    data = None
+    if stamp is not None:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading {os.path.basename(path)}: {e}")
+
+    with _lock:
+        _cache[path] = (stamp, data)
+    return default if data is None else data
+
+
+def load_library(filename, default=None):
+    """load_json() for a shipped library under the bundle's data/ folder."""
+    return load_json(get_bundled_data_path(filename), default)
+
+
+def invalidate(path=None):
+    """Drop one cached file (or everything) so the next load re-reads disk."""
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
@@ -149,12 +149,10 @@ def device_position_for_inverter(harness_map, tracker_to_group, group_layout, gr
         # Step 1: find the most extreme group by visual extent.
         anchor_grp_idx = primary_grp_idx
         anchor_val = None
+        touched_groups = {tracker_to_group[tidx][0] for tidx in inv_tracker_indices
+                          if tidx in tracker_to_group}
         for grp_idx_s, grp_data_s in enumerate(group_layout):
-            has_any = any(
-                tidx in tracker_to_group and tracker_to_group[tidx][0] == grp_idx_s
-                for tidx in inv_tracker_indices
-            )
-            if not has_any:
+            if grp_idx_s not in touched_groups:
                 continue
             grp_gy_s = grp_data_s['y']
             if device_position == 'south':
@@ -408,81 +406,14 @@ def build_group_layout(groups, templates, default_row_spacing_ft=20.0):
 
     for grp_idx, group_data in enumerate(groups):
         grp_pitch = group_data.get('row_spacing_ft', default_row_spacing_ft)
+        gx, gy = group_origin(group_data, auto_x_cursor)
 
-        saved_x = group_data.get('position_x')
-        gx = saved_x if saved_x is not None else auto_x_cursor
-        saved_y = group_data.get('position_y')
-        gy = saved_y if saved_y is not None else 0.0
-
-        group_trackers = []
-        group_motor_y = None
-        local_x_counter = 0
-
-        for seg in group_data.get('segments', []):
-            ref = seg.get('template_ref')
-            template = templates.get(ref) if ref else None
-            dims = tracker_dims_ft(template)
-
-            for _ in range(seg.get('quantity', 0)):
-                tracker = {}
-                if dims:
-                    tracker['width_ft'] = dims[0]
-                    tracker['length_ft'] = dims[1]
-                else:
-                    tracker['width_ft'] = 6.0
-                    tracker['length_ft'] = 180.0
-                max_tracker_width_ft = max(max_tracker_width_ft, tracker['width_ft'])
-
-                motor_y, motor_gap, has_motor = motor_position_in_tracker(template)
-                tracker['motor_y_ft'] = motor_y
-                tracker['motor_gap_ft'] = motor_gap
-                tracker['has_motor'] = has_motor
-                tracker['strings_per_tracker'] = seg.get('strings_per_tracker', 1)
-                tracker['local_x_idx'] = local_x_counter
-
-                if group_motor_y is None and has_motor:
-                    group_motor_y = motor_y
-
-                group_trackers.append(tracker)
-                tracker_to_group[global_idx] = (grp_idx, local_x_counter)
-
-                local_x_counter += 1
-                global_idx += 1
-
-        group_length = max((t['length_ft'] for t in group_trackers), default=0)
-
-        driveline_angle_deg = group_data.get('driveline_angle', 0.0)
-        driveline_tan = math.tan(math.radians(driveline_angle_deg)) if driveline_angle_deg != 0 else 0.0
-        tracker_alignment = group_data.get('tracker_alignment', 'motor')
-        ref_motor = group_motor_y or 0
-
-        visual_min_y_offset = 0.0
-        visual_max_y_offset = 0.0
-        for t in group_trackers:
-            t_length_val = t.get('length_ft', group_length)
-            t_local_x = t.get('local_x_idx', 0)
-            if tracker_alignment == 'top':
-                y_offset = 0.0
-            elif tracker_alignment == 'bottom':
-                y_offset = group_length - t_length_val
-            else:  # 'motor'
-                y_offset = (ref_motor or 0) - t.get('motor_y_ft', 0)
-            angle_y = t_local_x * grp_pitch * driveline_tan
-            visual_min_y_offset = min(visual_min_y_offset, y_offset + angle_y)
-            visual_max_y_offset = max(visual_max_y_offset, y_offset + angle_y + t_length_val)
-
-        group_layout.append({
-            'x': gx,
-            'y': gy,
-            'length_ft': group_length,
-            'motor_y_ft': group_motor_y or 0,
-            'row_spacing_ft': grp_pitch,
-            'driveline_tan': driveline_tan,
-            'tracker_alignment': tracker_alignment,
-            'visual_min_y': visual_min_y_offset,
-            'visual_max_y': visual_max_y_offset,
-            'trackers': group_trackers,
-        })
+        entry, group_width_ft = group_layout_entry(group_data, templates, gx, gy, grp_pitch)
+        group_layout.append(entry)
+        max_tracker_width_ft = max(max_tracker_width_ft, group_width_ft)
+        for local_idx in range(len(entry['trackers'])):
+            tracker_to_group[global_idx] = (grp_idx, local_idx)
+            global_idx += 1
 
         group_tracker_count = sum(seg.get('quantity', 0) for seg in group_data.get('segments', []))
         auto_x_cursor += group_tracker_count * grp_pitch + grp_pitch * 2
@@ -490,6 +421,92 @@ def build_group_layout(groups, templates, default_row_spacing_ft=20.0):
     return group_layout, tracker_to_group, max_tracker_width_ft
 
 
+def group_origin(group_data, auto_x_cursor):
+    """(x, y) of a group: its saved position, else the auto X cursor and Y=0."""
+    saved_x = group_data.get('position_x')
+    gx = saved_x if saved_x is not None else auto_x_cursor
+    saved_y = group_data.get('position_y')
+    gy = saved_y if saved_y is not None else 0.0
+    return gx, gy
+
+
+def group_layout_entry(group_data, templates, gx, gy, grp_pitch):
+    """One group's build_group_layout entry, placed at (gx, gy).
+
+    Depends only on the group, the templates it links and where it sits, so
+    callers that rebuild the layout often can cache it per group.
+    Returns (entry, max_tracker_width_ft) for the group's own trackers.
+    """
+    group_trackers = []
+    group_motor_y = None
+    local_x_counter = 0
+    max_tracker_width_ft = 0.0
+
+    for seg in group_data.get('segments', []):
+        ref = seg.get('template_ref')
+        template = templates.get(ref) if ref else None
+        dims = tracker_dims_ft(template)
+
+        for _ in range(seg.get('quantity', 0)):
+            tracker = {}
+            if dims:
+                tracker['width_ft'] = dims[0]
+                tracker['length_ft'] = dims[1]
+            else:
+                tracker['width_ft'] = 6.0
+                tracker['length_ft'] = 180.0
+            max_tracker_width_ft = max(max_tracker_width_ft, tracker['width_ft'])
+
+            motor_y, motor_gap, has_motor = motor_position_in_tracker(template)
+            tracker['motor_y_ft'] = motor_y
+            tracker['motor_gap_ft'] = motor_gap
+            tracker['has_motor'] = has_motor
+            tracker['strings_per_tracker'] = seg.get('strings_per_tracker', 1)
+            tracker['local_x_idx'] = local_x_counter
+
+            if group_motor_y is None and has_motor:
+                group_motor_y = motor_y
+
+            group_trackers.append(tracker)
+            local_x_counter += 1
+
+    group_length = max((t['length_ft'] for t in group_trackers), default=0)
+
+    driveline_angle_deg = group_data.get('driveline_angle', 0.0)
+    driveline_tan = math.tan(math.radians(driveline_angle_deg)) if driveline_angle_deg != 0 else 0.0
+    tracker_alignment = group_data.get('tracker_alignment', 'motor')
+    ref_motor = group_motor_y or 0
+
+    visual_min_y_offset = 0.0
+    visual_max_y_offset = 0.0
+    for t in group_trackers:
+        t_length_val = t.get('length_ft', group_length)
+        t_local_x = t.get('local_x_idx', 0)
+        if tracker_alignment == 'top':
+            y_offset = 0.0
+        elif tracker_alignment == 'bottom':
+            y_offset = group_length - t_length_val
+        else:  # 'motor'
+            y_offset = (ref_motor or 0) - t.get('motor_y_ft', 0)
+        angle_y = t_local_x * grp_pitch * driveline_tan
+        visual_min_y_offset = min(visual_min_y_offset, y_offset + angle_y)
+        visual_max_y_offset = max(visual_max_y_offset, y_offset + angle_y + t_length_val)
+
+    entry = {
+        'x': gx,
+        'y': gy,
+        'length_ft': group_length,
+        'motor_y_ft': group_motor_y or 0,
+        'row_spacing_ft': grp_pitch,
+        'driveline_tan': driveline_tan,
+        'tracker_alignment': tracker_alignment,
+        'visual_min_y': visual_min_y_offset,
+        'visual_max_y': visual_max_y_offset,
+        'trackers': group_trackers,
+    }
+    return entry, max_tracker_width_ft
+
+
 def apply_middle_x_bias(device_x, device_y, center_local, local_indices,
                          strings_per_tracker_map, pitch, group_x, group_num_trackers,
                          max_tracker_width_ft, pads):
@@ -0,0 +1,3205 @@
+"""Headless quick-estimate calculation engine.
+
+Extracted from src/ui/quick_estimate.py so the same allocation, whip/extender,
+harness and feeder math the Quick Estimate tab runs can also run without a
+display — batch refreshes, profiling, and tests.
+
+No Tk here. An EstimateEngine is built from a plain estimate dict in the same
+shape QuickEstimate.save_estimate() writes into project.quick_estimates, plus
+the tracker templates, inverter and (optionally) module it references, and
+EstimateEngine.calculate() returns the `totals` structure the dialog renders
+and exports.
+"""
+
+import json
+import math
+from collections import defaultdict
+
+from src.utils import device_geometry
+from src.utils.cable_losses import cable_losses, estimate_cable_runs, loss_totals
+from src.utils.data_store import load_json, load_library
+from src.utils.file_handlers import get_user_data_path
+from src.utils.string_allocation import allocate_strings_sequential, allocate_strings_spatial
+
+
+class EstimateValidationError(Exception):
+    """Raised by EstimateEngine.calculate() when the estimate can't be calculated.
+
+    `title` is a short heading suitable for a message box; str(exc) is the
+    full explanation.
+    """
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+
+
+def _as_int(value, default):
+    """int(value), or default for blanks / non-numeric strings."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _as_float(value, default):
+    """float(value), or default for blanks / non-numeric strings."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _int_keyed(d):
+    """Return `d` with int keys, converting JSON-round-tripped string keys.
+
+    Dicts that already have int keys are returned as-is (not copied) so that
+    in-place updates — e.g. device_geometry.resolve_ns_step clamping a step —
+    reach the caller's own dict, same as when the dialog owned this math.
+    """
+    if not d:
+        return {} if d is None else d
+    if all(isinstance(k, int) for k in d):
+        return d
+    return {int(k): v for k, v in d.items()}
+
+
+class EstimateCache:
+    """Partial results reused between EstimateEngine.calculate() runs.
+
+    Holds per-group tracker counts/layout and per-group (or per linked pool)
+    string allocations, keyed by a fingerprint of their inputs. An edit to
+    one segment only changes that group's fingerprint, so the other groups'
+    partials are merged back in as-is. Entries not used by the most recent
+    calculation are dropped, keeping the cache the size of one estimate.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached value for key, or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._used.add(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._used.add(key)
+
+    def prune(self):
+        """Drop entries the last calculation didn't touch."""
+        self._entries = {k: v for k, v in self._entries.items() if k in self._used}
+        self._used = set()
+
+    def clear(self):
+        self._entries.clear()
+        self._used = set()
+
+
+def _remap_allocation(result, index_map):
+    """Copy of an allocation result with tracker indices mapped through index_map."""
+    inverters = []
+    for inv in result['inverters']:
+        remapped = dict(inv)
+        remapped['tracker_indices'] = [(index_map[tidx], taken)
+                                       for tidx, taken in inv['tracker_indices']]
+        remapped['harness_map'] = [dict(entry, tracker_idx=index_map[entry['tracker_idx']])
+                                   for entry in inv['harness_map']]
+        inverters.append(remapped)
+    remapped_result = dict(result)
+    remapped_result['inverters'] = inverters
+    remapped_result['summary'] = dict(result['summary'],
+                                      tracker_type_counts=dict(result['summary']['tracker_type_counts']))
+    return remapped_result
+
+
+# Totals buckets a _wiring_partial() fills, site-wide and per device
+_WIRING_BUCKETS = ('whips_by_length', 'whips_pos_by_length', 'whips_neg_by_length',
+                   'extenders_pos_by_length', 'extenders_neg_by_length')
+_WIRING_DEVICE_BUCKETS = ('whips_by_length_per_device', 'whips_pos_by_length_per_device',
+                          'whips_neg_by_length_per_device', 'extenders_pos_by_length_per_device',
+                          'extenders_neg_by_length_per_device')
+_COMBINE_WHIP_SUMS = ('_combine_whip_len_sum', '_combine_whip_qty',
+                      '_combine_ext_pos_len_sum', '_combine_ext_pos_qty')
+
+
+def _reindex_wiring(part, tracker_map, inv_map, group_map):
+    """Copy of a wiring partial with tracker, inverter and group indices mapped.
+
+    Inverter index -1 (extenders of trackers no inverter took) is kept as is.
+    """
+    def inv(idx):
+        return idx if idx == -1 else inv_map[idx]
+
+    reindexed = dict(part)
+    for name in _WIRING_DEVICE_BUCKETS:
+        if name in part:
+            reindexed[name] = {inv(idx): counts for idx, counts in part[name].items()}
+    reindexed['ns_to_device'] = {(tracker_map[tidx], inv(idx)): ns
+                                 for (tidx, idx), ns in part['ns_to_device'].items()}
+    reindexed['placements'] = {inv(idx): (x, y, group_map[grp])
+                               for idx, (x, y, grp) in part['placements'].items()}
+    return reindexed
+
+
+def module_from_templates(groups, enabled_templates):
+    """Build a ModuleSpec from the first template-linked segment's module_spec.
+
+    Returns (module_spec, modules_per_string), or (None, None) when no segment
+    links an enabled template.
+    """
+    from src.models.module import ModuleSpec, ModuleType
+
+    for group in groups:
+        for seg in group.get('segments', []):
+            ref = seg.get('template_ref')
+            if ref and ref in enabled_templates:
+                tdata = enabled_templates[ref]
+                module_data = tdata.get('module_spec', {})
+                try:
+                    module = ModuleSpec(
+                        manufacturer=module_data.get('manufacturer', 'Unknown'),
+                        model=module_data.get('model', 'Unknown'),
+                        type=ModuleType(module_data.get('type', 'Mono PERC')),
+                        length_mm=float(module_data.get('length_mm', 2000)),
+                        width_mm=float(module_data.get('width_mm', 1000)),
+                        depth_mm=float(module_data.get('depth_mm', 40)),
+                        weight_kg=float(module_data.get('weight_kg', 25)),
+                        wattage=float(module_data.get('wattage', 400)),
+                        vmp=float(module_data.get('vmp', 40)),
+                        imp=float(module_data.get('imp', 10)),
+                        voc=float(module_data.get('voc', 48)),
+                        isc=float(module_data.get('isc', 10.5)),
+                        max_system_voltage=float(module_data.get('max_system_voltage', 1500))
+                    )
+                except Exception as e:
+                    print(f"Error creating ModuleSpec from template: {e}")
+                    return None, None
+                return module, tdata.get('modules_per_string', 28)
+    return None, None
+
+
+def load_enabled_templates(enabled_keys=None):
+    """Load tracker templates from the user library.
+
+    Returns {template_key: template_data_dict}. When enabled_keys is given
+    (a project's enabled_templates list) only those templates are returned.
+    """
+    templates = {}
+    try:
+        data = load_json(get_user_data_path('tracker_templates.json'))
+        if not data:
+            return templates
+
+        # Parse hierarchical format
+        all_templates = {}
+        first_value = next(iter(data.values()))
+        if isinstance(first_value, dict) and not any(key in first_value for key in ['module_orientation', 'modules_per_string']):
+            for manufacturer, template_group in data.items():
+                for template_name, template_data in template_group.items():
+                    unique_name = f"{manufacturer} - {template_name}"
+                    all_templates[unique_name] = template_data
+        else:
+            all_templates = data
+
+        # Filter to enabled only
+        if enabled_keys is not None:
+            for key in enabled_keys:
+                if key in all_templates:
+                    templates[key] = all_templates[key]
+        else:
+            templates = all_templates
+
+    except Exception as e:
+        print(f"Error loading enabled templates: {e}")
+
+    return templates
+
+
+class EstimateEngine:
+    """Calculates a quick estimate's rolled-up BOM totals without any UI.
+
+    Inputs are read once at construction; calculate() may be called repeatedly.
+    Besides the returned totals, a calculation leaves the per-tracker working
+    state the dialog, site preview and diagnostics read afterwards:
+    _tracker_to_segment, _split_tracker_details and _tracker_ns_to_device,
+    plus `warnings` — a list of (title, message) tuples for non-fatal issues.
+    """
+
+    def __init__(self, estimate, enabled_templates, inverter=None, module=None,
+                 nec_factor=1.56, combiner_library=None, cache=None):
+        """
+        Args:
+            estimate: estimate dict as stored in project.quick_estimates. Not
+                copied — groups, pads, etc. are read (and in a few documented
+                places updated) in place.
+            enabled_templates: {template_key: template_data} for the project.
+            inverter: InverterSpec assigned to the estimate, or None.
+            module: ModuleSpec to use for site-level module math. Derived from
+                the first linked template when None.
+            nec_factor: project NEC safety factor for combiner/trunk sizing.
+            combiner_library: pre-loaded combiner_box_library.json contents;
+                loaded lazily from the bundled data folder when None.
+            cache: EstimateCache shared across calculations of the same
+                estimate, so unchanged groups aren't recomputed. None
+                recalculates everything every time.
+        """
+        self.estimate = estimate
+        self.enabled_templates = enabled_templates or {}
+        self.selected_inverter = inverter
+        self.nec_factor = nec_factor
+        self._combiner_library = combiner_library
+        self._corridor_network = None  # CorridorNetwork over all corridors, built on first use
+        self.cache = cache
+
+        self.groups = estimate.get('groups', [])
+        self.topology = estimate.get('topology') or 'Distributed String'
+        self.lv_method = estimate.get('lv_collection_method') or 'Wire Harness'
+        self.polarity_convention = estimate.get('polarity_convention') or 'Negative Always South'
+        self.strings_per_device = _as_int(estimate.get('strings_per_device'), 0)
+        self.central_inv_count = _as_int(estimate.get('central_inverter_count', '1'), 1)
+        self.skids = _as_int(estimate.get('skids'), None)
+        self.ac_homerun_distance = _as_float(estimate.get('ac_homerun_distance', 50.0), 50.0)
+
+        self.wire_sizing = estimate.get('wire_sizing') or {}
+        self.wire_sizing_settings = estimate.get('wire_sizing_settings') or {}
+        self.pads = estimate.get('pads') or []
+        self.corridors = estimate.get('corridors') or []
+        self.device_names = _int_keyed(estimate.get('device_names'))
+        self.device_feeder_sizes = _int_keyed(estimate.get('device_feeder_sizes'))
+        self.device_ns_steps = _int_keyed(estimate.get('device_ns_steps'))
+        self.device_ew_steps = _int_keyed(estimate.get('device_ew_steps'))
+        self._whip_point_overrides = estimate.get('whip_point_overrides') or {}
+        self._whip_point_ns_legs = estimate.get('whip_point_ns_legs') or {}
+        self.allocation_locked = estimate.get('allocation_locked', False)
+        self.locked_allocation_result = estimate.get('locked_allocation_result')
+        self.last_combiner_assignments = estimate.get('combiner_assignments') or []
+        self.last_si_assignments = estimate.get('si_assignments') or []
+
+        if module is None:
+            module, template_mps = module_from_templates(self.groups, self.enabled_templates)
+            if template_mps is not None:
+                self.modules_per_string = _as_int(template_mps, 28)
+            else:
+                self.modules_per_string = _as_int(estimate.get('modules_per_string'), 28)
+        else:
+            self.modules_per_string = _as_int(estimate.get('modules_per_string'), 28)
+        self.selected_module = module
+
+        # Working state left behind by calculate()
+        self._tracker_to_segment = []
+        self._split_tracker_details = {}
+        self._tracker_ns_to_device = {}
+        self._fingerprints = None
+        self.warnings = []
+        self.strings_per_device_defaulted = None
+
+    # ==================== Pure helpers ====================
+
+    @staticmethod
+    def round_whip_length(raw_length_ft):
+        """Apply 5% waste factor and round up to nearest 10ft increment (min 10ft)"""
+        WASTE_FACTOR = 1.05
+        INCREMENT = 10
+        length_with_waste = raw_length_ft * WASTE_FACTOR
+        rounded = INCREMENT * math.ceil(length_with_waste / INCREMENT)
+        return max(10, int(rounded))
+
+    @staticmethod
+    def get_fuse_holder_category(fuse_current_amps):
+        """Determine fuse holder rating category from required fuse current"""
+        if fuse_current_amps <= 20:
+            return "20A and Below"
+        elif fuse_current_amps <= 32:
+            return "25-32A"
+        else:
+            return "32A and Above"
+
+    @staticmethod
+    def parse_harness_config(config_str):
+        """Parse harness config string like '2+1' into list of integers [2, 1]"""
+        try:
+            return [int(x) for x in config_str.split('+')]
+        except:
+            return []
+
+    @staticmethod
+    def _compact_device_index_map(inverters):
+        """Map each inverter's raw index to its compacted device index.
+
+        Mirrors SitePreviewWindow._compute_devices_from_allocation, which allocates
+        a device slot only for inverters with a non-empty harness_map — so the Nth
+        rendered/selected device is the Nth inverter that actually has one, not the
+        Nth inverter overall. device_names, device_ns_steps, device_ew_steps,
+        device_feeder_sizes, and pad/corridor assignments are all keyed by that
+        compacted index, not by an inverter's raw position in the allocation list.
+
+        Returns a list the same length as inverters; entries are None for
+        inverters that get no device slot.
+        """
+        mapping = []
+        next_dev_idx = 0
+        for inv in inverters:
+            if not inv.get('harness_map', []):
+                mapping.append(None)
+            else:
+                mapping.append(next_dev_idx)
+                next_dev_idx += 1
+        return mapping
+
+    @staticmethod
+    def _derive_harnesses_for_split(harness_config_sizes, spt, device_positions):
+        """Derive per-device harness configs from a segment's harness config and split boundaries.
+        
+        Walks the harness config north-to-south (physical position order) and
+        cuts any harness that straddles a device boundary.
+        
+        Args:
+            harness_config_sizes: list of ints, e.g. [6, 6] for "6+6"
+            spt: total strings per tracker
+            device_positions: list of dicts, each with:
+                - 'inv_idx': device index
+                - 'strings_taken': how many strings this device owns
+                - 'start_pos': first physical position owned (0-based, north)
+                
+        Returns:
+            list of dicts (same order as device_positions), each with:
+                - 'inv_idx': device index
+                - 'strings_taken': total strings
+                - 'harnesses': list of ints (harness sizes for this portion)
+        """
+        # Build the harness ranges: which physical positions each harness covers
+        harness_ranges = []
+        pos_cursor = 0
+        for h_size in harness_config_sizes:
+            harness_ranges.append((pos_cursor, pos_cursor + h_size - 1))  # inclusive
+            pos_cursor += h_size
+        
+        # Sort device portions by start_pos (north first)
+        sorted_portions = sorted(device_positions, key=lambda p: p['start_pos'])
+        
+        result = []
+        for portion in sorted_portions:
+            p_start = portion['start_pos']
+            p_end = p_start + portion['strings_taken'] - 1  # inclusive
+            
+            portion_harnesses = []
+            for h_start, h_end in harness_ranges:
+                # Find overlap between this harness range and this device's range
+                overlap_start = max(h_start, p_start)
+                overlap_end = min(h_end, p_end)
+                overlap = overlap_end - overlap_start + 1
+                
+                if overlap > 0:
+                    portion_harnesses.append(overlap)
+            
+            result.append({
+                'inv_idx': portion['inv_idx'],
+                'strings_taken': portion['strings_taken'],
+                'start_pos': portion['start_pos'],
+                'harnesses': portion_harnesses,
+            })
+        
+        return result
+
+    # ==================== Library / sizing lookups ====================
+
+    def load_combiner_library(self):
+        """Load combiner box library from JSON file (once per engine)"""
+        if self._combiner_library is not None:
+            return self._combiner_library
+        self._combiner_library = load_library('combiner_box_library.json', {})
+        return self._combiner_library
+
+    def find_combiner_box(self, strings_per_cb, breaker_size, fuse_holder_rating):
+        """Find a matching combiner box from the library.
+        
+        Returns the part_number and description, or None if no match.
+        Prefers smallest max_inputs that fits, with whips (whip_length > 0).
+        """
+        combiner_library = self.load_combiner_library()
+        
+        candidates = []
+        for part_num, cb_data in combiner_library.items():
+            if (cb_data.get('max_inputs', 0) >= strings_per_cb and
+                cb_data.get('breaker_size', 0) == breaker_size and
+                cb_data.get('fuse_holder_rating', '') == fuse_holder_rating):
+                candidates.append(cb_data)
+        
+        if not candidates:
+            return None
+        
+        # Sort by max_inputs (prefer smallest that fits), then prefer with whips
+        candidates.sort(key=lambda c: (c['max_inputs'], -c.get('whip_length_ft', 0)))
+        return candidates[0]
+
+    def _compute_dc_breaker_size(self):
+        """Estimate the DC feeder/CB breaker rating from the selected inverter's MPPT channels.
+
+        Takes the largest per-MPPT max_input_current, scales by 1.25 (continuous load),
+        and rounds up to the next standard breaker size. Falls back to 400A when no
+        inverter is selected or the channel data is missing.
+        """
+        BREAKER_SIZES = [100, 125, 150, 175, 200, 225, 250, 300, 350, 400, 450, 500, 600, 700, 800]
+        if self.selected_inverter and hasattr(self.selected_inverter, 'mppt_channels'):
+            channels = self.selected_inverter.mppt_channels
+            if channels:
+                max_ch_current = max(ch.max_input_current for ch in channels)
+                target = max_ch_current * 1.25
+                for bs in BREAKER_SIZES:
+                    if bs >= target:
+                        return bs
+        return 400
+
+    def get_wire_size_for(self, cable_type, num_strings=None):
+        """
+        Look up wire size from the wire_sizing dict.
+        
+        Args:
+            cable_type: 'harness', 'extender', 'whip', 'dc_feeder', 'ac_homerun'
+            num_strings: Required for harness/extender/whip — the harness string count
+            
+        Returns:
+            str: Cable size string (e.g., '10 AWG', '500 kcmil')
+        """
+        if cable_type in ('dc_feeder', 'ac_homerun'):
+            size = self.wire_sizing.get(cable_type, '')
+            return size if size else '4/0 AWG'
+        
+        if num_strings is None:
+            return '10 AWG'
+        
+        by_sc = self.wire_sizing.get('by_string_count', {})
+        # Try int key first, then string key (JSON round-trip converts int keys to strings)
+        entry = by_sc.get(num_strings) or by_sc.get(str(num_strings))
+        if entry:
+            return entry.get(cable_type, '10 AWG')
+
+        # No exact match — find the nearest configured string count.
+        # Split trackers (e.g. 1-string) inherit from the closest configured count.
+        if by_sc and num_strings is not None:
+            int_keys = []
+            for k in by_sc.keys():
+                try:
+                    int_keys.append(int(k))
+                except (ValueError, TypeError):
+                    pass
+            if int_keys:
+                # Prefer the closest count <= num_strings; otherwise use the minimum
+                floor_keys = [k for k in int_keys if k <= num_strings]
+                closest = max(floor_keys) if floor_keys else min(int_keys)
+                fallback_entry = by_sc.get(closest) or by_sc.get(str(closest))
+                if fallback_entry:
+                    return fallback_entry.get(cable_type, '10 AWG')
+
+        return '10 AWG'
+
+    def _get_effective_harness_config(self, seg):
+        """Get the effective harness config for a segment, considering LV Collection Method.
+        
+        When 'String HR' is selected, override to all 1-string harnesses (1+1+...+1).
+        Otherwise, return the segment's stored harness_config.
+        """
+        if self.lv_method in ('String HR', 'Trunk Bus'):
+            spt = seg.get('strings_per_tracker', 1)
+            return '+'.join(['1'] * int(spt))
+        return seg.get('harness_config', str(seg.get('strings_per_tracker', 1)))
+
+    def _get_harness_sizes(self, seg):
+        """Parse the effective harness config for a segment into a list of ints."""
+        return self.parse_harness_config(self._get_effective_harness_config(seg))
+
+    def _get_harness_config_for_tracker_type(self, strings_per_tracker):
+        """Find the harness config used for trackers with the given string count."""
+        for group in self.groups:
+            for seg in group['segments']:
+                if seg['strings_per_tracker'] == strings_per_tracker and seg['quantity'] > 0:
+                    return self.parse_harness_config(self._get_effective_harness_config(seg))
+                
+        # Fallback: single harness equal to full string count
+        return [int(strings_per_tracker)]
+
+    def _get_estimate_tracker_dims_ft(self, template_ref):
+        """Get (width_ft, length_ft) for a tracker from its template reference.
+        
+        Width = E-W dimension (across tracker row).
+        Length = N-S dimension (along tracker).
+        
+        Returns (width_ft, length_ft) or None if template not found.
+        """
+        if not template_ref or template_ref not in self.enabled_templates:
+            return None
+        
+        tdata = self.enabled_templates[template_ref]
+        ms = tdata.get('module_spec', {})
+        mps = tdata.get('modules_per_string', 28)
+        strings_per_tracker = tdata.get('strings_per_tracker', 1)
+        orientation = tdata.get('module_orientation', 'Portrait')
+        module_spacing_m = tdata.get('module_spacing_m', 0.02)
+        
+        mod_w_m = ms.get('width_mm', 1134) / 1000.0
+        mod_l_m = ms.get('length_mm', 2278) / 1000.0
+        
+        if orientation == 'Portrait':
+            mod_across = mod_l_m   # E-W (width of tracker)
+            mod_along = mod_w_m    # N-S (length of tracker)
+        else:
+            mod_across = mod_w_m
+            mod_along = mod_l_m
+        
+        # Width (E-W): module across dimension × modules_high (stacked columns)
+        modules_high = tdata.get('modules_high', 1)
+        width_m = mod_across * modules_high
+        
+        # Length (N-S): all modules laid end-to-end (full strings + partial) plus gaps and motor
+        full_spt = int(strings_per_tracker)
+        partial_mods = round((strings_per_tracker - full_spt) * mps) if strings_per_tracker != full_spt else 0
+        modules_in_row = full_spt * mps + partial_mods
+        
+        motor_gap_m = tdata.get('motor_gap_m', 0)
+        has_motor = tdata.get('has_motor', True)
+        if not has_motor:
+            motor_gap_m = 0
+        
+        length_m = modules_in_row * mod_along + max(modules_in_row - 1, 0) * module_spacing_m + motor_gap_m
+
+        width_ft = width_m * 3.28084
+        length_ft = length_m * 3.28084
+        
+        return (width_ft, length_ft)
+
+    def _calc_inline_fuse_rating(self, module_spec) -> int:
+        """Return the inline DC string fuse rating for a single string.
+        Uses fixed 1.25 NEC factor regardless of project setting."""
+        _FUSE_RATINGS = [5, 10, 15, 20, 25, 30, 35, 40, 45]
+        try:
+            if isinstance(module_spec, dict):
+                isc = float(module_spec.get('isc', 0))
+            elif module_spec is not None:
+                isc = float(module_spec.isc)
+            elif self.selected_module:
+                isc = float(self.selected_module.isc)
+            else:
+                return 15
+            nec_min = isc * 1.25
+            for rating in _FUSE_RATINGS:
+                if rating >= nec_min:
+                    return rating
+        except (ValueError, TypeError):
+            pass
+        return 15
+
+    def calculate_extender_lengths_per_segment(self, seg, device_position, string_offset=0, whip_point_override=None, harness_sizes_override=None, debug_label=None):
+        """Calculate per-harness positive and negative extender lengths for a segment.
+        
+        Returns a list of (pos_length_ft, neg_length_ft) tuples, one per harness in the config.
+        Multiply each by seg['quantity'] for total counts.
+        """
+        template_ref = seg.get('template_ref')
+        if harness_sizes_override is not None:
+            harness_sizes = harness_sizes_override
+        else:
+            harness_config = self._get_effective_harness_config(seg)
+            harness_sizes = self.parse_harness_config(harness_config)
+        spt = seg['strings_per_tracker']
+        
+        if not harness_sizes:
+            return []
+        
+        m_to_ft = 3.28084
+        
+        # Get template geometry
+        tracker_length_ft = None
+        string_length_ft = None
+        motor_y_ft = None
+        motor_gap_ft = 0
+        has_motor = False
+        
+        if template_ref and template_ref in self.enabled_templates:
+            tdata = self.enabled_templates[template_ref]
+            mod_spec = tdata.get('module_spec', {})
+            orientation = tdata.get('module_orientation', 'Portrait')
+            mps = tdata.get('modules_per_string', 28)
+            spacing_m = tdata.get('module_spacing_m', 0.02)
+            has_motor = tdata.get('has_motor', True)
+            motor_gap_m = tdata.get('motor_gap_m', 1.0) if has_motor else 0
+            
+            if orientation == 'Portrait':
+                mod_along_m = mod_spec.get('width_mm', 1000) / 1000
+            else:
+                mod_along_m = mod_spec.get('length_mm', 2000) / 1000
+            
+            string_length_ft = (mps * mod_along_m + (mps - 1) * spacing_m) * m_to_ft
+            motor_gap_ft = motor_gap_m * m_to_ft
+            
+            # Total tracker length — use full strings + partial modules
+            full_spt = int(spt)
+            partial_mods = round((spt - full_spt) * mps) if spt != full_spt else 0
+            total_modules = full_spt * mps + partial_mods
+            tracker_length_m = (total_modules * mod_along_m + 
+                               (total_modules - 1) * spacing_m + 
+                               (motor_gap_m if has_motor else 0))
+            tracker_length_ft = tracker_length_m * m_to_ft
+            
+            # Motor Y position from north end
+            if has_motor:
+                motor_placement = tdata.get('motor_placement_type', 'between_strings')
+                motor_pos_after = tdata.get('motor_position_after_string', None)
+                motor_string_idx = tdata.get('motor_string_index', None)
+                motor_split_north = tdata.get('motor_split_north', mps // 2)
+                
+                # Partial string on north adds height before everything
+                partial_north_mods = 0
+                spt_val = tdata.get('strings_per_tracker', 1)
+                if spt_val != int(spt_val) and tdata.get('partial_string_side', 'north') == 'north':
+                    partial_north_mods = round((spt_val - int(spt_val)) * mps)
+                partial_north_m = partial_north_mods * (mod_along_m + spacing_m) if partial_north_mods > 0 else 0
+                
+                # Partial string on north shifts motor further south
+                partial_north_mods_ext = 0
+                if spt != int(spt):
+                    tdata_ext = self.enabled_templates.get(template_ref, {})
+                    if tdata_ext.get('partial_string_side', 'north') == 'north':
+                        partial_north_mods_ext = round((spt - int(spt)) * mps)
+                partial_north_m_ext = partial_north_mods_ext * (mod_along_m + spacing_m)
+                
+                if motor_placement == 'between_strings':
+                    if motor_pos_after is not None:
+                        strings_before = motor_pos_after
+                    else:
+                        strings_before = 1  # default: after first string
+                    modules_before = strings_before * mps
+                    motor_y_m = partial_north_m + (modules_before * mod_along_m + 
+                                (modules_before - 1) * spacing_m + spacing_m)
+                    motor_y_ft = motor_y_m * m_to_ft
+                elif motor_placement == 'middle_of_string':
+                    if motor_string_idx is not None:
+                        strings_before = motor_string_idx - 1  # 1-based
+                    else:
+                        strings_before = 0
+                    modules_before = strings_before * mps + motor_split_north
+                    motor_y_m = partial_north_m + (modules_before * mod_along_m + 
+                                max(modules_before - 1, 0) * spacing_m + spacing_m)
+                    motor_y_ft = motor_y_m * m_to_ft
+                else:
+                    motor_y_ft = tracker_length_ft / 2
+            else:
+                motor_y_ft = tracker_length_ft / 2
+        
+        # Fallback if template not found
+        if tracker_length_ft is None:
+            module_width_ft = (self.selected_module.width_mm / 304.8) if self.selected_module else 3.3
+            mps = self.modules_per_string
+            string_length_ft = module_width_ft * mps
+            motor_gap_ft = 3.28
+            tracker_length_ft = string_length_ft * spt + motor_gap_ft
+            motor_y_ft = tracker_length_ft / 2
+            has_motor = True
+        
+        # Whip point in tracker-local Y coords — default determined by device_position
+        if device_position == 'north':
+            target_y = 0.0
+        elif device_position == 'south':
+            target_y = tracker_length_ft
+        else:  # middle
+            target_y = motor_y_ft + motor_gap_ft / 2
+
+        # Manual whip point override shifts relative to motor row, clamped to tracker bounds
+        if whip_point_override is not None:
+            target_y = max(0.0, min(tracker_length_ft,
+                                    motor_y_ft + motor_gap_ft / 2 + whip_point_override))
+        
+        # Resolve polarity convention
+        polarity = self.polarity_convention
+        
+        # Determine which absolute string index the motor gap follows
+        motor_after_string = None  # 0-based absolute string index
+        if has_motor and template_ref and template_ref in self.enabled_templates:
+            tdata_motor = self.enabled_templates[template_ref]
+            motor_placement = tdata_motor.get('motor_placement_type', 'between_strings')
+            if motor_placement == 'between_strings':
+                pos_after = tdata_motor.get('motor_position_after_string', None)
+                if pos_after is not None:
+                    motor_after_string = pos_after - 1 if pos_after > 0 else 0
+                else:
+                    motor_after_string = 0
+            elif motor_placement == 'middle_of_string':
+                # Motor is inside a string — gap is effectively after (string_index - 1)
+                # but for extender purposes, treat it as between string boundaries
+                idx = tdata_motor.get('motor_string_index', 1)
+                motor_after_string = idx - 1 if idx > 0 else 0
+        elif has_motor:
+            motor_after_string = 0  # default fallback
+        
+        # Build ALL string boundary positions for the full tracker N→S
+        inter_string_gap = (spacing_m if (template_ref and template_ref in self.enabled_templates) else 0.02) * m_to_ft
+        full_string_count = int(spt)
+        all_string_positions = []  # (north_edge, south_edge) for every string on tracker
+        y_cursor = 0.0
+        for abs_idx in range(full_string_count):
+            north_edge = y_cursor
+            south_edge = y_cursor + string_length_ft
+            all_string_positions.append((north_edge, south_edge))
+            y_cursor = south_edge
+            if has_motor and motor_after_string is not None and abs_idx == motor_after_string:
+                y_cursor += motor_gap_ft
+            elif abs_idx < full_string_count - 1:
+                y_cursor += inter_string_gap
+
+        # Assign harness indices starting from string_offset
+        # (For non-split trackers offset=0; for split portions, offset = physical start position)
+        string_positions = []
+        str_pos = string_offset
+        for h_idx, h_size in enumerate(harness_sizes):
+            for s in range(h_size):
+                if str_pos < len(all_string_positions):
+                    n_edge, s_edge = all_string_positions[str_pos]
+                    string_positions.append((n_edge, s_edge, h_idx))
+                    str_pos += 1
+        
+        # Calculate per-harness extender lengths
+        result = []
+        for h_idx, h_size in enumerate(harness_sizes):
+            harness_strings = [(n, s) for n, s, hi in string_positions if hi == h_idx]
+            
+            if not harness_strings:
+                result.append((10.0, 10.0))
+                continue
+            
+            # Find the device-side string (the harness end closest to the whip point)
+            harness_center = (harness_strings[0][0] + harness_strings[-1][1]) / 2
+            if device_position == 'north':
+                device_side = harness_strings[0]    # northernmost string
+            elif device_position == 'south':
+                device_side = harness_strings[-1]   # southernmost string
+            else:  # middle (or override) — compare harness center to whip point
+                if harness_center <= target_y:
+                    device_side = harness_strings[-1]   # harness is north of whip point → exit south end
+                else:
+                    device_side = harness_strings[0]    # harness is south of whip point → exit north end
+            
+            ds_north = device_side[0]  # north edge of device-side string
+            ds_south = device_side[1]  # south edge of device-side string
+            
+            # Determine which edge is positive and which is negative
+            if polarity == 'Negative Always South':
+                pos_y = ds_north
+                neg_y = ds_south
+            elif polarity == 'Negative Always North':
+                pos_y = ds_south
+                neg_y = ds_north
+            elif polarity == 'Negative Toward Device':
+                if device_position == 'north':
+                    neg_y = ds_north
+                    pos_y = ds_south
+                elif device_position == 'south':
+                    neg_y = ds_south
+                    pos_y = ds_north
+                else:
+                    if ds_north < motor_y_ft:
+                        neg_y = ds_south
+                        pos_y = ds_north
+                    else:
+                        neg_y = ds_north
+                        pos_y = ds_south
+            elif polarity == 'Positive Toward Device':
+                if device_position == 'north':
+                    pos_y = ds_north
+                    neg_y = ds_south
+                elif device_position == 'south':
+                    pos_y = ds_south
+                    neg_y = ds_north
+                else:
+                    if ds_north < motor_y_ft:
+                        pos_y = ds_south
+                        neg_y = ds_north
+                    else:
+                        pos_y = ds_north
+                        neg_y = ds_south
+            else:
+                pos_y = ds_north
+                neg_y = ds_south
+            
+            pos_extender = max(abs(pos_y - target_y), 5.0)
+            neg_extender = max(abs(neg_y - target_y), 5.0)
+
+            if debug_label:
+                wp_str = f"  whip_pt_override={whip_point_override:.1f}" if whip_point_override is not None else ""
+                print(f"    H{h_idx}: tracker_len={tracker_length_ft:.1f}ft"
+                      f"  target_y={target_y:.1f}{wp_str}"
+                      f"  device_side=[{device_side[0]:.1f},{device_side[1]:.1f}]"
+                      f"  pos_y={pos_y:.1f}  neg_y={neg_y:.1f}"
+                      f"  → ext+={pos_extender:.1f}  ext-={neg_extender:.1f}")
+
+            result.append((pos_extender, neg_extender))
+
+        return result
+
+    def calculate_cb_whip_distances(self, total_rows, num_combiners, row_spacing_ft):
+        """Calculate whip distances for each row based on evenly-spaced CB placement.
+        
+        Returns a list of (distance_ft, cb_index) for each row.
+        
+        CB placement logic:
+        - Rows are divided into groups, first CB(s) get extra rows if uneven
+        - Each CB is placed at the center of its group
+        - Each row connects to its nearest CB
+        """
+        if total_rows <= 0 or num_combiners <= 0:
+            return []
+        
+        # Divide rows into groups for each CB
+        base_group_size = total_rows // num_combiners
+        extra_rows = total_rows % num_combiners
+        
+        # Build groups - first CBs get the extra rows
+        groups = []
+        row_start = 1
+        for cb_idx in range(num_combiners):
+            group_size = base_group_size + (1 if cb_idx < extra_rows else 0)
+            row_end = row_start + group_size - 1
+            # CB position is center of its group
+            cb_position = (row_start + row_end) / 2.0
+            groups.append({
+                'cb_idx': cb_idx,
+                'row_start': row_start,
+                'row_end': row_end,
+                'cb_position': cb_position
+            })
+            row_start = row_end + 1
+        
+        # Calculate distance from each row to its assigned CB
+        whip_distances = []
+        for group_num in range(1, total_rows + 1):
+            # Find which group this row belongs to
+            for group in groups:
+                if group['row_start'] <= group_num <= group['row_end']:
+                    distance_ft = abs(group_num - group['cb_position']) * row_spacing_ft
+                    whip_distances.append((distance_ft, group['cb_idx']))
+                    break
+        
+        return whip_distances
+
+    def calculate_whip_distances_from_positions(self, allocation_result, topology, num_devices, row_spacing_ft=None):
+        """Calculate whip distances using device positions derived from allocation.
+        
+        For Distributed String and Centralized String: uses allocation result
+        to map each inverter's trackers to a device, computing real E-W + N-S distance.
+        
+        For Central Inverter: falls back to the abstract even-spacing method.
+        
+        Returns a flat list of distance_ft values, one per tracker.
+        """
+        if not allocation_result:
+            total_trackers = sum(
+                sum(seg['quantity'] for seg in group['segments'])
+                for group in self.groups
+            )
+            fallback_spacing = self.groups[0].get('row_spacing_ft', 20.0) if self.groups else 20.0
+            old_distances = self.calculate_cb_whip_distances(
+                total_trackers, num_devices, fallback_spacing
+            )
+            # Build flat spt list matching tracker order
+            spt_list = []
+            for group in self.groups:
+                for seg in group['segments']:
+                    for _ in range(seg['quantity']):
+                        spt_list.append(seg['strings_per_tracker'])
+            return [(d[0], spt_list[i] if i < len(spt_list) else 0, i, -1) for i, d in enumerate(old_distances)]
+
+        layout = self._site_layout()
+        inverters = allocation_result.get('inverters', [])
+        inv_indices = range(len(inverters))
+        placements = self._device_placements(
+            inverters, inv_indices, layout, self._compact_device_index_map(inverters))
+        return self._whip_distances(inverters, inv_indices, placements, layout,
+                                    self._tracker_ns_to_device)
+
+    def _site_layout(self, default_row_spacing_ft=20.0):
+        """Device geometry for every group, as the whip and feeder math read it.
+
+        Returns a dict with device_geometry.build_group_layout's 'group_layout',
+        'tracker_to_group' and 'max_tracker_width_ft', plus per global tracker
+        index 'tracker_world_x' (quick_estimate's tracker-centerline convention,
+        the whip's "from" end) and 'tracker_world_y' (the motor row shared with
+        site_preview.py, so a combiner N-S nudge and the whip length agree on
+        where the device actually is). 'group_keys' holds each group's cache
+        key, or None when there is no cache.
+        """
+        fingerprints = self._group_fingerprints() if self.cache is not None else None
+        layout = {
+            'group_layout': [],
+            'tracker_to_group': {},
+            'max_tracker_width_ft': 0.0,
+            'tracker_world_x': [],
+            'tracker_world_y': [],
+            'group_keys': [],
+        }
+        tracker_to_group = layout['tracker_to_group']
+        auto_x_cursor = 0.0
+
+        for grp_idx, group in enumerate(self.groups):
+            grp_pitch = group.get('row_spacing_ft', default_row_spacing_ft)
+            gx, gy = device_geometry.group_origin(group, auto_x_cursor)
+            key = None
+            if fingerprints is not None:
+                key = ('layout', fingerprints[grp_idx], gx, gy, grp_pitch)
+            geometry = self._group_geometry(group, gx, gy, grp_pitch, key)
+
+            global_start = len(layout['tracker_world_x'])
+            for local_idx in range(len(geometry['world_x'])):
+                tracker_to_group[global_start + local_idx] = (grp_idx, local_idx)
+            layout['group_layout'].append(geometry['entry'])
+            layout['max_tracker_width_ft'] = max(layout['max_tracker_width_ft'], geometry['max_width_ft'])
+            layout['tracker_world_x'].extend(geometry['world_x'])
+            layout['tracker_world_y'].extend(geometry['world_y'])
+            layout['group_keys'].append(key)
+
+            group_tracker_count = sum(seg['quantity'] for seg in group['segments'])
+            auto_x_cursor += group_tracker_count * grp_pitch + grp_pitch * 2
+
+        return layout
+
+    def _group_geometry(self, group, gx, gy, grp_pitch, key=None):
+        """One group's layout entry and tracker world X/Y, cached under key."""
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        entry, max_width_ft = device_geometry.group_layout_entry(
+            group, self.enabled_templates, gx, gy, grp_pitch)
+
+        world_x = []
+        local_idx = 0
+        for seg in group['segments']:
+            dims = self._get_estimate_tracker_dims_ft(seg.get('template_ref'))
+            t_half_width = dims[0] / 2 if dims else 0.0
+            for _ in range(seg['quantity']):
+                world_x.append(gx + local_idx * grp_pitch + t_half_width)
+                local_idx += 1
+        world_y = [device_geometry.tracker_motor_row_y(entry, t, l_idx)
+                   for l_idx, t in enumerate(entry['trackers'])]
+
+        geometry = {'entry': entry, 'max_width_ft': max_width_ft,
+                    'world_x': world_x, 'world_y': world_y}
+        if key is not None:
+            self.cache.put(key, geometry)
+        return geometry
+
+    def _device_placements(self, inverters, inv_indices, layout, inv_to_dev, default_row_spacing_ft=20.0):
+        """Device (x, y, primary_group_idx) for each of inv_indices with a harness_map.
+
+        The one device position both the whips and the routed feeders run to.
+        Returns {inv_idx: (x, y, primary_group_idx)}; inverters without a
+        usable harness_map are left out. Resolving a stored N-S step clamps it
+        in device_ns_steps, as it always has.
+        """
+        # device_position_for_inverter's rendered-box constants. quick_estimate
+        # has no rendered device box, but must use the SAME device_height_ft/
+        # offset_ft site_preview.py uses so a stored N-S step count resolves to
+        # the same anchor in both files — physical_anchor_y() below then
+        # converts the rendered-corner Y back into the physical connection Y.
+        _DEVICE_WIDTH_FT = 4.0
+        _DEVICE_HEIGHT_FT = 3.0
+        _OFFSET_FT = 5.0
+
+        group_layout = layout['group_layout']
+        tracker_to_group = layout['tracker_to_group']
+        max_tracker_width_ft = layout['max_tracker_width_ft']
+        placements = {}
+
+        for inv_idx in inv_indices:
+            harness_map = inverters[inv_idx].get('harness_map', [])
+            if not harness_map:
+                continue
+
+            geom = device_geometry.device_position_for_inverter(
+                harness_map, tracker_to_group, group_layout, self.groups,
+                _DEVICE_WIDTH_FT, _DEVICE_HEIGHT_FT, _OFFSET_FT, max_tracker_width_ft
+            )
+            if geom is None:
+                continue
+
+            primary_grp = geom['primary_group_idx']
+            group_source = self.groups[primary_grp] if primary_grp < len(self.groups) else {}
+
+            # Device X: same shared geometry as site_preview.py's rendered
+            # position, not quick_estimate's own tracker-centerline formula —
+            # so this and the CB popup agree exactly, not just on bias direction.
+            device_x = geom['x']
+
+            dev_idx = inv_to_dev[inv_idx]
+
+            # Device Y: resolve this device's own N-S nudge step (for the first
+            # time) against the shared anchor set, then convert the resolved
+            # rendered-corner Y back into the physical connection-point Y.
+            # Computed before the X bias below, which needs it for the
+            # nearest-pad tie-break.
+            if dev_idx is not None:
+                resolved_y, resolved_type = device_geometry.resolve_ns_step(
+                    self.device_ns_steps, dev_idx, geom['y'], geom['ns_anchors']
+                )
+            else:
+                resolved_y, resolved_type = geom['y'], None
+
+            effective_y = resolved_y if resolved_type is not None else geom['y']
+            effective_type = resolved_type if resolved_type is not None else geom['device_position']
+            device_y = device_geometry.physical_anchor_y(effective_y, effective_type, _DEVICE_HEIGHT_FT)
+
+            # For 'middle' placement: snap device_x into the row-spacing gap,
+            # using the shared bias direction (string-weighted, pad-tiebreak)
+            # so this agrees with site_preview.py's CB popup — quick_estimate's
+            # own "always bias east" rule could pick the opposite direction on
+            # a tie, throwing E-W off by a full row pitch for exactly the
+            # devices where the tie-break matters.
+            if geom['middle_bias_context'] is not None:
+                bc = geom['middle_bias_context']
+                device_x = device_geometry.apply_middle_x_bias(
+                    device_x, device_y, bc['center_local_x'], bc['local_x_indices'],
+                    bc['spt_map'], bc['pitch'], bc['group_x'], bc['group_num_trackers'],
+                    max_tracker_width_ft, self.pads
+                )
+
+            # Apply E-W nudge step — keyed by compacted device index (see
+            # _compact_device_index_map), not the raw inv_idx used above.
+            if dev_idx is not None:
+                ew_pitch = group_source.get('row_spacing_ft', default_row_spacing_ft)
+                if ew_pitch:
+                    device_x += self.device_ew_steps.get(dev_idx, 0) * (ew_pitch / 2.0)
+
+            placements[inv_idx] = (device_x, device_y, primary_grp)
+
+        return placements
+
+    def _whip_distances(self, inverters, inv_indices, placements, layout, ns_to_device):
+        """(distance_ft, spt, tracker_idx, inv_idx) per tracker of inv_indices.
+
+        Records each tracker's signed N-S offset to its device in
+        ns_to_device[(tracker_idx, inv_idx)].
+        """
+        tracker_world_x = layout['tracker_world_x']
+        tracker_world_y = layout['tracker_world_y']
+
+        # Compute distance for each tracker to its assigned device
+        # Deduplicate: each physical tracker generates whips once, even if split across inverters
+        whip_distances = []
+        seen_trackers = set()
+
+        for inv_idx in inv_indices:
+            placement = placements.get(inv_idx)
+            if placement is None:
+                continue
+
+            dev_x, dev_y, _ = placement
+
+            for entry in inverters[inv_idx]['harness_map']:
+                tidx = entry['tracker_idx']
+                is_split = entry.get('is_split', False)
+                
+                # Allow split tracker portions through (they appear in multiple inverters)
+                if tidx in seen_trackers and not is_split:
+                    continue
+                seen_trackers.add(tidx)
+                
+                if tidx >= len(tracker_world_x):
+                    continue
+                
+                ew_distance = abs(tracker_world_x[tidx] - dev_x)
+                # N-S inter-row distance (tracker to device) — stored for extender adjustment
+                ns_inter_row = abs(tracker_world_y[tidx] - dev_y)
+                
+                # Whip = E-W plus the N-S run from the tracker's row to the device's
+                # row. That N-S term is 0 for same-group trackers (device_y is the
+                # midpoint of primary-group tracker Ys), and is the full inter-group
+                # gap when a combiner spans groups — footage that was previously
+                # dropped from the BOM entirely.
+                total_distance = ew_distance + ns_inter_row
+                
+                # Store SIGNED N-S offset: positive = CB is south of tracker
+                signed_ns = dev_y - tracker_world_y[tidx]
+                ns_to_device[(tidx, inv_idx)] = signed_ns
+                
+                spt = entry.get('strings_per_tracker', 0)
+
+                whip_distances.append((total_distance, spt, tidx, inv_idx))
+        
+        return whip_distances
+
+    def calculate_routed_feeder_distances(self, allocation_result, topology, row_spacing_ft,
+                                          device_positions=None):
+        """Calculate routed feeder distances from each device to its assigned pad.
+        
+        `device_positions` is a {inv_idx: (x, y, primary_group_idx)} dict from
+        _device_placements(); calculate() passes the one its whips already
+        used, and it's computed here when None.
+
+        Returns a dict with:
+            'feeder_distances': list of (device_label, distance_ft) tuples
+            'feeder_total_ft': total feeder cable
+            'feeder_count': number of feeder runs
+            'homerun_distances': list of (pad_label, distance_ft) for AC homeruns (stub)
+        """
+        result = {
+            'feeder_distances': [],
+            'feeder_total_ft': 0,
+            'feeder_count': 0,
+            'routed_feeder_paths': {},  # {dev_idx: [(x,y),...]} three-leg or L-shape geometry
+        }
+        
+        if not self.pads or not allocation_result:
+            return result
+        
+        inverters = allocation_result.get('inverters', [])
+        if not inverters:
+            return result
+        
+        # Group left-edge X per group — still needed below for the azimuth
+        # rotation math (device X/Y itself comes entirely from the shared
+        # geometry in _device_placements).
+        group_x_map = {}
+        auto_x_cursor = 0.0
+
+        for grp_idx, group in enumerate(self.groups):
+            saved_x = group.get('position_x')
+            group_x_map[grp_idx] = saved_x if saved_x is not None else auto_x_cursor
+
+            group_tracker_count = sum(seg['quantity'] for seg in group['segments'])
+            auto_x_cursor += group_tracker_count * row_spacing_ft + row_spacing_ft * 2
+
+        # Motor-row-anchored world Y and N-S nudge — the same shared geometry
+        # the whips use, so a combiner N-S nudge moves the feeder route too,
+        # not just the whips.
+        if device_positions is None:
+            device_positions = self._device_placements(
+                inverters, range(len(inverters)), self._site_layout(row_spacing_ft),
+                self._compact_device_index_map(inverters), row_spacing_ft)
+        
+        # Build device -> pad lookup
+        device_to_pad = {}
+        for pad_idx, pad in enumerate(self.pads):
+            for dev_idx in pad.get('assigned_devices', []):
+                device_to_pad[dev_idx] = pad_idx
+
+        # Build device -> corridor lookup
+        device_to_corridor = {}
+        for c_idx, corridor in enumerate(self.corridors):
+            for dev_idx in corridor.get('assigned_devices', []):
+                device_to_corridor[dev_idx] = c_idx
+        corridors_key = None  # every corridor's points, for the per-device route cache
+
+        # Compute routed feeder distance (row-direction projection) from each device to its pad
+        for dev_idx in range(len(inverters)):
+            dev_pos = device_positions.get(dev_idx)
+            if dev_pos is None:
+                continue
+
+            pad_idx = device_to_pad.get(dev_idx)
+            if pad_idx is None or pad_idx >= len(self.pads):
+                continue
+
+            pad = self.pads[pad_idx]
+            pad_cx = pad['x'] + pad.get('width_ft', 10.0) / 2
+            pad_cy = pad['y'] + pad.get('height_ft', 8.0) / 2
+
+            dev_x, dev_y, primary_grp = dev_pos
+            group_source = self.groups[primary_grp] if primary_grp < len(self.groups) else {}
+
+            azimuth = group_source.get('azimuth', 180)
+            rotation_deg = azimuth - 180
+            driveline_angle_deg = group_source.get('driveline_angle', 0.0)
+
+            # Rotation center: horizontal midpoint of group, vertical midpoint of tracker length
+            gx = group_x_map.get(primary_grp, 0)
+            gy = group_source.get('position_y', 0) or 0
+            grp_count = sum(seg['quantity'] for seg in group_source.get('segments', []))
+            first_ref_r = None
+            for seg in group_source.get('segments', []):
+                ref = seg.get('template_ref')
+                if ref and ref in self.enabled_templates:
+                    first_ref_r = ref
+                    break
+            tlen_r = 180.0
+            twid_r = 0.0
+            if first_ref_r:
+                dims_r = self._get_estimate_tracker_dims_ft(first_ref_r)
+                if dims_r:
+                    twid_r, tlen_r = dims_r[0], dims_r[1]
+            rot_cx = gx + (twid_r + max(0, grp_count - 1) * row_spacing_ft) / 2
+            rot_cy = gy + tlen_r / 2
+
+            # Rotate device center by group azimuth
+            if rotation_deg != 0:
+                rad = math.radians(rotation_deg)
+                cos_r = math.cos(rad)
+                sin_r = math.sin(rad)
+                dx = dev_x - rot_cx
+                dy = dev_y - rot_cy
+                dev_x = rot_cx + dx * cos_r - dy * sin_r
+                dev_y = rot_cy + dx * sin_r + dy * cos_r
+
+            c_idx = device_to_corridor.get(dev_idx)
+            route_key = None
+            if self.cache is not None:
+                if corridors_key is None:
+                    corridors_key = json.dumps([c.get('points', []) for c in self.corridors], default=str)
+                route_key = ('feeder', dev_x, dev_y, pad_cx, pad_cy, rotation_deg,
+                             driveline_angle_deg, c_idx, corridors_key)
+                cached_route = self.cache.get(route_key)
+            else:
+                cached_route = None
+
+            if cached_route is not None:
+                routed, path_geom = cached_route
+            else:
+                routed, path_geom = self._route_feeder(
+                    dev_idx, c_idx, (dev_x, dev_y), (pad_cx, pad_cy), rotation_deg, driveline_angle_deg)
+                if route_key is not None:
+                    self.cache.put(route_key, (routed, path_geom))
+
+            result['routed_feeder_paths'][dev_idx] = path_geom
+            label = f"Dev-{dev_idx+1:02d}"
+            result['feeder_distances'].append((dev_idx, label, routed))
+            result['feeder_total_ft'] += routed
+            result['feeder_count'] += 1
+
+        return result
+
+    def _route_feeder(self, dev_idx, c_idx, device_xy, pad_xy, rotation_deg, driveline_angle_deg):
+        """(distance_ft, path) of one device's feeder to its pad centre.
+
+        Three-leg routing across the corridor network when the device is
+        assigned a usable corridor, else an L-shape along the (rotated) row
+        direction.
+        """
+        dev_x, dev_y = device_xy
+        pad_cx, pad_cy = pad_xy
+
+        # Corridor-aware routing (three-leg, across the corridor network) or L-shape fallback
+        routed = 0.0
+        used_corridor = False
+        if c_idx is not None and c_idx < len(self.corridors):
+            corridor = self.corridors[c_idx]
+            pts = corridor.get('points', [])
+            if len(pts) >= 2:
+                try:
+                    if self._corridor_network is None:
+                        from src.utils.corridor_routing import CorridorNetwork
+                        self._corridor_network = CorridorNetwork([c.get('points', []) for c in self.corridors])
+                    routed, path_geom = self._corridor_network.route(
+                        c_idx, (dev_x, dev_y), (pad_cx, pad_cy)
+                    )
+                    used_corridor = True
+                except Exception as e:
+                    print(f"Warning: corridor routing failed for device {dev_idx}: {e}", flush=True)
+
+        if not used_corridor:
+            # L-shape routing
+            driveline_tan = math.tan(math.radians(driveline_angle_deg)) if driveline_angle_deg != 0 else 0.0
+            mag = math.sqrt(1.0 + driveline_tan ** 2)
+            rdx_u, rdy_u = 1.0 / mag, driveline_tan / mag
+            if rotation_deg != 0:
+                cos_r = math.cos(math.radians(rotation_deg))
+                sin_r = math.sin(math.radians(rotation_deg))
+                row_dx = rdx_u * cos_r - rdy_u * sin_r
+                row_dy = rdx_u * sin_r + rdy_u * cos_r
+            else:
+                row_dx, row_dy = rdx_u, rdy_u
+            t = (pad_cx - dev_x) * row_dx + (pad_cy - dev_y) * row_dy
+            corner_x = dev_x + t * row_dx
+            corner_y = dev_y + t * row_dy
+            leg2 = math.sqrt((pad_cx - corner_x) ** 2 + (pad_cy - corner_y) ** 2)
+            routed = abs(t) + leg2
+            path_geom = [(dev_x, dev_y), (corner_x, corner_y), (pad_cx, pad_cy)]
+
+        return routed, path_geom
+
+    def _record_combined_whip(self, totals, whip_raw_ft, ext_pos_raw, ext_neg_raw,
+                              h_str_count, inv_idx):
+        """Record one harness as a combined (extender-folded) whip, per polarity.
+
+        Used only when the "combine extender + whip" setting is on. The combined
+        length is the whip E-W distance plus that polarity's extender leg, rounded
+        as a single conductor. Combined whips keep the WHIP wire gauge (no new sizing
+        rule). Populates the site-level per-polarity buckets, the per-device
+        per-polarity buckets, and total_whip_length.
+        """
+        gauge = self.get_wire_size_for('whip', h_str_count)
+        pos_len = self.round_whip_length(whip_raw_ft + ext_pos_raw)
+        neg_len = self.round_whip_length(whip_raw_ft + ext_neg_raw)
+        pos_key = (pos_len, gauge)
+        neg_key = (neg_len, gauge)
+        totals['whips_pos_by_length'][pos_key] += 1
+        totals['whips_neg_by_length'][neg_key] += 1
+        totals['total_whip_length'] += pos_len + neg_len
+        pd_pos = totals['whips_pos_by_length_per_device'].setdefault(inv_idx, {})
+        pd_neg = totals['whips_neg_by_length_per_device'].setdefault(inv_idx, {})
+        pd_pos[pos_key] = pd_pos.get(pos_key, 0) + 1
+        pd_neg[neg_key] = pd_neg.get(neg_key, 0) + 1
+
+        # Shadow running sums of the *separate* whip (E-W only) and extender (pos leg)
+        # lengths, mirroring what the symmetric extender/whip buckets would hold. These
+        # feed _compute_wire_length_estimates so the voltage-drop auto-sizing — and thus
+        # the whip gauge — is identical whether or not this setting is on.
+        whip_len = self.round_whip_length(whip_raw_ft)
+        totals['_combine_whip_len_sum'] = totals.get('_combine_whip_len_sum', 0) + whip_len * 2
+        totals['_combine_whip_qty'] = totals.get('_combine_whip_qty', 0) + 2
+        totals['_combine_ext_pos_len_sum'] = (
+            totals.get('_combine_ext_pos_len_sum', 0) + self.round_whip_length(ext_pos_raw))
+        totals['_combine_ext_pos_qty'] = totals.get('_combine_ext_pos_qty', 0) + 1
+
+    def _adjust_harnesses_for_splits(self, totals):
+        """Derive harness configs for split trackers based on allocation boundaries.
+        
+        Walks the segment's harness config north-to-south and cuts at the split
+        boundary. Harnesses cannot span device boundaries.
+        
+        Also builds self._split_tracker_details for use by whip and extender
+        calculations — maps each split tracker to per-device harness assignments.
+        """
+        self._split_tracker_details = {}
+        
+        inv_summary = totals.get('inverter_summary', {})
+        allocation_result = inv_summary.get('allocation_result')
+        
+        if not allocation_result:
+            return
+        
+        # Collect split tracker info from harness_map
+        split_trackers = {}
+        
+        for inv_idx, inv in enumerate(allocation_result['inverters']):
+            for entry in inv['harness_map']:
+                if entry['is_split']:
+                    tidx = entry['tracker_idx']
+                    if tidx not in split_trackers:
+                        split_trackers[tidx] = []
+                    entry_with_inv = dict(entry)
+                    entry_with_inv['inv_idx'] = inv_idx
+                    split_trackers[tidx].append(entry_with_inv)
+        
+        if not split_trackers:
+            return
+        
+        # Build tracker_to_segment map for looking up harness configs
+        tracker_seg_map = self._tracker_to_segment
+        
+        for tidx, entries in split_trackers.items():
+            spt = entries[0]['strings_per_tracker']
+            # Use per-tracker segment lookup to get correct harness config
+            # (multiple segments can share the same SPT with different configs)
+            if tidx < len(tracker_seg_map) and tracker_seg_map[tidx]:
+                seg = tracker_seg_map[tidx]['seg']
+                harness_config = self._get_effective_harness_config(seg)
+                original_harness_sizes = self.parse_harness_config(harness_config)
+            else:
+                original_harness_sizes = self._get_harness_config_for_tracker_type(spt)
+            
+            # Build device_positions with physical start positions
+            # Entries come from harness_map which is ordered by allocation sequence.
+            # For head/tail splits: head starts at 0, tail starts after head.
+            device_positions = []
+            pos_cursor = 0
+            
+            # Sort by split_position: head first, then middle, then tail
+            position_order = {'head': 0, 'middle': 1, 'tail': 2, 'full': 0}
+            sorted_entries = sorted(entries, key=lambda e: position_order.get(e.get('split_position', 'full'), 0))
+            
+            # Check if we have start_string_pos from Edit Devices (most accurate)
+            # This comes through the combiner assignments path
+            has_physical_pos = False
+            if self.last_combiner_assignments:
+                for cb in self.last_combiner_assignments:
+                    for conn in cb.get('connections', []):
+                        if conn['tracker_idx'] == tidx and 'start_string_pos' in conn:
+                            has_physical_pos = True
+                            break
+                    if has_physical_pos:
+                        break
+            
+            if has_physical_pos:
+                # Build from combiner assignments with physical positions
+                for cb_idx, cb in enumerate(self.last_combiner_assignments):
+                    for conn in cb.get('connections', []):
+                        if conn['tracker_idx'] == tidx:
+                            device_positions.append({
+                                'inv_idx': cb_idx,
+                                'strings_taken': conn['num_strings'],
+                                'start_pos': conn.get('start_string_pos', 0),
+                            })
+            elif any('start_physical_pos' in e for e in entries):
+                # Use physical positions from harness_map (from manual Edit Devices)
+                for entry in entries:
+                    device_positions.append({
+                        'inv_idx': entry['inv_idx'],
+                        'strings_taken': entry['strings_taken'],
+                        'start_pos': entry['start_physical_pos'],
+                    })
+            else:
+                # Fall back to allocation order (head=north, tail=south)
+                for entry in sorted_entries:
+                    device_positions.append({
+                        'inv_idx': entry['inv_idx'],
+                        'strings_taken': entry['strings_taken'],
+                        'start_pos': pos_cursor,
+                    })
+                    pos_cursor += entry['strings_taken']
+            # Derive harnesses for each portion
+            portion_details = self._derive_harnesses_for_split(
+                original_harness_sizes, spt, device_positions
+            )
+            
+            # Store for whip and extender calculations
+            self._split_tracker_details[tidx] = {
+                'spt': spt,
+                'original_config': original_harness_sizes,
+                'portions': portion_details,
+            }
+            
+            # Adjust harness totals: remove original, add derived
+            for size in original_harness_sizes:
+                if size in totals['harnesses_by_size']:
+                    totals['harnesses_by_size'][size] -= 1
+                    if totals['harnesses_by_size'][size] <= 0:
+                        del totals['harnesses_by_size'][size]
+            
+            all_new = []
+            for p in portion_details:
+                all_new.extend(p['harnesses'])
+            for size in all_new:
+                if size not in totals['harnesses_by_size']:
+                    totals['harnesses_by_size'][size] = 0
+                totals['harnesses_by_size'][size] += 1
+
+    # ==================== Calculation ====================
+
+    # ==================== Per-group partials (incremental recalculation) ====================
+
+    def _group_fingerprint(self, group, template_keys):
+        """Stable key for everything _group_partial() reads from `group`.
+
+        Position is left out on purpose: the partial's layout is local to
+        the group, so dragging a group on the site preview still reuses it.
+        """
+        inputs = {k: v for k, v in group.items() if k not in ('position_x', 'position_y')}
+        refs = sorted({seg.get('template_ref') for seg in group.get('segments', [])
+                       if seg.get('template_ref') in self.enabled_templates})
+        return json.dumps({
+            'group': inputs,
+            'templates': [template_keys[ref] for ref in refs],
+            'lv_method': self.lv_method,
+            'modules_per_string': self.modules_per_string,
+            'module_isc': getattr(self.selected_module, 'isc', None),
+        }, sort_keys=True, default=str)
+
+    def _group_fingerprints(self):
+        """_group_fingerprint() of every group, computed once per calculation."""
+        if self._fingerprints is None:
+            template_keys = self._template_keys()
+            self._fingerprints = [self._group_fingerprint(group, template_keys) for group in self.groups]
+        return self._fingerprints
+
+    def _group_partial(self, group, template_keys=None, fingerprint=None):
+        """Per-group tracker counts and local tracker layout.
+
+        Everything here depends only on the group itself, the templates it
+        links and the LV method, so the result is cached by fingerprint and
+        merged into the site totals by calculate(). Returned dicts are shared
+        with the cache — treat them as read-only.
+        """
+        key = None
+        if self.cache is not None:
+            if fingerprint is None:
+                if template_keys is None:
+                    template_keys = self._template_keys()
+                fingerprint = self._group_fingerprint(group, template_keys)
+            key = ('group', fingerprint)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        lv_method = self.lv_method
+        modules_per_string = self.modules_per_string
+        partial = {
+            'sequence': [],
+            'tracker_segments': [],
+            'total_trackers': 0,
+            'total_strings': 0,
+            'total_harnesses': 0,
+            'max_harness_strings': 0,
+            'trackers_by_string': defaultdict(int),
+            'harnesses_by_size': defaultdict(int),
+            'inline_fuses_by_rating': defaultdict(int),
+            'unique_modules': {},
+            'segment_module_data': [],
+            'layout': [],  # (spt, local x, local y, length_ft) per tracker
+            'row_spacing_ft': group.get('row_spacing_ft', 20.0),
+            'motor_y_ft': 0.0,
+        }
+
+        for seg_idx, seg in enumerate(group['segments']):
+            qty = seg['quantity']
+            spt = seg['strings_per_tracker']
+            harness_config = self._get_effective_harness_config(seg)
+
+            if qty <= 0:
+                continue
+
+            # Resolve module from template
+            seg_module = None
+            seg_mps = modules_per_string
+            ref = seg.get('template_ref')
+            if ref and ref in self.enabled_templates:
+                tdata = self.enabled_templates[ref]
+                seg_module = tdata.get('module_spec', {})
+                seg_mps = tdata.get('modules_per_string', modules_per_string)
+
+                # Track unique modules
+                mod_key = f"{seg_module.get('manufacturer', '?')} {seg_module.get('model', '?')} ({seg_module.get('wattage', '?')}W)"
+                if mod_key not in partial['unique_modules']:
+                    partial['unique_modules'][mod_key] = seg_module
+
+            partial['segment_module_data'].append({
+                'module_spec': seg_module,
+                'modules_per_string': seg_mps,
+                'qty': qty,
+                'spt': spt
+            })
+
+            # Determine if this segment has partial strings
+            full_spt = int(spt)
+            has_partial = (spt != full_spt)
+
+            # Add to flat tracker sequence (one entry per physical tracker)
+            # For partial-string trackers, pair adjacent trackers:
+            #   Left of pair: full_spt + 1 (owns the shared string)
+            #   Right of pair: full_spt
+            #   Unpaired odd tracker: full_spt (half-string not counted)
+            num_pairs = qty // 2 if has_partial else 0
+
+            for i in range(qty):
+                if has_partial:
+                    if i % 2 == 0 and i + 1 < qty:
+                        effective_spt = full_spt + 1  # Left of pair — owns shared string
+                    elif i % 2 == 1:
+                        effective_spt = full_spt  # Right of pair
+                    else:
+                        effective_spt = full_spt  # Unpaired odd tracker
+                else:
+                    effective_spt = spt
+
+                partial['sequence'].append(effective_spt)
+                partial['tracker_segments'].append(seg_idx)
+
+            partial['total_trackers'] += qty
+            if has_partial:
+                partial['total_strings'] += full_spt * qty + num_pairs  # Only paired halves count
+            else:
+                partial['total_strings'] += qty * spt
+
+            # Count trackers by effective string count
+            if has_partial:
+                num_pairs_count = qty // 2
+                # Left of pair
+                left_spt = full_spt + 1
+                partial['trackers_by_string'][left_spt] += num_pairs_count
+                # Right of pair + any unpaired
+                right_count = num_pairs_count + (qty % 2)
+                partial['trackers_by_string'][full_spt] += right_count
+            else:
+                partial['trackers_by_string'][spt] += qty
+
+            # Count harnesses by size (skip for Trunk Bus — no harnesses)
+            if lv_method != 'Trunk Bus':
+                harness_sizes = self.parse_harness_config(harness_config)
+                for size in harness_sizes:
+                    if size > partial['max_harness_strings']:
+                        partial['max_harness_strings'] = size
+                    partial['harnesses_by_size'][size] += qty
+                    partial['total_harnesses'] += qty
+
+            # Count inline fuses (Wire Harness only, positive side, size >= 2)
+            if lv_method == 'Wire Harness':
+                for size in harness_sizes:
+                    if size >= 2:
+                        fuse_rating = self._calc_inline_fuse_rating(seg_module)
+                        partial['inline_fuses_by_rating'][fuse_rating] += size * qty
+
+        # Compute group reference motor Y (same as SitePreviewWindow uses)
+        # This is the motor_y of the FIRST segment's template in the group
+        for seg in group['segments']:
+            ref_check = seg.get('template_ref')
+            if ref_check and ref_check in self.enabled_templates:
+                tdata_check = self.enabled_templates[ref_check]
+                if tdata_check.get('has_motor', True):
+                    # Compute this template's motor_y using same logic
+                    ms_c = tdata_check.get('module_spec', {})
+                    orient_c = tdata_check.get('module_orientation', 'Portrait')
+                    mps_c = tdata_check.get('modules_per_string', 28)
+                    spacing_c = tdata_check.get('module_spacing_m', 0.02)
+                    placement_c = tdata_check.get('motor_placement_type', 'between_strings')
+                    pos_after_c = tdata_check.get('motor_position_after_string', None)
+                    str_idx_c = tdata_check.get('motor_string_index', None)
+                    split_n_c = tdata_check.get('motor_split_north', mps_c // 2)
+                    mod_along_c = (ms_c.get('width_mm', 1000) if orient_c == 'Portrait' else ms_c.get('length_mm', 2000)) / 1000
+
+                    # Partial string on north adds offset
+                    spt_c = tdata_check.get('strings_per_tracker', 1)
+                    partial_north_m_c = 0
+                    if spt_c != int(spt_c) and tdata_check.get('partial_string_side', 'north') == 'north':
+                        partial_north_mods_c = round((spt_c - int(spt_c)) * mps_c)
+                        partial_north_m_c = partial_north_mods_c * (mod_along_c + spacing_c)
+
+                    if placement_c == 'between_strings':
+                        p = pos_after_c if pos_after_c is not None else (str_idx_c if str_idx_c is not None else 1)
+                        mn = p * mps_c
+                        motor_y_m = partial_north_m_c + (mn * mod_along_c + (mn - 1) * spacing_c + spacing_c) if mn > 0 else 0.0
+                        partial['motor_y_ft'] = motor_y_m * 3.28084
+                    elif placement_c == 'middle_of_string':
+                        s = str_idx_c if str_idx_c is not None else 1
+                        mb = (s - 1) * mps_c + split_n_c
+                        motor_y_m = partial_north_m_c + (mb * mod_along_c + (mb - 1) * spacing_c + spacing_c)
+                        partial['motor_y_ft'] = motor_y_m * 3.28084
+                    break  # Use first template's motor as reference
+
+        # Driveline angle for this group
+        driveline_angle_deg = group.get('driveline_angle', 0.0)
+        driveline_tan = math.tan(math.radians(driveline_angle_deg)) if driveline_angle_deg != 0 else 0.0
+
+        # Local tracker layout, left-to-right across all segments
+        grp_row_spacing = partial['row_spacing_ft']
+        tracker_within_group = 0
+        for seg in group['segments']:
+            qty = seg['quantity']
+            spt = seg['strings_per_tracker']
+            if qty <= 0:
+                continue
+
+            dims = self._get_estimate_tracker_dims_ft(seg.get('template_ref'))
+            t_length = dims[1] if dims else 180.0  # fallback tracker length
+
+            full_spt = int(spt)
+            has_partial = (spt != full_spt)
+
+            for i in range(qty):
+                if has_partial:
+                    if i % 2 == 0 and i + 1 < qty:
+                        effective_spt = full_spt + 1
+                    else:
+                        effective_spt = full_spt
+                else:
+                    effective_spt = int(spt)
+
+                local_x_offset = tracker_within_group * grp_row_spacing
+                partial['layout'].append(
+                    (effective_spt, local_x_offset, local_x_offset * driveline_tan, t_length))
+                tracker_within_group += 1
+
+        if key is not None:
+            self.cache.put(key, partial)
+        return partial
+
+    def _template_keys(self):
+        """{template_ref: serialized template} for fingerprinting groups."""
+        return {ref: json.dumps(tdata, sort_keys=True, default=str)
+                for ref, tdata in self.enabled_templates.items()}
+
+    def _allocate_spatial(self, entries, strings_per_inv, pitch_ft, force_single_row):
+        """allocate_strings_spatial(), reusing a cached result for identical inputs.
+
+        The cached allocation is stored against positions within `entries`
+        and remapped onto the entries' current original_idx, so a group
+        keeps its cached allocation when a group ahead of it in the flat
+        tracker order changes size.
+
+        Returns (allocation_result, cache_key); cache_key is None without a cache.
+        """
+        if self.cache is None:
+            return allocate_strings_spatial(entries, strings_per_inv, pitch_ft,
+                                            force_single_row=force_single_row), None
+
+        key = ('allocation', strings_per_inv, pitch_ft, force_single_row,
+               tuple((e['spt'], e['x'], e['y'], e['length_ft'], e['motor_y_ft']) for e in entries))
+        local_result = self.cache.get(key)
+        if local_result is None:
+            local_entries = [dict(e, original_idx=k) for k, e in enumerate(entries)]
+            local_result = allocate_strings_spatial(local_entries, strings_per_inv, pitch_ft,
+                                                    force_single_row=force_single_row)
+            self.cache.put(key, local_result)
+        return _remap_allocation(local_result, [e['original_idx'] for e in entries]), key
+
+    def _wiring_partial(self, group_indices, tracker_indices, inv_indices, allocation_result,
+                        layout, inv_to_dev, whip_inputs):
+        """Whips, extenders and device placements for one allocation unit.
+
+        A unit is a standalone group or a linked pool (or every group, when the
+        allocation isn't built per unit): group_indices, their global
+        tracker_indices and the inv_indices allocated to them. The devices
+        and trackers of one unit never mix with another's, so calculate()
+        runs this once per unit, caches it and merges the results with
+        _merge_wiring(). `whip_inputs` carries the site-level lookups the
+        whip math shares: 'whips_active', 'combine_active', 'num_devices',
+        'harness_count_by_spt', 'harness_sizes_by_spt' and
+        'tracker_harness_sizes' (per global tracker index).
+
+        Returns the unit's totals buckets, 'total_whip_length', the
+        'ns_to_device' offsets and the device 'placements', all keyed by
+        global tracker and inverter index.
+        """
+        whips_active = whip_inputs['whips_active']
+        combine_active = whip_inputs['combine_active']
+        num_devices = whip_inputs['num_devices']
+        harness_count_by_spt = whip_inputs['harness_count_by_spt']
+        harness_sizes_by_spt = whip_inputs['harness_sizes_by_spt']
+        tracker_harness_sizes_list = whip_inputs['tracker_harness_sizes']
+
+        part = {name: defaultdict(int) for name in _WIRING_BUCKETS}
+        for name in _WIRING_DEVICE_BUCKETS:
+            if name != 'whips_by_length_per_device':  # created by the first whip, as in totals
+                part[name] = {}
+        part['total_whip_length'] = 0
+        part['ns_to_device'] = {}
+        part['placements'] = {}
+
+        inverters = allocation_result.get('inverters', []) if allocation_result else []
+        if allocation_result and (whips_active or self.pads):
+            part['placements'] = self._device_placements(inverters, inv_indices, layout, inv_to_dev)
+
+        if len(tracker_indices) == len(self._tracker_to_segment):
+            unit_splits = self._split_tracker_details
+        else:
+            unit_trackers = set(tracker_indices)
+            unit_splits = {tidx: details for tidx, details in self._split_tracker_details.items()
+                           if tidx in unit_trackers}
+
+        # ==================== Whips (skipped for Trunk Bus) ====================
+        if whips_active:
+            if allocation_result:
+                whip_distances = self._whip_distances(
+                    inverters, inv_indices, part['placements'], layout, part['ns_to_device'])
+            else:
+                whip_distances = self.calculate_whip_distances_from_positions(
+                    allocation_result, self.topology, num_devices
+                )
+
+            split_details = self._split_tracker_details
+            tracker_seg_map_whip = self._tracker_to_segment
+            seen_whip_trackers = set()
+            
+            for entry in whip_distances:
+                if len(entry) == 4:
+                    distance_ft, spt, tidx, inv_idx = entry
+                else:
+                    distance_ft, spt = entry[0], entry[1]
+                    tidx, inv_idx = -1, -1
+                # Add NS leg of Manhattan whip when whip point has been manually positioned
+                if tidx >= 0 and inv_idx >= 0:
+                    ns_leg = self._whip_point_ns_legs.get(f"{tidx}:{inv_idx}", 0.0)
+                    distance_ft += ns_leg
+                whip_length = self.round_whip_length(distance_ft)
+                
+                if tidx in split_details:
+                    # Split tracker — collect ALL portions for this inv_idx
+                    # (a single inverter can own multiple portions when a harness
+                    #  straddles the split boundary)
+                    portion_harnesses = 0
+                    for portion in split_details[tidx]['portions']:
+                        if portion['inv_idx'] == inv_idx:
+                            portion_harnesses += len(portion['harnesses'])
+                    
+                    if portion_harnesses == 0:
+                        continue
+                    
+                    num_harnesses = portion_harnesses
+                else:
+                    # Non-split tracker — skip duplicates, use original harness count
+                    if tidx in seen_whip_trackers:
+                        continue
+                    seen_whip_trackers.add(tidx)
+                    num_harnesses = harness_count_by_spt.get(spt, 1)
+                
+                # Determine individual harness sizes for wire gauge lookup
+                if tidx in split_details:
+                    # Collect harness sizes from ALL portions for this inv_idx
+                    ind_harness_sizes = []
+                    for portion in split_details[tidx]['portions']:
+                        if portion['inv_idx'] == inv_idx:
+                            ind_harness_sizes.extend(portion['harnesses'])
+                    if not ind_harness_sizes:
+                        ind_harness_sizes = split_details[tidx]['portions'][0]['harnesses']
+                else:
+                    if tidx < len(tracker_harness_sizes_list):
+                        ind_harness_sizes = tracker_harness_sizes_list[tidx]
+                    else:
+                        ind_harness_sizes = harness_sizes_by_spt.get(spt, [spt])
+                
+                if not combine_active:
+                    for h_str_count in ind_harness_sizes:
+                        gauge = self.get_wire_size_for('whip', h_str_count)
+                        key = (whip_length, gauge)
+                        part['whips_by_length'][key] += 2  # pos + neg
+                        part['total_whip_length'] += whip_length * 2
+                        part.setdefault('whips_by_length_per_device', {})
+                        per_dev = part['whips_by_length_per_device'].setdefault(inv_idx, {})
+                        per_dev[key] = per_dev.get(key, 0) + 2
+                elif tidx < 0 or tidx >= len(tracker_seg_map_whip):
+                    # No tracker→segment mapping (e.g. no-allocation fallback): can't
+                    # pair with an extender, so keep the plain symmetric whip rather
+                    # than dropping the footage entirely.
+                    for h_str_count in ind_harness_sizes:
+                        gauge = self.get_wire_size_for('whip', h_str_count)
+                        key = (whip_length, gauge)
+                        part['whips_by_length'][key] += 2  # pos + neg
+                        part['total_whip_length'] += whip_length * 2
+                        part.setdefault('whips_by_length_per_device', {})
+                        per_dev = part['whips_by_length_per_device'].setdefault(inv_idx, {})
+                        per_dev[key] = per_dev.get(key, 0) + 2
+                else:
+                    # Combine mode: fold each harness's extender leg into its whip,
+                    # per polarity. Uses the FINAL whip distance (distance_ft, which
+                    # already includes any manual N-S leg) plus the FINAL extender pairs
+                    # (with any whip-point override applied), so a moved whip junction
+                    # nets out correctly. Combined whips carry the whip wire gauge.
+                    seg_info_c = tracker_seg_map_whip[tidx]
+                    seg_c = seg_info_c['seg']
+                    device_position_c = seg_info_c['device_position']
+                    wp_override_c = self._whip_point_overrides.get(f"{tidx}:{inv_idx}")
+                    if tidx in split_details:
+                        for portion in split_details[tidx]['portions']:
+                            if portion['inv_idx'] != inv_idx:
+                                continue
+                            ext_pairs_c = self.calculate_extender_lengths_per_segment(
+                                seg_c, device_position_c, portion.get('start_pos', 0),
+                                whip_point_override=wp_override_c,
+                                harness_sizes_override=portion['harnesses'])
+                            ph_c = portion['harnesses']
+                            for pair_idx, (pos_raw, neg_raw) in enumerate(ext_pairs_c):
+                                h_c = ph_c[pair_idx] if pair_idx < len(ph_c) else 1
+                                self._record_combined_whip(
+                                    part, distance_ft, pos_raw, neg_raw, h_c, inv_idx)
+                    else:
+                        ext_pairs_c = self.calculate_extender_lengths_per_segment(
+                            seg_c, device_position_c, whip_point_override=wp_override_c)
+                        for pair_idx, (pos_raw, neg_raw) in enumerate(ext_pairs_c):
+                            h_c = ind_harness_sizes[pair_idx] if pair_idx < len(ind_harness_sizes) else 1
+                            self._record_combined_whip(
+                                part, distance_ft, pos_raw, neg_raw, h_c, inv_idx)
+
+        split_details = self._split_tracker_details
+        tracker_seg_map = self._tracker_to_segment
+        
+        # Count how many split trackers exist per (group_idx, seg identity) so we can reduce bulk qty
+        split_tracker_seg_counts = {}  # (group_idx, id(seg)) -> count of split trackers
+        for tidx in unit_splits:
+            if tidx < len(tracker_seg_map):
+                info = tracker_seg_map[tidx]
+                key = (info['group_idx'], id(info['seg']))
+                split_tracker_seg_counts[key] = split_tracker_seg_counts.get(key, 0) + 1
+
+        # Build tracker-to-device and seg-to-trackers maps for per-device extender tagging
+        tracker_to_device_ext = {}
+        for _inv_idx_ext in inv_indices:
+            for _tidx_ext, _ in inverters[_inv_idx_ext].get('tracker_indices', []):
+                tracker_to_device_ext[_tidx_ext] = _inv_idx_ext
+        trackers_by_seg_id = {}
+        for _tidx_ext in tracker_indices:
+            if _tidx_ext < len(tracker_seg_map):
+                trackers_by_seg_id.setdefault(id(tracker_seg_map[_tidx_ext]['seg']), []).append(_tidx_ext)
+
+        # Process non-split trackers in bulk (original logic minus split count).
+        # In combine mode these extenders are folded into whips above, so skip.
+        for group_idx in ([] if combine_active else group_indices):
+            group = self.groups[group_idx]
+            device_position = group.get('device_position', 'middle')
+            for seg in group['segments']:
+                if seg['quantity'] <= 0:
+                    continue
+                
+                key = (group_idx, id(seg))
+                num_splits_in_seg = split_tracker_seg_counts.get(key, 0)
+                non_split_qty = seg['quantity'] - num_splits_in_seg
+                
+                if non_split_qty > 0:
+                    extender_pairs = self.calculate_extender_lengths_per_segment(seg, device_position)
+                    harness_sizes = self._get_harness_sizes(seg)
+                    for pair_idx, (pos_len, neg_len) in enumerate(extender_pairs):
+                        h_str_count = harness_sizes[pair_idx] if pair_idx < len(harness_sizes) else 1
+                        gauge = self.get_wire_size_for('extender', h_str_count)
+                        pos_rounded = self.round_whip_length(pos_len)
+                        neg_rounded = self.round_whip_length(neg_len)
+                        pos_key = (pos_rounded, gauge)
+                        neg_key = (neg_rounded, gauge)
+                        part['extenders_pos_by_length'][pos_key] += non_split_qty
+                        part['extenders_neg_by_length'][neg_key] += non_split_qty
+                    for _tidx_ns in [t for t in trackers_by_seg_id.get(id(seg), []) if t not in split_details]:
+                        _dev_ns = tracker_to_device_ext.get(_tidx_ns, -1)
+                        for pair_idx, (pos_len, neg_len) in enumerate(extender_pairs):
+                            h_str_count = harness_sizes[pair_idx] if pair_idx < len(harness_sizes) else 1
+                            gauge = self.get_wire_size_for('extender', h_str_count)
+                            pos_key = (self.round_whip_length(pos_len), gauge)
+                            neg_key = (self.round_whip_length(neg_len), gauge)
+                            _pd_pos = part['extenders_pos_by_length_per_device'].setdefault(_dev_ns, {})
+                            _pd_neg = part['extenders_neg_by_length_per_device'].setdefault(_dev_ns, {})
+                            _pd_pos[pos_key] = _pd_pos.get(pos_key, 0) + 1
+                            _pd_neg[neg_key] = _pd_neg.get(neg_key, 0) + 1
+
+        # Process split trackers individually — each portion gets its own extenders.
+        # In combine mode these are folded into whips above, so skip.
+        for tidx, details in ([] if combine_active else unit_splits.items()):
+            if tidx >= len(tracker_seg_map):
+                continue
+            
+            seg_info = tracker_seg_map[tidx]
+            seg = seg_info['seg']
+            device_position = seg_info['device_position']
+            
+            for portion in details['portions']:
+                string_offset = portion.get('start_pos', 0)
+                extender_pairs = self.calculate_extender_lengths_per_segment(
+                    seg, device_position, string_offset,
+                    harness_sizes_override=portion['harnesses'])
+                portion_harness_sizes = portion['harnesses']
+                
+                for pair_idx, (pos_len, neg_len) in enumerate(extender_pairs):
+                    h_str_count = portion_harness_sizes[pair_idx] if pair_idx < len(portion_harness_sizes) else 1
+                    gauge = self.get_wire_size_for('extender', h_str_count)
+                    pos_rounded = self.round_whip_length(pos_len)
+                    neg_rounded = self.round_whip_length(neg_len)
+                    pos_key = (pos_rounded, gauge)
+                    neg_key = (neg_rounded, gauge)
+                    part['extenders_pos_by_length'][pos_key] += 1
+                    part['extenders_neg_by_length'][neg_key] += 1
+                    per_dev_pos = part['extenders_pos_by_length_per_device'].setdefault(portion['inv_idx'], {})
+                    per_dev_neg = part['extenders_neg_by_length_per_device'].setdefault(portion['inv_idx'], {})
+                    per_dev_pos[pos_key] = per_dev_pos.get(pos_key, 0) + 1
+                    per_dev_neg[neg_key] = per_dev_neg.get(neg_key, 0) + 1
+
+        # Adjust extenders for trackers that have a user-set whip point override.
+        # Extenders are not affected by CB N-S position or device_position_overrides —
+        # only explicit _whip_point_overrides change extender lengths.
+        # In combine mode, whip-point overrides are already applied inside the
+        # combined-whip fold above, so this extender adjustment pass is skipped.
+        ns_offsets = part['ns_to_device']
+        if ns_offsets and not combine_active:
+            for (tidx, inv_idx), _signed_ns in ns_offsets.items():
+                wp_override = self._whip_point_overrides.get(f"{tidx}:{inv_idx}")
+
+                # Skip if no whip point override — base extenders are already correct
+                if wp_override is None:
+                    continue
+
+                if tidx >= len(tracker_seg_map):
+                    continue
+
+                seg_info = tracker_seg_map[tidx]
+                seg = seg_info['seg']
+                device_position = seg_info['device_position']  # layout-assigned, not CB-position-derived
+
+                if tidx in split_details:
+                    for portion in split_details[tidx]['portions']:
+                        if portion['inv_idx'] != inv_idx:
+                            continue
+                        string_offset = portion.get('start_pos', 0)
+                        h_override = portion['harnesses']
+
+                        # Base extenders — original device_position, no whip point override
+                        base_pairs = self.calculate_extender_lengths_per_segment(
+                            seg, device_position, string_offset,
+                            harness_sizes_override=h_override)
+                        # Adjusted extenders — same device_position, with whip point override applied
+                        adjusted_pairs = self.calculate_extender_lengths_per_segment(
+                            seg, device_position, string_offset,
+                            whip_point_override=wp_override,
+                            harness_sizes_override=h_override)
+                        portion_harness_sizes = portion['harnesses']
+
+                        for pair_idx in range(len(base_pairs)):
+                            h_str_count = portion_harness_sizes[pair_idx] if pair_idx < len(portion_harness_sizes) else 1
+                            gauge = self.get_wire_size_for('extender', h_str_count)
+                            # Remove base
+                            base_pos, base_neg = base_pairs[pair_idx]
+                            old_pos_key = (self.round_whip_length(base_pos), gauge)
+                            old_neg_key = (self.round_whip_length(base_neg), gauge)
+                            part['extenders_pos_by_length'][old_pos_key] -= 1
+                            part['extenders_neg_by_length'][old_neg_key] -= 1
+                            # Add adjusted
+                            adj_pos, adj_neg = adjusted_pairs[pair_idx]
+                            new_pos_key = (self.round_whip_length(adj_pos), gauge)
+                            new_neg_key = (self.round_whip_length(adj_neg), gauge)
+                            part['extenders_pos_by_length'][new_pos_key] += 1
+                            part['extenders_neg_by_length'][new_neg_key] += 1
+                            per_dev_pos = part['extenders_pos_by_length_per_device'].setdefault(inv_idx, {})
+                            per_dev_neg = part['extenders_neg_by_length_per_device'].setdefault(inv_idx, {})
+                            per_dev_pos[old_pos_key] = per_dev_pos.get(old_pos_key, 0) - 1
+                            per_dev_neg[old_neg_key] = per_dev_neg.get(old_neg_key, 0) - 1
+                            per_dev_pos[new_pos_key] = per_dev_pos.get(new_pos_key, 0) + 1
+                            per_dev_neg[new_neg_key] = per_dev_neg.get(new_neg_key, 0) + 1
+                else:
+                    # Non-split tracker
+                    base_pairs = self.calculate_extender_lengths_per_segment(
+                        seg, device_position)
+                    adjusted_pairs = self.calculate_extender_lengths_per_segment(
+                        seg, device_position, whip_point_override=wp_override)
+                    harness_sizes = self._get_harness_sizes(seg)
+
+                    for pair_idx in range(len(base_pairs)):
+                        h_str_count = harness_sizes[pair_idx] if pair_idx < len(harness_sizes) else 1
+                        gauge = self.get_wire_size_for('extender', h_str_count)
+                        # Remove base
+                        base_pos, base_neg = base_pairs[pair_idx]
+                        old_pos_key = (self.round_whip_length(base_pos), gauge)
+                        old_neg_key = (self.round_whip_length(base_neg), gauge)
+                        part['extenders_pos_by_length'][old_pos_key] -= 1
+                        part['extenders_neg_by_length'][old_neg_key] -= 1
+                        # Add adjusted
+                        adj_pos, adj_neg = adjusted_pairs[pair_idx]
+                        new_pos_key = (self.round_whip_length(adj_pos), gauge)
+                        new_neg_key = (self.round_whip_length(adj_neg), gauge)
+                        part['extenders_pos_by_length'][new_pos_key] += 1
+                        part['extenders_neg_by_length'][new_neg_key] += 1
+                        per_dev_pos = part['extenders_pos_by_length_per_device'].setdefault(inv_idx, {})
+                        per_dev_neg = part['extenders_neg_by_length_per_device'].setdefault(inv_idx, {})
+                        per_dev_pos[old_pos_key] = per_dev_pos.get(old_pos_key, 0) - 1
+                        per_dev_neg[old_neg_key] = per_dev_neg.get(old_neg_key, 0) - 1
+                        per_dev_pos[new_pos_key] = per_dev_pos.get(new_pos_key, 0) + 1
+                        per_dev_neg[new_neg_key] = per_dev_neg.get(new_neg_key, 0) + 1
+
+        return part
+
+    def _wiring_key(self, unit_key, group_indices, tracker_indices, inv_indices, layout,
+                    inv_to_dev, site_key, point_overrides):
+        """Cache key for _wiring_partial(), or None when the unit can't be cached.
+
+        Made of the unit's allocation key, its groups' layout keys (group
+        fingerprint plus where the group sits), the site-wide inputs in
+        site_key, and — renumbered to the unit's own tracker and inverter
+        positions — its split-tracker portions, device nudge steps and
+        whip-point overrides.
+        """
+        if unit_key is None or any(layout['group_keys'][gi] is None for gi in group_indices):
+            return None
+        inv_start = inv_indices.start
+        local_tracker = {tidx: k for k, tidx in enumerate(tracker_indices)}
+
+        splits = []
+        for tidx in tracker_indices:
+            details = self._split_tracker_details.get(tidx)
+            if details is None:
+                continue
+            portions = []
+            for portion in details['portions']:
+                if portion['inv_idx'] not in inv_indices:
+                    return None  # portion owned outside the unit (edited assignments)
+                portions.append((portion['inv_idx'] - inv_start, portion['strings_taken'],
+                                 portion['start_pos'], tuple(portion['harnesses'])))
+            splits.append((local_tracker[tidx], details['spt'],
+                           tuple(details['original_config']), tuple(portions)))
+
+        steps = []
+        for inv_idx in inv_indices:
+            dev_idx = inv_to_dev[inv_idx]
+            if dev_idx is not None:
+                steps.append((self.device_ns_steps.get(dev_idx, 0), self.device_ew_steps.get(dev_idx, 0)))
+
+        overrides = sorted(
+            (local_tracker[tidx], inv_idx - inv_start, value)
+            for (tidx, inv_idx), value in point_overrides.items()
+            if tidx in local_tracker and inv_idx in inv_indices
+        )
+
+        return ('wiring', unit_key, tuple(layout['group_keys'][gi] for gi in group_indices),
+                site_key, tuple(splits), tuple(steps),
+                json.dumps(overrides, sort_keys=True, default=str))
+
+    def _calculate_wiring(self, totals, allocation_result, wiring_units, group_tracker_counts, whip_inputs):
+        """Merge every allocation unit's _wiring_partial() into totals.
+
+        Units whose groups, allocation, device steps, overrides and site-wide
+        wire sizing are unchanged are merged back from the cache rather than
+        recomputed. Returns the {inv_idx: (x, y, primary_group_idx)} device
+        placements the routed feeders reuse.
+        """
+        layout = self._site_layout()
+        inverters = allocation_result.get('inverters', []) if allocation_result else []
+        inv_to_dev = self._compact_device_index_map(inverters)
+        placements = {}
+
+        if self.cache is None or wiring_units is None:
+            part = self._wiring_partial(
+                range(len(self.groups)), range(sum(group_tracker_counts)), range(len(inverters)),
+                allocation_result, layout, inv_to_dev, whip_inputs)
+            self._merge_wiring(totals, placements, part)
+            return placements
+
+        group_starts = [0]
+        for count in group_tracker_counts:
+            group_starts.append(group_starts[-1] + count)
+
+        site_key = (
+            json.dumps(self.wire_sizing, sort_keys=True, default=str),
+            self.polarity_convention,
+            self.selected_module.width_mm,
+            layout['max_tracker_width_ft'],
+            tuple((p['x'], p['y'], p.get('width_ft', 10.0), p.get('height_ft', 8.0)) for p in self.pads),
+            tuple((spt, tuple(sizes)) for spt, sizes in whip_inputs['harness_sizes_by_spt'].items()),
+            whip_inputs['whips_active'],
+            whip_inputs['combine_active'],
+        )
+
+        # {(tracker_idx, inv_idx): [ns_leg, whip_point_override]} from the
+        # "tidx:inv_idx"-keyed whip-point dicts
+        point_overrides = {}
+        for slot, source in enumerate((self._whip_point_ns_legs, self._whip_point_overrides)):
+            for text, value in source.items():
+                tidx, _, inv_idx = str(text).partition(':')
+                try:
+                    pair = (int(tidx), int(inv_idx))
+                except ValueError:
+                    continue
+                if f"{pair[0]}:{pair[1]}" == text:
+                    point_overrides.setdefault(pair, [None, None])[slot] = value
+
+        for group_indices, inv_start, inv_end, unit_key in wiring_units:
+            tracker_indices = [tidx for gi in group_indices
+                               for tidx in range(group_starts[gi], group_starts[gi + 1])]
+            inv_indices = range(inv_start, inv_end)
+            devices = [inv_to_dev[i] for i in inv_indices if inv_to_dev[i] is not None]
+            key = self._wiring_key(unit_key, group_indices, tracker_indices, inv_indices, layout,
+                                   inv_to_dev, site_key, point_overrides)
+            local = self.cache.get(key) if key is not None else None
+            if local is not None:
+                part = _reindex_wiring(local, tracker_indices, inv_indices, group_indices)
+                # Re-apply any N-S step clamp the original calculation made
+                for dev_idx, step in zip(devices, local['ns_steps']):
+                    if self.device_ns_steps.get(dev_idx, 0) != step:
+                        self.device_ns_steps[dev_idx] = step
+            else:
+                part = self._wiring_partial(group_indices, tracker_indices, inv_indices,
+                                            allocation_result, layout, inv_to_dev, whip_inputs)
+                if key is not None:
+                    local = _reindex_wiring(
+                        part,
+                        {tidx: k for k, tidx in enumerate(tracker_indices)},
+                        {inv_idx: k for k, inv_idx in enumerate(inv_indices)},
+                        {gi: k for k, gi in enumerate(group_indices)})
+                    local['ns_steps'] = tuple(self.device_ns_steps.get(dev_idx, 0) for dev_idx in devices)
+                    self.cache.put(key, local)
+            self._merge_wiring(totals, placements, part)
+
+        return placements
+
+    def _merge_wiring(self, totals, placements, part):
+        """Add one unit's _wiring_partial() into the site totals."""
+        for name in _WIRING_BUCKETS:
+            bucket = totals[name]
+            for key, count in part[name].items():
+                bucket[key] += count
+        for name in _WIRING_DEVICE_BUCKETS:
+            if name not in part:
+                continue
+            per_device = totals.setdefault(name, {})
+            for inv_idx, counts in part[name].items():
+                device_counts = per_device.setdefault(inv_idx, {})
+                for key, count in counts.items():
+                    device_counts[key] = device_counts.get(key, 0) + count
+        totals['total_whip_length'] += part['total_whip_length']
+        for name in _COMBINE_WHIP_SUMS:
+            if name in part:
+                totals[name] = totals.get(name, 0) + part[name]
+        self._tracker_ns_to_device.update(part['ns_to_device'])
+        placements.update(part['placements'])
+
+    def calculate(self):
+        """Calculate the rolled-up BOM totals for the estimate.
+
+        Returns the `totals` dict (harness/whip/extender/feeder buckets,
+        inverter_summary, combiner details, etc.).
+
+        Raises:
+            EstimateValidationError: groups without row spacing, no inverter,
+                or no module available.
+        """
+        self._tracker_to_segment = []
+        self._split_tracker_details = {}
+        self._tracker_ns_to_device = {}
+        self._fingerprints = None
+        self.warnings = []
+        self.strings_per_device_defaulted = None
+
+        # Aggregated totals
+        totals = {
+            'combiners_by_breaker': defaultdict(int),
+            'combiner_details': [],
+            'string_inverters': 0,
+            'trackers_by_string': defaultdict(int),
+            'harnesses_by_size': defaultdict(int),
+            'inline_fuses_by_rating': defaultdict(int),
+            'whips_by_length': defaultdict(int),
+            # Per-polarity combined-whip buckets — populated only when the
+            # "combine extender + whip" setting is on (pos ≠ neg on offset trackers,
+            # so these cannot use the symmetric whips_by_length bucket).
+            'whips_pos_by_length': defaultdict(int),
+            'whips_neg_by_length': defaultdict(int),
+            'whips_pos_by_length_per_device': {},
+            'whips_neg_by_length_per_device': {},
+            'extenders_pos_by_length': defaultdict(int),
+            'extenders_neg_by_length': defaultdict(int),
+            'extenders_pos_by_length_per_device': {},
+            'extenders_neg_by_length_per_device': {},
+            'total_whip_length': 0,
+            'dc_feeder_total_ft': 0,
+            'dc_feeder_count': 0,
+            'ac_homerun_total_ft': 0,
+            'ac_homerun_count': 0,
+            # Trunk Bus items
+            'trunk_cable_by_size': defaultdict(float),
+            'lbd_by_size': defaultdict(int),
+            'ipc_by_tap': defaultdict(int),
+        }
+        
+        # Topology and strings-per-inverter (used throughout calculation)
+        topology = self.topology
+        
+        if topology == 'Central Inverter':
+            # For Central Inverter, allocation groups = CBs.
+            # Compute strings_per_cb from library BEFORE allocation runs.
+            _central_inv_breaker = self._compute_dc_breaker_size()
+            strings_per_inv = 0  # Will be set after we know module_isc
+        else:
+            strings_per_inv = self.strings_per_device
+        
+        # Validate — all groups must have row spacing set
+        unset_groups = [g.get('name', f'Group {i+1}') for i, g in enumerate(self.groups)
+                        if not (g.get('row_spacing_ft') is not None and g.get('row_spacing_ft') > 0)]
+        if unset_groups:
+            raise EstimateValidationError(
+                "Row Spacing Required",
+                "Row spacing is not set for the following group(s):\n\n" +
+                "\n".join(f"  • {n}" for n in unset_groups) +
+                "\n\nPlease enter a row spacing before calculating."
+            )
+
+        # Validate — inverter must be assigned
+        if not self.selected_inverter:
+            raise EstimateValidationError(
+                "No Inverter Selected",
+                "No inverter is assigned to this estimate.\n\n"
+                "Go to Equipment → Inverters, right-click an inverter, and assign it to this estimate."
+            )
+
+        # Validate — need at least one linked template or a legacy fallback module
+        lv_method = self.lv_method
+        if not self.selected_module:
+            raise EstimateValidationError(
+                "No Module Available",
+                "No tracker templates are linked and no legacy module data was found.\n\n"
+                "Please link a tracker template to at least one segment before calculating."
+            )
+        
+        # ==================== Build tracker sequence from groups ====================
+        modules_per_string = self.modules_per_string
+
+        tracker_sequence = []
+        total_all_trackers = 0
+        total_all_strings = 0
+        total_all_harnesses = 0
+        max_harness_strings = 0
+        self._tracker_to_segment = []
+        
+        # Track unique modules across all groups
+        unique_modules = {}  # "Manufacturer Model (WattageW)" -> module_spec_dict
+        
+        # Per-segment module data for geometry calculations
+        segment_module_data = []  # list of {module_spec_dict, modules_per_string, qty, spt}
+
+        # Per-group partial results (counts + local tracker layout); reused
+        # from the cache for groups whose inputs haven't changed.
+        fingerprints = (self._group_fingerprints() if self.cache is not None
+                        else [None] * len(self.groups))
+        group_partials = [self._group_partial(group, fingerprint=fp)
+                          for group, fp in zip(self.groups, fingerprints)]
+
+        for group_idx, (group, partial) in enumerate(zip(self.groups, group_partials)):
+            segments = group['segments']
+            device_position = group.get('device_position', 'middle')
+            tracker_sequence.extend(partial['sequence'])
+            for seg_idx in partial['tracker_segments']:
+                self._tracker_to_segment.append({
+                    'group_idx': group_idx,
+                    'seg': segments[seg_idx],
+                    'device_position': device_position,
+                })
+
+            total_all_trackers += partial['total_trackers']
+            total_all_strings += partial['total_strings']
+            total_all_harnesses += partial['total_harnesses']
+            max_harness_strings = max(max_harness_strings, partial['max_harness_strings'])
+            for spt, count in partial['trackers_by_string'].items():
+                totals['trackers_by_string'][spt] += count
+            for size, count in partial['harnesses_by_size'].items():
+                totals['harnesses_by_size'][size] += count
+            for rating, count in partial['inline_fuses_by_rating'].items():
+                totals['inline_fuses_by_rating'][rating] += count
+            for mod_key, seg_module in partial['unique_modules'].items():
+                if mod_key not in unique_modules:
+                    unique_modules[mod_key] = seg_module
+            segment_module_data.extend(partial['segment_module_data'])
+
+        # Build harness-count-per-spt lookup for whip calculation
+        harness_count_by_spt = {}
+        harness_sizes_by_spt = {}
+        for group in self.groups:
+            for seg in group['segments']:
+                spt = seg['strings_per_tracker']
+                if spt not in harness_count_by_spt:
+                    harness_sizes = self._get_harness_sizes(seg)
+                    harness_count_by_spt[spt] = len(harness_sizes)
+                    harness_sizes_by_spt[spt] = harness_sizes
+
+        # Build per-tracker harness sizes (indexed by global tracker index)
+        # This handles segments with same SPT but different harness configs
+        tracker_harness_sizes_list = []
+        for group in self.groups:
+            for seg in group['segments']:
+                harness_sizes = self._get_harness_sizes(seg)
+                for _ in range(seg['quantity']):
+                    tracker_harness_sizes_list.append(list(harness_sizes))
+
+        # Warn about unpaired partial strings
+        unpaired_warnings = []
+        for group in self.groups:
+            for seg in group['segments']:
+                seg_spt = seg['strings_per_tracker']
+                if seg_spt != int(seg_spt) and seg['quantity'] % 2 != 0:
+                    ref = seg.get('template_ref', 'Unlinked')
+                    unpaired_warnings.append(f"{group['name']}: {seg['quantity']}x {seg_spt}S has 1 unpaired half-string")
+        
+        if unpaired_warnings:
+            self.warnings.append((
+                "Unpaired Partial Strings",
+                "The following segments have an odd number of partial-string trackers, "
+                "leaving half-strings unpaired:\n\n" + "\n".join(unpaired_warnings)
+            ))
+
+        # ==================== Module geometry (primary module for global calcs) ====================
+        module_isc = self.selected_module.isc
+        nec_factor = self.nec_factor
+        module_width_mm = self.selected_module.width_mm
+        module_width_ft = module_width_mm / 304.8
+        string_length_ft = module_width_ft * modules_per_string
+
+        # ==================== Build spatial tracker entries ====================
+        tracker_entries = []
+        flat_idx = 0
+        auto_x_cursor = 0.0  # Running X for auto-layout
+
+        for group, partial in zip(self.groups, group_partials):
+            saved_x = group.get('position_x')
+            saved_y = group.get('position_y')
+
+            if saved_x is not None and saved_y is not None:
+                group_x = saved_x
+                group_y = saved_y
+            else:
+                # Auto-layout: stack groups left-to-right at y=0
+                group_x = auto_x_cursor
+                group_y = 0.0
+
+            grp_row_spacing = partial['row_spacing_ft']
+            for spt, local_x_offset, local_y_offset, t_length in partial['layout']:
+                tracker_entries.append({
+                    'original_idx': flat_idx,
+                    'spt': spt,
+                    'x': group_x + local_x_offset,
+                    'y': group_y + local_y_offset,
+                    'length_ft': t_length,
+                    'motor_y_ft': partial['motor_y_ft'],
+                    'row_spacing_ft': grp_row_spacing,
+                })
+                flat_idx += 1
+
+            group_width = len(partial['layout']) * grp_row_spacing
+            auto_x_cursor += group_width + grp_row_spacing * 2  # Extra gap between groups
+
+        # For Central Inverter, compute strings_per_cb from library now that we have module_isc
+        if topology == 'Central Inverter':
+            _ci_fuse_current = module_isc * nec_factor * max(max_harness_strings, 1)
+            _ci_fuse_rating = self.get_fuse_holder_category(_ci_fuse_current)
+            _ci_library = self.load_combiner_library()
+            _ci_matching = [
+                cb for cb in _ci_library.values()
+                if (cb.get('breaker_size', 0) == _central_inv_breaker and
+                    cb.get('fuse_holder_rating', '') == _ci_fuse_rating)
+            ]
+            if _ci_matching:
+                _ci_matching.sort(key=lambda c: c.get('max_inputs', 0), reverse=True)
+                _ci_max_inputs = _ci_matching[0].get('max_inputs', 24)
+            else:
+                _ci_max_inputs = 24
+            
+            # User's Strings/CB input is authoritative. The library max-inputs
+            # value is only used as a default when the field is empty — never
+            # as a cap on user input. If the user picks a number that no real
+            # CB part supports, the BOM will surface that as a "NO MATCH" row.
+            user_strings_per_cb = self.strings_per_device
+            if user_strings_per_cb > 0:
+                strings_per_inv = user_strings_per_cb
+            else:
+                # No user input — default to library max; the dialog writes
+                # this back into its Strings/CB field.
+                strings_per_inv = _ci_max_inputs
+                self.strings_per_device_defaulted = strings_per_inv
+
+        # ==================== Allocation ====================
+        allocation_result = None
+        # (group indices, first inverter, end inverter, allocation cache key)
+        # per standalone group / linked pool; None when the allocation isn't
+        # built per unit (locked or sequential), so wiring runs site-wide.
+        wiring_units = None
+
+        if self.selected_inverter and strings_per_inv > 0 and total_all_strings > 0:
+            if self.allocation_locked and self.locked_allocation_result is not None:
+                # Use the locked (frozen) allocation — skip spatial recalculation
+                allocation_result = self.locked_allocation_result
+                spatial_runs = allocation_result.get('spatial_runs', 1)
+            elif tracker_entries:
+                # Build per-group entry slices first so we can combine linked groups.
+                per_group_entries = []
+                flat_offset = 0
+                for group in self.groups:
+                    grp_count = sum(seg['quantity'] for seg in group['segments'])
+                    per_group_entries.append(tracker_entries[flat_offset:flat_offset + grp_count])
+                    flat_offset += grp_count
+
+                # Group indices by link_id; standalone groups each get their own bucket.
+                link_buckets = {}   # link_id -> [grp_idx, ...]
+                standalone = []     # [grp_idx, ...]
+                for gi, g in enumerate(self.groups):
+                    lid = g.get('link_id')
+                    if lid:
+                        link_buckets.setdefault(lid, []).append(gi)
+                    else:
+                        standalone.append(gi)
+
+                merged_inverters = []
+                num_spatial_runs = 0
+                units = []
+
+                # Allocate standalone groups individually.
+                for gi in standalone:
+                    g = self.groups[gi]
+                    grp_entries = per_group_entries[gi]
+                    grp_spi = g.get('strings_per_inv') or strings_per_inv
+                    grp_pitch = g.get('row_spacing_ft', 20.0) or 20.0
+                    inv_start = len(merged_inverters)
+                    unit_key = ('unallocated',)
+                    if grp_entries and grp_spi > 0:
+                        grp_result, unit_key = self._allocate_spatial(
+                            grp_entries, grp_spi, grp_pitch,
+                            force_single_row=False)
+                        merged_inverters.extend(grp_result.get('inverters', []))
+                        num_spatial_runs += grp_result.get('spatial_runs', 1)
+                    units.append(([gi], inv_start, len(merged_inverters), unit_key))
+
+                # Allocate linked groups together — one allocation per pool.
+                for lid, grp_indices in link_buckets.items():
+                    combined_entries = []
+                    for gi in grp_indices:
+                        combined_entries.extend(per_group_entries[gi])
+                    if not combined_entries:
+                        units.append((grp_indices, len(merged_inverters), len(merged_inverters),
+                                      ('unallocated',)))
+                        continue
+                    # Use the first linked group's strings_per_inv override, fall back to global.
+                    primary_g = self.groups[grp_indices[0]]
+                    pool_spi = primary_g.get('strings_per_inv') or strings_per_inv
+                    pool_pitch = primary_g.get('row_spacing_ft', 20.0) or 20.0
+                    inv_start = len(merged_inverters)
+                    pool_result, unit_key = self._allocate_spatial(
+                        combined_entries, pool_spi, pool_pitch,
+                        force_single_row=True)
+                    merged_inverters.extend(pool_result.get('inverters', []))
+                    num_spatial_runs += pool_result.get('spatial_runs', 1)
+                    units.append((grp_indices, inv_start, len(merged_inverters), unit_key))
+
+                if merged_inverters:
+                    # Build merged summary
+                    total_inv_strings = sum(inv['total_strings'] for inv in merged_inverters)
+                    split_tidxs = set()
+                    for inv in merged_inverters:
+                        for entry in inv.get('harness_map', []):
+                            if entry.get('is_split'):
+                                split_tidxs.add(entry['tracker_idx'])
+                    total_split = len(split_tidxs)
+                    inv_sizes = [inv['total_strings'] for inv in merged_inverters]
+                    allocation_result = {
+                        'inverters': merged_inverters,
+                        'spatial_runs': num_spatial_runs,
+                        'summary': {
+                            'total_inverters': len(merged_inverters),
+                            'total_strings': total_inv_strings,
+                            'total_trackers': len(tracker_entries),
+                            'total_split_trackers': total_split,
+                            'max_strings_per_inverter': max(inv_sizes) if inv_sizes else 0,
+                            'min_strings_per_inverter': min(inv_sizes) if inv_sizes else 0,
+                            'num_larger_inverters': 0,
+                            'num_smaller_inverters': 0,
+                            'tracker_type_counts': {},
+                        }
+                    }
+                    spatial_runs = num_spatial_runs
+                    wiring_units = units
+                else:
+                    allocation_result = allocate_strings_sequential(tracker_sequence, strings_per_inv)
+                    spatial_runs = 1
+
+            module_wattage = self.selected_module.wattage
+            # Use site-level DC:AC (total DC power / total AC capacity)
+            total_alloc_strings = allocation_result['summary']['total_strings']
+            total_alloc_invs = allocation_result['summary']['total_inverters']
+
+            # Sum modules and DC capacity per-module-type so multi-module projects
+            # don't apply a single mps/wattage across strings of different module types.
+            _total_modules_sum = 0
+            _total_dc_w = 0.0
+            for _grp in self.groups:
+                for _seg in _grp.get('segments', []):
+                    _ref = _seg.get('template_ref')
+                    _qty = _seg.get('quantity', 0)
+                    _spt = _seg.get('strings_per_tracker', 1)
+                    if not (_ref and _ref in self.enabled_templates and _qty > 0):
+                        continue
+                    _td = self.enabled_templates[_ref]
+                    _mps = _td.get('modules_per_string', 28)
+                    _w = _td.get('module_spec', {}).get('wattage', module_wattage)
+                    _full_spt = int(_spt)
+                    if _spt != _full_spt:
+                        _ss = _full_spt * _qty + (_qty // 2)
+                    else:
+                        _ss = _qty * _full_spt
+                    _seg_modules = _ss * _mps
+                    _total_modules_sum += _seg_modules
+                    _total_dc_w += _seg_modules * _w
+            total_dc_kw = _total_dc_w / 1000
+            total_ac_kw = 0.0
+
+            if topology == 'Central Inverter':
+                # For Central Inverter, allocation groups are CBs, not inverters.
+                # DC:AC uses the user-specified central inverter count.
+                central_inv_count = self.central_inv_count
+                total_ac_kw = central_inv_count * self.selected_inverter.rated_power_kw
+                actual_dc_ac = round(total_dc_kw / total_ac_kw, 3) if total_ac_kw > 0 else 0.0
+            else:
+                if total_alloc_invs > 0:
+                    total_ac_kw = total_alloc_invs * self.selected_inverter.rated_power_kw
+                    actual_dc_ac = round(total_dc_kw / total_ac_kw, 3)
+                else:
+                    actual_dc_ac = 0.0         
+
+            if topology == 'Central Inverter':
+                totals['string_inverters'] = self.central_inv_count
+            else:
+                totals['string_inverters'] = allocation_result['summary']['total_inverters']
+            # Recount split trackers by unique tracker_idx (avoids double-counting)
+            _split_tidxs = set()
+            for _inv in allocation_result.get('inverters', []):
+                for _entry in _inv.get('harness_map', []):
+                    if _entry.get('is_split'):
+                        _split_tidxs.add(_entry['tracker_idx'])
+            _true_split_count = len(_split_tidxs)
+            
+            totals['inverter_summary'] = {
+                'strings_per_inverter': strings_per_inv,
+                'total_inverters': allocation_result['summary']['total_inverters'],
+                'total_split_trackers': _true_split_count,
+                'total_strings': allocation_result['summary']['total_strings'],
+                'actual_dc_ac': actual_dc_ac,
+                'allocation_result': allocation_result,
+                'allocations': [],  # Backward compat
+                'central_inverter_count': self.central_inv_count if topology == 'Central Inverter' else 0,
+            }
+            totals['total_dc_kw'] = round(total_dc_kw, 2)
+            totals['total_ac_kw'] = round(total_ac_kw, 2)
+            totals['total_modules'] = _total_modules_sum
+
+            # For Central Inverter, update device/combiner count from allocation
+            # (allocation respects group boundaries, may differ from library estimate)
+            if topology == 'Central Inverter':
+                num_combiners = allocation_result['summary']['total_inverters']
+                num_devices = num_combiners
+
+        # ==================== Topology-driven device & combiner counting ===================
+
+        total_inverters_count = totals.get('inverter_summary', {}).get('total_inverters', 0)
+        num_devices = 0
+        num_combiners = 0
+        strings_per_cb = 0
+
+        # Breaker size derived from inverter MPPT
+        breaker_size = self._compute_dc_breaker_size()
+
+        if topology == 'Distributed String':
+            num_devices = total_inverters_count
+
+        elif topology == 'Centralized String':
+            num_devices = total_inverters_count
+            num_combiners = total_inverters_count
+            strings_per_cb = strings_per_inv
+
+        elif topology == 'Central Inverter':
+            if lv_method == 'Trunk Bus':
+                # Trunk Bus: allocation groups = LBDs, not combiner boxes.
+                # num_devices is still needed for DC feeder distance calc.
+                if totals.get('inverter_summary', {}).get('allocation_result'):
+                    num_devices = totals['inverter_summary']['allocation_result']['summary']['total_inverters']
+                # Do NOT populate combiners_by_breaker — no combiner boxes for Trunk Bus.
+            else:
+                # CB count from library: target breaker + fuse holder rating → max inputs
+                fuse_current = module_isc * nec_factor * max(max_harness_strings, 1)
+                fuse_holder_rating = self.get_fuse_holder_category(fuse_current)
+                combiner_library = self.load_combiner_library()
+
+                matching_cbs = [
+                    cb_data for cb_data in combiner_library.values()
+                    if (cb_data.get('breaker_size', 0) == breaker_size and
+                        cb_data.get('fuse_holder_rating', '') == fuse_holder_rating)
+                ]
+
+                if matching_cbs:
+                    matching_cbs.sort(key=lambda c: c.get('max_inputs', 0), reverse=True)
+                    max_inputs_per_cb = matching_cbs[0].get('max_inputs', 24)
+                else:
+                    max_inputs_per_cb = 24  # fallback
+
+                if total_all_strings > 0:
+                    num_combiners = math.ceil(total_all_strings / max_inputs_per_cb)
+                    strings_per_cb = math.ceil(total_all_strings / num_combiners)
+                # Allocation may produce more CBs due to group boundaries.
+                # Update num_combiners from allocation if available.
+                if totals.get('inverter_summary', {}).get('allocation_result'):
+                    num_combiners = totals['inverter_summary']['allocation_result']['summary']['total_inverters']
+                num_devices = num_combiners
+
+        # Preliminary combiner count (used for DC feeder/AC homerun distance calc)
+        # Actual CB part matching is done later via Device Configurator or fallback
+        # For Central Inverter, post-allocation block sets the authoritative count.
+        if num_combiners > 0 and topology != 'Central Inverter':
+            if breaker_size not in totals['combiners_by_breaker']:
+                totals['combiners_by_breaker'][breaker_size] = 0
+            totals['combiners_by_breaker'][breaker_size] += num_combiners
+
+        # ==================== Harness split adjustment ====================
+        # For now it's a no-op since allocations=[] above.
+        self._adjust_harnesses_for_splits(totals)
+
+        # Adjust inline fuse counts for split trackers to match harness adjustments
+        if lv_method == 'Wire Harness' and self._split_tracker_details:
+            _tsm = self._tracker_to_segment
+            for tidx, split_info in self._split_tracker_details.items():
+                _seg_module = None
+                if tidx < len(_tsm):
+                    _seg = _tsm[tidx].get('seg')
+                    if _seg:
+                        _ref = _seg.get('template_ref')
+                        if _ref and _ref in self.enabled_templates:
+                            _seg_module = self.enabled_templates[_ref].get('module_spec')
+                _fuse_rating = self._calc_inline_fuse_rating(_seg_module)
+                for size in split_info['original_config']:
+                    if size >= 2:
+                        totals['inline_fuses_by_rating'][_fuse_rating] -= size
+                for portion in split_info['portions']:
+                    for size in portion['harnesses']:
+                        if size >= 2:
+                            totals['inline_fuses_by_rating'][_fuse_rating] += size
+            # Clean up zero/negative entries
+            zero_keys = [r for r, v in totals['inline_fuses_by_rating'].items() if v <= 0]
+            for r in zero_keys:
+                del totals['inline_fuses_by_rating'][r]
+
+        # ==================== Trunk Bus calculation ====================
+        if lv_method == 'Trunk Bus' and allocation_result:
+            from src.utils.cable_sizing import recommend_trunk_cable_size, select_lbd_size
+            
+            for inv_data in allocation_result.get('inverters', []):
+                block_strings = inv_data['total_strings']
+                if block_strings <= 0:
+                    continue
+                
+                # Count trackers in this LBD block
+                block_tracker_indices = [ti for ti, _ in inv_data['tracker_indices']]
+                num_trackers_in_block = len(block_tracker_indices)
+                
+                # Trunk cable length = (trackers - 1) × row_spacing
+                if num_trackers_in_block > 1:
+                    # Get row_spacing from tracker_entries for this block's trackers
+                    block_row_spacings = []
+                    for tidx in block_tracker_indices:
+                        if tidx < len(tracker_entries):
+                            block_row_spacings.append(tracker_entries[tidx].get('row_spacing_ft', 20.0))
+                    avg_row_spacing = sum(block_row_spacings) / len(block_row_spacings) if block_row_spacings else 20.0
+                    trunk_length_ft = (num_trackers_in_block - 1) * avg_row_spacing
+                else:
+                    trunk_length_ft = 0.0
+                
+                # Auto-size trunk cable
+                trunk_cable_size = recommend_trunk_cable_size(
+                    block_strings, module_isc, nec_factor
+                )
+                totals['trunk_cable_by_size'][trunk_cable_size] += trunk_length_ft
+                
+                # Auto-size LBD
+                lbd_size = select_lbd_size(block_strings, module_isc, nec_factor)
+                totals['lbd_by_size'][lbd_size] += 1
+                
+                # Count IPCs: 1 per tracker per polarity (×2), grouped by tap count
+                for tidx, strings_taken in inv_data['tracker_indices']:
+                    # Determine tap count: use strings_taken from this tracker
+                    # Auto-select: ≤2 strings → 2-tap, ≤4 strings → 4-tap
+                    if strings_taken <= 2:
+                        tap_count = 2
+                    else:
+                        tap_count = 4
+                    totals['ipc_by_tap'][tap_count] += 2  # pos + neg
+
+        # "Combine extender + whip into single whip" — fold each harness's extender
+        # leg into its whip so the takeoff has no extender line items and longer whips.
+        # Only active where whips actually run (not Trunk Bus, has trackers + devices);
+        # otherwise extenders are left untouched so no footage is silently dropped.
+        combine = self.wire_sizing_settings.get('combine_extender_whip', False)
+        combine_active = (combine and lv_method != 'Trunk Bus'
+                          and total_all_trackers > 0 and num_devices > 0)
+        # Recorded so diagnostics can relax the whip/extender invariants this
+        # feature intentionally breaks (no extenders, whips longer than E-W span).
+        totals['_combine_extender_whip'] = combine_active
+
+        # ==================== Whips and extenders ====================
+        whip_inputs = {
+            'whips_active': lv_method != 'Trunk Bus' and total_all_trackers > 0 and num_devices > 0,
+            'combine_active': combine_active,
+            'num_devices': num_devices,
+            'harness_count_by_spt': harness_count_by_spt,
+            'harness_sizes_by_spt': harness_sizes_by_spt,
+            'tracker_harness_sizes': tracker_harness_sizes_list,
+        }
+        group_tracker_counts = [len(partial['sequence']) for partial in group_partials]
+        device_placements = self._calculate_wiring(
+            totals, allocation_result, wiring_units, group_tracker_counts, whip_inputs)
+
+        # Clean up any zero-count entries left by whip-point override adjustments
+        if self._tracker_ns_to_device and not combine_active:
+            for key_dict in [totals['extenders_pos_by_length'], totals['extenders_neg_by_length']]:
+                zero_keys = [k for k, v in key_dict.items() if v <= 0]
+                for k in zero_keys:
+                    del key_dict[k]
+
+        # ==================== DC Feeder and AC Homerun ====================
+        # DC feeder avg is 0 when no pads exist (routed distances will be used when pads present)
+        dc_feeder_avg_ft = 0.0
+        ac_homerun_avg_ft = self.ac_homerun_distance
+
+        total_inverters = totals.get('inverter_summary', {}).get('total_inverters', 0)
+        total_combiners = sum(totals['combiners_by_breaker'].values())
+
+        # Default feeder size for devices without a per-device override
+        if topology == 'Distributed String':
+            default_feeder_size = self.wire_sizing.get('ac_homerun', '') or '4/0 AWG'
+        else:
+            default_feeder_size = self.wire_sizing.get('dc_feeder', '') or '4/0 AWG'
+
+        use_routed = bool(self.pads)
+
+        # Build per-device distance list: [(dev_idx, label, distance_ft), ...]
+        per_device_distances = []
+        
+        if use_routed and self.pads and allocation_result:
+            try:
+                routed = self.calculate_routed_feeder_distances(
+                    allocation_result, topology, min((g.get('row_spacing_ft', 20.0) for g in self.groups), default=20.0),
+                    device_positions=device_placements
+                )
+            except Exception as e:
+                print(f"[Routed distance error] {e}")
+                import traceback
+                traceback.print_exc()
+                routed = {'feeder_distances': [], 'feeder_total_ft': 0, 'feeder_count': 0}
+            
+            per_device_distances = routed['feeder_distances']  # already (dev_idx, label, ft)
+            totals['routed_feeder_details'] = routed['feeder_distances']
+        else:
+            # Build per-device using average distance
+            if topology == 'Distributed String':
+                num_feeders = total_inverters
+                avg_ft = ac_homerun_avg_ft
+            else:
+                num_feeders = total_combiners
+                avg_ft = dc_feeder_avg_ft
+            per_device_distances = [(i, f"Dev-{i+1:02d}", avg_ft) for i in range(num_feeders)]
+        
+        # Group primary device-to-pad cable by (per-device feeder size, parallel count)
+        # - 'count'       = number of physical runs (devices)
+        # - 'distance_ft' = sum of raw run distances (not multiplied) — used for avg display
+        # - 'total_ft'    = distance_ft × parallel_count (actual cable footage needed)
+        if topology == 'Distributed String':
+            parallel_count = max(1, self.wire_sizing.get('ac_homerun_parallel', 1))
+        else:
+            parallel_count = max(1, self.wire_sizing.get('dc_feeder_parallel', 1))
+
+        feeders_by_size = defaultdict(lambda: {'count': 0, 'distance_ft': 0.0, 'total_ft': 0.0})
+        for dev_idx, label, dist_ft in per_device_distances:
+            size = self.device_feeder_sizes.get(dev_idx, default_feeder_size)
+            key = (size, parallel_count)
+            feeders_by_size[key]['count'] += 1
+            feeders_by_size[key]['distance_ft'] += dist_ft
+            feeders_by_size[key]['total_ft'] += dist_ft * parallel_count
+        
+        totals['feeders_by_size'] = dict(feeders_by_size)
+        
+        # Aggregate totals (backward compat) — total_feeder_ft reflects parallel-multiplied cable
+        total_feeder_ft = sum(v['total_ft'] for v in feeders_by_size.values())
+        total_feeder_count = sum(v['count'] for v in feeders_by_size.values())
+        
+        if topology == 'Distributed String':
+            totals['dc_feeder_count'] = 0
+            totals['dc_feeder_total_ft'] = 0
+            totals['ac_homerun_count'] = total_feeder_count
+            totals['ac_homerun_total_ft'] = total_feeder_ft
+        elif topology == 'Centralized String':
+            totals['dc_feeder_count'] = total_feeder_count
+            totals['dc_feeder_total_ft'] = total_feeder_ft
+            totals['ac_homerun_count'] = total_inverters
+            totals['ac_homerun_total_ft'] = total_inverters * ac_homerun_avg_ft
+        elif topology == 'Central Inverter':
+            totals['dc_feeder_count'] = total_feeder_count
+            totals['dc_feeder_total_ft'] = total_feeder_ft
+            central_inv_count = self.central_inv_count
+            totals['central_inverter_count'] = central_inv_count
+            skids = self.skids if self.skids is not None else central_inv_count
+            totals['ac_homerun_count'] = skids
+            totals['ac_homerun_total_ft'] = skids * ac_homerun_avg_ft
+
+        # ==================== Display Results ====================
+        
+        total_inverters = totals.get('inverter_summary', {}).get('total_inverters', 0)
+        total_combiners = sum(totals['combiners_by_breaker'].values())
+
+        # Stash display context into totals so _redraw_results_tree has everything
+        totals['_display'] = {
+            'topology': topology,
+            'use_routed': use_routed,
+            'dc_feeder_avg_ft': dc_feeder_avg_ft,
+            'ac_homerun_avg_ft': ac_homerun_avg_ft,
+        }
+        totals['unique_modules'] = unique_modules
+        totals['segment_module_data'] = segment_module_data
+        totals['has_first_solar'] = any(
+            'first solar' in (m.get('manufacturer', '') or '').lower()
+            for m in unique_modules.values()
+        )
+
+        # Combiner / string-inverter assignments: preserve if allocation is locked
+        # (user edited devices), otherwise rebuild from scratch with correct
+        # positions. For Trunk Bus, still build assignments (used for device
+        # positions/labels) but they represent LBDs, not combiner boxes.
+        if not (self.allocation_locked and self.last_combiner_assignments):
+            self._build_combiner_assignments(totals, topology)
+
+        # Combiner BOM from the assignments. Skip Trunk Bus — LBDs are handled
+        # separately. The dialog may replace this with the Device Configurator's
+        # view afterwards (user breaker/fuse overrides).
+        if lv_method != 'Trunk Bus':
+            self._rebuild_combiner_totals_from_assignments(totals)
+
+        # Voltage drop and I²R loss of every cable run, per device and site-wide
+        totals['cable_losses'] = loss_totals(
+            cable_losses(estimate_cable_runs(self, totals)),
+            dc_power_w=totals.get('total_dc_kw', 0) * 1000.0)
+
+        if self.cache is not None:
+            self.cache.prune()
+
+        return totals
+
+    def _build_combiner_assignments(self, totals, topology):
+        """Build structured combiner box assignments for Device Configurator.
+        
+        Produces self.last_combiner_assignments — a list of dicts, one per CB,
+        each containing the tracker/harness connections that feed it.
+        
+        For Centralized String: 1 CB per inverter, connections from allocation harness_map.
+        For Central Inverter: distribute trackers proportionally across N combiners.
+        For Distributed String: no CBs — returns empty list.
+        """
+        self.last_combiner_assignments = []
+        self.last_si_assignments = []
+
+        if topology == 'Distributed String':
+            self._build_si_assignments(totals)
+            return
+        
+        inv_summary = totals.get('inverter_summary', {})
+        allocation_result = inv_summary.get('allocation_result')
+        module_isc = self.selected_module.isc if self.selected_module else 0
+
+        nec_factor = self.nec_factor
+        
+        # Standard breaker sizes for per-CB calculation
+        BREAKER_SIZES = [100, 125, 150, 175, 200, 225, 250, 300, 350, 400, 450, 500, 600, 700, 800]
+        
+        # Build flat tracker list with segment metadata for harness config lookup
+        tracker_segment_map = []  # flat list: one entry per tracker with its segment ref
+        for group in self.groups:
+            for seg in group['segments']:
+                harness_sizes = self._get_harness_sizes(seg)
+                for _ in range(seg['quantity']):
+                    tracker_segment_map.append({
+                        'spt': seg['strings_per_tracker'],
+                        'harness_sizes': list(harness_sizes),
+                        'wire_gauge': self._get_wire_gauge_for_segment(seg, 'whip'),
+                    })
+        
+        if topology == 'Centralized String' and allocation_result:
+            # 1 CB per inverter — connections directly from allocation harness_map
+            for inv_idx, inv in enumerate(allocation_result['inverters']):
+                cb_name = self.device_names.get(inv_idx, f"CB-{inv_idx + 1:02d}")
+                connections = self._build_connections_from_harness_map(
+                    inv['harness_map'], tracker_segment_map, module_isc, nec_factor
+                )
+                # Calculate per-CB breaker from actual total current
+                total_current = sum(
+                    c['num_strings'] * c['module_isc'] * c['nec_factor']
+                    for c in connections
+                )
+                calc_breaker = 400  # fallback
+                for bs in BREAKER_SIZES:
+                    if bs >= total_current:
+                        calc_breaker = bs
+                        break
+                
+                self.last_combiner_assignments.append({
+                    'combiner_name': cb_name,
+                    'device_idx': inv_idx,
+                    'breaker_size': calc_breaker,
+                    'module_isc': module_isc,
+                    'nec_factor': nec_factor,
+                    'connections': connections,
+                })
+        
+        elif topology == 'Central Inverter' and allocation_result:
+            # Central Inverter: allocation groups = CBs (or LBDs for Trunk Bus).
+            # Use allocation harness_map (same approach as Centralized String).
+            _dev_prefix = 'LBD' if self.lv_method == 'Trunk Bus' else 'CB'
+            for inv_idx, inv in enumerate(allocation_result['inverters']):
+                cb_name = self.device_names.get(inv_idx, f"{_dev_prefix}-{inv_idx + 1:02d}")
+                connections = self._build_connections_from_harness_map(
+                    inv['harness_map'], tracker_segment_map, module_isc, nec_factor
+                )
+                # Calculate per-CB breaker from actual total current
+                total_current = sum(
+                    c['num_strings'] * c['module_isc'] * c['nec_factor']
+                    for c in connections
+                )
+                calc_breaker = 400  # fallback
+                for bs in BREAKER_SIZES:
+                    if bs >= total_current:
+                        calc_breaker = bs
+                        break
+                
+                self.last_combiner_assignments.append({
+                    'combiner_name': cb_name,
+                    'device_idx': inv_idx,
+                    'breaker_size': calc_breaker,
+                    'module_isc': module_isc,
+                    'nec_factor': nec_factor,
+                    'connections': connections,
+                })
+
+    def _build_si_assignments(self, totals):
+        """Build self.last_si_assignments for Distributed String topology.
+
+        Mirrors _build_combiner_assignments but produces one entry per string
+        inverter rather than per combiner box. Each entry carries the same
+        tracker/harness connection list format used by the Device Configurator.
+        """
+        self.last_si_assignments = []
+
+        inv_summary = totals.get('inverter_summary', {})
+        allocation_result = inv_summary.get('allocation_result')
+        if not allocation_result:
+            return
+
+        module_isc = self.selected_module.isc if self.selected_module else 0
+
+        nec_factor = self.nec_factor
+
+        # Build flat tracker list for harness config / wire gauge lookup
+        tracker_segment_map = []
+        for group in self.groups:
+            for seg in group['segments']:
+                harness_sizes = self._get_harness_sizes(seg)
+                for _ in range(seg['quantity']):
+                    tracker_segment_map.append({
+                        'spt': seg['strings_per_tracker'],
+                        'harness_sizes': list(harness_sizes),
+                        'wire_gauge': self._get_wire_gauge_for_segment(seg, 'whip'),
+                    })
+
+        for inv_idx, inv in enumerate(allocation_result.get('inverters', [])):
+            inv_name = self.device_names.get(inv_idx, f"SI-{inv_idx + 1:02d}")
+            connections = self._build_connections_from_harness_map(
+                inv['harness_map'], tracker_segment_map, module_isc, nec_factor
+            )
+            self.last_si_assignments.append({
+                'inverter_name': inv_name,
+                'device_idx': inv_idx,
+                'module_isc': module_isc,
+                'nec_factor': nec_factor,
+                'inverter_spec': self.selected_inverter,
+                'connections': connections,
+            })
+
+    def _build_connections_from_harness_map(self, harness_map, tracker_segment_map, module_isc, nec_factor):
+        """Convert an allocation harness_map into Device Configurator connection dicts."""
+        connections = []
+        
+        # Group harness_map entries by tracker to assign harness labels
+        tracker_harness_counter = {}  # tracker_idx -> next harness number
+        
+        for entry in harness_map:
+            tidx = entry['tracker_idx']
+            strings_taken = entry['strings_taken']
+            spt = entry['strings_per_tracker']
+            is_split = entry.get('is_split', False)
+            
+            # Get segment info for this tracker
+            t_info = tracker_segment_map[tidx] if tidx < len(tracker_segment_map) else None
+            wire_gauge = t_info['wire_gauge'] if t_info else '10 AWG'
+            original_harnesses = t_info['harness_sizes'] if t_info else [spt]
+
+            if not is_split:
+                # Full tracker — one connection per harness in the config
+                pos_cursor = 0
+                for h_idx, h_size in enumerate(original_harnesses):
+                    connections.append({
+                        'tracker_idx': tidx,
+                        'tracker_label': f"T{tidx + 1:02d}",
+                        'harness_label': f"H{h_idx + 1:02d}",
+                        'num_strings': h_size,
+                        'start_string_pos': pos_cursor,
+                        'module_isc': module_isc,
+                        'nec_factor': nec_factor,
+                        'wire_gauge': self.get_wire_size_for('whip', h_size),
+                    })
+                    pos_cursor += h_size
+            else:
+                # Split tracker — distribute strings_taken across harnesses
+                remaining = strings_taken
+                harness_cursor = tracker_harness_counter.get(tidx, 0)
+                # Compute physical start position from split_position.
+                # Head starts at 0, tail starts at (spt - strings_taken).
+                # This is correct for fresh allocations where splits are always head/tail.
+                split_pos = entry.get('split_position', 'head')
+                if split_pos == 'tail':
+                    pos_cursor = spt - strings_taken
+                else:
+                    pos_cursor = 0
+                
+                while remaining > 0 and harness_cursor < len(original_harnesses):
+                    h_size = original_harnesses[harness_cursor]
+                    take = min(remaining, h_size)
+                    connections.append({
+                        'tracker_idx': tidx,
+                        'tracker_label': f"T{tidx + 1:02d}",
+                        'harness_label': f"H{harness_cursor + 1:02d}",
+                        'num_strings': take,
+                        'start_string_pos': pos_cursor,
+                        'module_isc': module_isc,
+                        'nec_factor': nec_factor,
+                        'wire_gauge': self.get_wire_size_for('whip', take),
+                    })
+                    pos_cursor += take
+                    remaining -= take
+                    if take >= h_size:
+                        harness_cursor += 1
+                
+                tracker_harness_counter[tidx] = harness_cursor
+        
+        return connections
+
+    def _get_wire_gauge_for_segment(self, seg, cable_type):
+        """Get the wire gauge for a segment from the wire sizing table."""
+        spt = seg.get('strings_per_tracker', 1)
+        harness_sizes = self._get_harness_sizes(seg)
+        max_harness = max(harness_sizes) if harness_sizes else spt
+        
+        # Look up from self.wire_sizing
+        if self.wire_sizing:
+            # Wire sizing is keyed by string count
+            sizing = self.wire_sizing.get(str(max_harness)) or self.wire_sizing.get(str(spt))
+            if sizing and cable_type in sizing:
+                return sizing[cable_type]
+        
+        return '10 AWG'
+
+    def _rebuild_combiner_totals_from_assignments(self, totals):
+        """Rebuild combiner BOM totals from last_combiner_assignments.
+
+        Replaces totals['combiners_by_breaker'] and ['combiner_details'] in place.
+        This is the headless combiner BOM; the dialog overrides it with the
+        Device Configurator's configs when that is available and in QE mode.
+        """
+        totals['combiners_by_breaker'] = {}
+        totals['combiner_details'] = []
+        
+        module_isc = self.selected_module.isc if self.selected_module else 0
+        nec_factor = self.nec_factor
+        
+        for cb in self.last_combiner_assignments:
+            bs = cb['breaker_size']
+            if bs not in totals['combiners_by_breaker']:
+                totals['combiners_by_breaker'][bs] = 0
+            totals['combiners_by_breaker'][bs] += 1
+        
+        for bs, qty in totals['combiners_by_breaker'].items():
+            max_h_strings = 1
+            max_inputs = 0
+            for cb in self.last_combiner_assignments:
+                if cb['breaker_size'] == bs:
+                    num_inputs = len(cb['connections'])
+                    max_inputs = max(max_inputs, num_inputs)
+                    for conn in cb['connections']:
+                        max_h_strings = max(max_h_strings, conn['num_strings'])
+            
+            fuse_current = module_isc * nec_factor * max_h_strings
+            fuse_holder_rating = self.get_fuse_holder_category(fuse_current)
+            
+            matched_cb = self.find_combiner_box(max_inputs, bs, fuse_holder_rating)
+            if matched_cb:
+                totals['combiner_details'].append({
+                    'part_number': matched_cb.get('part_number', ''),
+                    'description': matched_cb.get('description', ''),
+                    'max_inputs': matched_cb.get('max_inputs', 0),
+                    'breaker_size': bs,
+                    'fuse_holder_rating': fuse_holder_rating,
+                    'strings_per_cb': max_inputs,
+                    'quantity': qty,
+                    'block_name': 'Site Total'
+                })
+            else:
+                totals['combiner_details'].append({
+                    'part_number': 'NO MATCH',
+                    'description': f'No CB found: {max_inputs} inputs, {bs}A, {fuse_holder_rating}',
+                    'max_inputs': max_inputs,
+                    'breaker_size': bs,
+                    'fuse_holder_rating': fuse_holder_rating,
+                    'strings_per_cb': max_inputs,
+                    'quantity': qty,
+                    'block_name': 'Site Total'
+                })
@@ -0,0 +1,171 @@
+"""Write-only Excel output for the large BOM sheets.
+
+openpyxl's normal mode keeps a Cell object (and a copy of its style array)
+for every cell until the workbook is saved, so a Block Details sheet with tens
+of thousands of rows costs hundreds of MB and most of the export time goes to
+looking up the same Font/Fill/Border objects cell after cell. Write-only mode
+streams each row to a temp file as it is appended, but every sheet of the
+workbook has to be written that way and in order.
+
+The exporters therefore build the small sheets (project info, summary,
+combiner boxes, ...) in an ordinary Workbook as before, leave an empty
+placeholder where a big sheet goes, and call save_with_streamed_sheets().
+That copies the small sheets into a write-only workbook and lets a callback
+append the big sheet's rows straight into its placeholder's position.
+
+Cell formatting goes through the named styles in BOM_STYLES, so each streamed
+cell carries one style reference instead of four separate style objects.
+"""
+
+from copy import copy
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+CURRENCY_FORMAT = '"$"#,##0.00'
+
+_THIN = Side(style='thin')
+THIN_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+
+def solid_fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+_CENTER = Alignment(horizontal='center', vertical='center')
+_LEFT = Alignment(horizontal='left', vertical='center')
+_WRAP = Alignment(horizontal='left', vertical='center', wrap_text=True)
+_RIGHT = Alignment(horizontal='right')
+_WARNING_FILL = solid_fill("FFCCCC")
+
+# name -> NamedStyle keyword arguments. Styles without a font or border of
+# their own keep the workbook defaults, as cells styled one attribute at a
+# time did.
+BOM_STYLES = {
+    # Column headers (white on blue) and section rows of the BOM tables
+    'BOM Header': dict(font=Font(bold=True, color="FFFFFF", size=11), fill=solid_fill("4F81BD"),
+                       border=THIN_BORDER, alignment=_CENTER),
+    'BOM Section': dict(font=Font(bold=True, size=11), fill=solid_fill("D9E2F3"),
+                        border=THIN_BORDER, alignment=_CENTER),
+    'BOM Section Label': dict(font=Font(bold=True, size=11), fill=solid_fill("D9E2F3"),
+                              border=THIN_BORDER, alignment=_LEFT),
+    'BOM Section Price': dict(font=Font(bold=True, size=11), fill=solid_fill("D9E2F3"),
+                              border=THIN_BORDER, alignment=_RIGHT),
+    # Data cells
+    'BOM Cell': dict(border=THIN_BORDER, alignment=_CENTER),
+    'BOM Cell Left': dict(border=THIN_BORDER, alignment=_LEFT),
+    'BOM Cell Wrap': dict(border=THIN_BORDER, alignment=_WRAP),
+    'BOM Price': dict(border=THIN_BORDER, alignment=_RIGHT, number_format=CURRENCY_FORMAT),
+    # Price cells of lines without a part number
+    'BOM Price Blackout': dict(border=THIN_BORDER, alignment=_RIGHT, fill=solid_fill("000000")),
+    # Titles, per-device group headers and the grey sub-table headers
+    'BOM Title': dict(font=Font(bold=True, size=14)),
+    'BOM Summary Title': dict(font=Font(bold=True, size=14), fill=solid_fill("FFF2CC")),
+    'BOM Group': dict(font=Font(bold=True, size=11), fill=solid_fill("D9E2F3")),
+    'BOM Bold': dict(font=Font(bold=True, size=11)),
+    'BOM Note Title': dict(font=Font(bold=True, size=12)),
+    'BOM Subheader': dict(font=Font(bold=True), fill=solid_fill("E0E0E0"), border=THIN_BORDER),
+    'BOM Bordered': dict(border=THIN_BORDER),
+    'BOM Custom': dict(border=THIN_BORDER, fill=solid_fill("FFFFCC")),
+}
+# Rows whose unit carries a warning keep their alignment but turn light red
+for _name in ('BOM Cell', 'BOM Cell Wrap', 'BOM Price'):
+    BOM_STYLES[f'{_name} Warning'] = dict(BOM_STYLES[_name], fill=_WARNING_FILL)
+del _name
+
+
+def add_named_styles(workbook, names=None):
+    """Register BOM_STYLES (or just `names`) on workbook, skipping ones already there."""
+    existing = set(workbook.named_styles)
+    for name in names or BOM_STYLES:
+        if name not in existing:
+            spec = dict(BOM_STYLES[name])
+            spec.setdefault('font', copy(DEFAULT_FONT))
+            spec.setdefault('border', copy(DEFAULT_BORDER))
+            workbook.add_named_style(NamedStyle(name=name, **spec))
+
+
+def styled_row(ws, values, styles):
+    """One row for a write-only sheet.
+
+    styles is a single style name for the whole row or one name per value;
+    None leaves a cell unstyled. Unstyled None values are skipped entirely.
+    """
+    if styles is None or isinstance(styles, str):
+        styles = [styles] * len(values)
+    row = []
+    for value, style in zip(values, styles):
+        if style is None:
+            row.append(value)
+            continue
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        row.append(cell)
+    return row
+
+
+def copy_sheet(source, target):
+    """Copy an in-memory worksheet into an empty write-only worksheet.
+
+    Carries over values, cell styles, merged ranges, column widths, the
+    frozen pane and the auto-filter; that's everything the BOM exporters set.
+    """
+    for key, dim in source.column_dimensions.items():
+        target.column_dimensions[key].width = dim.width
+        target.column_dimensions[key].bestFit = dim.bestFit
+        target.column_dimensions[key].hidden = dim.hidden
+    target.freeze_panes = source.freeze_panes
+    # Style ids differ between the two workbooks; translate each distinct
+    # source style once and reuse the result for every cell that shares it
+    translated = {}
+    for row in source.iter_rows():
+        values = []
+        for cell in row:
+            if not cell.has_style:
+                values.append(cell.value)
+                continue
+            out = WriteOnlyCell(target, value=cell.value)
+            key = tuple(cell._style)
+            if key in translated:
+                out._style = copy(translated[key])
+            else:
+                if cell.style in BOM_STYLES:
+                    out.style = cell.style
+                out.font = copy(cell.font)
+                out.fill = copy(cell.fill)
+                out.border = copy(cell.border)
+                out.alignment = copy(cell.alignment)
+                out.number_format = cell.number_format
+                out.protection = copy(cell.protection)
+                translated[key] = copy(out._style)
+            values.append(out)
+        target.append(values)
+    for merged in source.merged_cells.ranges:
+        target.merged_cells.add(merged.coord)
+    target.auto_filter.ref = source.auto_filter.ref
+
+
+def save_with_streamed_sheets(workbook, filepath, streamed):
+    """Save workbook to filepath, writing some of its sheets in write-only mode.
+
+    Args:
+        workbook: in-memory Workbook holding every sheet in its final order;
+            the sheets named in `streamed` are empty placeholders
+        filepath: destination .xlsx path
+        streamed: {sheet title: write(ws)}; each callback receives a fresh
+            write-only worksheet, sets its column widths and merges, then
+            appends its rows from the top
+    """
+    out = Workbook(write_only=True)
+    add_named_styles(out)
+    for source in workbook.worksheets:
+        target = out.create_sheet(source.title)
+        write = streamed.get(source.title)
+        if write is not None:
+            write(target)
+        else:
+            copy_sheet(source, target)
+    out.save(filepath)
@@ -1,9 +1,72 @@
+import argparse
+import hashlib
 import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw, ImageFont
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Set
 from pathlib import Path
 
+from .render_cache import atomic_path, source_fingerprint
+
+# Sidecar in the output folder: {part_number: {'hash': spec hash, 'file': png name}}
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def harness_spec_hash(harness_spec: Dict[str, Any]) -> str:
+    """Hash of everything a harness drawing depends on, this module's source included"""
+    payload = json.dumps({'code': source_fingerprint(__file__), 'spec': harness_spec},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_manifest(output_dir: str) -> Dict[str, Dict[str, str]]:
+    """Read the drawing manifest in output_dir ({} if missing or unreadable)"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILENAME), 'r') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: str, manifest: Dict[str, Dict[str, str]]):
+    """Write the drawing manifest atomically"""
+    os.makedirs(output_dir, exist_ok=True)
+    with atomic_path(os.path.join(output_dir, MANIFEST_FILENAME)) as tmp_path:
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def drawing_filename(part_number: str) -> str:
+    return f"{part_number}_harness_drawing.png"
+
+
+def part_numbers_from_bom(bom_path: str) -> Set[str]:
+    """Every value under a 'Part Number' header in any sheet of an exported BOM workbook"""
+    from openpyxl import load_workbook
+
+    part_numbers = set()
+    workbook = load_workbook(bom_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            column = None
+            for row in sheet.iter_rows(values_only=True):
+                if column is None:
+                    # Header row can sit below a title block; look for it first
+                    for idx, value in enumerate(row):
+                        if isinstance(value, str) and value.strip() == 'Part Number':
+                            column = idx
+                            break
+                    continue
+                if column < len(row) and row[column] not in (None, ''):
+                    part_numbers.add(str(row[column]).strip())
+    finally:
+        workbook.close()
+    return part_numbers
+
+
 class HarnessDrawingGenerator:
     """Generator for harness technical drawings"""
     
@@ -79,6 +142,17 @@ class HarnessDrawingGenerator:
     
     def generate_harness_drawing(self, part_number: str, output_dir: str = 'harness_drawings') -> bool:
         """Generate a technical drawing for a specific harness part number"""
+        if not self._render_drawing(part_number, output_dir):
+            return False
+        # Keep the manifest in step so an incremental run doesn't skip this part
+        manifest = load_manifest(output_dir)
+        manifest[part_number] = {'hash': harness_spec_hash(self.harness_library[part_number]),
+                                 'file': drawing_filename(part_number)}
+        save_manifest(output_dir, manifest)
+        return True
+
+    def _render_drawing(self, part_number: str, output_dir: str) -> bool:
+        """Draw and save one PNG; no manifest bookkeeping"""
         if part_number not in self.harness_library:
             print(f"Error: Part number {part_number} not found in harness library")
             return False
@@ -102,7 +176,7 @@ class HarnessDrawingGenerator:
         self.draw_title_block(draw, harness_spec)
         
         # Save the image
-        filename = f"{part_number}_harness_drawing.png"
+        filename = drawing_filename(part_number)
         filepath = os.path.join(output_dir, filename)
         
         try:
@@ -417,16 +491,60 @@ class HarnessDrawingGenerator:
         polarity_x = (self.canvas_width - polarity_width) // 2
         draw.text((polarity_x, 55), polarity_text, fill=polarity_color, font=self.label_font)
     
-    def generate_all_harness_drawings(self, output_dir: str = 'harness_drawings') -> int:
-        """Generate drawings for all harnesses in the library"""
-        success_count = 0
-        
-        for part_number in self.harness_library.keys():
-            if self.generate_harness_drawing(part_number, output_dir):
-                success_count += 1
-        
-        print(f"Generated {success_count} harness drawings in {output_dir}/")
+    def generate_all_harness_drawings(self, output_dir: str = 'harness_drawings',
+                                      part_numbers: Optional[Iterable[str]] = None,
+                                      incremental: bool = False, workers: int = 1) -> int:
+        """Generate drawings for all harnesses in the library.
+
+        part_numbers limits the run to those parts (library keys or ATPI part
+        numbers). With incremental=True, parts whose spec hash matches the
+        manifest in output_dir and whose PNG exists are left alone. workers > 1
+        draws in a process pool. Returns the number of parts whose drawing is
+        now current (drawn or already up to date).
+        """
+        selected = self.resolve_part_numbers(part_numbers) if part_numbers is not None \
+            else list(self.harness_library.keys())
+
+        manifest = load_manifest(output_dir)
+        hashes = {pn: harness_spec_hash(self.harness_library[pn]) for pn in selected}
+        todo = selected
+        if incremental:
+            todo = [pn for pn in selected
+                    if manifest.get(pn, {}).get('hash') != hashes[pn]
+                    or not os.path.exists(os.path.join(output_dir, drawing_filename(pn)))]
+        skipped = len(selected) - len(todo)
+
+        n_workers = max(1, min(workers, len(todo)))
+        if n_workers > 1:
+            os.makedirs(output_dir, exist_ok=True)
+            jobs = [(pn, self.harness_library[pn], output_dir) for pn in todo]
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_drawing_worker,
+                                     initargs=(self.harness_library_path,)) as pool:
+                results = list(pool.map(_draw_in_worker, jobs))
+        else:
+            results = [self._render_drawing(pn, output_dir) for pn in todo]
+
+        drawn = [pn for pn, ok in zip(todo, results) if ok]
+        for pn in drawn:
+            manifest[pn] = {'hash': hashes[pn], 'file': drawing_filename(pn)}
+        if drawn:
+            save_manifest(output_dir, manifest)
+
+        success_count = len(drawn) + skipped
+        print(f"Generated {len(drawn)} harness drawings in {output_dir}/"
+              + (f" ({skipped} already up to date)" if skipped else ""))
         return success_count
+
+    def resolve_part_numbers(self, part_numbers: Iterable[str]) -> list:
+        """Library keys for the given part numbers, matching keys or ATPI part numbers"""
+        by_atpi = {spec.get('atpi_part_number'): pn for pn, spec in self.harness_library.items()
+                   if spec.get('atpi_part_number')}
+        resolved = []
+        for part_number in part_numbers:
+            key = part_number if part_number in self.harness_library else by_atpi.get(part_number)
+            if key and key not in resolved:
+                resolved.append(key)
+        return resolved
     
     def get_available_harnesses(self) -> Dict[str, str]:
         """Get list of available harnesses with descriptions"""
@@ -435,4 +553,57 @@ class HarnessDrawingGenerator:
             # Double-check that spec is a dictionary
             if isinstance(spec, dict):
                 available[part_num] = spec.get('description', 'No description')
-        return available
\ No newline at end of file
+        return available
+
+
+_worker_generator = None
+
+
+def _init_drawing_worker(harness_library_path):
+    """Process pool initializer: one generator (fonts loaded once) per worker"""
+    global _worker_generator
+    _worker_generator = HarnessDrawingGenerator(harness_library_path)
+
+
+def _draw_in_worker(job) -> bool:
+    part_number, harness_spec, output_dir = job
+    # Use the parent's spec, which may hold edits not yet saved to the library file
+    _worker_generator.harness_library[part_number] = harness_spec
+    return _worker_generator._render_drawing(part_number, output_dir)
+
+
+def main(argv=None) -> int:
+    """Regenerate harness drawings from the command line.
+
+        python -m src.utils.harness_drawing_generator --jobs 4
+        python -m src.utils.harness_drawing_generator --bom "Project BOM.xlsx"
+    """
+    parser = argparse.ArgumentParser(description="Generate harness drawing PNGs from the harness library")
+    parser.add_argument('--library', help="Harness library JSON (default: the bundled harness_library.json)")
+    parser.add_argument('--out', default='harness_drawings', help="Output folder (default: harness_drawings)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument('--bom', help="Only parts listed under 'Part Number' in this exported BOM workbook")
+    parser.add_argument('--part', action='append', dest='parts', help="Only this part number (repeatable)")
+    parser.add_argument('--force', action='store_true',
+                        help="Redraw every selected part, even if its manifest entry is current")
+    args = parser.parse_args(argv)
+
+    generator = HarnessDrawingGenerator(args.library)
+    part_numbers = None
+    if args.bom or args.parts:
+        part_numbers = set(args.parts or [])
+        if args.bom:
+            part_numbers |= part_numbers_from_bom(args.bom)
+        part_numbers = sorted(part_numbers)
+        if not generator.resolve_part_numbers(part_numbers):
+            print("No harness part numbers from the library found in the selection")
+            return 1
+
+    generator.generate_all_harness_drawings(args.out, part_numbers=part_numbers,
+                                            incremental=not args.force, workers=args.jobs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Indexed part-number lookups for the harness, whip and extender libraries.
+
+The libraries are flat {part_number: spec} dicts; matching a harness or cable
+used to mean scanning every entry. PartIndex buckets the specs once so each
+lookup is a dict hit, and keeps sorted spacing/length lists for the
+"nearest available" snaps.
+"""
+
+import bisect
+
+from src.utils.data_store import load_library
+
+
+# Harness spacings match when they differ by less than this (ft)
+SPACING_TOLERANCE_FT = 0.1
+
+
+class PartIndex:
+    """Lookup tables over the harness, whip and extender libraries.
+
+    Harnesses are keyed on (num_strings, polarity, spacing_ft, trunk_gauge);
+    whips and extenders on (wire_gauge, polarity, length_ft). Build once per
+    library load and reuse — the libraries themselves are not copied.
+    """
+
+    def __init__(self, harness_library=None, whip_library=None, extender_library=None):
+        self.harness_library = harness_library if harness_library is not None else {}
+        self.whip_library = whip_library if whip_library is not None else {}
+        self.extender_library = extender_library if extender_library is not None else {}
+
+        # (num_strings, polarity, spacing) -> [pn], and the same plus trunk gauge;
+        # spacings are the library's own values, matched within SPACING_TOLERANCE_FT
+        self._harness = {}
+        self._harness_by_trunk = {}
+        # (num_strings, polarity) and (num_strings, polarity, trunk) -> sorted spacings
+        self._harness_spacings = {}
+        # num_strings -> sorted spacings (any polarity/trunk); every spacing stocked
+        self._spacings_by_count = {}
+        self._all_spacings = set()
+
+        for pn, spec in self.harness_library.items():
+            if pn.startswith('_comment_') or not isinstance(spec, dict):
+                continue
+            num_strings = spec.get('num_strings')
+            polarity = spec.get('polarity')
+            spacing = float(spec.get('string_spacing_ft', 0))
+            trunk = spec.get('trunk_cable_size', spec.get('trunk_wire_gauge'))
+
+            self._harness.setdefault((num_strings, polarity, spacing), []).append(pn)
+            self._harness_by_trunk.setdefault((num_strings, polarity, spacing, trunk), []).append(pn)
+            for key in ((num_strings, polarity), (num_strings, polarity, trunk)):
+                self._harness_spacings.setdefault(key, set()).add(spacing)
+            if spec.get('string_spacing_ft') is not None:
+                self._spacings_by_count.setdefault(num_strings, set()).add(float(spec['string_spacing_ft']))
+                self._all_spacings.add(float(spec['string_spacing_ft']))
+
+        self._harness_spacings = {k: sorted(v) for k, v in self._harness_spacings.items()}
+        self._spacings_by_count = {k: sorted(v) for k, v in self._spacings_by_count.items()}
+        self._all_spacings = sorted(self._all_spacings)
+
+        # kind -> {(wire_gauge, polarity, length_ft): pn} (first entry wins, as the scans did)
+        self._cables = {}
+        # kind -> {(wire_gauge, polarity): sorted lengths}
+        self._cable_lengths = {}
+        for kind, library in (('whip', self.whip_library), ('extender', self.extender_library)):
+            parts = {}
+            lengths = {}
+            for pn, spec in library.items():
+                if pn.startswith('_comment_') or not isinstance(spec, dict):
+                    continue
+                gauge = spec.get('wire_gauge')
+                polarity = spec.get('polarity')
+                length = spec.get('length_ft')
+                parts.setdefault((gauge, polarity, length), pn)
+                if length is not None:
+                    lengths.setdefault((gauge, polarity), set()).add(length)
+            self._cables[kind] = parts
+            self._cable_lengths[kind] = {k: sorted(v) for k, v in lengths.items()}
+
+    # ------------------------------------------------------------------ harness
+
+    def find_harnesses(self, num_strings, polarity, spacing_ft, trunk_gauge=None):
+        """Return the sorted part numbers matching, or [] if none.
+
+        Spacings match within SPACING_TOLERANCE_FT; trunk_gauge=None matches
+        any trunk size.
+        """
+        spacing_ft = float(spacing_ft)
+        matches = []
+        for spacing in self._spacings_near(num_strings, polarity, spacing_ft, trunk_gauge):
+            if trunk_gauge:
+                matches.extend(self._harness_by_trunk.get((num_strings, polarity, spacing, trunk_gauge), []))
+            else:
+                matches.extend(self._harness.get((num_strings, polarity, spacing), []))
+        return sorted(matches)
+
+    def _spacings_near(self, num_strings, polarity, spacing_ft, trunk_gauge):
+        key = (num_strings, polarity, trunk_gauge) if trunk_gauge else (num_strings, polarity)
+        spacings = self._harness_spacings.get(key, [])
+        # Bisect a slightly wider window, then apply the tolerance test exactly
+        lo = bisect.bisect_left(spacings, spacing_ft - 2 * SPACING_TOLERANCE_FT)
+        hi = bisect.bisect_right(spacings, spacing_ft + 2 * SPACING_TOLERANCE_FT)
+        return [s for s in spacings[lo:hi] if abs(s - spacing_ft) < SPACING_TOLERANCE_FT]
+
+    def harness_spacings(self, num_strings, polarity=None, trunk_gauge=None):
+        """Sorted string spacings (ft) available for this harness size.
+
+        num_strings=None returns every spacing in the library.
+        """
+        if num_strings is None:
+            return list(self._all_spacings)
+        if polarity is None:
+            return list(self._spacings_by_count.get(num_strings, []))
+        if trunk_gauge:
+            return list(self._harness_spacings.get((num_strings, polarity, trunk_gauge), []))
+        return list(self._harness_spacings.get((num_strings, polarity), []))
+
+    def nearest_harness_spacing(self, num_strings, polarity, spacing_ft, trunk_gauge=None):
+        """Smallest available spacing >= spacing_ft, else the largest; None if no parts."""
+        return _snap_up(self.harness_spacings(num_strings, polarity, trunk_gauge), spacing_ft)
+
+    # ----------------------------------------------------------- whip/extender
+
+    def find_cable(self, kind, wire_gauge, polarity, length_ft):
+        """Return the whip/extender part number at exactly length_ft, or None."""
+        return self._cables.get(kind, {}).get((wire_gauge, polarity, length_ft))
+
+    def cable_lengths(self, kind, wire_gauge, polarity):
+        """Sorted stock lengths (ft) for this whip/extender gauge and polarity."""
+        return list(self._cable_lengths.get(kind, {}).get((wire_gauge, polarity), []))
+
+    def nearest_cable_length(self, kind, wire_gauge, polarity, length_ft):
+        """Smallest stock length >= length_ft, else the longest; None if no parts."""
+        return _snap_up(self.cable_lengths(kind, wire_gauge, polarity), length_ft)
+
+
+def _snap_up(sorted_values, value):
+    if not sorted_values:
+        return None
+    i = bisect.bisect_left(sorted_values, value)
+    return sorted_values[i] if i < len(sorted_values) else sorted_values[-1]
+
+
+_part_index = None
+
+
+def get_part_index():
+    """Shared PartIndex over the bundled harness/whip/extender libraries.
+
+    Rebuilt only when data_store hands back a different library object,
+    i.e. when one of the files changed on disk.
+    """
+    global _part_index
+    libraries = [load_library(filename, {})
+                 for filename in ('harness_library.json', 'whip_library.json', 'extender_library.json')]
+    if (_part_index is None
+            or _part_index.harness_library is not libraries[0]
+            or _part_index.whip_library is not libraries[1]
+            or _part_index.extender_library is not libraries[2]):
+        _part_index = PartIndex(*libraries)
+    return _part_index
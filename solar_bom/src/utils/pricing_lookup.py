@@ -2,16 +2,27 @@
 Pricing Lookup Utility
 Provides functions to look up component prices from pricing_data.json
 """
-import json
+import bisect
 import os
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_store import load_json, invalidate
 
 
 class PricingLookup:
     """Utility class for looking up component prices"""
     
+    # Categories priced per copper tier, in lookup order
+    COPPER_INDEXED_CATEGORIES = ('extenders', 'whips', 'harnesses')
+    
     def __init__(self):
         self.pricing_data: Dict[str, Any] = {}
+        self._tier_values: List[Any] = []    # tier list as stored, sorted ascending
+        self._tier_floats: List[float] = []  # same tiers as floats, for bisect
+        self._price_index: Dict[str, Dict[str, Optional[float]]] = {}  # {pn: {tier_key: price}}
         self.load_pricing_data()
     
     def get_pricing_file_path(self) -> str:
@@ -21,18 +32,72 @@ class PricingLookup:
         return os.path.join(project_root, 'data', 'pricing_data.json')
     
     def load_pricing_data(self):
-        """Load pricing data from JSON file"""
-        filepath = self.get_pricing_file_path()
+        """Load pricing data from JSON file, rebuilding the price index if it changed"""
+        data = load_json(self.get_pricing_file_path(), {})
+        if data is not self.pricing_data or not self._tier_values:
+            self.pricing_data = data
+            self._build_price_index()
+    
+    def _build_price_index(self):
+        """Flatten pricing_data into {part_number: {tier_key: price}}.
+        
+        Every part gets an entry for every tier so a lookup is two dict hits.
+        Precedence matches the category order get_price has always used:
+        fuses, then extenders/whips/harnesses (first subcategory with a price
+        for the tier), then combiner boxes.
+        """
+        self._tier_values = sorted(self.get_copper_tiers(), key=float)
+        self._tier_floats = [float(t) for t in self._tier_values]
+        tier_keys = [str(t) for t in self._tier_values]
+        
+        def flat_price(price):
+            return round(float(price), 2) if price else None
+        
+        index: Dict[str, Dict[str, Optional[float]]] = {}
+        
+        # Lowest precedence first; later categories overwrite
+        for part_number, price in self.pricing_data.get('combiner_boxes', {}).items():
+            flat = flat_price(price)
+            index[part_number] = {key: flat for key in tier_keys}
+        
+        copper_candidates: Dict[str, list] = {}
+        for category in self.COPPER_INDEXED_CATEGORIES:
+            for items in self.pricing_data.get(category, {}).values():
+                for part_number, prices in items.items():
+                    if isinstance(prices, dict):
+                        copper_candidates.setdefault(part_number, []).append(prices)
+        
+        for part_number, candidates in copper_candidates.items():
+            fallback = index.get(part_number, {})
+            by_tier = {}
+            for key in tier_keys:
+                price = None
+                for prices in candidates:
+                    price = self._tier_price(prices, key)
+                    if price is not None:
+                        break
+                by_tier[key] = price if price is not None else fallback.get(key)
+            index[part_number] = by_tier
+        
+        for part_number, price in self.pricing_data.get('fuses', {}).items():
+            flat = flat_price(price)
+            index[part_number] = {key: flat for key in tier_keys}
         
-        if os.path.exists(filepath):
+        self._price_index = index
+    
+    @staticmethod
+    def _tier_price(prices: dict, tier_key: str) -> Optional[float]:
+        """Price for tier_key from one part's {tier: price} dict, or None"""
+        if tier_key in prices:
+            return round(float(prices[tier_key]), 2)
+        # Try with float key in case of type mismatch
+        for key, value in prices.items():
             try:
-                with open(filepath, 'r') as f:
-                    self.pricing_data = json.load(f)
-            except Exception as e:
-                print(f"Warning: Failed to load pricing data: {e}")
-                self.pricing_data = {}
-        else:
-            self.pricing_data = {}
+                if float(key) == float(tier_key):
+                    return round(float(value), 2)
+            except (TypeError, ValueError):
+                continue
+        return None
     
     def get_current_copper_price(self) -> float:
         """Get the current copper price setting"""
@@ -50,17 +115,9 @@ class PricingLookup:
         if copper_price is None:
             copper_price = self.get_current_copper_price()
         
-        tiers = self.get_copper_tiers()
-        
-        # Find the appropriate tier (highest tier that copper price is >= to)
-        active_tier = tiers[0]
-        for tier in tiers:
-            if copper_price >= tier:
-                active_tier = tier
-            else:
-                break
-        
-        return str(active_tier)
+        # Highest tier that copper price is >= to, or the lowest tier if below all
+        i = bisect.bisect_right(self._tier_floats, copper_price)
+        return str(self._tier_values[max(i - 1, 0)])
     
     def get_price(self, part_number: str, copper_price: Optional[float] = None) -> Optional[float]:
         """
@@ -76,57 +133,30 @@ class PricingLookup:
         if not part_number or part_number == 'N/A':
             return None
         
-        # Clean up part number
-        part_number = str(part_number).strip()
+        prices = self._price_index.get(str(part_number).strip())
+        if prices is None:
+            return None
+        return prices.get(self.get_active_tier(copper_price))
+    
+    def get_prices(self, part_numbers: Iterable[str], copper_price: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """
+        Look up prices for many part numbers at one copper price.
         
-        # Check fuses first (flat pricing)
-        fuses = self.pricing_data.get('fuses', {})
-        if part_number in fuses:
-            price = fuses[part_number]
-            return round(float(price), 2) if price else None
+        The tier is resolved once for the whole batch.
         
-        # Get active tier for copper-indexed items
+        Returns:
+            {part_number: unit price or None} for each part number given
+        """
         tier_key = self.get_active_tier(copper_price)
-        
-        # Check extenders
-        price = self._lookup_copper_indexed('extenders', part_number, tier_key)
-        if price is not None:
-            return price
-        
-        # Check whips
-        price = self._lookup_copper_indexed('whips', part_number, tier_key)
-        if price is not None:
-            return price
-        
-        # Check harnesses
-        price = self._lookup_copper_indexed('harnesses', part_number, tier_key)
-        if price is not None:
-            return price
-        
-        # Check combiner boxes (flat pricing)
-        combiner_boxes = self.pricing_data.get('combiner_boxes', {})
-        if part_number in combiner_boxes:
-            price = combiner_boxes[part_number]
-            return round(float(price), 2) if price else None
-        
-        return None
-    
-    def _lookup_copper_indexed(self, category: str, part_number: str, tier_key: str) -> Optional[float]:
-        """Look up a price in a copper-indexed category (extenders, whips, harnesses)"""
-        category_data = self.pricing_data.get(category, {})
-        
-        for subcategory, items in category_data.items():
-            if part_number in items:
-                prices = items[part_number]
-                if isinstance(prices, dict) and tier_key in prices:
-                    return round(float(prices[tier_key]), 2)
-                # Try with float key in case of type mismatch
-                elif isinstance(prices, dict):
-                    for key, value in prices.items():
-                        if float(key) == float(tier_key):
-                            return round(float(value), 2)
-        
-        return None
+        index = self._price_index
+        result = {}
+        for part_number in part_numbers:
+            if not part_number or part_number == 'N/A':
+                result[part_number] = None
+                continue
+            prices = index.get(str(part_number).strip())
+            result[part_number] = prices.get(tier_key) if prices is not None else None
+        return result
     
     def get_price_with_details(self, part_number: str, copper_price: Optional[float] = None) -> Tuple[Optional[float], str]:
         """
@@ -142,16 +172,53 @@ class PricingLookup:
         
         tier_key = self.get_active_tier(copper_price)
         return price, f"Copper tier ${tier_key}/lb"
+    
+    def get_tier_keys(self) -> List[str]:
+        """Copper tier keys (e.g. "4.5"), ascending"""
+        return [str(t) for t in self._tier_values]
+    
+    def copper_sensitivity(self, part_numbers: Iterable[str], quantities: Iterable[float],
+                           tiers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Extended cost of a BOM at every copper tier in one pass.
+        
+        Args:
+            part_numbers: Part number per BOM line
+            quantities: Quantity per BOM line (same order as part_numbers)
+            tiers: Tier keys to evaluate (defaults to all configured tiers)
+        
+        Returns:
+            DataFrame with one row per BOM line: 'Part Number', 'Quantity', then
+            one extended-cost column per tier key. Unpriced lines are NaN.
+        """
+        part_numbers = [str(pn).strip() if pn else '' for pn in part_numbers]
+        qty = np.asarray(list(quantities), dtype=float)
+        tier_keys = list(tiers) if tiers is not None else self.get_tier_keys()
+        
+        # (lines x tiers) unit-price matrix; missing prices become NaN
+        empty = {}
+        unit_prices = np.array(
+            [[self._price_index.get(pn, empty).get(key) for key in tier_keys] for pn in part_numbers],
+            dtype=float,
+        ).reshape(len(part_numbers), len(tier_keys))
+        
+        sweep = pd.DataFrame(qty[:, None] * unit_prices, columns=tier_keys)
+        sweep.insert(0, 'Quantity', qty)
+        sweep.insert(0, 'Part Number', part_numbers)
+        return sweep
 
 
 # Singleton instance for convenience
 _pricing_lookup_instance = None
 
 def get_pricing_lookup() -> PricingLookup:
-    """Get the singleton PricingLookup instance"""
+    """Get the singleton PricingLookup instance, refreshed if pricing_data.json changed"""
     global _pricing_lookup_instance
     if _pricing_lookup_instance is None:
         _pricing_lookup_instance = PricingLookup()
+    else:
+        # Cheap when unchanged — data_store only re-parses on a new mtime
+        _pricing_lookup_instance.load_pricing_data()
     return _pricing_lookup_instance
 
 def lookup_price(part_number: str, copper_price: Optional[float] = None) -> Optional[float]:
@@ -162,4 +229,96 @@ def reload_pricing_data():
     """Reload pricing data from disk"""
     global _pricing_lookup_instance
     _pricing_lookup_instance = None
-    return get_pricing_lookup()
\ No newline at end of file
+    invalidate(PricingLookup().get_pricing_file_path())
+    return get_pricing_lookup()
+
+
+def write_copper_sensitivity_sheet(workbook, sweep: pd.DataFrame, descriptions: Optional[Dict[str, str]] = None,
+                                   copper_price: Optional[float] = None, sheet_name: str = "Copper Sensitivity"):
+    """
+    Add a sheet showing BOM extended cost at each copper tier.
+    
+    Args:
+        workbook: openpyxl Workbook to add the sheet to
+        sweep: Result of PricingLookup.copper_sensitivity()
+        descriptions: Optional {part_number: description} for the Description column
+        copper_price: Current copper price, used to highlight the active tier
+        sheet_name: Name of the new sheet
+    """
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+    
+    pricing = get_pricing_lookup()
+    if copper_price is None:
+        copper_price = pricing.get_current_copper_price()
+    active_tier = pricing.get_active_tier(copper_price)
+    tier_keys = [c for c in sweep.columns if c not in ('Part Number', 'Quantity')]
+    descriptions = descriptions or {}
+    
+    title_font = Font(bold=True, size=14)
+    header_font = Font(bold=True, size=11, color="FFFFFF")
+    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+    active_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    label_font = Font(bold=True)
+    thin_border = Border(
+        left=Side(style='thin'), right=Side(style='thin'),
+        top=Side(style='thin'), bottom=Side(style='thin')
+    )
+    center_align = Alignment(horizontal='center', vertical='center')
+    money_format = '"$"#,##0.00'
+    
+    ws = workbook.create_sheet(sheet_name)
+    ws.cell(row=1, column=1, value="Copper Price Sensitivity").font = title_font
+    ws.cell(row=2, column=1, value="Current Copper Price:").font = label_font
+    ws.cell(row=2, column=2, value=f"${copper_price:.2f}/lb (tier ${float(active_tier):.2f}/lb)")
+    ws.cell(row=3, column=1, value="Extended cost of each priced BOM line at every copper tier. Unpriced lines are omitted.")
+    
+    header_row = 5
+    headers = ['Part Number', 'Description', 'Quantity'] + [f"${float(t):.2f}/lb" for t in tier_keys]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=header_row, column=col, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = center_align
+        cell.border = thin_border
+    
+    priced = sweep[sweep[tier_keys].notna().any(axis=1)] if tier_keys else sweep.iloc[0:0]
+    row = header_row + 1
+    for line in priced.itertuples(index=False):
+        values = list(line)
+        part_number, qty = values[0], values[1]
+        ws.cell(row=row, column=1, value=part_number)
+        ws.cell(row=row, column=2, value=descriptions.get(part_number, ''))
+        ws.cell(row=row, column=3, value=int(qty) if float(qty).is_integer() else qty)
+        for i, value in enumerate(values[2:]):
+            cell = ws.cell(row=row, column=4 + i, value=None if pd.isna(value) else round(float(value), 2))
+            cell.number_format = money_format
+        for col in range(1, len(headers) + 1):
+            ws.cell(row=row, column=col).border = thin_border
+        row += 1
+    
+    # Totals per tier, then change vs. the active tier
+    totals = priced[tier_keys].sum() if tier_keys else pd.Series(dtype=float)
+    base = float(totals.get(active_tier, 0.0)) if active_tier in totals.index else 0.0
+    ws.cell(row=row, column=3, value="Total:").font = label_font
+    ws.cell(row=row + 1, column=3, value="vs. Current:").font = label_font
+    for i, key in enumerate(tier_keys):
+        total_cell = ws.cell(row=row, column=4 + i, value=round(float(totals[key]), 2))
+        total_cell.font = label_font
+        total_cell.number_format = money_format
+        delta_cell = ws.cell(row=row + 1, column=4 + i, value=round(float(totals[key]) - base, 2))
+        delta_cell.number_format = money_format
+        for r in (row, row + 1):
+            ws.cell(row=r, column=4 + i).border = thin_border
+    
+    # Highlight the active tier column
+    if active_tier in tier_keys:
+        col = 4 + tier_keys.index(active_tier)
+        for r in range(header_row + 1, row + 1):
+            ws.cell(row=r, column=col).fill = active_fill
+    
+    widths = [22, 60, 10] + [14] * len(tier_keys)
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+    
+    return ws
\ No newline at end of file
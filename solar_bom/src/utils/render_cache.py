@@ -0,0 +1,51 @@
+"""Helpers shared by the on-disk render caches.
+
+The site PDF's wiring pages and the harness drawing PNGs are both cached on
+disk and keyed on a hash of what they draw. Both keys include the source of
+the module that draws them, so editing the drawing code invalidates every
+cached file, and both caches write each file under a temporary name and
+rename it into place, so a reader never sees a half-written one.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+
+_fingerprints = {}
+
+
+def source_fingerprint(module_file: str) -> str:
+    """Hash of a module's source file (or the app version when frozen).
+
+    Pass the drawing module's __file__; the result is computed once per file.
+    """
+    fingerprint = _fingerprints.get(module_file)
+    if fingerprint is None:
+        try:
+            with open(module_file, 'rb') as f:
+                fingerprint = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            from version import get_version
+            fingerprint = get_version()
+        _fingerprints[module_file] = fingerprint
+    return fingerprint
+
+
+@contextmanager
+def atomic_path(path: str):
+    """Yield a temporary path to write; it replaces path when the block succeeds.
+
+    The temporary name carries the process id, so worker processes writing
+    the same cache entry never share one. On error it is removed and path is
+    left untouched.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
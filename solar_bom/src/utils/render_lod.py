@@ -0,0 +1,74 @@
+"""Level-of-detail tiers shared by the Site Preview canvas and the site PDF.
+
+Zoomed out on a large site, per-string rectangles, motor markers and tracker
+labels are all smaller than a pixel, yet each one still costs a canvas item
+or a PDF object. Both renderers pick a tier from the drawing scale in
+pixels (or PDF points) per world foot:
+
+    'group'    -- one merged footprint per run of trackers sharing a color
+    'tracker'  -- tracker outlines, strings coalesced into same-color runs
+    'string'   -- full detail: string rectangles, motors, tracker labels
+
+Pure Python, no Tk or matplotlib.
+"""
+
+from collections import Counter
+
+# Below this many px/ft a 20 ft row pitch is ~4 px and trackers blur together
+LOD_GROUP_PX_PER_FT = 0.2
+
+# Per-string rectangles and motor markers need a tracker at least ~6 px wide
+LOD_STRING_PX_PER_FT = 1.0
+
+
+def lod_tier(px_per_ft, group_below=LOD_GROUP_PX_PER_FT, string_below=LOD_STRING_PX_PER_FT):
+    """'group', 'tracker' or 'string' for a drawing scale in px (or pt) per foot."""
+    if px_per_ft < group_below:
+        return 'group'
+    if px_per_ft < string_below:
+        return 'tracker'
+    return 'string'
+
+
+def color_runs(colors):
+    """(start, end, value) for each run of equal consecutive values; end is inclusive."""
+    runs = []
+    start = 0
+    for i in range(1, len(colors) + 1):
+        if i == len(colors) or colors[i] != colors[start]:
+            runs.append((start, i - 1, colors[start]))
+            start = i
+    return runs
+
+
+def dominant_color(colors, default='#DDDDDD'):
+    """Most common color; ties go to the one seen first."""
+    if not colors:
+        return default
+    counts = Counter(colors)
+    best = max(counts.values())
+    return next(c for c in colors if counts[c] == best)
+
+
+def footprint_polygon(spans):
+    """Outline around side-by-side trackers as a list of (x, y) points.
+
+    spans are (x_min, x_max, y_min, y_max) per tracker, ordered west to east.
+    The outline follows each tracker's north end, then comes back along the
+    south ends, bridging the row gaps with straight edges.
+    """
+    top = []
+    bottom = []
+    for x_min, x_max, y_min, y_max in spans:
+        top.extend([(x_min, y_min), (x_max, y_min)])
+        bottom.extend([(x_min, y_max), (x_max, y_max)])
+    return top + bottom[::-1]
+
+
+def group_footprints(spans, colors):
+    """[(color, polygon)] merging consecutive trackers of the same color.
+
+    spans as for footprint_polygon; colors holds one color per span.
+    """
+    return [(color, footprint_polygon(spans[start:end + 1]))
+            for start, end, color in color_runs(colors)]
@@ -2,10 +2,19 @@
 Site PDF Generator — Renders the Quick Estimate string allocation site preview
 to an 11x17 landscape PDF with a titleblock sidebar.
 
-Uses matplotlib for vector PDF output (crisp at any zoom level).
+Uses matplotlib for vector PDF output (crisp at any zoom level). Wiring
+diagram pages are rendered in worker processes and cached on disk as one-page
+PDFs, then merged after the site page with pypdf (when installed).
 """
 
+import hashlib
+import io
+import json
 import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
@@ -14,10 +23,20 @@ matplotlib.use('Agg')  # Non-interactive backend for PDF generation
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, Rectangle
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.backends.backend_pdf import PdfPages
 import matplotlib.patheffects as pe
-from matplotlib.transforms import Affine2D
 from matplotlib.path import Path
+import numpy as np
+
+try:
+    from pypdf import PdfWriter
+except ImportError:  # wiring pages fall back to in-process rendering
+    PdfWriter = None
+
+from src.utils import geometry_kernels
+from src.utils.render_lod import color_runs, dominant_color, group_footprints, lod_tier
+from src.utils.render_cache import atomic_path, source_fingerprint
 
 
 # Page dimensions in inches (11x17 landscape)
@@ -40,6 +59,12 @@ DRAWING_HEIGHT = PAGE_HEIGHT - DRAWING_BOTTOM - DRAWING_TOP - PAGE_MARGIN
 SIDEBAR_LEFT = PAGE_WIDTH - PAGE_MARGIN - SIDEBAR_WIDTH
 SIDEBAR_BOTTOM = PAGE_MARGIN
 
+# Level-of-detail thresholds in points per foot (see render_lod). The page is
+# vector and gets zoomed and printed, so strings stay until trackers are
+# ~1.5 pt wide; groups merge once the row pitch drops to ~1 pt.
+PDF_LOD_GROUP_PT_PER_FT = 0.05
+PDF_LOD_STRING_PT_PER_FT = 0.25
+
 # Pad colors (match site_preview.py)
 PAD_COLORS = ['#C62828', '#1565C0', '#2E7D32', '#E65100', '#6A1B9A',
               '#00838F', '#AD1457', '#4E342E']
@@ -57,7 +82,9 @@ def generate_site_pdf(filepath: str,
                       align_on_motor: bool = True,
                       wiring_specs: Optional[List[Dict]] = None,
                       table_corner: str = 'top-right',
-                      corridors: Optional[List[Dict]] = None) -> bool:
+                      corridors: Optional[List[Dict]] = None,
+                      wiring_workers: Optional[int] = None,
+                      wiring_cache_dir: Optional[str] = None) -> bool:
     """
     Generate an 11x17 landscape PDF of the string allocation site preview,
     optionally followed by DC cabling wiring diagram pages.
@@ -74,6 +101,10 @@ def generate_site_pdf(filepath: str,
         show_routes: Whether to draw L-shaped routes from devices to pads.
         align_on_motor: Whether to draw motor alignment lines.
         wiring_specs: Optional list of dicts describing unique tracker wiring configs.
+        wiring_workers: Processes for rendering wiring pages (default: CPU count,
+            1 = render in this process).
+        wiring_cache_dir: Folder of cached wiring pages (default: the user data
+            folder's cache/wiring_pages).
 
     Returns:
         True on success, False on error.
@@ -81,6 +112,13 @@ def generate_site_pdf(filepath: str,
     from matplotlib.backends.backend_pdf import PdfPages
 
     try:
+        # Wiring pages come back as cached one-page PDF files; without pypdf
+        # to merge them they are drawn into the same PdfPages as before.
+        wiring_files = None
+        if wiring_specs and PdfWriter is not None:
+            wiring_files = _render_wiring_page_files(wiring_specs, project_info,
+                                                     wiring_workers, wiring_cache_dir)
+
         with PdfPages(filepath) as pdf:
             # ===== Page 1: Site Preview =====
             fig = _create_site_page(group_layout, device_positions, pads,
@@ -91,12 +129,15 @@ def generate_site_pdf(filepath: str,
             plt.close(fig)
 
             # ===== Pages 2+: Wiring Diagrams =====
-            if wiring_specs:
+            if wiring_specs and wiring_files is None:
                 wiring_figs = _create_wiring_pages(wiring_specs, project_info)
                 for wfig in wiring_figs:
                     pdf.savefig(wfig)
                     plt.close(wfig)
 
+        if wiring_files:
+            _append_pdf_pages(filepath, wiring_files)
+
         return True
 
     except Exception as e:
@@ -167,7 +208,10 @@ def _create_site_page(group_layout, device_positions, pads, colors,
     # --- Draw site elements ---
     max_width = _get_max_tracker_width(group_layout)
 
-    _draw_groups(ax, group_layout, max_width)
+    # Drawing scale in points per foot picks the level of detail
+    pt_per_ft = effective_drawing_w * 72.0 / max(xlim_final[1] - xlim_final[0], 1e-9)
+    tier = lod_tier(pt_per_ft, PDF_LOD_GROUP_PT_PER_FT, PDF_LOD_STRING_PT_PER_FT)
+    _draw_groups(ax, group_layout, max_width, tier=tier)
     _draw_devices(ax, device_positions, device_label, pads, group_layout)
     if show_routes:
         _draw_routes(ax, device_positions, pads, topology, group_layout, corridors=corridors)
@@ -299,19 +343,29 @@ def _get_max_tracker_width(group_layout):
     return max_w
 
 
-def _draw_groups(ax, group_layout, max_width):
-    """Draw all groups with color-coded string rectangles, tracker outlines, and motors."""
+def _draw_groups(ax, group_layout, max_width, tier='string'):
+    """Draw all groups with color-coded string rectangles, tracker outlines, and motors.
+
+    tier is a render_lod tier: 'tracker' merges same-colored strings and
+    drops motors, 'group' draws one footprint per run of same-colored trackers.
+
+    Each group becomes a handful of collections (strings, outlines, motors)
+    with vertices pre-rotated in NumPy, rather than one patch per rectangle.
+    """
     for group_idx, group_data in enumerate(group_layout):
         pitch = group_data.get('row_spacing_ft', 20)
         gx = group_data['x']
         gy = group_data['y']
 
         rcx, rcy, rotation_deg = _group_rotation_info(group_data)
-        if rotation_deg:
-            group_transform = Affine2D().rotate_deg_around(rcx, rcy, rotation_deg) + ax.transData
-        else:
-            group_transform = ax.transData
 
+        # Rectangles as parallel x / y / w / h lists, one set per layer
+        strings = ([], [], [], [])
+        string_fill = []
+        outlines = ([], [], [], [])
+        motors = ([], [], [], [])
+        footprint_spans = []
+        footprint_colors = []
         for t_idx, tracker in enumerate(group_data['trackers']):
             spt = tracker['strings_per_tracker']
             assignments = tracker.get('assignments', [])
@@ -376,48 +430,69 @@ def _draw_groups(ax, group_layout, max_width):
             while len(string_colors) < len(string_heights):
                 string_colors.append('#DDDDDD')
 
-            # Draw each string rectangle
-            for s_idx in range(len(string_heights)):
-                sy = ty + sum(string_heights[:s_idx])
-                sh = string_heights[s_idx]
-                color = string_colors[s_idx] if s_idx < len(string_colors) else '#DDDDDD'
-
-                rect = Rectangle(
-                    (tx + tx_offset, sy), t_width, sh,
-                    facecolor=color, edgecolor='#555555', linewidth=0.3,
-                    transform=group_transform
-                )
-                ax.add_patch(rect)
+            if tier == 'group':
+                footprint_spans.append((tx + tx_offset, tx + tx_offset + t_width, ty, ty + t_length))
+                footprint_colors.append(dominant_color(string_colors[:len(string_heights)]))
+                continue
+
+            # 'tracker' tier: one rectangle per run of same-colored strings
+            if tier == 'tracker':
+                runs = color_runs(string_colors[:len(string_heights)])
+            else:
+                runs = [(s_idx, s_idx, string_colors[s_idx]) for s_idx in range(len(string_heights))]
+            for start, end, color in runs:
+                _append_rect(strings, tx + tx_offset, ty + sum(string_heights[:start]),
+                             t_width, sum(string_heights[start:end + 1]))
+                string_fill.append(color)
 
             # Tracker outline
-            outline = Rectangle(
-                (tx + tx_offset - 0.5, ty - 0.5),
-                t_width + 1.0, t_length + 1.0,
-                facecolor='none', edgecolor='#222222', linewidth=0.4,
-                transform=group_transform
-            )
-            ax.add_patch(outline)
+            _append_rect(outlines, tx + tx_offset - 0.5, ty - 0.5, t_width + 1.0, t_length + 1.0)
 
             # Motor indicator
-            if tracker.get('has_motor', False):
-                motor_y = tracker['motor_y_ft']
+            if tier == 'string' and tracker.get('has_motor', False):
                 motor_gap = tracker.get('motor_gap_ft', 1.0)
-                motor_world_y = ty + motor_y
-                motor_x1 = tx + tx_offset - 0.3
-                motor_w = t_width + 0.6
-                motor_rect = Rectangle(
-                    (motor_x1, motor_world_y), motor_w, motor_gap,
-                    facecolor='#666666', edgecolor='#444444', linewidth=0.3,
-                    transform=group_transform
-                )
-                ax.add_patch(motor_rect)
-                # Motor dot — rotate position manually since ax.plot doesn't use patch transforms
-                motor_cx = motor_x1 + motor_w / 2
-                motor_cy = motor_world_y + motor_gap / 2
-                if rotation_deg:
-                    motor_cx, motor_cy = _rotate_pt(rcx, rcy, motor_cx, motor_cy, rotation_deg)
-                ax.plot(motor_cx, motor_cy, 'o', color='#FF8800',
-                        markersize=2, markeredgecolor='#CC6600', markeredgewidth=0.3)
+                _append_rect(motors, tx + tx_offset - 0.3, ty + tracker['motor_y_ft'],
+                             t_width + 0.6, motor_gap)
+
+        if footprint_spans:
+            footprints = group_footprints(footprint_spans, footprint_colors)
+            verts = [geometry_kernels.rotate_polys(np.array(poly, dtype=float), rcx, rcy, rotation_deg)
+                     if rotation_deg else poly for _, poly in footprints]
+            ax.add_collection(PolyCollection(
+                verts, facecolors=[color for color, _ in footprints],
+                edgecolors='#222222', linewidths=0.3))
+            continue
+
+        if strings[0]:
+            ax.add_collection(PolyCollection(
+                _rect_verts(strings, rcx, rcy, rotation_deg), facecolors=string_fill,
+                edgecolors='#555555', linewidths=0.3))
+        if outlines[0]:
+            ax.add_collection(PolyCollection(
+                _rect_verts(outlines, rcx, rcy, rotation_deg), facecolors='none',
+                edgecolors='#222222', linewidths=0.4))
+        if motors[0]:
+            motor_verts = _rect_verts(motors, rcx, rcy, rotation_deg)
+            ax.add_collection(PolyCollection(
+                motor_verts, facecolors='#666666', edgecolors='#444444', linewidths=0.3))
+            # Motor dots at the (already rotated) motor rectangle centers
+            centers = motor_verts.mean(axis=1)
+            ax.plot(centers[:, 0], centers[:, 1], 'o', color='#FF8800',
+                    markersize=2, markeredgecolor='#CC6600', markeredgewidth=0.3)
+
+
+def _append_rect(rects, x, y, w, h):
+    """Append one rectangle to an (xs, ys, ws, hs) list tuple."""
+    for column, value in zip(rects, (x, y, w, h)):
+        column.append(value)
+
+
+def _rect_verts(rects, rcx, rcy, rotation_deg):
+    """(N, 4, 2) world corners of (xs, ys, ws, hs) rectangles, rotated with the group."""
+    polys = geometry_kernels.rect_polys(*rects)
+    if rotation_deg:
+        polys = geometry_kernels.rotate_polys(polys, rcx, rcy, rotation_deg)
+    return polys
 
 
 def _draw_devices(ax, device_positions, device_label, pads, group_layout=None):
@@ -432,6 +507,14 @@ def _draw_devices(ax, device_positions, device_label, pads, group_layout=None):
             for dev_idx in pad.get('assigned_devices', []):
                 device_to_pad[dev_idx] = pad_idx
 
+    # Fill color
+    if device_label == 'CB':
+        fill_color = '#FF9800'
+    else:
+        fill_color = '#2196F3'
+
+    device_verts = []
+    outline_colors = []
     for dev_idx, dev in enumerate(device_positions):
         dx = dev['x']
         dy = dev['y']
@@ -441,18 +524,9 @@ def _draw_devices(ax, device_positions, device_label, pads, group_layout=None):
 
         # Rotation from the device's group
         grp_idx = dev.get('group_idx')
-        rd = 0.0
-        dev_transform = ax.transData
+        rcx, rcy, rd = None, None, 0.0
         if group_layout and grp_idx is not None and grp_idx < len(group_layout):
             rcx, rcy, rd = _group_rotation_info(group_layout[grp_idx])
-            if rd:
-                dev_transform = Affine2D().rotate_deg_around(rcx, rcy, rd) + ax.transData
-
-        # Fill color
-        if device_label == 'CB':
-            fill_color = '#FF9800'
-        else:
-            fill_color = '#2196F3'
 
         # Outline color from pad assignment
         if dev_idx in device_to_pad and pads:
@@ -461,12 +535,8 @@ def _draw_devices(ax, device_positions, device_label, pads, group_layout=None):
         else:
             outline_color = '#E65100' if device_label == 'CB' else '#0D47A1'
 
-        rect = Rectangle(
-            (dx, dy), dw, dh,
-            facecolor=fill_color, edgecolor=outline_color, linewidth=0.8,
-            transform=dev_transform
-        )
-        ax.add_patch(rect)
+        device_verts.append(_rect_verts(([dx], [dy], [dw], [dh]), rcx, rcy, rd)[0])
+        outline_colors.append(outline_color)
 
         # Label above device (rotate anchor point if needed)
         lx = dx + dw / 2
@@ -478,11 +548,15 @@ def _draw_devices(ax, device_positions, device_label, pads, group_layout=None):
                 ha='center', va='bottom', fontfamily='sans-serif',
                 bbox=dict(facecolor='white', edgecolor='none', alpha=0.85, pad=1))
 
+    ax.add_collection(PolyCollection(
+        device_verts, facecolors=fill_color, edgecolors=outline_colors, linewidths=0.8))
+
 
 def _draw_routes(ax, device_positions, pads, topology, group_layout=None, corridors=None):
     """Draw routes from devices to their assigned pads.
 
-    Corridor-assigned devices get three-leg paths; others get L-shaped paths.
+    Corridor-assigned devices get three-leg paths, across junctions with other
+    corridors when shorter; others get L-shaped paths.
     """
     if not pads or not device_positions:
         return
@@ -496,7 +570,11 @@ def _draw_routes(ax, device_positions, pads, topology, group_layout=None, corrid
     for c_idx, corridor in enumerate(corridors or []):
         for dev_idx in corridor.get('assigned_devices', []):
             device_to_corridor[dev_idx] = c_idx
+    corridor_network = None  # CorridorNetwork over all corridors, built on first use
 
+    linestyle = '--' if topology == 'Distributed String' else '-'
+    paths = []
+    path_colors = []
     for dev_idx, dev in enumerate(device_positions):
         pad_idx = device_to_pad.get(dev_idx)
         if pad_idx is None or pad_idx >= len(pads):
@@ -521,7 +599,6 @@ def _draw_routes(ax, device_positions, pads, topology, group_layout=None, corrid
         pad_cy = pad['y'] + pad.get('height_ft', 8) / 2
 
         color = PAD_COLORS[pad_idx % len(PAD_COLORS)]
-        linestyle = '--' if topology == 'Distributed String' else '-'
 
         # --- Corridor three-leg path ---
         c_idx = device_to_corridor.get(dev_idx)
@@ -529,13 +606,14 @@ def _draw_routes(ax, device_positions, pads, topology, group_layout=None, corrid
             corridor_pts = corridors[c_idx].get('points', [])
             if len(corridor_pts) >= 2:
                 try:
-                    from .corridor_routing import three_leg_distance
-                    _dist, path_geom = three_leg_distance(
-                        (dev_cx, dev_cy), (pad_cx, pad_cy), corridor_pts
+                    if corridor_network is None:
+                        from .corridor_routing import CorridorNetwork
+                        corridor_network = CorridorNetwork([c.get('points', []) for c in corridors])
+                    _dist, path_geom = corridor_network.route(
+                        c_idx, (dev_cx, dev_cy), (pad_cx, pad_cy)
                     )
-                    xs = [p[0] for p in path_geom]
-                    ys = [p[1] for p in path_geom]
-                    ax.plot(xs, ys, color=color, linewidth=0.4, linestyle=linestyle, alpha=0.6)
+                    paths.append([(p[0], p[1]) for p in path_geom])
+                    path_colors.append(color)
                     continue
                 except Exception as e:
                     print(f"Warning: PDF corridor route failed for device {dev_idx}: {e}")
@@ -557,8 +635,12 @@ def _draw_routes(ax, device_positions, pads, topology, group_layout=None, corrid
         corner_x = dev_cx + t * row_dx
         corner_y = dev_cy + t * row_dy
 
-        ax.plot([dev_cx, corner_x, pad_cx], [dev_cy, corner_y, pad_cy],
-                color=color, linewidth=0.4, linestyle=linestyle, alpha=0.6)
+        paths.append([(dev_cx, dev_cy), (corner_x, corner_y), (pad_cx, pad_cy)])
+        path_colors.append(color)
+
+    if paths:
+        ax.add_collection(LineCollection(
+            paths, colors=path_colors, linewidths=0.4, linestyles=linestyle, alpha=0.6))
 
 
 def _draw_pads(ax, pads):
@@ -566,19 +648,20 @@ def _draw_pads(ax, pads):
     if not pads:
         return
 
+    rects = ([], [], [], [])
+    for pad in pads:
+        _append_rect(rects, pad['x'], pad['y'], pad.get('width_ft', 10), pad.get('height_ft', 8))
+    ax.add_collection(PolyCollection(
+        geometry_kernels.rect_polys(*rects),
+        facecolors=[PAD_COLORS[i % len(PAD_COLORS)] for i in range(len(pads))],
+        edgecolors='#222222', linewidths=0.6))
+
     for pad_idx, pad in enumerate(pads):
         px = pad['x']
         py = pad['y']
         pw = pad.get('width_ft', 10)
         ph = pad.get('height_ft', 8)
         label = pad.get('label', f'Pad {pad_idx + 1}')
-        base_color = PAD_COLORS[pad_idx % len(PAD_COLORS)]
-
-        rect = Rectangle(
-            (px, py), pw, ph,
-            facecolor=base_color, edgecolor='#222222', linewidth=0.6
-        )
-        ax.add_patch(rect)
 
         # Label
         cx = px + pw / 2
@@ -675,47 +758,52 @@ def _compute_table_dims(project_info):
 
 
 def _compute_tracker_bboxes(group_layout):
-    """Return axis-aligned bounding boxes (xmin,xmax,ymin,ymax) per tracker in data feet."""
-    bboxes = []
+    """Return axis-aligned tracker bounding boxes in data feet.
+
+    An (N, 4) array with columns (xmin, ymin, xmax, ymax), one row per
+    tracker in group order — see geometry_kernels.
+    """
+    boxes = []
     for group in group_layout:
+        trackers = group['trackers']
+        if not trackers:
+            continue
         gx    = group['x']
         gy    = group['y']
         pitch = group.get('row_spacing_ft', 20)
         max_w = _get_max_tracker_width([group])
         rcx, rcy, rd = _group_rotation_info(group)
 
-        for t_idx, tracker in enumerate(group['trackers']):
-            t_width  = tracker.get('width_ft', max_w)
-            t_length = tracker.get('length_ft', 100)
-            tx       = gx + t_idx * pitch
-            tx_off   = (max_w - t_width) / 2 if max_w > t_width else 0
-            ang_dy   = t_idx * pitch * math.tan(math.radians(group.get('driveline_angle', 0)))
-
-            _talign = group.get('tracker_alignment', 'motor')
-            mgl = group.get('length_ft', t_length)
-            if _talign == 'top':
-                ty = gy + ang_dy
-            elif _talign == 'bottom':
-                ty = gy + (mgl - t_length) + ang_dy
-            elif tracker.get('has_motor', False) and group.get('motor_y_ft', None) is not None:
-                ty = gy + (group['motor_y_ft'] - tracker['motor_y_ft']) + ang_dy
+        t_idx    = np.arange(len(trackers), dtype=float)
+        t_width  = np.array([t.get('width_ft', max_w) for t in trackers], dtype=float)
+        t_length = np.array([t.get('length_ft', 100) for t in trackers], dtype=float)
+        tx       = gx + t_idx * pitch
+        tx_off   = np.where(max_w > t_width, (max_w - t_width) / 2, 0.0)
+        ang_dy   = t_idx * pitch * math.tan(math.radians(group.get('driveline_angle', 0)))
+
+        _talign = group.get('tracker_alignment', 'motor')
+        mgl = group.get('length_ft', None)
+        mgl = t_length if mgl is None else np.full(len(trackers), float(mgl))
+        if _talign == 'top':
+            ty = gy + ang_dy
+        elif _talign == 'bottom':
+            ty = gy + (mgl - t_length) + ang_dy
+        else:
+            centered = gy + (mgl - t_length) / 2 + ang_dy
+            if group.get('motor_y_ft', None) is not None:
+                has_motor = np.array([bool(t.get('has_motor', False)) for t in trackers])
+                motor_y = np.array([t.get('motor_y_ft', 0.0) if t.get('has_motor', False) else 0.0
+                                    for t in trackers], dtype=float)
+                ty = np.where(has_motor, gy + (group['motor_y_ft'] - motor_y) + ang_dy, centered)
             else:
-                ty = gy + (mgl - t_length) / 2 + ang_dy
+                ty = centered
 
-            corners = [
-                (tx + tx_off,            ty),
-                (tx + tx_off + t_width,  ty),
-                (tx + tx_off + t_width,  ty + t_length),
-                (tx + tx_off,            ty + t_length),
-            ]
-            if rd:
-                corners = [_rotate_pt(rcx, rcy, cx2, cy2, rd) for cx2, cy2 in corners]
-
-            xs = [c[0] for c in corners]
-            ys = [c[1] for c in corners]
-            bboxes.append((min(xs), max(xs), min(ys), max(ys)))
+        corners = geometry_kernels.rect_polys(tx + tx_off, ty, t_width, t_length)
+        if rd:
+            corners = geometry_kernels.rotate_polys(corners, rcx, rcy, rd)
+        boxes.append(geometry_kernels.poly_bboxes(corners))
 
-    return bboxes
+    return np.concatenate(boxes) if boxes else np.zeros((0, 4))
 
 
 def _adjust_bounds_to_aspect(xmin, xmax, ymin, ymax, drawing_w, drawing_h):
@@ -781,13 +869,9 @@ def _find_best_table_corner(group_layout, xlim, ylim, table_w, table_h,
         # Convert page corners to data coords (note: higher page-y → lower data-y because Y is inverted)
         d_x1, d_ymax_t = page_to_data(px1, py1)  # page bottom-left → data upper bound
         d_x2, d_ymin_t = page_to_data(px2, py2)  # page top-right   → data lower bound
-        total = 0.0
-        for tx1, tx2, ty1, ty2 in tracker_bboxes:
-            ix1 = max(d_x1, tx1);    ix2 = min(d_x2, tx2)
-            iy1 = max(d_ymin_t, ty1); iy2 = min(d_ymax_t, ty2)
-            if ix2 > ix1 and iy2 > iy1:
-                total += (ix2 - ix1) * (iy2 - iy1)
-        return total
+        areas = geometry_kernels.aabb_intersection_areas(
+            tracker_bboxes, (d_x1, d_ymin_t, d_x2, d_ymax_t))
+        return float(areas.sum())
 
     order = ['top-right', 'bottom-right', 'top-left', 'bottom-left']
     overlaps = {c: overlap_for(c) for c in order}
@@ -1272,6 +1356,9 @@ def _draw_sidebar(fig, project_info, sheet_name='STRING ALLOCATION'):
 
 MAX_DIAGRAMS_PER_PAGE = 2
 
+# Cached wiring pages beyond this count are pruned, least recently used first
+WIRING_CACHE_MAX_FILES = 500
+
 
 def _create_wiring_pages(wiring_specs, project_info):
     """Create figures for wiring diagram pages, up to 2 diagrams per page."""
@@ -1283,6 +1370,105 @@ def _create_wiring_pages(wiring_specs, project_info):
     return figures
 
 
+def _render_wiring_page_files(wiring_specs, project_info, workers=None, cache_dir=None):
+    """Render each wiring page to a cached one-page PDF; return the paths in page order.
+
+    Pages already in the cache are reused. The rest are drawn in a process
+    pool, or in this process for a single page, workers=1, or when running
+    inside a daemonic worker (which cannot start its own pool).
+    """
+    cache_dir = cache_dir or _wiring_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    paths = []
+    jobs = []
+    for page_start in range(0, len(wiring_specs), MAX_DIAGRAMS_PER_PAGE):
+        page_specs = wiring_specs[page_start:page_start + MAX_DIAGRAMS_PER_PAGE]
+        path = os.path.join(cache_dir, _wiring_page_key(page_specs, project_info, page_start) + '.pdf')
+        paths.append(path)
+        if os.path.exists(path):
+            os.utime(path)  # mark as recently used for pruning
+        else:
+            jobs.append((path, page_specs, project_info, page_start))
+
+    n_workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if n_workers > 1 and not multiprocessing.current_process().daemon:
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                list(pool.map(_render_wiring_page_file, jobs))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Warning: parallel wiring page render failed ({e}); rendering in-process")
+    for job in jobs:
+        if not os.path.exists(job[0]):
+            _render_wiring_page_file(job)
+
+    _prune_wiring_cache(cache_dir, keep=set(paths))
+    return paths
+
+
+def _render_wiring_page_file(job):
+    """Draw one wiring page and save it as a single-page PDF (process pool entry point)."""
+    path, page_specs, project_info, page_start = job
+    fig = _create_single_wiring_page(page_specs, project_info, page_start)
+    try:
+        with atomic_path(path) as tmp_path:
+            fig.savefig(tmp_path, format='pdf')
+    finally:
+        plt.close(fig)
+
+
+def _append_pdf_pages(filepath, page_files):
+    """Append the pages of each PDF in page_files to the PDF at filepath."""
+    with open(filepath, 'rb') as f:
+        writer = PdfWriter(clone_from=io.BytesIO(f.read()))
+    for page_file in page_files:
+        writer.append(page_file)
+    # Every page file embeds its own font glyphs; share the identical ones
+    writer.compress_identical_objects()
+    with open(filepath, 'wb') as f:
+        writer.write(f)
+
+
+def _wiring_cache_dir():
+    from src.utils.file_handlers import get_user_data_dir
+    return os.path.join(get_user_data_dir(), 'cache', 'wiring_pages')
+
+
+def _wiring_page_key(page_specs, project_info, page_start):
+    """Cache key for one wiring page: everything that ends up drawn on it.
+
+    Includes this module's source, so a change to the drawing code never
+    serves a stale cached page.
+    """
+    payload = json.dumps({
+        'code': source_fingerprint(__file__),
+        'matplotlib': matplotlib.__version__,
+        'date': datetime.now().strftime('%m/%d/%Y'),  # printed in the titleblock
+        'page_start': page_start,
+        'specs': page_specs,
+        'project_info': project_info,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _prune_wiring_cache(cache_dir, keep=(), max_files=WIRING_CACHE_MAX_FILES):
+    """Delete the least recently used cached pages beyond max_files."""
+    try:
+        entries = [e for e in os.scandir(cache_dir) if e.name.endswith('.pdf')]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - max_files]:
+        if entry.path in keep:
+            continue
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
 def _create_single_wiring_page(specs, project_info, start_idx):
     """Create one 11x17 page with 1-2 wiring diagrams plus titleblock."""
     fig = plt.figure(figsize=(PAGE_WIDTH, PAGE_HEIGHT))
@@ -0,0 +1,102 @@
+"""Uniform-grid broad phase for axis-aligned bounding boxes.
+
+Site Preview hit-testing and overlap checks used to compare every item
+against every other. UniformGrid buckets boxes by the world-space cells they
+cover, so a query only looks at items in nearby cells. Pure Python, no Tk.
+
+Boxes are (xmin, ymin, xmax, ymax) in world feet. Intersection is inclusive:
+boxes that merely touch are reported, matching the SAT checks downstream.
+"""
+
+import math
+
+
+def bbox_of(points):
+    """(xmin, ymin, xmax, ymax) of an iterable of (x, y) points."""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def boxes_intersect(a, b):
+    """True if two (xmin, ymin, xmax, ymax) boxes overlap or touch."""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class UniformGrid:
+    """Spatial hash of keyed bounding boxes on square cells of `cell_size` ft."""
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size) if cell_size and cell_size > 0 else 1.0
+        self._cells = {}  # (cx, cy) -> [key, ...]
+        self._boxes = {}  # key -> bbox
+
+    @classmethod
+    def from_boxes(cls, boxes, cell_size=None):
+        """Build a grid over {key: bbox}.
+
+        cell_size defaults to the mean of the boxes' larger side, which keeps
+        both the cells-per-box and boxes-per-cell counts small.
+        """
+        if cell_size is None:
+            sides = [max(b[2] - b[0], b[3] - b[1]) for b in boxes.values()]
+            cell_size = sum(sides) / len(sides) if sides else 1.0
+        grid = cls(cell_size)
+        for key, bbox in boxes.items():
+            grid.insert(key, bbox)
+        return grid
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def _cell_range(self, bbox):
+        cs = self.cell_size
+        return (math.floor(bbox[0] / cs), math.floor(bbox[1] / cs),
+                math.floor(bbox[2] / cs), math.floor(bbox[3] / cs))
+
+    def insert(self, key, bbox):
+        """Add `key` with bounding box `bbox`. Keys must be unique."""
+        self._boxes[key] = bbox
+        cx0, cy0, cx1, cy1 = self._cell_range(bbox)
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cells.setdefault((cx, cy), []).append(key)
+
+    def query(self, bbox):
+        """Keys whose boxes intersect `bbox`."""
+        cx0, cy0, cx1, cy1 = self._cell_range(bbox)
+        seen = set()
+        hits = []
+        boxes = self._boxes
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for key in self._cells.get((cx, cy), ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if boxes_intersect(boxes[key], bbox):
+                        hits.append(key)
+        return hits
+
+    def query_point(self, x, y):
+        """Keys whose boxes contain the point (x, y)."""
+        cs = self.cell_size
+        boxes = self._boxes
+        return [key for key in self._cells.get((math.floor(x / cs), math.floor(y / cs)), ())
+                if boxes[key][0] <= x <= boxes[key][2] and boxes[key][1] <= y <= boxes[key][3]]
+
+    def candidate_pairs(self):
+        """Sorted (a, b) key pairs, a < b, whose boxes intersect."""
+        pairs = set()
+        boxes = self._boxes
+        for keys in self._cells.values():
+            n = len(keys)
+            for i in range(n):
+                a = keys[i]
+                for j in range(i + 1, n):
+                    b = keys[j]
+                    pair = (a, b) if a < b else (b, a)
+                    if pair not in pairs and boxes_intersect(boxes[a], boxes[b]):
+                        pairs.add(pair)
+        return sorted(pairs)
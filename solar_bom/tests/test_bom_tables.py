@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.bom_tables import BOM_TABLE_SCHEMAS, conform_table, parquet_engine, write_bom_tables
+
+
+def _summary():
+    return pd.DataFrame([
+        {'Component Type': '--- Cables ---', 'Description': '', 'Part Number': '', 'Quantity': '', 'Unit': ''},
+        {'Component Type': 'Whip', 'Description': 'Whip 10ft, 10 AWG', 'Part Number': 'WHP-10',
+         'Quantity': 12, 'Unit': 'ea', 'Unit Price': 3.5},
+        {'Component Type': 'Extender', 'Description': 'Extender 20ft', 'Part Number': '',
+         'Quantity': 5.5, 'Unit': 'feet', 'Unit Price': None},
+    ])
+
+
+class TestBomTables(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_schema_is_stable(self):
+        """Test every table gets its schema's columns and dtypes, even when empty"""
+        for table, schema in BOM_TABLE_SCHEMAS.items():
+            for df in (pd.DataFrame(), None):
+                out = conform_table(df, table)
+                self.assertEqual(list(out.columns), [c for c, _, _ in schema])
+                self.assertEqual([str(t) for t in out.dtypes], [d for _, _, d in schema])
+                self.assertEqual(len(out), 0)
+
+    def test_summary_rows(self):
+        """Test section rows are dropped, blanks become nulls and extended price is filled"""
+        out = conform_table(_summary(), 'summary')
+        self.assertEqual(list(out['component_type']), ['Whip', 'Extender'])
+        self.assertAlmostEqual(out['extended_price'][0], 42.0)
+        self.assertTrue(pd.isna(out['extended_price'][1]))
+        self.assertTrue(pd.isna(out['part_number'][1]))
+
+    def test_csv_round_trip(self):
+        """Test one CSV per table, readable back with the same values"""
+        tables = {'summary': _summary(), 'block_allocation': pd.DataFrame()}
+        written = write_bom_tables(tables, self.tmp.name, stem='site', formats=['csv'])
+        self.assertEqual(sorted(os.path.basename(p) for p in written),
+                         ['site_block_allocation.csv', 'site_summary.csv'])
+        self.assertEqual(sorted(os.listdir(self.tmp.name)),
+                         ['site_block_allocation.csv', 'site_summary.csv'])
+        back = pd.read_csv(os.path.join(self.tmp.name, 'site_summary.csv'))
+        self.assertEqual(list(back.columns), [c for c, _, _ in BOM_TABLE_SCHEMAS['summary']])
+        self.assertEqual(list(back['quantity']), [12.0, 5.5])
+        empty = pd.read_csv(os.path.join(self.tmp.name, 'site_block_allocation.csv'))
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(list(empty.columns), [c for c, _, _ in BOM_TABLE_SCHEMAS['block_allocation']])
+
+    def test_bad_arguments(self):
+        """Test unknown formats and tables raise ValueError"""
+        with self.assertRaises(ValueError):
+            write_bom_tables({'summary': _summary()}, self.tmp.name, formats=['xlsx'])
+        with self.assertRaises(ValueError):
+            write_bom_tables({'pricing': _summary()}, self.tmp.name, formats=['csv'])
+
+    @unittest.skipIf(parquet_engine() is not None, "a Parquet engine is installed")
+    def test_parquet_without_engine(self):
+        """Test asking for Parquet without pyarrow/fastparquet raises ImportError before writing"""
+        with self.assertRaises(ImportError):
+            write_bom_tables({'summary': _summary()}, self.tmp.name)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    @unittest.skipIf(parquet_engine() is None, "no Parquet engine installed")
+    def test_parquet_round_trip(self):
+        """Test Parquet files keep the schema's dtypes"""
+        write_bom_tables({'summary': _summary()}, self.tmp.name, formats=['parquet'])
+        back = pd.read_parquet(os.path.join(self.tmp.name, 'bom_summary.parquet'))
+        self.assertEqual(list(back.columns), [c for c, _, _ in BOM_TABLE_SCHEMAS['summary']])
+        self.assertEqual(str(back['quantity'].dtype), 'float64')
+
+
+if __name__ == '__main__':
+    unittest.main()
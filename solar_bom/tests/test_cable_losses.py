@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.cable_losses import (
+    LOSS_CABLE_TYPES, cable_losses, device_loss_summary, estimate_cable_runs, write_cable_loss_sheet,
+)
+from src.utils.cable_sizing import get_ampacity_table, get_voltage_drop_pct, voltage_drop_many
+from src.utils.estimate_engine import EstimateEngine
+from src.utils.excel_stream import save_with_streamed_sheets
+from src.utils.inverter_library import load_merged_inverter_specs
+
+from tests.test_estimate_engine import TEMPLATES, make_estimate
+
+
+class TestVoltageDropMany(unittest.TestCase):
+    def test_matches_scalar(self):
+        """Test the array form returns get_voltage_drop_pct for every run, unknown sizes included"""
+        gauges = ['10 AWG', '4/0 AWG', '12 AWG', '500 kcmil', '3 AWG', 'bogus']
+        materials = ['copper', 'aluminum', 'copper', 'aluminum', 'unobtainium', 'copper']
+        current = np.array([13.25, 200.0, 9.0, 350.0, 40.0, 10.0])
+        length = np.array([300.0, 1200.0, 50.0, 0.0, 100.0, 100.0])
+        voltage = np.array([1162.0, 800.0, 1162.0, 1500.0, 1500.0, 0.0])
+        result = voltage_drop_many(current, length, get_ampacity_table().gauge_index(gauges),
+                                   np.array(materials, dtype=object), voltage)
+        for i in range(len(gauges)):
+            self.assertEqual(result['vd_pct'][i],
+                             get_voltage_drop_pct(current[i], length[i], gauges[i], materials[i], voltage[i]))
+        self.assertTrue(np.allclose(result['loss_w'], current * result['vd_v']))
+        self.assertEqual(result['loss_w'][4], 0.0)
+
+
+class TestCableLosses(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        inverters, _ = load_merged_inverter_specs()
+        cls.engine = EstimateEngine(make_estimate(), TEMPLATES, inverter=inverters['SMA Highpower PEAK3 150kW'])
+        cls.totals = cls.engine.calculate()
+        cls.losses = cable_losses(estimate_cable_runs(cls.engine, cls.totals))
+
+    def test_runs_cover_estimate(self):
+        """Test every harness and whip of the estimate is a run"""
+        by_type = self.losses.groupby('cable_type')['circuits'].sum()
+        self.assertEqual(by_type['harness'], sum(self.totals['harnesses_by_size'].values()))
+        self.assertEqual(by_type['whip'], sum(self.totals['whips_by_length'].values()) / 2)
+        whip_ft = sum(length * count for (length, _), count in self.totals['whips_by_length'].items())
+        whips = self.losses[self.losses['cable_type'] == 'whip']
+        self.assertAlmostEqual((whips['one_way_length_ft'] * whips['circuits'] * 2).sum(), whip_ft)
+        strings = sum(spt * count for spt, count in self.totals['trackers_by_string'].items())
+        self.assertEqual(by_type['string'], strings)
+        self.assertTrue(set(self.losses['cable_type']) <= set(LOSS_CABLE_TYPES))
+        self.assertTrue((self.losses['current_a'] > 0).all())
+
+    def test_engine_totals(self):
+        """Test calculate() reports the site and per-device losses of the run table"""
+        reported = self.totals['cable_losses']
+        self.assertAlmostEqual(reported['total_loss_w'], self.losses['total_loss_w'].sum())
+        self.assertAlmostEqual(reported['loss_pct'],
+                               reported['total_loss_w'] / (self.totals['total_dc_kw'] * 10.0))
+        self.assertAlmostEqual(sum(reported['by_cable_type'].values()), reported['total_loss_w'])
+        summary = device_loss_summary(self.losses)
+        self.assertEqual(list(reported['by_device']), list(summary['device_idx']))
+        first = reported['by_device'][summary['device_idx'][0]]
+        self.assertEqual(first['device_name'], 'SI-01')
+        self.assertAlmostEqual(first['total_loss_w'], summary['total_loss_w'][0])
+
+    def test_summary_and_sheet(self):
+        """Test the per-device summary adds up and is written to the workbook"""
+        summary = device_loss_summary(self.losses)
+        self.assertEqual(list(summary['device_name'][:2]), ['SI-01', 'SI-02'])
+        self.assertAlmostEqual(summary['total_loss_w'].sum(), self.losses['total_loss_w'].sum())
+
+        wb = Workbook()
+        wb.active.title = 'Cable Losses'
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'losses.xlsx')
+            save_with_streamed_sheets(wb, path, {'Cable Losses': lambda ws: write_cable_loss_sheet(
+                ws, self.losses, dc_power_w=self.totals['total_dc_kw'] * 1000.0)})
+            ws = load_workbook(path)['Cable Losses']
+        self.assertEqual(ws['A5'].value, 'Device')
+        self.assertEqual(ws['A5'].style, 'BOM Header')
+        self.assertEqual(ws['A6'].value, 'SI-01')
+        self.assertEqual(ws.max_row, 5 + len(summary) + 4 + len(self.losses))
+
+
+if __name__ == '__main__':
+    unittest.main()
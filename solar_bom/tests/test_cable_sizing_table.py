@@ -0,0 +1,110 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import cable_sizing
+from src.utils.cable_sizing import (
+    autosize_cache_info, autosize_conductor, autosize_harness_for_block, autosize_many,
+    get_ampacity_table, get_base_ampacity, reload_nec_tables,
+)
+
+SETTINGS = dict(material='copper', insulation_type='PV Wire', installation_method='conduit',
+                ambient_c=40, ccc_count=4, termination_temp_c=75, vd_target_pct=2.0)
+
+
+class TestAmpacityTable(unittest.TestCase):
+    def test_table_matches_nec_lookups(self):
+        """Test the dense table holds the same base ampacities as the dict lookups"""
+        table = get_ampacity_table()
+        for material in ('copper', 'aluminum'):
+            for method in ('conduit', 'free_air'):
+                row = table.ampacity_row(material, 90, method == 'free_air')
+                for i, gauge in enumerate(table.gauges):
+                    self.assertEqual(row[i], get_base_ampacity(gauge, material, 90, method), gauge)
+        self.assertFalse(table.ampacity_row('unobtainium', 90, False).any())
+
+    def test_batch_matches_single_runs(self):
+        """Test autosize_many picks the gauge autosize_conductor picks for every run"""
+        rng = np.random.default_rng(7)
+        isc = rng.uniform(0, 400, 200)
+        ocpd = rng.choice([0.0, 100.0, 400.0], 200)
+        length = rng.choice([0.0, 150.0, 900.0, 2500.0], 200)
+        for method in ('conduit', 'free_air'):
+            settings = dict(SETTINGS, installation_method=method)
+            batch = autosize_many(isc, ocpd, length, source_voltage=1500.0, **settings)
+            for i in range(len(isc)):
+                single = autosize_conductor(isc[i], ocpd[i], one_way_length_ft=length[i],
+                                            source_voltage=1500.0, **settings)
+                self.assertEqual(batch['gauge'][i], single['gauge'])
+                self.assertEqual(batch['binding_constraint'][i], single['binding_constraint'])
+                self.assertEqual(batch['ampacity_passes'][i], single['ampacity_passes'])
+                self.assertEqual(batch['vd_passes'][i], single['vd_passes'])
+
+    def test_details_match_single_runs(self):
+        """Test autosize_many details are the breakdown autosize_conductor returns"""
+        rng = np.random.default_rng(3)
+        isc = rng.uniform(0, 400, 60)
+        length = rng.choice([0.0, 150.0, 2500.0], 60)
+        batch = autosize_many(isc, 100.0, length, source_voltage=1500.0, details=True, **SETTINGS)
+        for i in range(len(isc)):
+            self.assertEqual(batch['details'][i],
+                             autosize_conductor(isc[i], 100.0, one_way_length_ft=length[i],
+                                                source_voltage=1500.0, **SETTINGS))
+        self.assertNotIn('details', autosize_many(isc, 0, 0, source_voltage=0, **SETTINGS))
+
+    def test_binding_constraints(self):
+        """Test ampacity-bound, voltage-drop-bound and oversized runs"""
+        batch = autosize_many([10.0, 10.0, 5000.0], 0, [0.0, 5000.0, 0.0], source_voltage=1500.0,
+                              **SETTINGS)
+        self.assertEqual(list(batch['binding_constraint']), ['ampacity', 'voltage_drop', 'ampacity'])
+        self.assertEqual(list(batch['ampacity_passes']), [True, True, False])
+        largest = cable_sizing.CABLE_SIZE_ORDER_EXTENDED[-1]
+        self.assertEqual(batch['gauge'][2], largest)
+
+
+class TestAutosizeMemo(unittest.TestCase):
+    def setUp(self):
+        cable_sizing.clear_autosize_cache()
+
+    def test_repeat_calls_hit(self):
+        """Test identical inputs are sized once, positional or keyword, and callers get their own dict"""
+        args = (20.0, 0.0, 'copper', 'PV Wire', 'free_air', 40, 1, 90, 300.0, 1500.0, 2.0)
+        first = autosize_conductor(*args)
+        first['gauge'] = 'edited'
+        second = autosize_conductor(**dict(zip(
+            ('isc_total_a', 'ocpd_rating_a', 'material', 'insulation_type', 'installation_method',
+             'ambient_c', 'ccc_count', 'termination_temp_c', 'one_way_length_ft', 'source_voltage',
+             'vd_target_pct'), args)))
+        self.assertNotEqual(second['gauge'], 'edited')
+        info = autosize_cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+        # 40 and 40.0 are echoed back as given, so they are separate entries
+        self.assertEqual(autosize_conductor(*args[:5], 40.0, *args[6:])['ambient_temp_c'], 40.0)
+        self.assertEqual(autosize_cache_info().misses, 2)
+
+    def test_wrappers_share_memo(self):
+        """Test the project-aware wrappers go through the memo"""
+        settings = {'ambient_temp_c': 35, 'per_cable_type': {}}
+        a = autosize_harness_for_block(4, 14.0, settings, 'whip', 200.0, 1300.0)
+        b = autosize_harness_for_block(4, 14.0, settings, 'whip', 200.0, 1300.0)
+        self.assertEqual(a, b)
+        self.assertEqual(autosize_cache_info().hits, 1)
+
+    def test_reload_clears_memo(self):
+        """Test reloading the NEC tables drops memoized results"""
+        autosize_conductor(20.0, 0.0, 'copper', 'PV Wire', 'conduit', 30, 2, 75, 0.0, 0.0, 2.0)
+        table = get_ampacity_table()
+        reload_nec_tables()
+        self.assertEqual(autosize_cache_info().currsize, 0)
+        self.assertIsNot(get_ampacity_table(), table)
+
+
+if __name__ == '__main__':
+    unittest.main()
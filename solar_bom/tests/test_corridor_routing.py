@@ -0,0 +1,105 @@
+import unittest
+import sys
+import random
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import corridor_routing
+from src.utils.corridor_routing import CorridorIndex, CorridorNetwork
+
+# Hand-drawn road: climbs, doubles back in y, then runs flat
+ROAD = [(0.0, 0.0), (100.0, 50.0), (200.0, 50.0), (300.0, 120.0), (350.0, 20.0), (500.0, 20.0)]
+
+
+class TestCorridorIndex(unittest.TestCase):
+    def test_lookups_match_scans(self):
+        """Test crossings, nearest vertex and arc length match the polyline scans"""
+        index = CorridorIndex(ROAD)
+        for y in (-10.0, 0.0, 20.0, 35.0, 50.0, 80.0, 120.0, 200.0):
+            self.assertEqual(index.intersect_horizontal(y), corridor_routing.intersect_horizontal(y, ROAD), y)
+            self.assertEqual(index.nearest_endpoint((0.0, y)), corridor_routing.nearest_endpoint((0.0, y), ROAD), y)
+        for pos in ((0, 0.0), (2, 0.5), (4, 1.0)):
+            self.assertEqual(index.arc_length_at(pos), corridor_routing._arc_param_to_length(ROAD, *pos))
+
+    def test_three_leg_distance_matches_scan(self):
+        """Test routed totals and path geometry for random devices, on-vertex ys included"""
+        rng = random.Random(11)
+        index = CorridorIndex(ROAD)
+        devices = [(rng.uniform(-50, 550), rng.choice([rng.uniform(-20, 140), rng.choice(ROAD)[1]]))
+                   for _ in range(200)]
+        pads = [(260.0, 60.0)] * len(devices)
+        expected = [_scan_three_leg(device, pad, ROAD) for device, pad in zip(devices, pads)]
+        self.assertEqual(index.three_leg_distances(devices, pads), expected)
+
+    def test_simple_route(self):
+        """Test a device and pad on a straight corridor"""
+        total, path = CorridorIndex([(0, 0), (0, 100)]).three_leg_distance((30.0, 10.0), (-20.0, 90.0))
+        self.assertEqual(total, 30.0 + 80.0 + 20.0)
+        self.assertEqual(path, [(30.0, 10.0), (0.0, 10.0), (0.0, 90.0), (-20.0, 90.0)])
+
+
+class TestCorridorNetwork(unittest.TestCase):
+    def test_single_corridor_unchanged(self):
+        """Test a lone corridor routes exactly like three_leg_distance"""
+        rng = random.Random(5)
+        network = CorridorNetwork([ROAD, []])
+        requests = [(0, (rng.uniform(-50, 550), rng.uniform(-20, 140)), (260.0, 60.0)) for _ in range(50)]
+        self.assertEqual(network.route_many(requests),
+                         [corridor_routing.three_leg_distance(d, p, ROAD) for _, d, p in requests])
+
+    def test_route_changes_road_at_junction(self):
+        """Test a device on a diagonal road reaches a pad beside a crossing road through the junction"""
+        diagonal = [(0.0, 0.0), (1000.0, 1000.0)]
+        road = [(0.0, -200.0), (0.0, 1000.0)]
+        network = CorridorNetwork([diagonal, road])
+        total, path = network.route(0, (50.0, 50.0), (10.0, 900.0))
+        single, _ = corridor_routing.three_leg_distance((50.0, 50.0), (10.0, 900.0), diagonal)
+        self.assertAlmostEqual(total, 50.0 * 2 ** 0.5 + 900.0 + 10.0)
+        self.assertLess(total, single)
+        self.assertEqual(path, [(50.0, 50.0), (50.0, 50.0), (0.0, 0.0), (0.0, 900.0), (10.0, 900.0)])
+        # The pad's tree is shared by later devices
+        self.assertEqual(len(network._trees), 1)
+        network.route(0, (80.0, 80.0), (10.0, 900.0))
+        self.assertEqual(len(network._trees), 1)
+
+    def test_snapped_t_junction(self):
+        """Test a road ending just short of another is still joined to it"""
+        diagonal = [(0.0, 0.0), (1000.0, 1000.0)]
+        spur = [(-1.5, 0.0), (-1.5, 1000.0)]
+        total, path = CorridorNetwork([diagonal, spur]).route(0, (50.0, 50.0), (10.0, 900.0))
+        self.assertAlmostEqual(total, 50.0 * 2 ** 0.5 + 1.5 + 900.0 + 11.5)
+        self.assertIn((-1.5, 0.0), path)
+        far_spur = [(-5.0, 0.0), (-5.0, 1000.0)]
+        _, path = CorridorNetwork([diagonal, far_spur]).route(0, (50.0, 50.0), (10.0, 900.0))
+        self.assertNotIn((-5.0, 0.0), path)
+
+    def test_exit_needs_pad_row(self):
+        """Test a corridor that never reaches the pad's row is not used as its exit"""
+        network = CorridorNetwork([[(0, 0), (0, 1000)], [(2000, 1000), (0, 1000)]])
+        total, path = network.route(0, (10, 1000), (2000, 0))
+        self.assertEqual(total, 3010.0)
+        self.assertEqual(path, [(10, 1000), (0.0, 1000), (0, 0), (0.0, 0), (2000, 0)])
+
+
+def _scan_three_leg(device_xy, pad_xy, polyline):
+    """Reference three-leg route by full scans of the polyline."""
+    entry_x, entry_pos = corridor_routing.pick_entry(device_xy, polyline)
+    exit_x, exit_pos = corridor_routing.pick_entry(pad_xy, polyline)
+    total = (abs(device_xy[0] - entry_x) + corridor_routing.polyline_arc_length(polyline, entry_pos, exit_pos)
+             + abs(pad_xy[0] - exit_x))
+    entry_len = corridor_routing._arc_param_to_length(polyline, *entry_pos)
+    exit_len = corridor_routing._arc_param_to_length(polyline, *exit_pos)
+    lo, hi = sorted((entry_len, exit_len))
+    middle = [polyline[i] for i in range(len(polyline) - 1)
+              if corridor_routing._arc_param_to_length(polyline, i, 1.0) > lo
+              and lo <= corridor_routing._arc_param_to_length(polyline, i, 0.0) < hi]
+    if entry_len > exit_len:
+        middle.reverse()
+    return total, [device_xy, (entry_x, device_xy[1])] + middle + [(exit_x, pad_xy[1]), pad_xy]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import data_store
+
+
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'library.json')
+
+    def tearDown(self):
+        data_store.invalidate(self.path)
+        self.tmpdir.cleanup()
+
+    def _write(self, data, mtime_ns):
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_cached_until_mtime_changes(self):
+        """Test that the parsed object is reused until the file changes"""
+        self._write({'a': 1}, 1_000_000_000)
+        first = data_store.load_json(self.path)
+        self.assertEqual(first, {'a': 1})
+        self.assertIs(data_store.load_json(self.path), first)
+
+        self._write({'a': 2}, 2_000_000_000)
+        second = data_store.load_json(self.path)
+        self.assertEqual(second, {'a': 2})
+        self.assertIsNot(second, first)
+
+    def test_missing_or_invalid_file_returns_default(self):
+        """Test the default for a missing file and for unparseable JSON"""
+        self.assertEqual(data_store.load_json(self.path, {}), {})
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        self.assertEqual(data_store.load_json(self.path, {}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import copy
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import device_geometry
+from src.utils.estimate_engine import EstimateCache, EstimateEngine, EstimateValidationError
+from src.utils.inverter_library import load_merged_inverter_specs
+
+
+MODULE_SPEC = {
+    "manufacturer": "Acme", "model": "M-550", "type": "Mono PERC",
+    "length_mm": 2278, "width_mm": 1134, "depth_mm": 35, "weight_kg": 28,
+    "wattage": 550, "vmp": 41.5, "imp": 13.25, "voc": 49.6, "isc": 14.0,
+    "max_system_voltage": 1500,
+}
+
+TEMPLATES = {
+    "Acme - 3S": {
+        "module_orientation": "Portrait", "modules_per_string": 28, "strings_per_tracker": 3,
+        "module_spacing_m": 0.02, "has_motor": True, "motor_gap_m": 1.0,
+        "motor_position_after_string": 1, "motor_placement_type": "between_strings",
+        "module_spec": MODULE_SPEC,
+    },
+}
+
+
+def make_estimate(topology="Distributed String", strings_per_device="12"):
+    return {
+        "groups": [{
+            "id": "g1", "name": "Group 1", "row_spacing_ft": 20.0,
+            "device_position": "middle", "position_x": 0.0, "position_y": 0.0,
+            "driveline_angle": 0.0,
+            "segments": [{"quantity": 8, "strings_per_tracker": 3,
+                          "harness_config": "3", "template_ref": "Acme - 3S"}],
+        }],
+        "topology": topology,
+        "lv_collection_method": "Wire Harness",
+        "strings_per_device": strings_per_device,
+        "central_inverter_count": "1",
+        "wire_sizing": {},
+    }
+
+
+class TestEstimateEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        inverters, _ = load_merged_inverter_specs()
+        cls.inverter = inverters['SMA Highpower PEAK3 150kW']
+
+    def test_distributed_string_totals(self):
+        """Test a headless calculation without any UI"""
+        engine = EstimateEngine(make_estimate(), TEMPLATES, inverter=self.inverter)
+        totals = engine.calculate()
+
+        self.assertEqual(dict(totals['trackers_by_string']), {3: 8})
+        self.assertEqual(dict(totals['harnesses_by_size']), {3: 8})
+        self.assertEqual(totals['string_inverters'], 2)
+        self.assertEqual(len(engine._tracker_to_segment), 8)
+
+    def test_cached_recalculation_matches_full(self):
+        """Test that an edit reuses unchanged groups and matches a full recalculation"""
+        estimate = make_estimate()
+        second = copy.deepcopy(estimate['groups'][0])
+        second.update(id="g2", name="Group 2", position_x=400.0)
+        estimate['groups'].append(second)
+
+        cache = EstimateCache()
+        EstimateEngine(copy.deepcopy(estimate), TEMPLATES, inverter=self.inverter, cache=cache).calculate()
+
+        estimate['groups'][1]['segments'][0]['quantity'] = 6
+        misses = cache.misses
+        cached = EstimateEngine(copy.deepcopy(estimate), TEMPLATES, inverter=self.inverter, cache=cache).calculate()
+        full = EstimateEngine(copy.deepcopy(estimate), TEMPLATES, inverter=self.inverter).calculate()
+
+        # Only the edited group's partial, allocation, layout and wiring are recomputed
+        self.assertEqual(cache.misses - misses, 4)
+        self.assertEqual(dict(cached['trackers_by_string']), {3: 14})
+        self.assertEqual(cached['inverter_summary']['allocation_result'],
+                         full['inverter_summary']['allocation_result'])
+        self.assertEqual(dict(cached['whips_by_length']), dict(full['whips_by_length']))
+
+    def test_cached_recalculation_skips_unchanged_groups(self):
+        """Test that layout, whips, extenders and feeder routes are only redone for the edited group"""
+        estimate = make_estimate()
+        second = copy.deepcopy(estimate['groups'][0])
+        second.update(id="g2", name="Group 2", position_x=400.0)
+        estimate['groups'].append(second)
+        estimate['pads'] = [{"x": 200.0, "y": -100.0, "width_ft": 10.0, "height_ft": 8.0,
+                             "assigned_devices": [0, 1, 2, 3]}]
+
+        cache = EstimateCache()
+        EstimateEngine(copy.deepcopy(estimate), TEMPLATES, inverter=self.inverter, cache=cache).calculate()
+
+        estimate['groups'][1]['segments'][0]['quantity'] = 6
+        spies = {name: mock.patch.object(EstimateEngine, name, autospec=True,
+                                         side_effect=getattr(EstimateEngine, name))
+                 for name in ('_wiring_partial', '_route_feeder')}
+        with mock.patch.object(device_geometry, 'group_layout_entry',
+                               wraps=device_geometry.group_layout_entry) as geometry, \
+                spies['_wiring_partial'] as wiring, spies['_route_feeder'] as route:
+            cached = EstimateEngine(copy.deepcopy(estimate), TEMPLATES, inverter=self.inverter,
+                                    cache=cache).calculate()
+        full = EstimateEngine(copy.deepcopy(estimate), TEMPLATES, inverter=self.inverter).calculate()
+
+        self.assertEqual([call.args[0]['id'] for call in geometry.call_args_list], ["g2"])
+        self.assertEqual([list(call.args[1]) for call in wiring.call_args_list], [[1]])
+        self.assertEqual(sorted(call.args[1] for call in route.call_args_list), [2, 3])
+        for key in ('whips_by_length', 'extenders_pos_by_length', 'extenders_neg_by_length',
+                    'routed_feeder_details'):
+            self.assertEqual(cached[key], full[key], key)
+
+    def test_missing_inverter_raises(self):
+        """Test that a missing inverter surfaces as a validation error"""
+        engine = EstimateEngine(make_estimate(), TEMPLATES)
+        with self.assertRaises(EstimateValidationError) as ctx:
+            engine.calculate()
+        self.assertEqual(ctx.exception.title, "No Inverter Selected")
+
+    def test_parse_harness_config(self):
+        """Test harness config parsing"""
+        self.assertEqual(EstimateEngine.parse_harness_config("2+1"), [2, 1])
+        self.assertEqual(EstimateEngine.parse_harness_config("4"), [4])
+
+
+if __name__ == '__main__':
+    unittest.main()
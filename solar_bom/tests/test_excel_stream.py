@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.bom_generator import BOMGenerator
+from src.utils.excel_stream import add_named_styles, save_with_streamed_sheets, styled_row
+
+
+def _bom_table():
+    return pd.DataFrame([
+        {'Component Type': '--- Cables ---', 'Part Number': None, 'Description': None,
+         'Quantity': None, 'Unit': None, 'Unit Price': None},
+        {'Component Type': 'Whip', 'Part Number': 'WHP-10', 'Description': 'Whip 10ft, 10 AWG',
+         'Quantity': 12, 'Unit': 'ea', 'Unit Price': 3.5},
+        {'Component Type': 'Whip', 'Part Number': 'N/A', 'Description': 'Unmatched whip',
+         'Quantity': 2, 'Unit': 'ea', 'Unit Price': 1.25},
+        {'Component Type': 'Extender', 'Part Number': 'EXT-20', 'Description': 'Extender 20ft',
+         'Quantity': 5.5, 'Unit': 'feet (warning: over length)', 'Unit Price': float('nan')},
+    ])
+
+
+def _cell_format(cell):
+    return (cell.font.b, cell.font.sz, cell.fill.fgColor.rgb, cell.border.left.style,
+            cell.alignment.horizontal, cell.alignment.wrap_text)
+
+
+class TestExcelStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'out.xlsx')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sheet_order_and_copy(self):
+        """Test in-memory sheets are copied and streamed sheets land in their placeholder's slot"""
+        wb = Workbook()
+        info = wb.active
+        info.title = 'Info'
+        info.merge_cells('A1:C1')
+        info['A1'] = 'Title'
+        info['A1'].font = Font(bold=True, size=14)
+        info['B3'] = 42
+        info['B3'].fill = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
+        info.column_dimensions['B'].width = 33
+        info.auto_filter.ref = 'A2:C3'
+        wb.create_sheet('Big')
+        wb.create_sheet('After')['A1'] = 'tail'
+
+        def write_big(ws):
+            ws.column_dimensions['A'].width = 20
+            for i in range(100):
+                ws.append(styled_row(ws, [f'row {i}', i], 'BOM Cell'))
+
+        save_with_streamed_sheets(wb, self.path, {'Big': write_big})
+
+        out = load_workbook(self.path)
+        self.assertEqual(out.sheetnames, ['Info', 'Big', 'After'])
+        info = out['Info']
+        self.assertEqual(info['A1'].value, 'Title')
+        self.assertTrue(info['A1'].font.b)
+        self.assertEqual(info['B3'].value, 42)
+        self.assertEqual(info['B3'].fill.fgColor.rgb, '00FFCCCC')
+        self.assertEqual([str(r) for r in info.merged_cells.ranges], ['A1:C1'])
+        self.assertEqual(info.column_dimensions['B'].width, 33)
+        self.assertEqual(info.auto_filter.ref, 'A2:C3')
+        big = out['Big']
+        self.assertEqual(big.max_row, 100)
+        self.assertEqual(big['B100'].value, 99)
+        self.assertEqual(big['A1'].style, 'BOM Cell')
+        self.assertEqual(big.column_dimensions['A'].width, 20)
+        self.assertEqual(out['After']['A1'].value, 'tail')
+
+    def test_streamed_block_details_match_in_memory(self):
+        """Test the streamed Block Details sheet looks like _format_excel_sheet's in-memory one"""
+        generator = BOMGenerator({})
+        data = _bom_table()
+
+        mem_path = os.path.join(self.tmp.name, 'memory.xlsx')
+        with pd.ExcelWriter(mem_path, engine='openpyxl') as writer:
+            data.to_excel(writer, sheet_name='Block Details', index=False)
+            generator._format_excel_sheet(writer.sheets['Block Details'], data)
+
+        wb = Workbook()
+        wb.active.title = 'Block Details'
+        save_with_streamed_sheets(wb, self.path, {
+            'Block Details': lambda ws: generator._write_block_details_sheet(ws, data)})
+
+        memory = load_workbook(mem_path)['Block Details']
+        streamed = load_workbook(self.path)['Block Details']
+        self.assertEqual(streamed.max_row, memory.max_row)
+        self.assertEqual(sorted(map(str, streamed.merged_cells.ranges)),
+                         sorted(map(str, memory.merged_cells.ranges)))
+        for col in 'ABCDEF':
+            self.assertEqual(streamed.column_dimensions[col].width, memory.column_dimensions[col].width)
+        for row_m, row_s in zip(memory.iter_rows(), streamed.iter_rows()):
+            # Merged-over cells only keep their borders
+            for cell_m, cell_s in zip(row_m[:1] if row_m[0].row == 2 else row_m, row_s):
+                self.assertEqual(cell_s.value in (None, ''), cell_m.value in (None, ''), cell_s.coordinate)
+                if cell_m.value not in (None, ''):
+                    self.assertEqual(cell_s.value, cell_m.value, cell_s.coordinate)
+                self.assertEqual(_cell_format(cell_s), _cell_format(cell_m), cell_s.coordinate)
+
+        # Section label, warning row and blacked-out price of the N/A part
+        self.assertEqual(streamed['A2'].value, 'Cables')
+        self.assertEqual(streamed['A5'].fill.fgColor.rgb, '00FFCCCC')
+        self.assertIsNone(streamed['F4'].value)
+        self.assertEqual(streamed['F4'].fill.fgColor.rgb, '00000000')
+        self.assertEqual(streamed['F3'].number_format, '"$"#,##0.00')
+
+    def test_named_styles_registered_once(self):
+        """Test add_named_styles can be called repeatedly on the same workbook"""
+        wb = Workbook()
+        add_named_styles(wb)
+        count = len(wb.named_styles)
+        add_named_styles(wb)
+        self.assertEqual(len(wb.named_styles), count)
+        self.assertIn('BOM Header', wb.named_styles)
+
+
+if __name__ == '__main__':
+    unittest.main()
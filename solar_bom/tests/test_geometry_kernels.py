@@ -0,0 +1,48 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import geometry_kernels
+
+
+class TestGeometryKernels(unittest.TestCase):
+    def test_rect_polys_and_bboxes(self):
+        """Test rectangle corners, rotation and bounding boxes"""
+        polys = geometry_kernels.rect_polys([0.0, 10.0], 0.0, 2.0, [4.0, 6.0])
+        self.assertEqual(polys.shape, (2, 4, 2))
+        self.assertEqual(polys[1].tolist(), [[10, 0], [12, 0], [12, 6], [10, 6]])
+        np.testing.assert_allclose(geometry_kernels.poly_bboxes(polys), [[0, 0, 2, 4], [10, 0, 12, 6]])
+
+        rotated = geometry_kernels.rotate_polys(polys[:1], 1.0, 2.0, 90)
+        np.testing.assert_allclose(geometry_kernels.poly_bboxes(rotated), [[-1, 1, 3, 3]], atol=1e-12)
+
+    def test_sat_overlap(self):
+        """Test SAT on overlapping, touching, separated and rotated quads"""
+        a = geometry_kernels.rect_polys([0, 0, 0], [0, 0, 0], 2, 2)
+        b = geometry_kernels.rect_polys([1, 2, 2.5], [1, 0, 0], 2, 2)
+        self.assertEqual(geometry_kernels.sat_overlap(a, b).tolist(), [True, True, False])
+
+        # A diamond whose bounding box overlaps the square but whose edges don't
+        diamond = geometry_kernels.rotate_polys(geometry_kernels.rect_polys(2, 2, 2, 2), 3, 3, 45)
+        self.assertFalse(geometry_kernels.sat_overlap(a[:1], diamond)[0])
+
+    def test_any_overlap_and_areas(self):
+        """Test set-vs-set overlap and box intersection areas"""
+        a = geometry_kernels.rect_polys([0, 10], 0, 2, 2)
+        b = geometry_kernels.rect_polys([11, 30], 1, 2, 2)
+        boxes_a = geometry_kernels.poly_bboxes(a)
+        boxes_b = geometry_kernels.poly_bboxes(b)
+        self.assertTrue(geometry_kernels.any_overlap(a, boxes_a, b, boxes_b))
+        self.assertFalse(geometry_kernels.any_overlap(a[:1], boxes_a[:1], b, boxes_b))
+        np.testing.assert_allclose(
+            geometry_kernels.aabb_intersection_areas(boxes_a, (1, 1, 11, 5)), [1.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
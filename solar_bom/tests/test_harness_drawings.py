@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from openpyxl import Workbook
+
+from src.utils.harness_drawing_generator import (HarnessDrawingGenerator, load_manifest,
+                                                 part_numbers_from_bom)
+
+
+class TestHarnessDrawings(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, 'drawings')
+        base = {'num_strings': 3, 'polarity': 'positive', 'string_spacing_ft': 26.0,
+                'drop_wire_gauge': '10 AWG', 'trunk_wire_gauge': '10 AWG', 'fused': False}
+        library = {
+            '_comment_': 'ignored',
+            'H-3P': dict(base, part_number='H-3P', atpi_part_number='PR-H3P'),
+            'H-3N': dict(base, part_number='H-3N', polarity='negative'),
+            'H-4P': dict(base, part_number='H-4P', num_strings=4),
+        }
+        self.library_path = os.path.join(self.tmp.name, 'harness_library.json')
+        with open(self.library_path, 'w') as f:
+            json.dump(library, f)
+        self.generator = HarnessDrawingGenerator(self.library_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_incremental(self):
+        """Test incremental runs redraw only parts whose spec changed"""
+        self.assertEqual(self.generator.generate_all_harness_drawings(self.out), 3)
+        self.assertEqual(sorted(load_manifest(self.out)), ['H-3N', 'H-3P', 'H-4P'])
+
+        drawn = []
+        original = self.generator._render_drawing
+        self.generator._render_drawing = lambda pn, out: drawn.append(pn) or original(pn, out)
+
+        self.assertEqual(self.generator.generate_all_harness_drawings(self.out, incremental=True), 3)
+        self.assertEqual(drawn, [])
+
+        self.generator.harness_library['H-4P']['string_spacing_ft'] = 30.0
+        os.remove(os.path.join(self.out, 'H-3N_harness_drawing.png'))
+        self.generator.generate_all_harness_drawings(self.out, incremental=True)
+        self.assertEqual(sorted(drawn), ['H-3N', 'H-4P'])
+
+    def test_part_selection_from_bom(self):
+        """Test BOM part numbers (keys or ATPI numbers) select parts to draw"""
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['Project BOM'])
+        ws.append([])
+        ws.append(['Component Type', 'Part Number', 'Quantity'])
+        ws.append(['Harness', 'PR-H3P', 10])
+        ws.append(['Harness', 'H-4P', 4])
+        ws.append(['Whip', 'WHIP-1', 8])
+        bom_path = os.path.join(self.tmp.name, 'bom.xlsx')
+        wb.save(bom_path)
+
+        part_numbers = part_numbers_from_bom(bom_path)
+        self.assertEqual(part_numbers, {'PR-H3P', 'H-4P', 'WHIP-1'})
+        self.assertEqual(self.generator.resolve_part_numbers(sorted(part_numbers)), ['H-4P', 'H-3P'])
+
+        self.assertEqual(self.generator.generate_all_harness_drawings(
+            self.out, part_numbers=part_numbers, incremental=True), 2)
+        self.assertEqual(sorted(f for f in os.listdir(self.out) if f.endswith('.png')),
+                         ['H-3P_harness_drawing.png', 'H-4P_harness_drawing.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.part_index import PartIndex
+from src.utils.bom_generator import BOMGenerator
+
+
+HARNESS_LIBRARY = {
+    "_comment_standard": "Standard harnesses",
+    "2P-10D8T-102": {"num_strings": 2, "polarity": "positive", "string_spacing_ft": 102.0,
+                     "trunk_wire_gauge": "8 AWG"},
+    "2P-10D10T-102": {"num_strings": 2, "polarity": "positive", "string_spacing_ft": 102.0,
+                      "trunk_wire_gauge": "10 AWG"},
+    "2P-10D8T-113": {"num_strings": 2, "polarity": "positive", "string_spacing_ft": 113.0,
+                     "trunk_wire_gauge": "8 AWG"},
+}
+
+WHIP_LIBRARY = {
+    "WHI-8-P-10": {"wire_gauge": "8 AWG", "polarity": "positive", "length_ft": 10},
+    "WHI-8-P-20": {"wire_gauge": "8 AWG", "polarity": "positive", "length_ft": 20},
+    "WHI-8-N-10": {"wire_gauge": "8 AWG", "polarity": "negative", "length_ft": 10},
+}
+
+
+class TestPartIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PartIndex(HARNESS_LIBRARY, WHIP_LIBRARY, {})
+
+    def test_find_harnesses(self):
+        """Test harness lookup with and without a trunk gauge filter"""
+        self.assertEqual(self.index.find_harnesses(2, "positive", 102.0, "8 AWG"), ["2P-10D8T-102"])
+        self.assertEqual(self.index.find_harnesses(2, "positive", 102.0),
+                         ["2P-10D10T-102", "2P-10D8T-102"])
+        self.assertEqual(self.index.find_harnesses(3, "positive", 102.0), [])
+
+    def test_spacing_tolerance(self):
+        """Test spacings within 0.1 ft of a stocked spacing match it"""
+        self.assertEqual(self.index.find_harnesses(2, "positive", 102.05, "8 AWG"), ["2P-10D8T-102"])
+        self.assertEqual(self.index.find_harnesses(2, "positive", 101.95, "8 AWG"), ["2P-10D8T-102"])
+        self.assertEqual(self.index.find_harnesses(2, "positive", 102.15, "8 AWG"), [])
+
+    def test_find_cable(self):
+        """Test whip lookup by gauge, polarity and exact length"""
+        self.assertEqual(self.index.find_cable("whip", "8 AWG", "positive", 20), "WHI-8-P-20")
+        self.assertEqual(self.index.find_cable("whip", "8 AWG", "positive", 20.0), "WHI-8-P-20")
+        self.assertIsNone(self.index.find_cable("whip", "8 AWG", "negative", 20))
+        self.assertIsNone(self.index.find_cable("extender", "8 AWG", "positive", 10))
+
+    def test_nearest_queries(self):
+        """Test snapping up to the nearest stock spacing/length"""
+        self.assertEqual(self.index.nearest_harness_spacing(2, "positive", 105.0), 113.0)
+        self.assertEqual(self.index.nearest_harness_spacing(2, "positive", 150.0), 113.0)
+        self.assertEqual(self.index.nearest_harness_spacing(2, "positive", 105.0, "10 AWG"), 102.0)
+        self.assertEqual(self.index.nearest_cable_length("whip", "8 AWG", "positive", 12), 20)
+        self.assertIsNone(self.index.nearest_cable_length("whip", "6 AWG", "positive", 12))
+        self.assertEqual(self.index.harness_spacings(None), [102.0, 113.0])
+
+
+class TestHarnessSpacingSnap(unittest.TestCase):
+    def setUp(self):
+        self.generator = BOMGenerator({})
+        self.generator.part_index = PartIndex(HARNESS_LIBRARY, WHIP_LIBRARY, {})
+
+    def test_snaps_to_stocked_spacing(self):
+        """Test the generator snaps up to this harness's stocked spacings"""
+        self.assertEqual(self.generator.find_matching_harness_part_number(2, "positive", 50.0, "10 AWG"),
+                         "2P-10D10T-102")
+        self.assertEqual(self.generator.find_matching_harness_part_number(2, "positive", 105.0, "8 AWG"),
+                         "2P-10D8T-113")
+        self.assertEqual(self.generator.find_matching_harness_part_number(
+            2, "positive", 50.0, "8 AWG", {2: 113.05}), "2P-10D8T-113")
+
+    def test_never_snaps_down(self):
+        """Test a spacing beyond this harness's stock misses instead of matching a shorter one"""
+        self.assertEqual(self.generator.find_matching_harness_part_number(2, "positive", 105.0, "10 AWG"),
+                         "N/A")
+        # Beyond every spacing in the library the largest is used, as before
+        self.assertEqual(self.generator.find_matching_harness_part_number(2, "positive", 150.0, "8 AWG"),
+                         "2P-10D8T-113")
+
+
+if __name__ == '__main__':
+    unittest.main()
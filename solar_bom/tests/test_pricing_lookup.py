@@ -0,0 +1,74 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.pricing_lookup import PricingLookup
+
+
+PRICING_DATA = {
+    "settings": {"current_copper_price": 4.7, "copper_price_tiers": [4.0, 4.5, 5.0]},
+    "extenders": {"8_awg": {"EXT-8-P-10": {"4.0": 16.77, "4.5": 17.18, "5.0": 17.6}}},
+    "whips": {"8_awg": {"WHI-8-P-10": {"4.0": 13.32, "4.5": 13.73}}},
+    "harnesses": {},
+    "fuses": {"FUSE-20": 13.54, "FUSE-ZERO": 0},
+    "combiner_boxes": {"WHI-8-P-10": 99.0},
+}
+
+
+class TestPricingLookup(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, 'pricing_data.json')
+        with open(path, 'w') as f:
+            json.dump(PRICING_DATA, f)
+
+        class _Lookup(PricingLookup):
+            def get_pricing_file_path(self):
+                return path
+
+        self.pricing = _Lookup()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_active_tier(self):
+        """Test tier resolution at, between and outside the tier breaks"""
+        self.assertEqual(self.pricing.get_active_tier(), "4.5")
+        self.assertEqual(self.pricing.get_active_tier(5.0), "5.0")
+        self.assertEqual(self.pricing.get_active_tier(9.0), "5.0")
+        self.assertEqual(self.pricing.get_active_tier(3.0), "4.0")
+
+    def test_get_price(self):
+        """Test copper-indexed, flat and missing part prices"""
+        self.assertEqual(self.pricing.get_price("EXT-8-P-10"), 17.18)
+        self.assertEqual(self.pricing.get_price("EXT-8-P-10", copper_price=5.2), 17.6)
+        self.assertEqual(self.pricing.get_price("FUSE-20"), 13.54)
+        self.assertIsNone(self.pricing.get_price("FUSE-ZERO"))
+        self.assertIsNone(self.pricing.get_price("UNKNOWN"))
+        # Whip has no 5.0 tier price, so the combiner box entry is used
+        self.assertEqual(self.pricing.get_price("WHI-8-P-10", copper_price=5.0), 99.0)
+
+    def test_get_prices(self):
+        """Test the bulk lookup matches single lookups"""
+        part_numbers = ["EXT-8-P-10", "WHI-8-P-10", "FUSE-20", "UNKNOWN", "N/A"]
+        prices = self.pricing.get_prices(part_numbers, copper_price=4.0)
+        self.assertEqual(prices, {pn: self.pricing.get_price(pn, 4.0) for pn in part_numbers})
+
+    def test_copper_sensitivity(self):
+        """Test extended cost per tier for a small BOM"""
+        sweep = self.pricing.copper_sensitivity(["EXT-8-P-10", "FUSE-20", "UNKNOWN"], [10, 2, 5])
+        self.assertEqual(list(sweep.columns), ["Part Number", "Quantity", "4.0", "4.5", "5.0"])
+        self.assertAlmostEqual(sweep.loc[0, "4.5"], 171.8)
+        self.assertAlmostEqual(sweep.loc[1, "5.0"], 27.08)
+        self.assertTrue(sweep.loc[2, ["4.0", "4.5", "5.0"]].isna().all())
+
+
+if __name__ == '__main__':
+    unittest.main()
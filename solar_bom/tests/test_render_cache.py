@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import harness_drawing_generator, site_pdf_generator
+from src.utils.render_cache import atomic_path, source_fingerprint
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprint_per_module(self):
+        """Test each drawing module is fingerprinted from its own source"""
+        pdf = source_fingerprint(site_pdf_generator.__file__)
+        self.assertEqual(source_fingerprint(site_pdf_generator.__file__), pdf)
+        self.assertNotEqual(source_fingerprint(harness_drawing_generator.__file__), pdf)
+
+    def test_atomic_path(self):
+        """Test a finished write replaces the file and a failed one leaves it and no temp file"""
+        path = os.path.join(self.tmp.name, 'page.pdf')
+        with atomic_path(path) as tmp_path:
+            with open(tmp_path, 'w') as f:
+                f.write('first')
+        with self.assertRaises(RuntimeError):
+            with atomic_path(path) as tmp_path:
+                with open(tmp_path, 'w') as f:
+                    f.write('partial')
+                raise RuntimeError('render failed')
+        with open(path) as f:
+            self.assertEqual(f.read(), 'first')
+        self.assertEqual(os.listdir(self.tmp.name), ['page.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.render_lod import (color_runs, dominant_color, group_footprints,
+                                  lod_tier, LOD_GROUP_PX_PER_FT, LOD_STRING_PX_PER_FT)
+
+
+class TestRenderLOD(unittest.TestCase):
+    def test_lod_tier(self):
+        """Test tiers switch at the px/ft thresholds"""
+        self.assertEqual(lod_tier(LOD_GROUP_PX_PER_FT / 2), 'group')
+        self.assertEqual(lod_tier(LOD_GROUP_PX_PER_FT), 'tracker')
+        self.assertEqual(lod_tier(LOD_STRING_PX_PER_FT), 'string')
+        self.assertEqual(lod_tier(0.1, group_below=0.05, string_below=0.25), 'tracker')
+
+    def test_color_runs(self):
+        """Test consecutive equal colors collapse into inclusive runs"""
+        self.assertEqual(color_runs(['a', 'a', 'b', 'a']), [(0, 1, 'a'), (2, 2, 'b'), (3, 3, 'a')])
+        self.assertEqual(color_runs([]), [])
+        self.assertEqual(dominant_color(['b', 'a', 'a', 'b', 'c']), 'b')
+        self.assertEqual(dominant_color([], default='#EEEEEE'), '#EEEEEE')
+
+    def test_group_footprints(self):
+        """Test same-colored neighbouring trackers merge into one outline"""
+        spans = [(0, 6, 0, 300), (20, 26, 10, 290), (40, 46, 0, 300)]
+        footprints = group_footprints(spans, ['red', 'red', 'blue'])
+        self.assertEqual([color for color, _ in footprints], ['red', 'blue'])
+        self.assertEqual(footprints[0][1], [(0, 0), (6, 0), (20, 10), (26, 10),
+                                            (26, 290), (20, 290), (6, 300), (0, 300)])
+        self.assertEqual(len(footprints[1][1]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
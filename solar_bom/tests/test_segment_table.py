@@ -0,0 +1,81 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.models.block import BlockConfig, HarnessGroup, WiringConfig, WiringType
+from src.models.tracker import StringPosition, TrackerPosition
+from src.utils.bom_generator import BOMGenerator
+
+
+def _tracker(x, n_strings):
+    strings = [StringPosition(i, 0.0, 0.0, 0.0, 0.0, 28) for i in range(n_strings)]
+    return TrackerPosition(x=x, y=0.0, rotation=0.0, template=None, strings=strings)
+
+
+def _block(block_id, wiring_type, routes, groupings=None, **kwargs):
+    wiring = WiringConfig(wiring_type=wiring_type, positive_collection_points=[],
+                          negative_collection_points=[], strings_per_collection={},
+                          cable_routes=routes, harness_groupings=groupings or {})
+    return BlockConfig(block_id=block_id, inverter=None, tracker_template=None, width_m=50.0,
+                       height_m=100.0, row_spacing_m=6.0, ns_spacing_m=1.0, gcr=0.4,
+                       tracker_positions=[_tracker(0.0, 2), _tracker(6.0, 2)],
+                       wiring_config=wiring, **kwargs)
+
+
+class TestSegmentTable(unittest.TestCase):
+    def setUp(self):
+        # Harness block: tracker 1 whips use the per-harness 6 AWG, tracker 2 the
+        # block default; one whip route has three points, one route is a stub
+        harness = _block('B1', WiringType.HARNESS, {
+            'pos_whip_t1-h1_whip': [(0, 0), (0, 3), (4, 3)],
+            'neg_whip_t1-h1_whip': [(0, 0), (0, 10)],
+            'pos_whip_t2-h2_whip': [(0, 0), (0, 10)],
+            'pos_extender_0_h0': [(0, 0), (0, 20)],
+            'pos_src_0_0': [(0, 0), (0, 2)],
+            'neg_whip_stub': [(1, 1)],
+        }, groupings={2: [HarnessGroup([0, 1], whip_cable_size='6 AWG')]})
+        homerun = _block('B2', WiringType.HOMERUN, {
+            'pos_string_0': [(0, 0), (0, 2)],
+            'neg_string_0': [(0, 0), (0, 2)],
+        }, underground_routing=True)
+        self.generator = BOMGenerator({'B1': harness, 'B2': homerun})
+
+    def test_table_rows(self):
+        """Test one row per route with its cable type, polarity, size and length"""
+        table = self.generator.segment_table()
+        self.assertEqual(list(table.columns), ['block_id', 'route_id', 'cable_type', 'polarity',
+                                               'cable_size', 'length_ft'])
+        self.assertNotIn('neg_whip_stub', set(table['route_id']))
+        rows = table.set_index('route_id')
+        self.assertEqual(rows.loc['pos_whip_t1-h1_whip', 'cable_size'], '6 AWG')
+        self.assertEqual(rows.loc['pos_whip_t2-h2_whip', 'cable_size'], '8 AWG')
+        self.assertEqual(rows.loc['pos_extender_0_h0', 'cable_type'], 'extender')
+        self.assertEqual(rows.loc['neg_string_0', 'polarity'], 'Negative')
+        self.assertAlmostEqual(rows.loc['pos_whip_t1-h1_whip', 'length_ft'], 7 * 3.28084)
+        self.assertAlmostEqual(rows.loc['pos_string_0', 'length_ft'], 2 * 3.28084)
+
+    def test_counts_in_bom(self):
+        """Test segment counts land in the block quantities with per-harness sizes"""
+        quantities = self.generator.calculate_cable_quantities()
+        b1 = quantities['B1']
+        # 7 m -> 24.1 ft with waste, rounded up past the next 5 ft
+        self.assertEqual(b1['Positive Whip Cable (6 AWG) Segment 30ft (6 AWG)']['quantity'], 1)
+        self.assertEqual(b1['Positive Whip Cable (8 AWG) Segment 40ft (8 AWG)']['quantity'], 1)
+        self.assertIn('Positive Extender Cable (8 AWG) Segment 75ft (8 AWG)', b1)
+        # String cable segments are only counted for homerun blocks
+        self.assertFalse(any('String Cable' in key for key in b1))
+        self.assertEqual(quantities['B2']['Positive String Cable Segment 15ft (10 AWG)']['quantity'], 1)
+
+    def test_empty(self):
+        """Test blocks without routes give an empty table"""
+        generator = BOMGenerator({'B3': _block('B3', WiringType.HARNESS, {})})
+        self.assertTrue(generator.segment_table().empty)
+        self.assertTrue(generator.segment_counts().empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.spatial_grid import UniformGrid, bbox_of
+
+
+class TestUniformGrid(unittest.TestCase):
+    def setUp(self):
+        self.boxes = {
+            0: (0, 0, 6, 300),
+            1: (20, 0, 26, 300),
+            2: (24, 100, 30, 400),     # overlaps 1
+            3: (-500, -500, -490, -490),
+            4: (26, 300, 40, 310),     # touches 1 and overlaps 2
+        }
+        self.grid = UniformGrid.from_boxes(self.boxes, cell_size=50)
+
+    def test_query(self):
+        """Test box and point queries return only intersecting keys"""
+        self.assertEqual(sorted(self.grid.query((0, 0, 10, 10))), [0])
+        self.assertEqual(sorted(self.grid.query((22, 150, 25, 160))), [1, 2])
+        self.assertEqual(self.grid.query((1000, 1000, 1001, 1001)), [])
+        self.assertEqual(sorted(self.grid.query_point(25, 200)), [1, 2])
+        self.assertEqual(self.grid.query_point(-495, -495), [3])
+
+    def test_candidate_pairs_match_brute_force(self):
+        """Test grid pairs equal an all-pairs bounding box comparison"""
+        expected = [(a, b) for a in self.boxes for b in self.boxes if a < b
+                    and self.boxes[a][0] <= self.boxes[b][2] and self.boxes[b][0] <= self.boxes[a][2]
+                    and self.boxes[a][1] <= self.boxes[b][3] and self.boxes[b][1] <= self.boxes[a][3]]
+        self.assertEqual(self.grid.candidate_pairs(), sorted(expected))
+        self.assertEqual(self.grid.candidate_pairs(), [(1, 2), (1, 4), (2, 4)])
+
+    def test_bbox_of(self):
+        """Test bounding box of a rotated rectangle"""
+        self.assertEqual(bbox_of([(1, 2), (3, -1), (0, 5), (2, 2)]), (0, -1, 3, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.models import tracker
+from src.models.module import ModuleOrientation, ModuleSpec, ModuleType
+from src.models.tracker import TrackerPosition, TrackerTemplate
+
+
+def _template(**kwargs):
+    spec = ModuleSpec(manufacturer='M', model='X', type=ModuleType.MONO_PERC, length_mm=2278,
+                      width_mm=1134, depth_mm=35, weight_kg=28, wattage=550, vmp=41.5, imp=13.25,
+                      voc=49.6, isc=14.0, max_system_voltage=1500)
+    values = dict(template_name='2S', module_spec=spec, module_orientation=ModuleOrientation.PORTRAIT,
+                  modules_per_string=28, strings_per_tracker=2, module_spacing_m=0.02,
+                  motor_position_after_string=1)
+    values.update(kwargs)
+    return TrackerTemplate(**values)
+
+
+class TestStringGeometry(unittest.TestCase):
+    def setUp(self):
+        tracker.clear_string_geometry_cache()
+
+    def test_shared_per_template(self):
+        """Test trackers from one template share geometry but get their own strings"""
+        template = _template()
+        a = TrackerPosition(x=0.0, y=0.0, rotation=0.0, template=template)
+        b = TrackerPosition(x=6.0, y=50.0, rotation=0.0, template=template)
+        a.calculate_string_positions()
+        b.calculate_string_positions()
+        self.assertEqual(len(tracker._string_geometry_cache), 1)
+        self.assertEqual(a.strings, b.strings)
+        self.assertIsNot(a.strings[0], b.strings[0])
+        # Relative to the tracker: the first string starts at its north end
+        self.assertEqual(a.strings[0].positive_source_y, 0.0)
+        self.assertAlmostEqual(a.strings[1].positive_source_y, a.strings[0].negative_source_y + 1.0)
+
+    def test_template_edit_recomputes(self):
+        """Test an edited template doesn't reuse the old geometry"""
+        template = _template()
+        pos = TrackerPosition(x=0.0, y=0.0, rotation=0.0, template=template)
+        pos.calculate_string_positions()
+        before = pos.strings[1].positive_source_y
+        template.motor_gap_m = 2.0
+        pos.calculate_string_positions()
+        self.assertAlmostEqual(pos.strings[1].positive_source_y, before + 1.0)
+
+    def test_polarity_toward_device(self):
+        """Test toward-device conventions still flip per tracker position"""
+        template = _template()
+        north = TrackerPosition(x=0.0, y=0.0, rotation=0.0, template=template)
+        south = TrackerPosition(x=0.0, y=200.0, rotation=0.0, template=template)
+        for pos in (north, south):
+            pos.set_polarity_info("Negative Toward Device", 100.0)
+            pos.calculate_string_positions()
+        # North of the device keeps negative at the south end; south of it flips
+        self.assertLess(north.strings[0].positive_source_y, north.strings[0].negative_source_y)
+        self.assertGreater(south.strings[0].positive_source_y, south.strings[0].negative_source_y)
+
+        north.set_polarity_info("Negative Always North", None)
+        north.calculate_string_positions()
+        self.assertEqual(north.strings, south.strings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils import site_pdf_generator as spg
+
+
+def _spec(spt=3, name='1x3'):
+    return {
+        'strings_per_tracker': spt, 'modules_per_string': 26, 'template_name': name,
+        'module_width_mm': 1134, 'module_length_mm': 2384, 'module_orientation': 'Portrait',
+        'harness_sizes': [spt], 'has_motor': True, 'motor_placement_type': 'between_strings',
+        'motor_position_after_string': 1, 'motor_string_index': 1,
+        'motor_split_north': 13, 'motor_split_south': 13,
+        'polarity_convention': 'Negative Always South', 'device_position': 'south',
+        'inverter_topology': 'Distributed String', 'connector_type': 'MC4', 'has_extender': False,
+        'wire_gauges': {'string': '10 AWG', 'harness': {spt: '8 AWG'},
+                        'whip': {spt: '6 AWG'}, 'extender': {spt: '8 AWG'}},
+    }
+
+
+class TestWiringPageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = self.tmp.name
+        self.project_info = {'project_name': 'Cache Test', 'customer': 'c'}
+        self.specs = [_spec(2, 'A'), _spec(3, 'B'), _spec(4, 'C')]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_page_key(self):
+        """Test the cache key tracks the specs, project info and page position"""
+        key = spg._wiring_page_key(self.specs[:2], self.project_info, 0)
+        self.assertEqual(key, spg._wiring_page_key([dict(s) for s in self.specs[:2]],
+                                                   dict(self.project_info), 0))
+        self.assertNotEqual(key, spg._wiring_page_key(self.specs[:2], self.project_info, 2))
+        self.assertNotEqual(key, spg._wiring_page_key(
+            self.specs[:2], dict(self.project_info, customer='other'), 0))
+        self.assertNotEqual(key, spg._wiring_page_key(
+            [self.specs[0], _spec(3, 'B2')], self.project_info, 0))
+
+    def test_rerender_only_changed_pages(self):
+        """Test cached pages are reused and only an edited page is redrawn"""
+        paths = spg._render_wiring_page_files(self.specs, self.project_info, workers=1,
+                                              cache_dir=self.cache_dir)
+        self.assertEqual(len(paths), 2)
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+
+        with patch.object(spg, '_render_wiring_page_file') as render:
+            again = spg._render_wiring_page_files(self.specs, self.project_info, workers=1,
+                                                  cache_dir=self.cache_dir)
+            self.assertEqual(again, paths)
+            render.assert_not_called()
+
+            edited = self.specs[:2] + [_spec(4, 'C2')]
+            spg._render_wiring_page_files(edited, self.project_info, workers=1,
+                                          cache_dir=self.cache_dir)
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(render.call_args[0][0][3], 2)  # page starting at diagram C
+
+    def test_prune(self):
+        """Test pruning keeps the newest files and anything still in use"""
+        for i in range(5):
+            path = os.path.join(self.cache_dir, f'{i}.pdf')
+            open(path, 'wb').close()
+            os.utime(path, (i, i))
+        keep = {os.path.join(self.cache_dir, '0.pdf')}
+        spg._prune_wiring_cache(self.cache_dir, keep=keep, max_files=2)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['0.pdf', '3.pdf', '4.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main()